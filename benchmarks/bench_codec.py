@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Per-RPC CPU cost of request encoding and response decoding, per JSON backend.
+
+Builds realistically sized batchexecute traffic (list_notebooks for a large
+account, a multi-MB source fulltext, a studio poll, a streamed query answer)
+and times the client's own encode/decode path with each installed codec.
+
+    python benchmarks/bench_codec.py [--rounds N]
+
+Install the optional backends to compare: pip install orjson msgspec
+"""
+
+import argparse
+import json
+import time
+
+from notebooklm_mcp import codec
+from notebooklm_mcp.api_client import NotebookLMClient
+
+
+def wrap_rpc(rpc_id: str, result: object) -> bytes:
+    """Frame a result the way batchexecute does (inner JSON string in wrb.fr)."""
+    chunk = json.dumps([["wrb.fr", rpc_id, json.dumps(result), None, None, None, "generic"]])
+    trailer = json.dumps([["di", 123], ["af.httprm", 122, "-1234567890", 1]])
+    return f")]}}'\n{len(chunk)}\n{chunk}\n{len(trailer)}\n{trailer}\n".encode()
+
+
+def notebook_list(count: int) -> list:
+    sources = [[[f"src-{i:04d}-0000-0000-0000-000000000000"], f"Source title {i}", [None, 1234, [1700000000, 0]]]
+               for i in range(8)]
+    return [[
+        [f"Notebook {i} about research topic", sources, f"nb-{i:06d}-0000-0000-0000-000000000000", "📘",
+         None, [1, False, True, None, None, [1700000000 + i, 0], None, None, [1700000000, 0]]]
+        for i in range(count)
+    ]]
+
+
+def fulltext(size_bytes: int) -> list:
+    paragraph = "NotebookLM source paragraph with some unicode — café, 데이터, 数据. " * 8
+    paragraphs = [[[0, len(paragraph), [[[0, len(paragraph), [paragraph]]]]]] for _ in range(size_bytes // len(paragraph))]
+    return [[["src-id"], "Large PDF", [None, size_bytes, None, None, 3]], None, None, [paragraphs]]
+
+
+def studio_poll(count: int) -> list:
+    return [[
+        [f"artifact-{i}", f"Audio Overview {i}", 1, [[["src-1"]]], 3, None, [None, None, None, None, None,
+         [[f"https://example.com/audio/{i}.m4a", 4]]], None, None, None, None, None, None, None, None,
+         [1700000000, 0]]
+        for i in range(count)
+    ]]
+
+
+def query_stream(chunks: int) -> bytes:
+    parts = [")]}'\n"]
+    answer = ""
+    for i in range(chunks):
+        answer += f"Sentence {i} of a long grounded answer with citations [1]. "
+        inner = json.dumps([[answer, None, [f"conv-{i}"], None, [[], None, None, None, 1]]])
+        chunk = json.dumps([["wrb.fr", None, inner]])
+        parts.append(f"{len(chunk)}\n{chunk}\n")
+    return "".join(parts).encode()
+
+
+def bench(label: str, fn, rounds: int) -> float:
+    fn()  # warm-up
+    start = time.process_time()
+    for _ in range(rounds):
+        fn()
+    per_call_ms = (time.process_time() - start) / rounds * 1000
+    print(f"  {label:<38} {per_call_ms:9.3f} ms")
+    return per_call_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    client = NotebookLMClient.__new__(NotebookLMClient)
+    client.csrf_token = "csrf"
+    client._session_id = "sid"
+
+    workloads = {
+        "list_notebooks (2000 notebooks)": (NotebookLMClient.RPC_LIST_NOTEBOOKS, wrap_rpc("wXbhsf", notebook_list(2000))),
+        "get_source_fulltext (~4 MB)": (NotebookLMClient.RPC_GET_SOURCE, wrap_rpc("hizoJc", fulltext(4_000_000))),
+        "poll_studio_status (200 artifacts)": (NotebookLMClient.RPC_POLL_STUDIO, wrap_rpc("gArtLc", studio_poll(200))),
+    }
+    query_body = query_stream(200)
+    request_params = [["src-1", "src-2"], "What is this about?", None, [2, None, [1]], "conv-id"] * 20
+
+    for backend in codec.available_backends():
+        codec.set_backend(backend)
+        print(f"backend: {backend}")
+        bench("encode request body", lambda: client._build_request_body("rLM1Ne", request_params), args.rounds * 50)
+        for label, (rpc_id, body) in workloads.items():
+            bench(f"decode {label}",
+                  lambda: client._extract_rpc_result(client._parse_response(body), rpc_id), args.rounds)
+        bench("decode query stream (200 chunks)", lambda: client._parse_query_response(query_body), args.rounds)
+        print()
+
+
+if __name__ == "__main__":
+    main()
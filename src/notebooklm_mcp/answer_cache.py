@@ -0,0 +1,349 @@
+"""Opt-in cache of first-turn query answers.
+
+A repeated question against an unchanged notebook costs a full
+GenerateFreeFormStreamed round trip (10-60 s). With use_cache=True,
+query() looks the question up here first. Only first-turn questions are
+cached: a follow-up's answer depends on the conversation before it.
+
+The key is the notebook ID, the sorted source IDs queried, the normalized
+question (case and whitespace folded, trailing punctuation dropped) and the
+chat options sent with the query. Each answer is stored with the notebook's
+version - CachedNotebook.fingerprint of the get_notebook structure (held for
+NOTEBOOKLM_NOTEBOOK_CACHE_TTL, default 60 s), which changes with the
+notebook's modified time and with any source's metadata - and is only served
+while that value is unchanged. Configuring the chat or changing the notebook
+through the client drops the notebook's answers.
+
+A hit starts a new conversation seeded with the cached turn, so follow-ups
+on the returned conversation_id carry the question and answer as history.
+
+QueryIndex (query(match_similar=True)) also catches rewordings. Each
+question is reduced to its content words (stopwords and framing words such
+as "summarize" or "key" dropped, plurals folded) and their character
+trigrams, each set with a MinHash signature. Two questions match only if
+their numbers and short words (up to 3 characters: years, chapter numbers,
+acronyms) agree exactly; their score is then the estimated Jaccard
+similarity of the words, weighted 3:1 over that of the trigrams. A new
+question scoring at least the threshold against a past one in the same
+scope (notebook, sources, chat options) gets that question's answer. The
+match needs no RPC; the same version rule applies. Scopes are small
+(bounded per notebook), so matching is a linear scan over signatures; the
+least recently used scopes are dropped beyond NOTEBOOKLM_SIMILAR_QUERY_SCOPES.
+
+Environment overrides:
+    NOTEBOOKLM_ANSWER_CACHE_SIZE=<n>              Answers kept (default 256, 0 = no caching)
+    NOTEBOOKLM_ANSWER_CACHE_TTL=<secs>            Answer lifetime (default 86400)
+    NOTEBOOKLM_SIMILAR_QUERY_THRESHOLD=<0-1>      Similarity that counts as a match (default 0.7)
+    NOTEBOOKLM_SIMILAR_QUERY_LIMIT=<n>            Questions indexed per scope (default 200)
+    NOTEBOOKLM_SIMILAR_QUERY_SCOPES=<n>           Scopes indexed (default 256)
+"""
+
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+
+def normalize_query(text: str) -> str:
+    """Question text with case, whitespace and trailing punctuation folded."""
+    return " ".join(text.casefold().split()).rstrip("?!. ")
+
+
+def answer_scope(notebook_id: str, source_ids: Iterable[str], chat_options: str) -> tuple:
+    """What an answer depends on besides the question; starts with the notebook ID."""
+    return notebook_id, tuple(sorted(source_ids)), chat_options
+
+
+def answer_key(scope: tuple, query_text: str) -> Hashable:
+    """Cache key of a first-turn question."""
+    return *scope, normalize_query(query_text)
+
+
+class CachedAnswer:
+    """An answer and the notebook state it was given for."""
+
+    __slots__ = ("answer", "query_text", "version", "stored_at")
+
+    def __init__(self, answer: str, query_text: str, version: str):
+        self.answer = answer
+        self.query_text = query_text
+        self.version = version
+        self.stored_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+
+class AnswerCache:
+    """LRU of first-turn answers, checked against the notebook's version."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 86400.0):
+        """
+        Args:
+            max_entries: Answers kept, least recently used dropped first
+            ttl: Seconds an answer is served at all
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, CachedAnswer] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "AnswerCache":
+        """Defaults, overridden by NOTEBOOKLM_ANSWER_CACHE_* environment variables."""
+        def env(name: str, default: float) -> float:
+            try:
+                return float(os.environ[name])
+            except (KeyError, ValueError):
+                return default
+
+        return cls(
+            max_entries=int(env("NOTEBOOKLM_ANSWER_CACHE_SIZE", 256)),
+            ttl=env("NOTEBOOKLM_ANSWER_CACHE_TTL", 86400.0),
+        )
+
+    def get(self, key: Hashable, version: str) -> CachedAnswer | None:
+        """Answer for the key if the notebook has not changed since it was stored."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version and entry.age < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, answer: str, query_text: str, version: str) -> None:
+        """Store a complete answer given while the notebook was at `version`."""
+        if self.max_entries <= 0 or not answer:
+            return
+        with self._lock:
+            self._entries[key] = CachedAnswer(answer, query_text, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, notebook_id: str) -> None:
+        """Drop every answer for the notebook."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == notebook_id]:
+                del self._entries[key]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# =========================================================================
+# Near-duplicate questions
+# =========================================================================
+
+# Words that carry no meaning of their own in a question, and words that
+# frame the request ("summarize the main ...") rather than name its subject
+_STOPWORDS = frozenset(
+    "a about all an and any are as at be been by can could did do does for from "
+    "had has have how i in into is it its me my of on or our please should tell "
+    "that the their there these they this those to was we were what when where "
+    "which who why will with would you your".split()
+    + "brief briefly describe detail details discuss explain give identify key list "
+    "main major mention outline overview primary say summarise summarize summary".split()
+)
+_SHORT_WORD = 3
+# Share of the score from the word set; the rest comes from character trigrams
+_WORD_WEIGHT = 0.75
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def content_words(text: str) -> list[str]:
+    """Words of a question that name its subject, with plural "s" folded."""
+    words = []
+    for word in re.findall(r"\w+", normalize_query(text)):
+        # Single letters are mostly split-off contractions ("paper's")
+        if word in _STOPWORDS or (len(word) == 1 and not word.isdigit()):
+            continue
+        if len(word) > _SHORT_WORD + 1 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return words
+
+
+def trigrams(words: Iterable[str]) -> set[str]:
+    """Character trigrams of each word (catches other inflections)."""
+    grams = set()
+    for word in words:
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+@dataclass(frozen=True)
+class Signature:
+    """What a question is matched on: exact key words, then word and trigram MinHashes."""
+
+    keys: frozenset[str]
+    words: tuple[int, ...]
+    grams: tuple[int, ...]
+
+
+class MinHasher:
+    """MinHash signatures from k universal hash permutations of a 64-bit shingle hash."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+
+    def _minhash(self, shingles: Iterable[str]) -> tuple[int, ...]:
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+            for shingle in shingles
+        ]
+        return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self._perms)
+
+    def signature(self, text: str) -> Signature | None:
+        """Signature of a question; None if it has no content words."""
+        words = set(content_words(text))
+        if not words:
+            return None
+        # Numbers and short words (years, chapters, acronyms) must agree exactly
+        keys = frozenset(word for word in words if len(word) <= _SHORT_WORD or any(c.isdigit() for c in word))
+        return Signature(keys, self._minhash(words), self._minhash(trigrams(words)))
+
+
+def _jaccard(first: tuple[int, ...], second: tuple[int, ...]) -> float:
+    if not first or len(first) != len(second):
+        return 0.0
+    return sum(x == y for x, y in zip(first, second)) / len(first)
+
+
+def similarity(first: Signature | None, second: Signature | None) -> float:
+    """Estimated similarity of two questions: 0 unless their key words agree."""
+    if first is None or second is None or first.keys != second.keys:
+        return 0.0
+    return _WORD_WEIGHT * _jaccard(first.words, second.words) + (1 - _WORD_WEIGHT) * _jaccard(
+        first.grams, second.grams
+    )
+
+
+class IndexedQuery:
+    """A past first-turn question, its signature and its answer."""
+
+    __slots__ = ("query_text", "signature", "answer", "version", "stored_at")
+
+    def __init__(self, query_text: str, signature: Signature, answer: str, version: str):
+        self.query_text = query_text
+        self.signature = signature
+        self.answer = answer
+        self.version = version
+        self.stored_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+
+class QueryIndex:
+    """Per-scope MinHash index of past questions for near-duplicate matching."""
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        per_scope: int = 200,
+        ttl: float = 86400.0,
+        num_perm: int = 64,
+        max_scopes: int = 256,
+    ):
+        """
+        Args:
+            threshold: Estimated similarity (0-1) at which a past answer is reused
+            per_scope: Questions kept per (notebook, sources, chat options), oldest dropped first
+            ttl: Seconds an answer is reused at all
+            num_perm: MinHash permutations (more = finer similarity estimates)
+            max_scopes: Scopes kept, least recently used dropped first
+        """
+        self.threshold = threshold
+        self.per_scope = per_scope
+        self.ttl = ttl
+        self.max_scopes = max_scopes
+        self._hasher = MinHasher(num_perm)
+        self._lock = threading.Lock()
+        self._scopes: OrderedDict[tuple, deque[IndexedQuery]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "QueryIndex":
+        """Defaults, overridden by NOTEBOOKLM_SIMILAR_QUERY_* environment variables."""
+        def env(name: str, default: float) -> float:
+            try:
+                return float(os.environ[name])
+            except (KeyError, ValueError):
+                return default
+
+        return cls(
+            threshold=env("NOTEBOOKLM_SIMILAR_QUERY_THRESHOLD", 0.7),
+            per_scope=int(env("NOTEBOOKLM_SIMILAR_QUERY_LIMIT", 200)),
+            ttl=env("NOTEBOOKLM_ANSWER_CACHE_TTL", 86400.0),
+            max_scopes=int(env("NOTEBOOKLM_SIMILAR_QUERY_SCOPES", 256)),
+        )
+
+    def match(self, scope: tuple, query_text: str, version: str) -> tuple[IndexedQuery, float] | None:
+        """Most similar past question in the scope at or above the threshold, with its score."""
+        signature = self._hasher.signature(query_text)
+        best, best_score = None, 0.0
+        with self._lock:
+            entries = self._scopes.get(scope, ())
+            for entry in list(entries):
+                if entry.version != version or entry.age >= self.ttl:
+                    entries.remove(entry)
+                    continue
+                score = similarity(signature, entry.signature)
+                if score > best_score:
+                    best, best_score = entry, score
+            if best is None or best_score < self.threshold:
+                self.misses += 1
+                return None
+            self._scopes.move_to_end(scope)
+            self.hits += 1
+            return best, best_score
+
+    def add(self, scope: tuple, query_text: str, answer: str, version: str) -> None:
+        """Index a complete first-turn answer."""
+        if self.per_scope <= 0 or self.max_scopes <= 0 or not answer:
+            return
+        signature = self._hasher.signature(query_text)
+        if signature is None:
+            return
+        with self._lock:
+            entries = self._scopes.setdefault(scope, deque(maxlen=self.per_scope))
+            entries.append(IndexedQuery(query_text, signature, answer, version))
+            self._scopes.move_to_end(scope)
+            while len(self._scopes) > self.max_scopes:
+                self._scopes.popitem(last=False)
+
+    def invalidate(self, notebook_id: str) -> None:
+        """Forget every question asked of the notebook."""
+        with self._lock:
+            for scope in [scope for scope in self._scopes if scope[0] == notebook_id]:
+                del self._scopes[scope]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            questions = sum(len(entries) for entries in self._scopes.values())
+        return {"questions": questions, "hits": self.hits, "misses": self.misses}
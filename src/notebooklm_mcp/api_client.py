@@ -4,19 +4,49 @@
 Internal API. See CLAUDE.md for full documentation.
 """
 
+import contextlib
 import json
 import logging
 import os
 import re
+import threading
+import time
 import urllib.parse
-from dataclasses import dataclass
-from datetime import datetime, timezone
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from typing import Any
 
 
 import httpx
 
-from . import constants
+from . import codec, constants
+from .answer_cache import AnswerCache, QueryIndex, answer_key, answer_scope
+from .decoders import (
+    Notebook,
+    SourceContent,
+    decode_conversations,
+    decode_notebook_list,
+    decode_research_tasks,
+    decode_studio_artifacts,
+    parse_timestamp,
+)
+from .circuit import BATCHEXECUTE, QUERY, CircuitBreaker
+from .conversations import (  # noqa: F401 - re-exported
+    ConversationBackend,
+    ConversationStore,
+    ConversationTurn,
+    HistoryPolicy,
+    conversation_store_from_env,
+)
+from .deadline import clamp_timeout, remaining_time
+from .framing import FrameDecoder, decode_frames
+from .fulltext_cache import FulltextCache
+from .notebook_cache import CachedNotebook, NotebookCache, NotebookListCache, NotebookListSnapshot
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .singleflight import SingleFlight, rpc_key
+from .summary_cache import NOTEBOOK_SUMMARY, SOURCE_GUIDE, SummaryCache
+from .transport import TransportConfig
 
 # Configure logger (API internals only logged at DEBUG level, usually disabled)
 logger = logging.getLogger("notebooklm_mcp.api")
@@ -128,6 +158,9 @@ class AuthenticationError(Exception):
 DEFAULT_TIMEOUT = 30.0  # Default for most operations
 SOURCE_ADD_TIMEOUT = 120.0  # Extended timeout for all source operations (large slides/docs/websites)
 
+# Most RPCs coalesced into a single batchexecute POST (larger batches are split)
+MAX_RPC_BATCH_SIZE = 20
+
 
 # Ownership constants (from metadata position 0)
 OWNERSHIP_MINE = constants.OWNERSHIP_MINE
@@ -135,59 +168,33 @@ OWNERSHIP_SHARED = constants.OWNERSHIP_SHARED
 
 
 @dataclass
-class ConversationTurn:
-    """Represents a single turn in a conversation (query + response).
-
-    Used to track conversation history for follow-up queries.
-    NotebookLM requires the full conversation history in follow-up requests.
-    """
-    query: str       # The user's question
-    answer: str      # The AI's response
-    turn_number: int  # 1-indexed turn number in the conversation
-
+class QueryStreamState:
+    """Progress of a streamed query response.
 
-
-def parse_timestamp(ts_array: list | None) -> str | None:
-    """Convert [seconds, nanoseconds] timestamp array to ISO format string.
+    Each chunk of GenerateFreeFormStreamed carries the full text so far, so
+    the longest answer (type 1) and thinking (type 2) chunks are the best
+    snapshots received at any point.
     """
-    if not ts_array or not isinstance(ts_array, list) or len(ts_array) < 1:
-        return None
-
-    try:
-        seconds = ts_array[0]
-        if not isinstance(seconds, (int, float)):
-            return None
-
-        # Convert to datetime
-        dt = datetime.fromtimestamp(seconds, tz=timezone.utc)
-        return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
-    except (ValueError, OSError, OverflowError):
-        return None
-
-
-@dataclass
-class Notebook:
-    """Represents a NotebookLM notebook."""
-
-    id: str
-    title: str
-    source_count: int
-    sources: list[dict]
-    is_owned: bool = True     # True if owned by user, False if shared with user
-    is_shared: bool = False   # True if shared with others (for owned notebooks)
-    created_at: str | None = None   # ISO format timestamp
-    modified_at: str | None = None  # ISO format timestamp
+    answer: str = ""
+    thinking: str = ""
+    started_at: float = field(default_factory=time.monotonic)
+    first_token_at: float | None = None
+    raw_head: str = ""  # First 1000 chars of the raw response (for debugging)
+    request_bytes: int = 0  # Size of the request body sent
+    history_turns: int = 0  # Earlier turns sent with the query
 
     @property
-    def url(self) -> str:
-        return f"https://notebooklm.google.com/notebook/{self.id}"
+    def best_text(self) -> str:
+        """Answer if any arrived, otherwise the latest thinking text."""
+        return self.answer or self.thinking
 
     @property
-    def ownership(self) -> str:
-        """Return human-readable ownership status."""
-        if self.is_owned:
-            return "owned"
-        return "shared_with_me"
+    def time_to_first_token(self) -> float | None:
+        """Seconds from request start to the first chunk with text."""
+        if self.first_token_at is None:
+            return None
+        return round(self.first_token_at - self.started_at, 3)
+
 
 
 class NotebookLMClient:
@@ -270,6 +277,24 @@ class NotebookLMClient:
     RPC_LIST_MIND_MAPS = "cFji9"       # List existing mind maps
     RPC_DELETE_MIND_MAP = "AH0mwd"     # Delete a mind map
 
+    # RPCs that can run for minutes; sent through the long-running lane so
+    # they don't hold the connections short metadata RPCs and polls use.
+    # Queries (GenerateFreeFormStreamed) always use that lane too.
+    LONG_RUNNING_RPCS = frozenset({RPC_ADD_SOURCE, RPC_IMPORT_RESEARCH})
+    # Reads and polls: resent after any transient failure (429/5xx, timeouts,
+    # dropped connections). Every other RPC creates or changes something and is
+    # only resent when the request cannot have reached the server (see retry.py)
+    IDEMPOTENT_RPCS = frozenset({
+        RPC_LIST_NOTEBOOKS, RPC_GET_NOTEBOOK, RPC_GET_SOURCE, RPC_CHECK_FRESHNESS,
+        RPC_GET_CONVERSATIONS, RPC_PREFERENCES, RPC_SUBSCRIPTION, RPC_SETTINGS,
+        RPC_GET_SUMMARY, RPC_GET_SOURCE_GUIDE, RPC_POLL_RESEARCH, RPC_POLL_STUDIO,
+        RPC_LIST_MIND_MAPS,
+    })
+    # Rate limiter key for GenerateFreeFormStreamed (not a batchexecute RPC)
+    QUERY_RATE_KEY = "query"
+    # Chat options sent with every query (part of the answer cache key)
+    QUERY_OPTIONS = [2, None, [1]]
+
     # Report format constants
     REPORT_FORMAT_BRIEFING_DOC = constants.REPORT_FORMAT_BRIEFING_DOC
     REPORT_FORMAT_STUDY_GUIDE = constants.REPORT_FORMAT_STUDY_GUIDE
@@ -327,7 +352,30 @@ class NotebookLMClient:
         "sec-ch-ua-platform": '"macOS"',
     }
 
-    def __init__(self, cookies: dict[str, str], csrf_token: str = "", session_id: str = ""):
+    # Whether the constructor fetches missing CSRF/session tokens eagerly.
+    # The async client defers this to its first RPC (no event loop in __init__).
+    _REFRESH_AUTH_ON_INIT = True
+
+    def __init__(
+        self,
+        cookies: dict[str, str],
+        csrf_token: str = "",
+        session_id: str = "",
+        transport: TransportConfig | None = None,
+        long_running_transport: TransportConfig | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        notebook_cache: NotebookCache | None = None,
+        fulltext_cache: FulltextCache | None = None,
+        summary_cache: SummaryCache | None = None,
+        notebook_list_cache: NotebookListCache | None = None,
+        answer_cache: AnswerCache | None = None,
+        query_index: QueryIndex | None = None,
+        conversation_store: ConversationBackend | None = None,
+        history_policy: HistoryPolicy | None = None,
+        restore_conversations: bool = False,
+    ):
         """
         Initialize the client.
 
@@ -335,15 +383,58 @@ class NotebookLMClient:
             cookies: Dict of Google auth cookies (SID, SSID, HSID, APISID, SAPISID, etc.)
             csrf_token: CSRF token (optional - will be auto-extracted from page if not provided)
             session_id: Session ID (optional - will be auto-extracted from page if not provided)
+            transport: Connection pool / HTTP/2 settings for short RPCs
+                (default: TransportConfig.from_env())
+            long_running_transport: Settings for queries, source adds and imports
+                (default: TransportConfig.long_running_from_env())
+            rate_limiter: Per-account rate/concurrency limiter; pass the same one to
+                every client of an account (default: a new RateLimiter.from_env())
+            retry_policy: Backoff and retry budget for transient RPC failures
+                (default: RetryPolicy.from_env())
+            circuit_breaker: Fails calls fast while their endpoint keeps failing;
+                share it like the rate limiter (default: a new CircuitBreaker.from_env())
+            notebook_cache: Short-lived cache of get_notebook results
+                (default: a new NotebookCache.from_env())
+            fulltext_cache: On-disk cache of source full text
+                (default: FulltextCache.from_env(), under ~/.notebooklm-mcp/)
+            summary_cache: Cache of source guides and notebook summaries; share it
+                across clients (default: a new SummaryCache.from_env())
+            notebook_list_cache: Stale-while-revalidate list_notebooks snapshot
+                (default: a new NotebookListCache.from_env())
+            answer_cache: First-turn answers reused by query(use_cache=True)
+                (default: a new AnswerCache.from_env())
+            query_index: Near-duplicate question index used by query(match_similar=True)
+                (default: a new QueryIndex.from_env())
+            conversation_store: Bounded store of conversation turns for follow-ups
+                (default: conversation_store_from_env(), SQLite shared by every process)
+            history_policy: Which earlier turns follow-ups send, unless a query passes
+                its own (default: HistoryPolicy.from_env(), all of them)
+            restore_conversations: Fetch the server's history (hPTbtc) for a follow-up
+                whose conversation the store does not hold (default: False; the
+                response layout is unverified)
         """
         self.cookies = cookies
         self.csrf_token = csrf_token
+        self._transport = transport or TransportConfig.from_env()
+        self._long_running_transport = long_running_transport or TransportConfig.long_running_from_env()
         self._client: httpx.Client | None = None
+        self._long_running_client: httpx.Client | None = None
+        self._rate_limiter = rate_limiter or RateLimiter.from_env(labels=RPC_NAMES)
+        self._retry_policy = retry_policy or RetryPolicy.from_env()
+        self._circuit_breaker = circuit_breaker or CircuitBreaker.from_env(labels=RPC_NAMES)
+        self._single_flight = SingleFlight()
+        self._notebook_cache = notebook_cache or NotebookCache.from_env()
+        self._fulltext_cache = fulltext_cache or FulltextCache.from_env()
+        self._summary_cache = summary_cache or SummaryCache.from_env()
+        self._notebook_list_cache = notebook_list_cache or NotebookListCache.from_env()
+        self._answer_cache = answer_cache or AnswerCache.from_env()
+        self._query_index = query_index or QueryIndex.from_env()
         self._session_id = session_id
 
-        # Conversation cache for follow-up queries
-        # Key: conversation_id, Value: list of ConversationTurn objects
-        self._conversation_cache: dict[str, list[ConversationTurn]] = {}
+        # Conversation turns for follow-up queries, by conversation_id
+        self._conversations = conversation_store or conversation_store_from_env()
+        self._history_policy = history_policy or HistoryPolicy.from_env()
+        self._restore_conversations = restore_conversations
 
         # Request counter for _reqid parameter (required for query endpoint)
         import random
@@ -351,7 +442,7 @@ class NotebookLMClient:
 
         # Only refresh CSRF token if not provided - tokens actually last hours/days, not minutes
         # The retry logic in _call_rpc() handles expired tokens gracefully
-        if not self.csrf_token:
+        if not self.csrf_token and self._REFRESH_AUTH_ON_INIT:
             self._refresh_auth_tokens()
 
     def _refresh_auth_tokens(self) -> None:
@@ -364,51 +455,66 @@ class NotebookLMClient:
         Raises:
             ValueError: If cookies are expired (redirected to login) or tokens not found
         """
-        # Build cookie header
+        # Shares the RPC connection pool (no extra TLS handshake)
+        client = self._get_client()
+        response = client.send(self._build_page_request(client), follow_redirects=True)
+        self._apply_page_tokens(response)
+
+    def _build_page_request(self, client: httpx.Client | httpx.AsyncClient) -> httpx.Request:
+        """GET request for the NotebookLM homepage on the shared RPC client."""
+        page_headers = self._page_fetch_headers()
+        request = client.build_request("GET", f"{self.BASE_URL}/", headers=page_headers, timeout=15.0)
+        # Drop the client's RPC-only defaults (Content-Type, X-Same-Domain, ...)
+        for name in self._rpc_headers().keys() - page_headers.keys():
+            request.headers.pop(name, None)
+        return request
+
+    def _page_fetch_headers(self) -> dict[str, str]:
+        """Browser-like headers (plus cookies) for fetching the NotebookLM homepage."""
         cookie_header = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        return {**self._PAGE_FETCH_HEADERS, "Cookie": cookie_header}
 
-        # Must use browser-like headers for page fetch
-        headers = {**self._PAGE_FETCH_HEADERS, "Cookie": cookie_header}
+    def _apply_page_tokens(self, response: httpx.Response) -> None:
+        """Extract CSRF token and session ID from a fetched homepage response.
+
+        Raises:
+            ValueError: If cookies are expired (redirected to login) or tokens not found
+        """
+        # Check if redirected to login (cookies expired)
+        if "accounts.google.com" in str(response.url):
+            raise ValueError(
+                "Authentication expired. AI assistants: Run `notebooklm-mcp-auth` via Bash/terminal tool to re-authenticate automatically. Users: Run `notebooklm-mcp-auth` in your terminal."
+            )
 
-        # Use a temporary client for the page fetch
-        with httpx.Client(headers=headers, follow_redirects=True, timeout=15.0) as client:
-            response = client.get(f"{self.BASE_URL}/")
+        if response.status_code != 200:
+            raise ValueError(f"Failed to fetch NotebookLM page: HTTP {response.status_code}")
 
-            # Check if redirected to login (cookies expired)
-            if "accounts.google.com" in str(response.url):
-                raise ValueError(
-                    "Authentication expired. AI assistants: Run `notebooklm-mcp-auth` via Bash/terminal tool to re-authenticate automatically. Users: Run `notebooklm-mcp-auth` in your terminal."
-                )
+        html = response.text
 
-            if response.status_code != 200:
-                raise ValueError(f"Failed to fetch NotebookLM page: HTTP {response.status_code}")
-
-            html = response.text
-
-            # Extract CSRF token (SNlM0e)
-            csrf_match = re.search(r'"SNlM0e":"([^"]+)"', html)
-            if not csrf_match:
-                # Save HTML for debugging
-                from pathlib import Path
-                debug_dir = Path.home() / ".notebooklm-mcp"
-                debug_dir.mkdir(exist_ok=True)
-                debug_path = debug_dir / "debug_page.html"
-                debug_path.write_text(html)
-                raise ValueError(
-                    f"Could not extract CSRF token from page. "
-                    f"Page saved to {debug_path} for debugging. "
-                    f"The page structure may have changed."
-                )
+        # Extract CSRF token (SNlM0e)
+        csrf_match = re.search(r'"SNlM0e":"([^"]+)"', html)
+        if not csrf_match:
+            # Save HTML for debugging
+            from pathlib import Path
+            debug_dir = Path.home() / ".notebooklm-mcp"
+            debug_dir.mkdir(exist_ok=True)
+            debug_path = debug_dir / "debug_page.html"
+            debug_path.write_text(html)
+            raise ValueError(
+                f"Could not extract CSRF token from page. "
+                f"Page saved to {debug_path} for debugging. "
+                f"The page structure may have changed."
+            )
 
-            self.csrf_token = csrf_match.group(1)
+        self.csrf_token = csrf_match.group(1)
 
-            # Extract session ID (FdrFJe) - optional but helps
-            sid_match = re.search(r'"FdrFJe":"([^"]+)"', html)
-            if sid_match:
-                self._session_id = sid_match.group(1)
+        # Extract session ID (FdrFJe) - optional but helps
+        sid_match = re.search(r'"FdrFJe":"([^"]+)"', html)
+        if sid_match:
+            self._session_id = sid_match.group(1)
 
-            # Cache the extracted tokens to avoid re-fetching the page on next request
-            self._update_cached_tokens()
+        # Cache the extracted tokens to avoid re-fetching the page on next request
+        self._update_cached_tokens()
 
     def _update_cached_tokens(self) -> None:
         """Update the cached auth tokens with newly extracted CSRF token and session ID.
@@ -440,33 +546,120 @@ class NotebookLMClient:
             # Silently fail - caching is an optimization, not critical
             pass
 
-    def _get_client(self) -> httpx.Client:
-        """Get or create HTTP client."""
+    def _rpc_headers(self) -> dict[str, str]:
+        """Headers sent with every batchexecute/query request."""
+        # Build cookie string
+        cookie_str = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        return {
+            "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
+            "Origin": self.BASE_URL,
+            "Referer": f"{self.BASE_URL}/",
+            "Cookie": cookie_str,
+            "X-Same-Domain": "1",
+            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+        }
+
+    def _get_client(self, long_running: bool = False) -> httpx.Client:
+        """Get or create the HTTP client for the short or long-running lane."""
+        if long_running:
+            if self._long_running_client is None:
+                self._long_running_client = httpx.Client(
+                    headers=self._rpc_headers(), **self._long_running_transport.client_kwargs()
+                )
+            return self._long_running_client
         if self._client is None:
-            # Build cookie string
-            cookie_str = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
-
-            self._client = httpx.Client(
-                headers={
-                    "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
-                    "Origin": self.BASE_URL,
-                    "Referer": f"{self.BASE_URL}/",
-                    "Cookie": cookie_str,
-                    "X-Same-Domain": "1",
-                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-                },
-                timeout=30.0,
-            )
+            self._client = httpx.Client(headers=self._rpc_headers(), **self._transport.client_kwargs())
         return self._client
 
+    def _is_long_running(self, calls: list[tuple[str, Any]]) -> bool:
+        """Whether a batch belongs in the long-running lane."""
+        return any(rpc_id in self.LONG_RUNNING_RPCS for rpc_id, _ in calls)
+
+    def _is_idempotent(self, calls: list[tuple[str, Any]]) -> bool:
+        """Whether every call in a batch is safe to resend after any transient failure."""
+        return all(rpc_id in self.IDEMPOTENT_RPCS for rpc_id, _ in calls)
+
+    @staticmethod
+    def _log_rpc_retry(calls: list[tuple[str, Any]], error: Exception, attempt: int, delay: float) -> None:
+        names = ",".join(RPC_NAMES.get(rpc_id, rpc_id) for rpc_id, _ in calls)
+        logger.info(f"Retrying {names} (attempt {attempt}) in {delay:.2f}s after {type(error).__name__}: {error}")
+
+    @staticmethod
+    def _lane(long_running: bool) -> str:
+        return "long" if long_running else "short"
+
+    def rate_limit_stats(self) -> dict[str, Any]:
+        """Concurrency limits, token buckets and throttling counters for this account."""
+        return self._rate_limiter.stats()
+
+    def _request_timeout(
+        self, timeout: float | None, long_running: bool
+    ) -> float | httpx.Timeout | None:
+        """Timeout for one request: `timeout` (or the lane default) cut to the caller's deadline.
+
+        Returns `timeout` unchanged outside a deadline scope. Raises
+        DeadlineExceeded once the deadline has passed.
+        """
+        if remaining_time() is None:
+            return timeout
+        config = self._long_running_transport if long_running else self._transport
+        read = clamp_timeout(timeout or config.timeout)
+        return httpx.Timeout(
+            read, connect=min(config.connect_timeout, read), pool=min(config.pool_timeout, read)
+        )
+
+    @contextlib.contextmanager
+    def _invalidates(self, notebook_id: str | None = None, source_id: str | None = None) -> Iterator[None]:
+        """Drop cached data touched by a mutation, even if the call fails.
+
+        A failed or timed-out mutation may still have been applied server-side.
+        Every mutation can change the notebook list (titles, source counts).
+        """
+        try:
+            yield
+        finally:
+            self._notebook_list_cache.invalidate()
+            if notebook_id is not None:
+                self._notebook_cache.invalidate(notebook_id)
+                self._summary_cache.invalidate(notebook_id)
+                self._answer_cache.invalidate(notebook_id)
+                self._query_index.invalidate(notebook_id)
+            if source_id is not None:
+                self._notebook_cache.invalidate_source(source_id)
+                self._fulltext_cache.invalidate(source_id)
+                self._summary_cache.invalidate(source_id)
+
+    def conversation_stats(self) -> dict[str, Any]:
+        """Conversations and bytes held by the conversation store, and its evictions."""
+        return self._conversations.stats()
+
+    def circuit_stats(self) -> dict[str, Any]:
+        """Circuit breaker state per (endpoint, RPC) that has seen traffic."""
+        return self._circuit_breaker.stats()
+
+    def _refresh_client_headers(self) -> None:
+        """Apply new cookies to the live clients after auth recovery.
+
+        Only the default headers change, so pooled connections (and their TLS
+        sessions) stay warm. Requests already in flight keep their headers.
+        """
+        for client in (self._client, self._long_running_client):
+            if client is not None:
+                client.headers.update(self._rpc_headers())
+
     def _build_request_body(self, rpc_id: str, params: Any) -> str:
         """Build the batchexecute request body."""
+        return self._build_batch_request_body([(rpc_id, params)])
+
+    def _build_batch_request_body(self, calls: list[tuple[str, Any]]) -> str:
+        """Build a batchexecute request body carrying one or more RPC calls."""
         # The params need to be JSON-encoded, then wrapped in the RPC structure
         # Use separators to match Chrome's compact format (no spaces)
-        params_json = json.dumps(params, separators=(',', ':'))
-
-        f_req = [[[rpc_id, params_json, None, "generic"]]]
-        f_req_json = json.dumps(f_req, separators=(',', ':'))
+        f_req = [[
+            [rpc_id, codec.dumps(params), None, call_id]
+            for (rpc_id, params), call_id in zip(calls, self._batch_call_ids(len(calls)))
+        ]]
+        f_req_json = codec.dumps(f_req)
 
         # URL encode (safe='' encodes all characters including /)
         body_parts = [f"f.req={urllib.parse.quote(f_req_json, safe='')}"]
@@ -477,6 +670,17 @@ class NotebookLMClient:
         # Add trailing & to match NotebookLM's format
         return "&".join(body_parts) + "&"
 
+    @staticmethod
+    def _batch_call_ids(count: int) -> list[str]:
+        """Per-call identifiers for f.req, echoed back at wrb.fr item[6].
+
+        A lone call uses "generic" like the web UI; batched calls are numbered
+        so that repeated rpc_ids in one POST can be told apart.
+        """
+        if count == 1:
+            return ["generic"]
+        return [str(i) for i in range(1, count + 1)]
+
     def _build_url(self, rpc_id: str, source_path: str = "/") -> str:
         """Build the batchexecute URL with query params."""
         params = {
@@ -493,153 +697,213 @@ class NotebookLMClient:
         query = urllib.parse.urlencode(params)
         return f"{self.BATCHEXECUTE_URL}?{query}"
 
-    def _parse_response(self, response_text: str) -> Any:
-        """Parse the batchexecute response."""
+    def _parse_response(self, response_body: bytes | str) -> Any:
+        """Parse the batchexecute response into its list of JSON chunks."""
         # Response format:
         # )]}'
         # <byte_count>
         # <json_array>
+        return decode_frames(response_body)
 
-        # Remove the anti-XSSI prefix
-        if response_text.startswith(")]}'"):
-            response_text = response_text[4:]
-
-        lines = response_text.strip().split("\n")
-
-        # Parse each chunk
-        results = []
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            if not line:
-                i += 1
-                continue
-
-            # Try to parse as byte count
-            try:
-                byte_count = int(line)
-                # Next line(s) should be the JSON payload
-                i += 1
-                if i < len(lines):
-                    json_str = lines[i]
-                    try:
-                        data = json.loads(json_str)
-                        results.append(data)
-                    except json.JSONDecodeError:
-                        pass
-                i += 1
-            except ValueError:
-                # Not a byte count, try to parse as JSON
-                try:
-                    data = json.loads(line)
-                    results.append(data)
-                except json.JSONDecodeError:
-                    pass
-                i += 1
-
-        return results
+    def _extract_rpc_result(self, parsed_response: list, rpc_id: str, call_id: str | None = None) -> Any:
+        """Extract the result for a specific RPC ID from the parsed response.
 
-    def _extract_rpc_result(self, parsed_response: list, rpc_id: str) -> Any:
-        """Extract the result for a specific RPC ID from the parsed response."""
+        Args:
+            parsed_response: Output of _parse_response
+            rpc_id: The RPC ID to look for
+            call_id: Per-call identifier (item[6]); required to tell batched
+                calls with the same rpc_id apart, ignored when None
+        """
         for chunk in parsed_response:
             if isinstance(chunk, list):
                 for item in chunk:
                     if isinstance(item, list) and len(item) >= 3:
                         if item[0] == "wrb.fr" and item[1] == rpc_id:
+                            identifier = item[6] if len(item) > 6 else None
+                            if call_id is not None and identifier != call_id:
+                                continue
+
                             # Check for generic error signature (e.g. auth expired)
                             # Signature: ["wrb.fr", "RPC_ID", null, null, null, [16], "generic"]
-                            if len(item) > 6 and item[6] == "generic" and isinstance(item[5], list) and 16 in item[5]:
+                            if identifier is not None and isinstance(item[5], list) and 16 in item[5]:
                                 raise AuthenticationError("RPC Error 16: Authentication expired")
 
                             result_str = item[2]
                             if isinstance(result_str, str):
                                 try:
-                                    return json.loads(result_str)
-                                except json.JSONDecodeError:
+                                    return codec.loads(result_str)
+                                except codec.DECODE_ERRORS:
                                     return result_str
                             return result_str
         return None
 
+    def _extract_batch_results(self, parsed_response: list, calls: list[tuple[str, Any]]) -> list[Any]:
+        """Split a batchexecute response back into one result per call, in order."""
+        if len(calls) == 1:
+            return [self._extract_rpc_result(parsed_response, calls[0][0])]
+        return [
+            self._extract_rpc_result(parsed_response, rpc_id, call_id)
+            for (rpc_id, _), call_id in zip(calls, self._batch_call_ids(len(calls)))
+        ]
+
+    @staticmethod
+    def _batch_rpc_ids(calls: list[tuple[str, Any]]) -> str:
+        """Comma-separated distinct rpc_ids for the batchexecute rpcids URL param."""
+        return ",".join(dict.fromkeys(rpc_id for rpc_id, _ in calls))
+
+    def _log_rpc_request(self, rpc_id: str, url: str, body: str) -> None:
+        """Log an outgoing RPC (URL params + decoded request params) at DEBUG level."""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
+        method_name = RPC_NAMES.get(rpc_id, "unknown")
+        logger.debug("=" * 70)
+        logger.debug(f"RPC Call: {rpc_id} ({method_name})")
+        logger.debug("-" * 70)
+
+        # Parse and display URL params
+        url_params = _parse_url_params(url)
+        logger.debug("URL Parameters:")
+        for key, value in url_params.items():
+            logger.debug(f"  {key}: {value}")
+
+        # Decode and display request body
+        logger.debug("-" * 70)
+        logger.debug("Request Params:")
+        decoded_body = _decode_request_body(body)
+        if "params" in decoded_body:
+            logger.debug(_format_debug_json(decoded_body["params"]))
+        elif "f.req" in decoded_body:
+            logger.debug(_format_debug_json(decoded_body["f.req"]))
+        else:
+            logger.debug(_format_debug_json(decoded_body))
+
+    def _log_rpc_response(self, response: httpx.Response) -> None:
+        """Log the HTTP status (and body of error responses) at DEBUG level."""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
+        logger.debug("-" * 70)
+        logger.debug(f"Response Status: {response.status_code}")
+        if response.status_code >= 400:
+            logger.debug("Error Response Body:")
+            logger.debug(response.text[:2000] if len(response.text) > 2000 else response.text)
+            logger.debug("=" * 70)
+
+    def _log_rpc_result(self, result: Any) -> None:
+        """Log the extracted RPC result at DEBUG level."""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
+        logger.debug("-" * 70)
+        logger.debug("Response Data:")
+        logger.debug(_format_debug_json(result))
+        logger.debug("=" * 70)
+
+    @staticmethod
+    def _is_auth_failure(error: Exception) -> bool:
+        """True for HTTP 401/403 and RPC Error 16 (expired auth)."""
+        if isinstance(error, AuthenticationError):
+            return True
+        return isinstance(error, httpx.HTTPStatusError) and error.response.status_code in (401, 403)
+
     def _call_rpc(
         self,
         rpc_id: str,
         params: Any,
         path: str = "/",
         timeout: float | None = None,
-        _retry: bool = False,
-        _deep_retry: bool = False,
     ) -> Any:
         """Execute an RPC call and return the extracted result.
 
-        Includes automatic retry on auth failures with three-layer recovery:
+        Transient failures are retried per the RPC's idempotency class (see
+        IDEMPOTENT_RPCS and retry.py). Auth failures use three-layer recovery:
         1. Refresh CSRF/session tokens (fast, handles token expiry)
         2. Reload cookies from disk (handles external re-authentication)
         3. Run headless auth (auto-refresh if Chrome profile has saved login)
+
+        Identical reads issued concurrently share one request (singleflight.py).
         """
-        client = self._get_client()
-        body = self._build_request_body(rpc_id, params)
-        url = self._build_url(rpc_id, path)
+        if rpc_id in self.IDEMPOTENT_RPCS:
+            return self._single_flight.do(
+                rpc_key(rpc_id, params, path, timeout),
+                lambda: self._call_rpc_batch([(rpc_id, params)], path, timeout)[0],
+            )
+        return self._call_rpc_batch([(rpc_id, params)], path, timeout)[0]
 
-        # Enhanced debug logging
-        if logger.isEnabledFor(logging.DEBUG):
-            method_name = RPC_NAMES.get(rpc_id, "unknown")
-            logger.debug("=" * 70)
-            logger.debug(f"RPC Call: {rpc_id} ({method_name})")
-            logger.debug("-" * 70)
-
-            # Parse and display URL params
-            url_params = _parse_url_params(url)
-            logger.debug("URL Parameters:")
-            for key, value in url_params.items():
-                logger.debug(f"  {key}: {value}")
-
-            # Decode and display request body
-            logger.debug("-" * 70)
-            logger.debug("Request Params:")
-            decoded_body = _decode_request_body(body)
-            if "params" in decoded_body:
-                logger.debug(_format_debug_json(decoded_body["params"]))
-            elif "f.req" in decoded_body:
-                logger.debug(_format_debug_json(decoded_body["f.req"]))
-            else:
-                logger.debug(_format_debug_json(decoded_body))
+    def _call_rpc_batch(
+        self,
+        calls: list[tuple[str, Any]],
+        path: str = "/",
+        timeout: float | None = None,
+    ) -> list[Any]:
+        """Execute several RPCs sharing a source path and return their results in order.
 
-        try:
-            if timeout:
-                response = client.post(url, content=body, timeout=timeout)
-            else:
-                response = client.post(url, content=body)
+        Batches larger than MAX_RPC_BATCH_SIZE are split into several POSTs.
+        """
+        results = []
+        for start in range(0, len(calls), MAX_RPC_BATCH_SIZE):
+            results.extend(self._post_rpc_batch(calls[start:start + MAX_RPC_BATCH_SIZE], path, timeout))
+        return results
 
-            # Log response before raise_for_status (so we can see error responses)
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug("-" * 70)
-                logger.debug(f"Response Status: {response.status_code}")
-                if response.status_code >= 400:
-                    logger.debug("Error Response Body:")
-                    logger.debug(response.text[:2000] if len(response.text) > 2000 else response.text)
-                    logger.debug("=" * 70)
+    def _post_rpc_batch(
+        self,
+        calls: list[tuple[str, Any]],
+        path: str = "/",
+        timeout: float | None = None,
+    ) -> list[Any]:
+        """Send one batchexecute POST, retrying transient failures per the retry policy."""
+        retry = self._retry_policy.start(self._is_idempotent(calls))
+        while True:
+            try:
+                # An open circuit raises CircuitOpenError here, which is never retried
+                with self._circuit_breaker.guard([rpc_id for rpc_id, _ in calls], BATCHEXECUTE):
+                    return self._send_rpc_batch(calls, path, timeout)
+            except (httpx.HTTPError, AuthenticationError) as e:
+                delay = retry.next_delay(e)
+                if delay is None:
+                    raise
+                self._log_rpc_retry(calls, e, retry.attempts, delay)
+                time.sleep(delay)
+
+    def _send_rpc_batch(
+        self,
+        calls: list[tuple[str, Any]],
+        path: str = "/",
+        timeout: float | None = None,
+        _retry: bool = False,
+        _deep_retry: bool = False,
+    ) -> list[Any]:
+        """Send one batchexecute POST (with auth recovery) and split its results."""
+        long_running = self._is_long_running(calls)
+        client = self._get_client(long_running)
+        rpc_ids = self._batch_rpc_ids(calls)
+        body = self._build_batch_request_body(calls)
+        url = self._build_url(rpc_ids, path)
+        self._log_rpc_request(rpc_ids, url, body)
+
+        try:
+            with self._rate_limiter.slot([rpc_id for rpc_id, _ in calls], self._lane(long_running)):
+                timeout = self._request_timeout(timeout, long_running)
+                if timeout:
+                    response = client.post(url, content=body, timeout=timeout)
+                else:
+                    response = client.post(url, content=body)
 
-            response.raise_for_status()
+                # Log response before raise_for_status (so we can see error responses)
+                self._log_rpc_response(response)
+                response.raise_for_status()
 
             # Check for RPC-level errors (soft auth failure)
-            parsed = self._parse_response(response.text)
-            result = self._extract_rpc_result(parsed, rpc_id)
-
-            # Enhanced debug logging for extracted result
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug("-" * 70)
-                logger.debug("Response Data:")
-                logger.debug(_format_debug_json(result))
-                logger.debug("=" * 70)
-            
-            return result
+            parsed = self._parse_response(response.content)
+            results = self._extract_batch_results(parsed, calls)
+            for result in results:
+                self._log_rpc_result(result)
+            return results
 
         except (httpx.HTTPStatusError, AuthenticationError) as e:
             # Check for auth failures (401/403 HTTP or RPC Error 16)
-            is_http_auth = isinstance(e, httpx.HTTPStatusError) and e.response.status_code in (401, 403)
-            is_rpc_auth = isinstance(e, AuthenticationError)
-            
-            if not (is_http_auth or is_rpc_auth):
+            if not self._is_auth_failure(e):
                 # Not an auth error, re-raise immediately
                 raise
             
@@ -647,8 +911,8 @@ class NotebookLMClient:
             if not _retry:
                 try:
                     self._refresh_auth_tokens()
-                    self._client = None
-                    return self._call_rpc(rpc_id, params, path, timeout, _retry=True)
+                    self._refresh_client_headers()
+                    return self._send_rpc_batch(calls, path, timeout, _retry=True)
                 except ValueError:
                     # CSRF refresh failed (cookies expired) - continue to layer 2
                     pass
@@ -656,8 +920,8 @@ class NotebookLMClient:
             # Layer 2 & 3: Reload from disk or run headless auth (deep retry)
             if not _deep_retry:
                 if self._try_reload_or_headless_auth():
-                    self._client = None
-                    return self._call_rpc(rpc_id, params, path, timeout, _retry=True, _deep_retry=True)
+                    self._refresh_client_headers()
+                    return self._send_rpc_batch(calls, path, timeout, _retry=True, _deep_retry=True)
             
             # All recovery attempts failed
             raise AuthenticationError(
@@ -702,22 +966,25 @@ class NotebookLMClient:
     # Conversation Management (for query follow-ups)
     # =========================================================================
 
-    def _build_conversation_history(self, conversation_id: str) -> list | None:
+    def _build_conversation_history(
+        self, conversation_id: str, policy: HistoryPolicy | None = None
+    ) -> list | None:
         """Build the conversation history array for follow-up queries.
 
         Chrome expects history in format: [[answer, null, 2], [query, null, 1], ...]
         where type 1 = user message, type 2 = AI response.
 
-        The history includes ALL previous turns, not just the most recent one.
-        Turns are added in chronological order (oldest first).
+        The history includes the previous turns the policy keeps (by default
+        all of them). Turns are added in chronological order (oldest first).
 
         Args:
             conversation_id: The conversation ID to get history for
+            policy: History window (default: the client's history policy)
 
         Returns:
             List in Chrome's expected format, or None if no history exists
         """
-        turns = self._conversation_cache.get(conversation_id, [])
+        turns = (policy or self._history_policy).apply(self._conversations.get(conversation_id))
         if not turns:
             return None
 
@@ -731,34 +998,65 @@ class NotebookLMClient:
         return history if history else None
 
     def _cache_conversation_turn(
-        self, conversation_id: str, query: str, answer: str
-    ) -> None:
+        self,
+        conversation_id: str,
+        query: str,
+        answer: str,
+        request_bytes: int | None = None,
+        elapsed: float | None = None,
+    ) -> ConversationTurn:
         """Cache a conversation turn for future follow-up queries.
     """
-        if conversation_id not in self._conversation_cache:
-            self._conversation_cache[conversation_id] = []
-
-        turn_number = len(self._conversation_cache[conversation_id]) + 1
-        turn = ConversationTurn(query=query, answer=answer, turn_number=turn_number)
-        self._conversation_cache[conversation_id].append(turn)
+        return self._conversations.append(conversation_id, query, answer, request_bytes, elapsed)
+
+    def _restore_conversation(self, notebook_id: str, conversation_id: str) -> int:
+        """Fill the local store with an unknown conversation's turns from the server.
+
+        After a restart, or on a worker whose store never saw the conversation,
+        a follow-up would otherwise be sent without its history. Fetches the
+        notebook's conversations (hPTbtc) and stores the requested one's turns.
+        Opt-in (restore_conversations): it costs an RPC per unknown or expired
+        conversation, and the message layout it reads is unverified (see
+        decode_conversations). Returns the number of turns restored (0 if the
+        server has none).
+        """
+        try:
+            result = self._call_rpc(self.RPC_GET_CONVERSATIONS, [notebook_id], f"/notebook/{notebook_id}")
+        except Exception as e:
+            logger.info(f"Could not fetch server history of conversation {conversation_id}: {e}")
+            return 0
+        return self._store_restored_turns(result, conversation_id)
+
+    def _store_restored_turns(self, result: Any, conversation_id: str) -> int:
+        """Store the turns of `conversation_id` from a hPTbtc result, unless they appeared meanwhile."""
+        turns = decode_conversations(result).get(conversation_id, [])
+        if not turns or self._conversations.get(conversation_id):
+            return 0
+        for query, answer in turns:
+            self._conversations.append(conversation_id, query, answer)
+        logger.debug(f"Restored {len(turns)} turns of conversation {conversation_id} from the server")
+        return len(turns)
 
     def clear_conversation(self, conversation_id: str) -> bool:
         """Clear the conversation cache for a specific conversation.
     """
-        if conversation_id in self._conversation_cache:
-            del self._conversation_cache[conversation_id]
-            return True
-        return False
+        return self._conversations.delete(conversation_id)
 
     def get_conversation_history(self, conversation_id: str) -> list[dict] | None:
         """Get the conversation history for a specific conversation.
     """
-        turns = self._conversation_cache.get(conversation_id)
+        turns = self._conversations.get(conversation_id)
         if not turns:
             return None
 
         return [
-            {"turn": t.turn_number, "query": t.query, "answer": t.answer}
+            {
+                "turn": t.turn_number,
+                "query": t.query,
+                "answer": t.answer,
+                "request_bytes": t.request_bytes,
+                "elapsed_seconds": t.elapsed,
+            }
             for t in turns
         ]
 
@@ -767,30 +1065,44 @@ class NotebookLMClient:
     # =========================================================================
 
     def list_notebooks(self, debug: bool = False) -> list[Notebook]:
-        """List all notebooks."""
-        client = self._get_client()
+        """List all notebooks (possibly a stale snapshot, see notebook_list_snapshot)."""
+        if debug:
+            return self._fetch_notebook_list(debug=True).notebooks
+        return self.notebook_list_snapshot().notebooks
 
-        # [null, 1, null, [2]] - params for list notebooks
-        params = [None, 1, None, [2]]
-        body = self._build_request_body(self.RPC_LIST_NOTEBOOKS, params)
-        url = self._build_url(self.RPC_LIST_NOTEBOOKS)
+    def notebook_list_snapshot(self) -> NotebookListSnapshot:
+        """Notebook list, served stale-while-revalidate (see notebook_cache.py).
 
-        if debug:
-            print(f"[DEBUG] URL: {url}")
-            print(f"[DEBUG] Body: {body[:200]}...")
+        A stale snapshot is returned at once and refreshed in a background thread.
+        """
+        snapshot = self._notebook_list_cache.get()
+        if snapshot is None:
+            return self._fetch_notebook_list()
+        if not snapshot.fresh and self._notebook_list_cache.start_refresh():
+            threading.Thread(target=self._refresh_notebook_list, daemon=True).start()
+        return snapshot
+
+    def _refresh_notebook_list(self) -> None:
+        try:
+            self._fetch_notebook_list()
+        except Exception as e:
+            logger.info(f"Background notebook list refresh failed: {e}")
+        finally:
+            self._notebook_list_cache.end_refresh()
 
-        response = client.post(url, content=body)
-        response.raise_for_status()
+    def _fetch_notebook_list(self, debug: bool = False) -> NotebookListSnapshot:
+        """Fetch the notebook list and store it as the current snapshot."""
+        epoch = self._notebook_list_cache.epoch()
+        # [null, 1, null, [2]] - params for list notebooks
+        params = [None, 1, None, [2]]
 
         if debug:
-            print(f"[DEBUG] Response status: {response.status_code}")
-            print(f"[DEBUG] Response length: {len(response.text)} chars")
+            print(f"[DEBUG] URL: {self._build_url(self.RPC_LIST_NOTEBOOKS)}")
+            print(f"[DEBUG] Body: {self._build_request_body(self.RPC_LIST_NOTEBOOKS, params)[:200]}...")
 
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_LIST_NOTEBOOKS)
+        result = self._call_rpc(self.RPC_LIST_NOTEBOOKS, params)
 
         if debug:
-            print(f"[DEBUG] Parsed chunks: {len(parsed)}")
             print(f"[DEBUG] Result type: {type(result)}")
             if result:
                 print(f"[DEBUG] Result length: {len(result) if isinstance(result, list) else 'N/A'}")
@@ -798,89 +1110,48 @@ class NotebookLMClient:
                     print(f"[DEBUG] First item type: {type(result[0])}")
                     print(f"[DEBUG] First item: {str(result[0])[:500]}...")
 
-        notebooks = []
-        if result and isinstance(result, list):
-            #   [0] = "Title"
-            #   [1] = [sources]
-            #   [2] = "notebook-uuid"
-            #   [3] = "emoji" or null
-            #   [4] = null
-            #   [5] = [metadata] where metadata[0] = ownership (1=mine, 2=shared_with_me)
-            notebook_list = result[0] if result and isinstance(result[0], list) else result
-
-            for nb_data in notebook_list:
-                if isinstance(nb_data, list) and len(nb_data) >= 3:
-                    title = nb_data[0] if isinstance(nb_data[0], str) else "Untitled"
-                    sources_data = nb_data[1] if len(nb_data) > 1 else []
-                    notebook_id = nb_data[2] if len(nb_data) > 2 else None
-
-                    is_owned = True  # Default to owned
-                    is_shared = False  # Default to not shared
-                    created_at = None
-                    modified_at = None
-
-                    if len(nb_data) > 5 and isinstance(nb_data[5], list) and len(nb_data[5]) > 0:
-                        metadata = nb_data[5]
-                        ownership_value = metadata[0]
-                        # 1 = mine (owned), 2 = shared with me
-                        is_owned = ownership_value == OWNERSHIP_MINE
-
-                        # Check if shared (for owned notebooks)
-                        # Based on observation: [1, true, true, ...] -> Shared
-                        #                       [1, false, true, ...] -> Private
-                        if len(metadata) > 1:
-                            is_shared = bool(metadata[1])
-
-                        # metadata[5] = [seconds, nanos] = last modified
-                        # metadata[8] = [seconds, nanos] = created
-                        if len(metadata) > 5:
-                            modified_at = parse_timestamp(metadata[5])
-                        if len(metadata) > 8:
-                            created_at = parse_timestamp(metadata[8])
-
-                    sources = []
-                    if isinstance(sources_data, list):
-                        for src in sources_data:
-                            if isinstance(src, list) and len(src) >= 2:
-                                # Source structure: [[source_id], title, metadata, ...]
-                                src_ids = src[0] if src[0] else []
-                                src_title = src[1] if len(src) > 1 else "Untitled"
-
-                                # Extract the source ID (might be in a list)
-                                src_id = src_ids[0] if isinstance(src_ids, list) and src_ids else src_ids
-
-                                sources.append({
-                                    "id": src_id,
-                                    "title": src_title,
-                                })
-
-                    if notebook_id:
-                        notebooks.append(Notebook(
-                            id=notebook_id,
-                            title=title,
-                            source_count=len(sources),
-                            sources=sources,
-                            is_owned=is_owned,
-                            is_shared=is_shared,
-                            created_at=created_at,
-                            modified_at=modified_at,
-                        ))
-
-        return notebooks
+        return self._notebook_list_cache.put(self._parse_notebook_list(result), epoch)
+
+    def _parse_notebook_list(self, result: Any) -> list[Notebook]:
+        """Decode the wXbhsf (list notebooks) result into Notebook objects."""
+        return decode_notebook_list(result)
 
     def get_notebook(self, notebook_id: str) -> dict | None:
-        """Get notebook details."""
-        return self._call_rpc(
-            self.RPC_GET_NOTEBOOK,
-            [notebook_id, None, [2], None, 0],
-            f"/notebook/{notebook_id}",
-        )
+        """Get notebook details (briefly cached, see notebook_cache.py)."""
+        return self._cached_notebook(notebook_id).result
+
+    def _cached_notebook(self, notebook_id: str) -> CachedNotebook:
+        """Notebook structure from the cache, fetching it on a miss."""
+        entry = self._notebook_cache.get(notebook_id)
+        if entry is None:
+            epoch = self._notebook_cache.epoch()
+            result = self._call_rpc(
+                self.RPC_GET_NOTEBOOK,
+                [notebook_id, None, [2], None, 0],
+                f"/notebook/{notebook_id}",
+            )
+            entry = self._notebook_cache.put(notebook_id, result, epoch)
+        return entry
 
     def get_notebook_summary(self, notebook_id: str) -> dict[str, Any]:
-        """Get AI-generated summary and suggested topics for a notebook."""
+        """Get AI-generated summary and suggested topics for a notebook.
+
+        Cached until the notebook's sources change (see summary_cache.py).
+        """
+        fingerprint = self._cached_notebook(notebook_id).fingerprint
+        cached = self._summary_cache.get(NOTEBOOK_SUMMARY, notebook_id, fingerprint)
+        if cached is not None:
+            return cached
         result = self._call_rpc(
             self.RPC_GET_SUMMARY, [notebook_id, [2]], f"/notebook/{notebook_id}"
         )
+        summary = self._parse_notebook_summary(result)
+        if fingerprint is not None:
+            self._summary_cache.put(NOTEBOOK_SUMMARY, notebook_id, fingerprint, summary)
+        return summary
+
+    def _parse_notebook_summary(self, result: Any) -> dict[str, Any]:
+        """Decode the VfAZjd (notebook summary) result."""
         summary = ""
         suggested_topics = []
 
@@ -905,8 +1176,21 @@ class NotebookLMClient:
         }
 
     def get_source_guide(self, source_id: str) -> dict[str, Any]:
-        """Get AI-generated summary and keywords for a source."""
+        """Get AI-generated summary and keywords for a source.
+
+        Cached until the source changes (see summary_cache.py).
+        """
+        version = self._notebook_cache.source_version(source_id)
+        cached = self._summary_cache.get(SOURCE_GUIDE, source_id, version)
+        if cached is not None:
+            return cached
         result = self._call_rpc(self.RPC_GET_SOURCE_GUIDE, [[[[source_id]]]], "/")
+        guide = self._parse_source_guide(result)
+        self._summary_cache.put(SOURCE_GUIDE, source_id, version, guide)
+        return guide
+
+    def _parse_source_guide(self, result: Any) -> dict[str, Any]:
+        """Decode the tr032e (source guide) result."""
         summary = ""
         keywords = []
 
@@ -930,7 +1214,8 @@ class NotebookLMClient:
         """Get the full text content of a source.
 
         Returns the raw text content that was indexed from the source,
-        along with metadata like title and source type.
+        along with metadata like title and source type. Results are kept
+        on disk (see fulltext_cache.py).
 
         Args:
             source_id: The source UUID
@@ -938,83 +1223,46 @@ class NotebookLMClient:
         Returns:
             Dict with content, title, source_type, and char_count
         """
+        version = self._source_version(source_id)
+        cached = self._fulltext_cache.get(source_id, version)
+        if cached is not None:
+            return cached
+
         # The hizoJc RPC returns source details including full text
         params = [[source_id], [2], [2]]
         result = self._call_rpc(self.RPC_GET_SOURCE, params, "/")
 
-        content = ""
-        title = ""
-        source_type = ""
-        url = None
+        content = self._parse_source_fulltext(result)
+        self._fulltext_cache.put(source_id, content, version)
+        return content
 
-        if result and isinstance(result, list):
-            # Response structure:
-            # result[0] = [[source_id], title, metadata, ...]
-            # result[1] = null
-            # result[2] = null
-            # result[3] = [[content_blocks]]
-            #
-            # Each content block: [start_pos, end_pos, content_data, ...]
-
-            # Extract from result[0] which contains source metadata
-            if len(result) > 0 and isinstance(result[0], list):
-                source_meta = result[0]
-
-                # Title is at position 1
-                if len(source_meta) > 1 and isinstance(source_meta[1], str):
-                    title = source_meta[1]
-
-                # Metadata is at position 2
-                if len(source_meta) > 2 and isinstance(source_meta[2], list):
-                    metadata = source_meta[2]
-                    # Source type code is at position 4
-                    if len(metadata) > 4:
-                        type_code = metadata[4]
-                        source_type = constants.SOURCE_TYPES.get_name(type_code)
-
-                    # URL might be at position 7 for web sources
-                    if len(metadata) > 7 and isinstance(metadata[7], list):
-                        url_info = metadata[7]
-                        if len(url_info) > 0 and isinstance(url_info[0], str):
-                            url = url_info[0]
-
-            # Extract content from result[3][0] - array of content blocks
-            if len(result) > 3 and isinstance(result[3], list):
-                content_wrapper = result[3]
-                if len(content_wrapper) > 0 and isinstance(content_wrapper[0], list):
-                    content_blocks = content_wrapper[0]
-                    # Collect all text from content blocks
-                    text_parts = []
-                    for block in content_blocks:
-                        if isinstance(block, list):
-                            # Each block is [start, end, content_data, ...]
-                            # Extract all text strings recursively
-                            texts = self._extract_all_text(block)
-                            text_parts.extend(texts)
-                    content = "\n\n".join(text_parts)
+    def _source_version(self, source_id: str) -> str | None:
+        """Fingerprint of a source's metadata, refetching the notebook that lists it if needed.
 
-        return {
-            "content": content,
-            "title": title,
-            "source_type": source_type,
-            "url": url,
-            "char_count": len(content),
-        }
+        None when no notebook is known to list the source.
+        """
+        version = self._notebook_cache.source_version(source_id)
+        notebook_id = self._notebook_cache.source_owner(source_id)
+        if version is None and notebook_id is not None:
+            try:
+                version = self._cached_notebook(notebook_id).source_version(source_id)
+            except Exception as e:
+                logger.info(f"Could not revalidate source {source_id}: {e}")
+        return version
 
-    def _extract_all_text(self, data: list) -> list[str]:
-        """Recursively extract all text strings from nested arrays."""
-        texts = []
-        for item in data:
-            if isinstance(item, str) and len(item) > 0:
-                texts.append(item)
-            elif isinstance(item, list):
-                texts.extend(self._extract_all_text(item))
-        return texts
+    def _parse_source_fulltext(self, result: Any) -> dict[str, Any]:
+        """Decode the hizoJc (get source) result into text content and metadata."""
+        return SourceContent.decode(result).to_dict()
 
     def create_notebook(self, title: str = "") -> Notebook | None:
         """Create a new notebook."""
         params = [title, None, None, [2], [1, None, None, None, None, None, None, None, None, None, [1]]]
-        result = self._call_rpc(self.RPC_CREATE_NOTEBOOK, params)
+        with self._invalidates():
+            result = self._call_rpc(self.RPC_CREATE_NOTEBOOK, params)
+        return self._parse_created_notebook(result, title)
+
+    def _parse_created_notebook(self, result: Any, title: str) -> Notebook | None:
+        """Decode the CCqFvf (create notebook) result."""
         if result and isinstance(result, list) and len(result) >= 3:
             notebook_id = result[2]
             if notebook_id:
@@ -1029,7 +1277,8 @@ class NotebookLMClient:
     def rename_notebook(self, notebook_id: str, new_title: str) -> bool:
         """Rename a notebook."""
         params = [notebook_id, [[None, None, None, [None, new_title]]]]
-        result = self._call_rpc(self.RPC_RENAME_NOTEBOOK, params, f"/notebook/{notebook_id}")
+        with self._invalidates(notebook_id):
+            result = self._call_rpc(self.RPC_RENAME_NOTEBOOK, params, f"/notebook/{notebook_id}")
         return result is not None
 
     def configure_chat(
@@ -1040,6 +1289,19 @@ class NotebookLMClient:
         response_length: str = "default",
     ) -> dict[str, Any]:
         """Configure chat goal/style and response length for a notebook."""
+        params = self._chat_settings_params(notebook_id, goal, custom_prompt, response_length)
+        with self._invalidates(notebook_id):
+            result = self._call_rpc(self.RPC_RENAME_NOTEBOOK, params, f"/notebook/{notebook_id}")
+        return self._parse_chat_settings(result, notebook_id, goal, custom_prompt, response_length)
+
+    def _chat_settings_params(
+        self,
+        notebook_id: str,
+        goal: str,
+        custom_prompt: str | None,
+        response_length: str,
+    ) -> list:
+        """Validate chat settings and build the s0tc2d params that apply them."""
         goal_code = constants.CHAT_GOALS.get_code(goal)
 
         # Validate custom prompt
@@ -1058,9 +1320,17 @@ class NotebookLMClient:
             goal_setting = [goal_code]
 
         chat_settings = [goal_setting, [length_code]]
-        params = [notebook_id, [[None, None, None, None, None, None, None, chat_settings]]]
-        result = self._call_rpc(self.RPC_RENAME_NOTEBOOK, params, f"/notebook/{notebook_id}")
+        return [notebook_id, [[None, None, None, None, None, None, None, chat_settings]]]
 
+    def _parse_chat_settings(
+        self,
+        result: Any,
+        notebook_id: str,
+        goal: str,
+        custom_prompt: str | None,
+        response_length: str,
+    ) -> dict[str, Any]:
+        """Decode the s0tc2d result of a chat configuration update."""
         if result:
             # Response format: [title, null, id, emoji, null, metadata, null, [[goal_code, prompt?], [length_code]]]
             settings = result[7] if len(result) > 7 else None
@@ -1090,35 +1360,32 @@ class NotebookLMClient:
         Returns:
             True on success, False on failure
         """
-        client = self._get_client()
-
         params = [[notebook_id], [2]]
-        body = self._build_request_body(self.RPC_DELETE_NOTEBOOK, params)
-        url = self._build_url(self.RPC_DELETE_NOTEBOOK)
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_DELETE_NOTEBOOK)
-
+        with self._invalidates(notebook_id):
+            result = self._call_rpc(self.RPC_DELETE_NOTEBOOK, params)
         return result is not None
 
     def check_source_freshness(self, source_id: str) -> bool | None:
         """Check if a Drive source is fresh (up-to-date with Google Drive).
     """
-        client = self._get_client()
-
         params = [None, [source_id], [2]]
-        body = self._build_request_body(self.RPC_CHECK_FRESHNESS, params)
-        url = self._build_url(self.RPC_CHECK_FRESHNESS)
+        result = self._call_rpc(self.RPC_CHECK_FRESHNESS, params)
+        return self._parse_freshness(result)
 
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_CHECK_FRESHNESS)
+    def check_sources_freshness(self, source_ids: list[str]) -> dict[str, bool | None]:
+        """Check freshness of several Drive sources in one batchexecute round trip.
 
+        Returns:
+            Dict mapping source_id to True (fresh), False (stale) or None (unknown)
+        """
+        if not source_ids:
+            return {}
+        calls = [(self.RPC_CHECK_FRESHNESS, [None, [source_id], [2]]) for source_id in source_ids]
+        results = self._call_rpc_batch(calls)
+        return {source_id: self._parse_freshness(result) for source_id, result in zip(source_ids, results)}
+
+    def _parse_freshness(self, result: Any) -> bool | None:
+        """Decode the yR9Yof (check freshness) result: True = fresh, False = stale."""
         # true = fresh, false = stale
         if result and isinstance(result, list) and len(result) > 0:
             inner = result[0] if result else []
@@ -1129,19 +1396,14 @@ class NotebookLMClient:
     def sync_drive_source(self, source_id: str) -> dict | None:
         """Sync a Drive source with the latest content from Google Drive.
     """
-        client = self._get_client()
-
         # Sync params: [null, ["source_id"], [2]]
         params = [None, [source_id], [2]]
-        body = self._build_request_body(self.RPC_SYNC_DRIVE, params)
-        url = self._build_url(self.RPC_SYNC_DRIVE)
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_SYNC_DRIVE)
+        with self._invalidates(source_id=source_id):
+            result = self._call_rpc(self.RPC_SYNC_DRIVE, params)
+        return self._parse_synced_source(result)
 
+    def _parse_synced_source(self, result: Any) -> dict | None:
+        """Decode the FLmJqe (sync Drive source) result."""
         if result and isinstance(result, list) and len(result) > 0:
             source_data = result[0] if result else []
             if isinstance(source_data, list) and len(source_data) >= 3:
@@ -1176,19 +1438,11 @@ class NotebookLMClient:
         Returns:
             True on success, False on failure
         """
-        client = self._get_client()
-
         # Delete source params: [[["source_id"]], [2]]
         # Note: Extra nesting compared to delete_notebook
         params = [[[source_id]], [2]]
-        body = self._build_request_body(self.RPC_DELETE_SOURCE, params)
-        url = self._build_url(self.RPC_DELETE_SOURCE)
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_DELETE_SOURCE)
+        with self._invalidates(source_id=source_id):
+            result = self._call_rpc(self.RPC_DELETE_SOURCE, params)
 
         # Response is typically [] on success
         return result is not None
@@ -1196,145 +1450,18 @@ class NotebookLMClient:
     def get_notebook_sources_with_types(self, notebook_id: str) -> list[dict]:
         """Get all sources from a notebook with their type information.
     """
-        result = self.get_notebook(notebook_id)
-
-        sources = []
-        # The notebook data is wrapped in an outer array
-        if result and isinstance(result, list) and len(result) >= 1:
-            notebook_data = result[0] if isinstance(result[0], list) else result
-            # Sources are in notebook_data[1]
-            sources_data = notebook_data[1] if len(notebook_data) > 1 else []
-
-            if isinstance(sources_data, list):
-                for src in sources_data:
-                    if isinstance(src, list) and len(src) >= 3:
-                        # Source structure: [[id], title, [metadata...], [null, 2]]
-                        source_id = src[0][0] if src[0] and isinstance(src[0], list) else None
-                        title = src[1] if len(src) > 1 else "Untitled"
-                        metadata = src[2] if len(src) > 2 else []
-
-                        source_type = None
-                        drive_doc_id = None
-                        if isinstance(metadata, list):
-                            if len(metadata) > 4:
-                                source_type = metadata[4]
-                            # Drive doc info at metadata[0]
-                            if len(metadata) > 0 and isinstance(metadata[0], list):
-                                drive_doc_id = metadata[0][0] if metadata[0] else None
-
-                        # Google Docs (type 1) and Slides/Sheets (type 2) are stored in Drive
-                        # and can be synced if they have a drive_doc_id
-                        can_sync = drive_doc_id is not None and source_type in (
-                            self.SOURCE_TYPE_GOOGLE_DOCS,
-                            self.SOURCE_TYPE_GOOGLE_OTHER,
-                        )
-
-                        # Extract URL if available (position 7)
-                        url = None
-                        if isinstance(metadata, list) and len(metadata) > 7:
-                            url_info = metadata[7]
-                            if isinstance(url_info, list) and len(url_info) > 0:
-                                url = url_info[0]
-
-                        sources.append({
-                            "id": source_id,
-                            "title": title,
-                            "source_type": source_type,
-                            "source_type_name": constants.SOURCE_TYPES.get_name(source_type),
-                            "url": url,
-                            "drive_doc_id": drive_doc_id,
-                            "can_sync": can_sync,  # True for Drive docs AND Gemini Notes
-                        })
-
-        return sources
+        return [source.to_dict() for source in self._cached_notebook(notebook_id).sources]
 
 
     def add_url_source(self, notebook_id: str, url: str) -> dict | None:
         """Add a URL (website or YouTube) as a source to a notebook.
     """
-        client = self._get_client()
-
-        # URL position differs for YouTube vs regular websites:
-        # - YouTube: position 7
-        # - Regular websites: position 2
-        is_youtube = "youtube.com" in url.lower() or "youtu.be" in url.lower()
-
-        if is_youtube:
-            # YouTube: [null, null, null, null, null, null, null, [url], null, null, 1]
-            source_data = [None, None, None, None, None, None, None, [url], None, None, 1]
-        else:
-            # Regular website: [null, null, [url], null, null, null, null, null, null, null, 1]
-            source_data = [None, None, [url], None, None, None, None, None, None, None, 1]
-
-        params = [
-            [source_data],
-            notebook_id,
-            [2],
-            [1, None, None, None, None, None, None, None, None, None, [1]]
-        ]
-        body = self._build_request_body(self.RPC_ADD_SOURCE, params)
-        source_path = f"/notebook/{notebook_id}"
-        url_endpoint = self._build_url(self.RPC_ADD_SOURCE, source_path)
-
-        try:
-            response = client.post(url_endpoint, content=body, timeout=SOURCE_ADD_TIMEOUT)
-            response.raise_for_status()
-        except httpx.TimeoutException:
-            # Large pages may take longer than the timeout but still succeed on backend
-            return {
-                "status": "timeout",
-                "message": f"Operation timed out after {SOURCE_ADD_TIMEOUT}s but may have succeeded. Check notebook sources before retrying.",
-            }
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_ADD_SOURCE)
-
-        if result and isinstance(result, list) and len(result) > 0:
-            source_list = result[0] if result else []
-            if source_list and len(source_list) > 0:
-                source_data = source_list[0]
-                source_id = source_data[0][0] if source_data[0] else None
-                source_title = source_data[1] if len(source_data) > 1 else "Untitled"
-                return {"id": source_id, "title": source_title}
-        return None
+        return self._add_source(notebook_id, self._url_source_data(url), "Untitled")
 
     def add_text_source(self, notebook_id: str, text: str, title: str = "Pasted Text") -> dict | None:
         """Add pasted text as a source to a notebook.
     """
-        client = self._get_client()
-
-        # Text source params structure:
-        source_data = [None, [title, text], None, 2, None, None, None, None, None, None, 1]
-        params = [
-            [source_data],
-            notebook_id,
-            [2],
-            [1, None, None, None, None, None, None, None, None, None, [1]]
-        ]
-        body = self._build_request_body(self.RPC_ADD_SOURCE, params)
-        source_path = f"/notebook/{notebook_id}"
-        url_endpoint = self._build_url(self.RPC_ADD_SOURCE, source_path)
-
-        try:
-            response = client.post(url_endpoint, content=body, timeout=SOURCE_ADD_TIMEOUT)
-            response.raise_for_status()
-        except httpx.TimeoutException:
-            return {
-                "status": "timeout",
-                "message": f"Operation timed out after {SOURCE_ADD_TIMEOUT}s but may have succeeded. Check notebook sources before retrying.",
-            }
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_ADD_SOURCE)
-
-        if result and isinstance(result, list) and len(result) > 0:
-            source_list = result[0] if result else []
-            if source_list and len(source_list) > 0:
-                source_data = source_list[0]
-                source_id = source_data[0][0] if source_data[0] else None
-                source_title = source_data[1] if len(source_data) > 1 else title
-                return {"id": source_id, "title": source_title}
-        return None
+        return self._add_source(notebook_id, self._text_source_data(text, title), title)
 
     def add_drive_source(
         self,
@@ -1345,10 +1472,44 @@ class NotebookLMClient:
     ) -> dict | None:
         """Add a Google Drive document as a source to a notebook.
     """
-        client = self._get_client()
+        return self._add_source(notebook_id, self._drive_source_data(document_id, title, mime_type), title)
+
+    def _add_source(self, notebook_id: str, source_data: list, default_title: str) -> dict | None:
+        """Send an izAoDd (add source) RPC with the extended source timeout."""
+        params = self._add_source_params(notebook_id, source_data)
+        try:
+            with self._invalidates(notebook_id):
+                result = self._call_rpc(
+                    self.RPC_ADD_SOURCE, params, f"/notebook/{notebook_id}", timeout=SOURCE_ADD_TIMEOUT
+                )
+        except httpx.TimeoutException:
+            # Large files/pages may take longer than the timeout but still succeed on backend
+            return self._source_add_timeout_result()
+        return self._parse_added_source(result, default_title)
+
+    @staticmethod
+    def _url_source_data(url: str) -> list:
+        """Source payload for a website or YouTube URL."""
+        # URL position differs for YouTube vs regular websites:
+        # - YouTube: position 7
+        # - Regular websites: position 2
+        is_youtube = "youtube.com" in url.lower() or "youtu.be" in url.lower()
 
-        # Drive source params structure (verified from network capture):
-        source_data = [
+        if is_youtube:
+            # YouTube: [null, null, null, null, null, null, null, [url], null, null, 1]
+            return [None, None, None, None, None, None, None, [url], None, None, 1]
+        # Regular website: [null, null, [url], null, null, null, null, null, null, null, 1]
+        return [None, None, [url], None, None, None, None, None, None, None, 1]
+
+    @staticmethod
+    def _text_source_data(text: str, title: str) -> list:
+        """Source payload for pasted text."""
+        return [None, [title, text], None, 2, None, None, None, None, None, None, 1]
+
+    @staticmethod
+    def _drive_source_data(document_id: str, title: str, mime_type: str) -> list:
+        """Source payload for a Google Drive document (verified from network capture)."""
+        return [
             [document_id, mime_type, 1, title],  # Drive document info at position 0
             None,
             None,
@@ -1361,35 +1522,33 @@ class NotebookLMClient:
             None,
             1
         ]
-        params = [
+
+    @staticmethod
+    def _add_source_params(notebook_id: str, source_data: list) -> list:
+        """Wrap a single source payload in the izAoDd params structure."""
+        return [
             [source_data],
             notebook_id,
             [2],
             [1, None, None, None, None, None, None, None, None, None, [1]]
         ]
-        body = self._build_request_body(self.RPC_ADD_SOURCE, params)
-        source_path = f"/notebook/{notebook_id}"
-        url_endpoint = self._build_url(self.RPC_ADD_SOURCE, source_path)
-
-        try:
-            response = client.post(url_endpoint, content=body, timeout=SOURCE_ADD_TIMEOUT)
-            response.raise_for_status()
-        except httpx.TimeoutException:
-            # Large files may take longer than the timeout but still succeed on backend
-            return {
-                "status": "timeout",
-                "message": f"Operation timed out after {SOURCE_ADD_TIMEOUT}s but may have succeeded. Check notebook sources before retrying.",
-            }
 
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_ADD_SOURCE)
+    @staticmethod
+    def _source_add_timeout_result() -> dict:
+        """Result returned when a source add times out client-side."""
+        return {
+            "status": "timeout",
+            "message": f"Operation timed out after {SOURCE_ADD_TIMEOUT}s but may have succeeded. Check notebook sources before retrying.",
+        }
 
+    def _parse_added_source(self, result: Any, default_title: str) -> dict | None:
+        """Decode the izAoDd (add source) result into {id, title}."""
         if result and isinstance(result, list) and len(result) > 0:
             source_list = result[0] if result else []
             if source_list and len(source_list) > 0:
                 source_data = source_list[0]
                 source_id = source_data[0][0] if source_data[0] else None
-                source_title = source_data[1] if len(source_data) > 1 else title
+                source_title = source_data[1] if len(source_data) > 1 else default_title
                 return {"id": source_id, "title": source_title}
         return None
 
@@ -1400,6 +1559,9 @@ class NotebookLMClient:
         source_ids: list[str] | None = None,
         conversation_id: str | None = None,
         timeout: float = 120.0,
+        use_cache: bool = False,
+        match_similar: bool = False,
+        history: HistoryPolicy | None = None,
     ) -> dict | None:
         """Query the notebook with a question.
 
@@ -1412,8 +1574,16 @@ class NotebookLMClient:
             source_ids: Optional list of source IDs to query (default: all sources)
             conversation_id: Optional conversation ID for follow-up questions.
                            If None, starts a new conversation.
-                           If provided and exists in cache, includes conversation history.
+                           If provided and exists in cache, includes conversation history;
+                           an unknown one is first restored from the server
+                           if the client was created with restore_conversations.
             timeout: Request timeout in seconds (default: 120.0)
+            use_cache: Reuse the answer to the same first-turn question while the
+                notebook is unchanged (see answer_cache.py)
+            match_similar: Also reuse the answer to a reworded first-turn question
+                whose similarity reaches the index threshold
+            history: Which earlier turns a follow-up sends (default: the client's
+                history policy; see conversations.HistoryPolicy)
 
         Returns:
             Dict with:
@@ -1422,15 +1592,156 @@ class NotebookLMClient:
             - turn_number: Which turn this is in the conversation (1 = first)
             - is_follow_up: Whether this was a follow-up query
             - raw_response: The raw parsed response (for debugging)
+            - request_bytes, history_turns: Request body size and earlier turns sent
+            - cached, cache_age_seconds: Only on answers served from the cache
+            - matched_question, similarity: Only on answers to a similar question
         """
-        import uuid
+        result = None
+        for update in self.query_stream(
+            notebook_id, query_text, source_ids, conversation_id, timeout,
+            use_cache=use_cache, match_similar=match_similar, history=history,
+        ):
+            if update["type"] == "done":
+                result = update["result"]
+        return result
 
-        client = self._get_client()
+    def query_stream(
+        self,
+        notebook_id: str,
+        query_text: str,
+        source_ids: list[str] | None = None,
+        conversation_id: str | None = None,
+        timeout: float = 120.0,
+        use_cache: bool = False,
+        match_similar: bool = False,
+        history: HistoryPolicy | None = None,
+    ) -> Iterator[dict]:
+        """Query the notebook and yield answer updates as the response streams in.
+
+        Args are the same as query().
+
+        Yields:
+            {"type": "thinking", "text": ...} while the model is reasoning
+            {"type": "answer", "text": ...} with the answer received so far
+            {"type": "done", "result": ...} last, with the query() result dict.
+            If the timeout hits after some text arrived, the result holds the
+            best partial answer and "partial" is True.
+        """
+        client = self._get_client(long_running=True)
 
         # If no source_ids provided, get them from the notebook
+        notebook = None
         if source_ids is None:
-            notebook_data = self.get_notebook(notebook_id)
-            source_ids = self._extract_source_ids_from_notebook(notebook_data)
+            notebook = self._cached_notebook(notebook_id)
+            source_ids = notebook.source_ids
+
+        scope, version = None, None
+        if (use_cache or match_similar) and conversation_id is None:
+            # The notebook structure (60 s cache), not the stale-while-revalidate list
+            version = (notebook or self._cached_notebook(notebook_id)).fingerprint
+            scope = self._answer_scope(notebook_id, source_ids, version)
+            cached = self._reused_answer(scope, query_text, version, use_cache, match_similar)
+            if cached is not None:
+                yield {"type": "answer", "text": cached["answer"]}
+                yield {"type": "done", "result": cached}
+                return
+
+        if (
+            self._restore_conversations
+            and conversation_id is not None
+            and not self._conversations.get(conversation_id)
+        ):
+            self._restore_conversation(notebook_id, conversation_id)
+
+        conversation_id, is_new_conversation, body, history_turns = self._build_query_body(
+            query_text, source_ids, conversation_id, history
+        )
+        url = self._build_query_url()
+        # The answer is cut off at the tool call's deadline, if that comes first
+        timeout = clamp_timeout(timeout)
+
+        state = QueryStreamState(request_bytes=len(body), history_turns=history_turns)
+        decoder = FrameDecoder()
+        deadline = state.started_at + timeout
+        partial = False
+        try:
+            with self._circuit_breaker.guard([self.QUERY_RATE_KEY], QUERY), \
+                    self._rate_limiter.slot([self.QUERY_RATE_KEY], "long"), \
+                    client.stream("POST", url, content=body, timeout=timeout) as response:
+                response.raise_for_status()
+                for data in response.iter_bytes():
+                    yield from self._feed_query_bytes(state, decoder, data)
+                    if time.monotonic() >= deadline:
+                        partial = True
+                        break
+                else:
+                    yield from self._query_updates(state, decoder.finish())
+        except httpx.TimeoutException:
+            # Keep what already arrived; only fail if there is nothing to return
+            if not state.best_text:
+                raise
+            partial = True
+
+        result = self._finish_streamed_query(state, conversation_id, query_text, is_new_conversation, partial)
+        if scope is not None and not partial:
+            self._remember_answer(scope, query_text, result["answer"], version, use_cache, match_similar)
+        yield {"type": "done", "result": result}
+
+    def _answer_scope(self, notebook_id: str, source_ids: list[str], version: str | None) -> tuple | None:
+        """Answer cache scope of a first-turn question (None if the notebook version is unknown)."""
+        if version is None:
+            return None
+        return answer_scope(notebook_id, source_ids, codec.dumps(self.QUERY_OPTIONS))
+
+    def _reused_answer(
+        self, scope: tuple | None, query_text: str, version: str | None, use_cache: bool, match_similar: bool
+    ) -> dict | None:
+        """query() result from an earlier answer to the same or a similar question, if any."""
+        if scope is None:
+            return None
+        extra = {}
+        hit = self._answer_cache.get(answer_key(scope, query_text), version) if use_cache else None
+        if hit is None and match_similar:
+            match = self._query_index.match(scope, query_text, version)
+            if match is not None:
+                hit, score = match
+                extra = {"matched_question": hit.query_text, "similarity": round(score, 3)}
+        if hit is None:
+            return None
+
+        import uuid
+
+        # New conversation seeded with the cached turn, so follow-ups get the history
+        result = self._finish_query(str(uuid.uuid4()), query_text, hit.answer, True, "")
+        result["cached"] = True
+        result["cache_age_seconds"] = round(hit.age, 1)
+        result.update(extra)
+        return result
+
+    def _remember_answer(
+        self, scope: tuple, query_text: str, answer: str, version: str, use_cache: bool, match_similar: bool
+    ) -> None:
+        """Keep a complete first-turn answer for later use_cache / match_similar queries."""
+        if use_cache:
+            self._answer_cache.put(answer_key(scope, query_text), answer, query_text, version)
+        if match_similar:
+            self._query_index.add(scope, query_text, answer, version)
+
+    def _build_query_body(
+        self,
+        query_text: str,
+        source_ids: list[str] | None,
+        conversation_id: str | None,
+        history: HistoryPolicy | None = None,
+    ) -> tuple[str, bool, str, int]:
+        """Build the GenerateFreeFormStreamed request body.
+
+        Returns:
+            Tuple of (conversation_id, is_new_conversation, body, history_turns).
+            A new conversation ID is generated when none is given; history_turns
+            is the number of earlier turns the history policy let through.
+        """
+        import uuid
 
         # Determine if this is a new conversation or follow-up
         is_new_conversation = conversation_id is None
@@ -1439,7 +1750,7 @@ class NotebookLMClient:
             conversation_history = None
         else:
             # Check if we have cached history for this conversation
-            conversation_history = self._build_conversation_history(conversation_id)
+            conversation_history = self._build_conversation_history(conversation_id, history)
 
         # Build source IDs structure: [[[sid]]] for each source (3 brackets, not 4!)
         sources_array = [[[sid]] for sid in source_ids] if source_ids else []
@@ -1451,15 +1762,15 @@ class NotebookLMClient:
             sources_array,
             query_text,
             conversation_history,  # None for new, history array for follow-ups
-            [2, None, [1]],
+            self.QUERY_OPTIONS,
             conversation_id,
         ]
 
         # Use compact JSON format matching Chrome (no spaces)
-        params_json = json.dumps(params, separators=(",", ":"))
+        params_json = codec.dumps(params)
 
         f_req = [None, params_json]
-        f_req_json = json.dumps(f_req, separators=(",", ":"))
+        f_req_json = codec.dumps(f_req)
 
         # URL encode with safe='' to encode all characters including /
         body_parts = [f"f.req={urllib.parse.quote(f_req_json, safe='')}"]
@@ -1468,6 +1779,11 @@ class NotebookLMClient:
         # Add trailing & to match NotebookLM's format
         body = "&".join(body_parts) + "&"
 
+        history_turns = len(conversation_history) // 2 if conversation_history else 0
+        return conversation_id, is_new_conversation, body, history_turns
+
+    def _build_query_url(self) -> str:
+        """Build the query endpoint URL (increments the _reqid counter)."""
         self._reqid_counter += 100000  # Increment counter
         url_params = {
             "bl": os.environ.get("NOTEBOOKLM_BL", "boq_labs-tailwind-frontend_20260108.06_p0"),
@@ -1479,59 +1795,91 @@ class NotebookLMClient:
             url_params["f.sid"] = self._session_id
 
         query_string = urllib.parse.urlencode(url_params)
-        url = f"{self.BASE_URL}{self.QUERY_ENDPOINT}?{query_string}"
-
-        response = client.post(url, content=body, timeout=timeout)
-        response.raise_for_status()
-
-        # Parse streaming response
-        answer_text = self._parse_query_response(response.text)
+        return f"{self.BASE_URL}{self.QUERY_ENDPOINT}?{query_string}"
 
-        # Cache this turn for future follow-ups (only if we got an answer)
-        if answer_text:
-            self._cache_conversation_turn(conversation_id, query_text, answer_text)
-
-        # Calculate turn number
-        turns = self._conversation_cache.get(conversation_id, [])
-        turn_number = len(turns)
+    def _finish_query(
+        self,
+        conversation_id: str,
+        query_text: str,
+        answer_text: str,
+        is_new_conversation: bool,
+        response_text: str,
+        partial: bool = False,
+        request_bytes: int | None = None,
+        elapsed: float | None = None,
+    ) -> dict:
+        """Cache the completed turn and build the query() result dict."""
+        # Cache this turn for future follow-ups (only if we got a complete answer)
+        if answer_text and not partial:
+            turn_number = self._cache_conversation_turn(
+                conversation_id, query_text, answer_text, request_bytes, elapsed
+            ).turn_number
+        else:
+            turn_number = len(self._conversations.get(conversation_id))
 
         return {
             "answer": answer_text,
             "conversation_id": conversation_id,
             "turn_number": turn_number,
             "is_follow_up": not is_new_conversation,
-            "raw_response": response.text[:1000] if response.text else "",  # Truncate for debugging
+            "partial": partial,
+            "raw_response": response_text[:1000] if response_text else "",  # Truncate for debugging
         }
 
-    def _extract_source_ids_from_notebook(self, notebook_data: Any) -> list[str]:
-        """Extract source IDs from notebook data.
-    """
-        source_ids = []
-        if not notebook_data or not isinstance(notebook_data, list):
-            return source_ids
+    def _finish_streamed_query(
+        self,
+        state: QueryStreamState,
+        conversation_id: str,
+        query_text: str,
+        is_new_conversation: bool,
+        partial: bool,
+    ) -> dict:
+        """Build the query() result from a streamed response, with timing and request size."""
+        elapsed = round(time.monotonic() - state.started_at, 3)
+        result = self._finish_query(
+            conversation_id, query_text, state.best_text, is_new_conversation, state.raw_head, partial,
+            request_bytes=state.request_bytes, elapsed=elapsed,
+        )
+        result["time_to_first_token_seconds"] = state.time_to_first_token
+        result["elapsed_seconds"] = elapsed
+        result["request_bytes"] = state.request_bytes
+        result["history_turns"] = state.history_turns
+        logger.debug(
+            f"Query stream finished: ttft={result['time_to_first_token_seconds']}s "
+            f"total={elapsed}s request={state.request_bytes}B history_turns={state.history_turns} "
+            f"partial={partial}"
+        )
+        return result
 
-        try:
-            # Notebook structure: [[notebook_title, sources_array, notebook_id, ...]]
-            # The outer array contains one element with all notebook info
-            # Sources are at position [0][1]
-            if len(notebook_data) > 0 and isinstance(notebook_data[0], list):
-                notebook_info = notebook_data[0]
-                if len(notebook_info) > 1 and isinstance(notebook_info[1], list):
-                    sources = notebook_info[1]
-                    for source in sources:
-                        # Each source: [[source_id], title, metadata, [null, 2]]
-                        if isinstance(source, list) and len(source) > 0:
-                            source_id_wrapper = source[0]
-                            if isinstance(source_id_wrapper, list) and len(source_id_wrapper) > 0:
-                                source_id = source_id_wrapper[0]
-                                if isinstance(source_id, str):
-                                    source_ids.append(source_id)
-        except (IndexError, TypeError):
-            pass
+    def _feed_query_bytes(self, state: QueryStreamState, decoder: FrameDecoder, data: bytes) -> list[dict]:
+        """Consume raw query response bytes; return updates for every chunk that grew the best text."""
+        if len(state.raw_head) < 1000:
+            state.raw_head += data[:1000 - len(state.raw_head)].decode("utf-8", errors="replace")
+        return self._query_updates(state, decoder.feed(data))
+
+    def _query_updates(self, state: QueryStreamState, payloads: list[Any]) -> list[dict]:
+        """Fold decoded query chunks into state; return an update per improvement."""
+        updates = []
+        for payload in payloads:
+            text, is_answer = self._extract_answer_from_data(payload)
+            if not text:
+                continue
 
-        return source_ids
+            if is_answer:
+                if len(text) <= len(state.answer):
+                    continue
+                state.answer = text
+            else:
+                if len(text) <= len(state.thinking):
+                    continue
+                state.thinking = text
 
-    def _parse_query_response(self, response_text: str) -> str:
+            if state.first_token_at is None:
+                state.first_token_at = time.monotonic()
+            updates.append({"type": "answer" if is_answer else "thinking", "text": text})
+        return updates
+
+    def _parse_query_response(self, response_text: bytes | str) -> str:
         """Parse the streaming query response and extract the final answer.
 
         The query endpoint returns a streaming response with multiple chunks.
@@ -1552,47 +1900,11 @@ class NotebookLMClient:
         Returns:
             The extracted answer text, or empty string if parsing fails
         """
-        # Remove anti-XSSI prefix
-        if response_text.startswith(")]}'"):
-            response_text = response_text[4:]
-
-        lines = response_text.strip().split("\n")
-        longest_answer = ""
-        longest_thinking = ""
-
-        # Parse chunks - prioritize type 1 (answers) over type 2 (thinking)
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            if not line:
-                i += 1
-                continue
-
-            # Try to parse as byte count (indicates next line is JSON)
-            try:
-                int(line)
-                i += 1
-                if i < len(lines):
-                    json_line = lines[i]
-                    text, is_answer = self._extract_answer_from_chunk(json_line)
-                    if text:
-                        if is_answer and len(text) > len(longest_answer):
-                            longest_answer = text
-                        elif not is_answer and len(text) > len(longest_thinking):
-                            longest_thinking = text
-                i += 1
-            except ValueError:
-                # Not a byte count, try to parse as JSON directly
-                text, is_answer = self._extract_answer_from_chunk(line)
-                if text:
-                    if is_answer and len(text) > len(longest_answer):
-                        longest_answer = text
-                    elif not is_answer and len(text) > len(longest_thinking):
-                        longest_thinking = text
-                i += 1
+        state = QueryStreamState()
+        self._query_updates(state, decode_frames(response_text))
 
         # Return answer if found, otherwise fall back to thinking
-        return longest_answer if longest_answer else longest_thinking
+        return state.best_text
 
     def _extract_answer_from_chunk(self, json_str: str) -> tuple[str | None, bool]:
         """Extract answer text from a single JSON chunk.
@@ -1612,10 +1924,13 @@ class NotebookLMClient:
             Tuple of (text, is_answer) where is_answer is True for actual answers (type 1)
         """
         try:
-            data = json.loads(json_str)
-        except json.JSONDecodeError:
+            data = codec.loads(json_str)
+        except codec.DECODE_ERRORS:
             return None, False
+        return self._extract_answer_from_data(data)
 
+    def _extract_answer_from_data(self, data: Any) -> tuple[str | None, bool]:
+        """Extract answer text from a decoded JSON chunk (see _extract_answer_from_chunk)."""
         if not isinstance(data, list) or len(data) == 0:
             return None, False
 
@@ -1630,8 +1945,8 @@ class NotebookLMClient:
                 continue
 
             try:
-                inner_data = json.loads(inner_json_str)
-            except json.JSONDecodeError:
+                inner_data = codec.loads(inner_json_str)
+            except codec.DECODE_ERRORS:
                 continue
 
             # Type indicator is at inner_data[0][4][-1]: 1 = answer, 2 = thinking
@@ -1663,6 +1978,18 @@ class NotebookLMClient:
     ) -> dict | None:
         """Start a research session to discover sources.
     """
+        rpc_id, params, source_lower, mode_lower = self._research_start_request(notebook_id, query, source, mode)
+        result = self._call_rpc(rpc_id, params, f"/notebook/{notebook_id}")
+        return self._parse_research_start(result, notebook_id, query, source_lower, mode_lower)
+
+    def _research_start_request(
+        self, notebook_id: str, query: str, source: str, mode: str
+    ) -> tuple[str, list, str, str]:
+        """Validate research options and pick the RPC.
+
+        Returns:
+            Tuple of (rpc_id, params, normalized_source, normalized_mode)
+        """
         # Validate inputs
         source_lower = source.lower()
         mode_lower = mode.lower()
@@ -1679,8 +2006,6 @@ class NotebookLMClient:
         # Map to internal constants
         source_type = self.RESEARCH_SOURCE_WEB if source_lower == "web" else self.RESEARCH_SOURCE_DRIVE
 
-        client = self._get_client()
-
         if mode_lower == "fast":
             # Fast Research: Ljjv0c
             params = [[query, source_type], None, 1, notebook_id]
@@ -1690,15 +2015,12 @@ class NotebookLMClient:
             params = [None, [1], [query, source_type], 5, notebook_id]
             rpc_id = self.RPC_START_DEEP_RESEARCH
 
-        body = self._build_request_body(rpc_id, params)
-        url = self._build_url(rpc_id, f"/notebook/{notebook_id}")
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, rpc_id)
+        return rpc_id, params, source_lower, mode_lower
 
+    def _parse_research_start(
+        self, result: Any, notebook_id: str, query: str, source_lower: str, mode_lower: str
+    ) -> dict | None:
+        """Decode the Ljjv0c/QA9ei (start research) result."""
         if result and isinstance(result, list) and len(result) > 0:
             task_id = result[0]
             report_id = result[1] if len(result) > 1 else None
@@ -1724,141 +2046,24 @@ class NotebookLMClient:
         Returns:
             Dict with status, sources, and summary when complete
         """
-        client = self._get_client()
-
         # Poll params: [null, null, "notebook_id"]
         params = [None, None, notebook_id]
-        body = self._build_request_body(self.RPC_POLL_RESEARCH, params)
-        url = self._build_url(self.RPC_POLL_RESEARCH, f"/notebook/{notebook_id}")
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_POLL_RESEARCH)
-
-        if not result or not isinstance(result, list) or len(result) == 0:
-            return {"status": "no_research", "message": "No active research found"}
-
-        # Unwrap the outer array to get [[task_id, task_info, status], [ts1], [ts2]]
-        if isinstance(result[0], list) and len(result[0]) > 0 and isinstance(result[0][0], list):
-            result = result[0]
-
-        # Result may contain multiple research tasks - find the most recent/active one
-        research_tasks = []
-
-        for task_data in result:
-            # task_data structure: [task_id, task_info] (only 2 elements for deep research)
-            if not isinstance(task_data, list) or len(task_data) < 2:
-                continue
-
-            task_id = task_data[0]
-            task_info = task_data[1] if len(task_data) > 1 else None
-
-            # Skip timestamp arrays (task_id should be a UUID string, not an int)
-            if not isinstance(task_id, str):
-                continue
-
-            if not task_info or not isinstance(task_info, list):
-                continue
-
-            # Parse task info structure:
-            # Note: status is at task_info[4], NOT task_data[2] (which is a timestamp)
-            query_info = task_info[1] if len(task_info) > 1 else None
-            research_mode = task_info[2] if len(task_info) > 2 else None
-            sources_and_summary = task_info[3] if len(task_info) > 3 else []
-            status_code = task_info[4] if len(task_info) > 4 else None
-
-            query_text = query_info[0] if query_info and len(query_info) > 0 else ""
-            source_type = query_info[1] if query_info and len(query_info) > 1 else 1
-
-            sources_data = []
-            summary = ""
-            report = ""
-
-            # Handle different structures for fast vs deep research
-            if isinstance(sources_and_summary, list) and len(sources_and_summary) >= 1:
-                # sources_and_summary[0] is always the sources list
-                sources_data = sources_and_summary[0] if isinstance(sources_and_summary[0], list) else []
-                # For fast research, summary may be at [1]
-                if len(sources_and_summary) >= 2 and isinstance(sources_and_summary[1], str):
-                    summary = sources_and_summary[1]
-
-            # Parse sources - structure differs between fast and deep research
-            # Fast research: [url, title, desc, type, ...]
-            # Deep research: [None, title, None, type, None, None, [report], ...]
-            sources = []
-            if isinstance(sources_data, list) and len(sources_data) > 0:
-                for idx, src in enumerate(sources_data):
-                    if not isinstance(src, list) or len(src) < 2:
-                        continue
-
-                    # Check if this is deep research format (src[0] is None, src[1] is title)
-                    if src[0] is None and len(src) > 1 and isinstance(src[1], str):
-                        # Deep research format
-                        title = src[1] if isinstance(src[1], str) else ""
-                        result_type = src[3] if len(src) > 3 and isinstance(src[3], int) else 5
-                        # Report is at src[6][0] for deep research
-                        if len(src) > 6 and isinstance(src[6], list) and len(src[6]) > 0:
-                            report = src[6][0] if isinstance(src[6][0], str) else ""
-
-                        sources.append({
-                            "index": idx,
-                            "url": "",  # Deep research doesn't have URLs in source list
-                            "title": title,
-                            "description": "",
-                            "result_type": result_type,
-                            "result_type_name": constants.RESULT_TYPES.get_name(result_type),
-                        })
-                    elif isinstance(src[0], str) or len(src) >= 3:
-                        # Fast research format: [url, title, desc, type, ...]
-                        url = src[0] if isinstance(src[0], str) else ""
-                        title = src[1] if len(src) > 1 and isinstance(src[1], str) else ""
-                        desc = src[2] if len(src) > 2 and isinstance(src[2], str) else ""
-                        result_type = src[3] if len(src) > 3 and isinstance(src[3], int) else 1
-
-                        sources.append({
-                            "index": idx,
-                            "url": url,
-                            "title": title,
-                            "description": desc,
-                            "result_type": result_type,
-                            "result_type_name": constants.RESULT_TYPES.get_name(result_type),
-                        })
+        result = self._call_rpc(self.RPC_POLL_RESEARCH, params, f"/notebook/{notebook_id}")
+        return self._parse_research_poll(result, target_task_id)
 
-            # Determine status (1 = in_progress, 2 = completed, 6 = imported/completed)
-            # Fix: Status 6 means "Imported" which is also a completed state
-            status = "completed" if status_code in (2, 6) else "in_progress"
-
-            research_tasks.append({
-                "task_id": task_id,
-                "status": status,
-                "query": query_text,
-                "source_type": "web" if source_type == 1 else "drive",
-                "mode": "deep" if research_mode == 5 else "fast",
-                "sources": sources,
-                "source_count": len(sources),
-                "summary": summary,
-                "report": report,  # Deep research report (markdown)
-            })
-
-        if not research_tasks:
+    def _parse_research_poll(self, result: Any, target_task_id: str | None = None) -> dict | None:
+        """Decode the e3bVqc (poll research) result, optionally selecting one task."""
+        tasks = decode_research_tasks(result)
+        if not tasks:
             return {"status": "no_research", "message": "No active research found"}
 
-        # If target_task_id provided, find the specific task
         if target_task_id:
-            for task in research_tasks:
-                if task["task_id"] == target_task_id:
-                    return task
-            # If specified task not found, return None or error
-            # For now, return None to indicate not found/not ready?
-            # Or maybe we shouldn't filter strict if it's not found?
-            # Let's return None implies "waiting" or "not found yet"
-            return None
+            # None while the requested task has not shown up yet
+            task = next((task for task in tasks if task.task_id == target_task_id), None)
+            return task.to_dict() if task else None
 
-        # Return the most recent (first) task if no task_id specified
-
-        return research_tasks[0]
+        # Most recent (first) task
+        return tasks[0].to_dict()
 
 
     def import_research_sources(
@@ -1872,8 +2077,15 @@ class NotebookLMClient:
         if not sources:
             return []
 
-        client = self._get_client()
+        params = self._import_research_params(notebook_id, task_id, sources)
+        # Import can take a long time when fetching multiple web sources
+        # Use 120s timeout instead of the default 30s
+        with self._invalidates(notebook_id):
+            result = self._call_rpc(self.RPC_IMPORT_RESEARCH, params, f"/notebook/{notebook_id}", timeout=120.0)
+        return self._parse_imported_sources(result)
 
+    def _import_research_params(self, notebook_id: str, task_id: str, sources: list[dict]) -> list:
+        """Build the LBwxtb (import research) params for the given research sources."""
         # Build source array for import
         # Web source: [null, null, ["url", "title"], null, null, null, null, null, null, null, 2]
         # Drive source: Extract doc_id from URL and use different structure
@@ -1917,18 +2129,10 @@ class NotebookLMClient:
             source_array.append(source_data)
 
         # Note: source_array is already [source1, source2, ...], don't double-wrap
-        params = [None, [1], task_id, notebook_id, source_array]
-        body = self._build_request_body(self.RPC_IMPORT_RESEARCH, params)
-        url = self._build_url(self.RPC_IMPORT_RESEARCH, f"/notebook/{notebook_id}")
-
-        # Import can take a long time when fetching multiple web sources
-        # Use 120s timeout instead of the default 30s
-        response = client.post(url, content=body, timeout=120.0)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_IMPORT_RESEARCH)
+        return [None, [1], task_id, notebook_id, source_array]
 
+    def _parse_imported_sources(self, result: Any) -> list[dict]:
+        """Decode the LBwxtb (import research) result into [{id, title}]."""
         imported_sources = []
         if result and isinstance(result, list):
             # Response is wrapped: [[source1, source2, ...]]
@@ -1961,8 +2165,29 @@ class NotebookLMClient:
     ) -> dict | None:
         """Create an Audio Overview (podcast) for a notebook.
     """
-        client = self._get_client()
+        params = self._audio_overview_params(
+            notebook_id, source_ids, format_code, length_code, language, focus_prompt
+        )
+        result = self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "audio",
+            format=constants.AUDIO_FORMATS.get_name(format_code),
+            length=constants.AUDIO_LENGTHS.get_name(length_code),
+            language=language,
+        )
 
+    def _audio_overview_params(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        format_code: int,
+        length_code: int,
+        language: str,
+        focus_prompt: str,
+    ) -> list:
+        """Build the R7cb6c params for an Audio Overview."""
         # Build source IDs in the nested format: [[[id1]], [[id2]], ...]
         sources_nested = [[[sid]] for sid in source_ids]
 
@@ -1982,7 +2207,7 @@ class NotebookLMClient:
             ]
         ]
 
-        params = [
+        return [
             [2],
             notebook_id,
             [
@@ -1994,32 +2219,6 @@ class NotebookLMClient:
             ]
         ]
 
-        body = self._build_request_body(self.RPC_CREATE_STUDIO, params)
-        url = self._build_url(self.RPC_CREATE_STUDIO, f"/notebook/{notebook_id}")
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_CREATE_STUDIO)
-
-        if result and isinstance(result, list) and len(result) > 0:
-            artifact_data = result[0]
-            artifact_id = artifact_data[0] if isinstance(artifact_data, list) and len(artifact_data) > 0 else None
-            status_code = artifact_data[4] if isinstance(artifact_data, list) and len(artifact_data) > 4 else None
-
-            return {
-                "artifact_id": artifact_id,
-                "notebook_id": notebook_id,
-                "type": "audio",
-                "status": "in_progress" if status_code == 1 else "completed" if status_code == 3 else "unknown",
-                "format": constants.AUDIO_FORMATS.get_name(format_code),
-                "length": constants.AUDIO_LENGTHS.get_name(length_code),
-                "language": language,
-            }
-
-        return None
-
     def create_video_overview(
         self,
         notebook_id: str,
@@ -2031,8 +2230,29 @@ class NotebookLMClient:
     ) -> dict | None:
         """Create a Video Overview for a notebook.
     """
-        client = self._get_client()
+        params = self._video_overview_params(
+            notebook_id, source_ids, format_code, visual_style_code, language, focus_prompt
+        )
+        result = self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "video",
+            format=constants.VIDEO_FORMATS.get_name(format_code),
+            visual_style=constants.VIDEO_STYLES.get_name(visual_style_code),
+            language=language,
+        )
 
+    def _video_overview_params(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        format_code: int,
+        visual_style_code: int,
+        language: str,
+        focus_prompt: str,
+    ) -> list:
+        """Build the R7cb6c params for a Video Overview."""
         # Build source IDs in the nested format: [[[id1]], [[id2]], ...]
         sources_nested = [[[sid]] for sid in source_ids]
 
@@ -2051,7 +2271,7 @@ class NotebookLMClient:
             ]
         ]
 
-        params = [
+        return [
             [2],
             notebook_id,
             [
@@ -2063,15 +2283,21 @@ class NotebookLMClient:
             ]
         ]
 
-        body = self._build_request_body(self.RPC_CREATE_STUDIO, params)
-        url = self._build_url(self.RPC_CREATE_STUDIO, f"/notebook/{notebook_id}")
+    def _post_studio_create(self, notebook_id: str, params: list) -> Any:
+        """Send an R7cb6c (create studio artifact) RPC and return its result."""
+        return self._call_rpc(self.RPC_CREATE_STUDIO, params, f"/notebook/{notebook_id}")
 
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_CREATE_STUDIO)
+    def _parse_created_artifact(
+        self, result: Any, notebook_id: str, artifact_type: str, **details: Any
+    ) -> dict | None:
+        """Decode an R7cb6c (create studio artifact) result.
 
+        Args:
+            result: Extracted RPC result
+            notebook_id: The notebook UUID
+            artifact_type: Type label for the result ("audio", "report", ...)
+            **details: Type-specific fields appended to the result dict
+        """
         if result and isinstance(result, list) and len(result) > 0:
             artifact_data = result[0]
             artifact_id = artifact_data[0] if isinstance(artifact_data, list) and len(artifact_data) > 0 else None
@@ -2080,11 +2306,9 @@ class NotebookLMClient:
             return {
                 "artifact_id": artifact_id,
                 "notebook_id": notebook_id,
-                "type": "video",
+                "type": artifact_type,
                 "status": "in_progress" if status_code == 1 else "completed" if status_code == 3 else "unknown",
-                "format": constants.VIDEO_FORMATS.get_name(format_code),
-                "visual_style": constants.VIDEO_STYLES.get_name(visual_style_code),
-                "language": language,
+                **details,
             }
 
         return None
@@ -2092,143 +2316,36 @@ class NotebookLMClient:
     def poll_studio_status(self, notebook_id: str) -> list[dict]:
         """Poll for studio content (audio/video overviews) status.
     """
-        client = self._get_client()
-
-        # Poll params: [[2], notebook_id, 'NOT artifact.status = "ARTIFACT_STATUS_SUGGESTED"']
-        params = [[2], notebook_id, 'NOT artifact.status = "ARTIFACT_STATUS_SUGGESTED"']
-        body = self._build_request_body(self.RPC_POLL_STUDIO, params)
-        url = self._build_url(self.RPC_POLL_STUDIO, f"/notebook/{notebook_id}")
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
+        params = self._poll_studio_params(notebook_id)
+        result = self._call_rpc(self.RPC_POLL_STUDIO, params, f"/notebook/{notebook_id}")
+        return self._parse_studio_artifacts(result)
 
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_POLL_STUDIO)
+    def poll_studio_with_mind_maps(self, notebook_id: str) -> tuple[list[dict], list[dict]]:
+        """Poll studio artifacts and list mind maps in one batchexecute round trip.
 
-        artifacts = []
-        if result and isinstance(result, list) and len(result) > 0:
-            # Response is an array of artifacts, possibly wrapped
-            artifact_list = result[0] if isinstance(result[0], list) else result
+        Returns:
+            (artifacts, mind_maps) as returned by poll_studio_status and list_mind_maps
+        """
+        artifacts_result, mind_maps_result = self._call_rpc_batch(
+            self._studio_overview_calls(notebook_id), f"/notebook/{notebook_id}"
+        )
+        return self._parse_studio_artifacts(artifacts_result), self._parse_mind_map_list(mind_maps_result)
 
-            for artifact_data in artifact_list:
-                if not isinstance(artifact_data, list) or len(artifact_data) < 5:
-                    continue
+    def _studio_overview_calls(self, notebook_id: str) -> list[tuple[str, Any]]:
+        """gArtLc (poll studio) + cFji9 (list mind maps) calls for one notebook."""
+        return [
+            (self.RPC_POLL_STUDIO, self._poll_studio_params(notebook_id)),
+            (self.RPC_LIST_MIND_MAPS, [notebook_id]),
+        ]
 
-                artifact_id = artifact_data[0]
-                title = artifact_data[1] if len(artifact_data) > 1 else ""
-                type_code = artifact_data[2] if len(artifact_data) > 2 else None
-                status_code = artifact_data[4] if len(artifact_data) > 4 else None
-
-                audio_url = None
-                video_url = None
-                duration_seconds = None
-
-                # Audio artifacts have URLs at position 6
-                if type_code == self.STUDIO_TYPE_AUDIO and len(artifact_data) > 6:
-                    audio_options = artifact_data[6]
-                    if isinstance(audio_options, list) and len(audio_options) > 3:
-                        audio_url = audio_options[3] if isinstance(audio_options[3], str) else None
-                        # Duration is often at position 9
-                        if len(audio_options) > 9 and isinstance(audio_options[9], list):
-                            duration_seconds = audio_options[9][0] if audio_options[9] else None
-
-                # Video artifacts have URLs at position 8
-                if type_code == self.STUDIO_TYPE_VIDEO and len(artifact_data) > 8:
-                    video_options = artifact_data[8]
-                    if isinstance(video_options, list) and len(video_options) > 3:
-                        video_url = video_options[3] if isinstance(video_options[3], str) else None
-
-                # Infographic artifacts have image URL at position 14
-                infographic_url = None
-                if type_code == self.STUDIO_TYPE_INFOGRAPHIC and len(artifact_data) > 14:
-                    infographic_options = artifact_data[14]
-                    if isinstance(infographic_options, list) and len(infographic_options) > 2:
-                        # URL is at [2][0][1][0] - image_data[0][1][0]
-                        image_data = infographic_options[2]
-                        if isinstance(image_data, list) and len(image_data) > 0:
-                            first_image = image_data[0]
-                            if isinstance(first_image, list) and len(first_image) > 1:
-                                image_details = first_image[1]
-                                if isinstance(image_details, list) and len(image_details) > 0:
-                                    url = image_details[0]
-                                    if isinstance(url, str) and url.startswith("http"):
-                                        infographic_url = url
-
-                # Slide deck artifacts have download URL at position 16
-                slide_deck_url = None
-                if type_code == self.STUDIO_TYPE_SLIDE_DECK and len(artifact_data) > 16:
-                    slide_deck_options = artifact_data[16]
-                    if isinstance(slide_deck_options, list) and len(slide_deck_options) > 0:
-                        # URL is typically at position 0 in the options
-                        if isinstance(slide_deck_options[0], str) and slide_deck_options[0].startswith("http"):
-                            slide_deck_url = slide_deck_options[0]
-                        # Or may be nested deeper
-                        elif len(slide_deck_options) > 3 and isinstance(slide_deck_options[3], str):
-                            slide_deck_url = slide_deck_options[3]
-
-                # Report artifacts have content at position 7
-                report_content = None
-                if type_code == self.STUDIO_TYPE_REPORT and len(artifact_data) > 7:
-                    report_options = artifact_data[7]
-                    if isinstance(report_options, list) and len(report_options) > 1:
-                        # Content is nested in the options
-                        content_data = report_options[1] if isinstance(report_options[1], list) else None
-                        if content_data and len(content_data) > 0:
-                            # Report content is typically markdown text
-                            report_content = content_data[0] if isinstance(content_data[0], str) else None
-
-                # Flashcard artifacts have cards data at position 9
-                flashcard_count = None
-                if type_code == self.STUDIO_TYPE_FLASHCARDS and len(artifact_data) > 9:
-                    flashcard_options = artifact_data[9]
-                    if isinstance(flashcard_options, list) and len(flashcard_options) > 1:
-                        # Count cards in the data
-                        cards_data = flashcard_options[1] if isinstance(flashcard_options[1], list) else None
-                        if cards_data:
-                            flashcard_count = len(cards_data) if isinstance(cards_data, list) else None
-
-                # Extract created_at timestamp
-                # Position varies by type but often at position 10, 15, or similar
-                created_at = None
-                # Try common timestamp positions
-                for ts_pos in [10, 15, 17]:
-                    if len(artifact_data) > ts_pos:
-                        ts_candidate = artifact_data[ts_pos]
-                        if isinstance(ts_candidate, list) and len(ts_candidate) >= 2:
-                            # Check if it looks like a timestamp [seconds, nanos]
-                            if isinstance(ts_candidate[0], (int, float)) and ts_candidate[0] > 1700000000:
-                                created_at = parse_timestamp(ts_candidate)
-                                break
-
-                # Map type codes to type names
-                type_map = {
-                    self.STUDIO_TYPE_AUDIO: "audio",
-                    self.STUDIO_TYPE_REPORT: "report",
-                    self.STUDIO_TYPE_VIDEO: "video",
-                    self.STUDIO_TYPE_FLASHCARDS: "flashcards",  # Also includes Quiz (type 4)
-                    self.STUDIO_TYPE_INFOGRAPHIC: "infographic",
-                    self.STUDIO_TYPE_SLIDE_DECK: "slide_deck",
-                    self.STUDIO_TYPE_DATA_TABLE: "data_table",
-                }
-                artifact_type = type_map.get(type_code, "unknown")
-                status = "in_progress" if status_code == 1 else "completed" if status_code == 3 else "unknown"
+    @staticmethod
+    def _poll_studio_params(notebook_id: str) -> list:
+        """gArtLc params: [[2], notebook_id, 'NOT artifact.status = "ARTIFACT_STATUS_SUGGESTED"']"""
+        return [[2], notebook_id, 'NOT artifact.status = "ARTIFACT_STATUS_SUGGESTED"']
 
-                artifacts.append({
-                    "artifact_id": artifact_id,
-                    "title": title,
-                    "type": artifact_type,
-                    "status": status,
-                    "created_at": created_at,
-                    "audio_url": audio_url,
-                    "video_url": video_url,
-                    "infographic_url": infographic_url,
-                    "slide_deck_url": slide_deck_url,
-                    "report_content": report_content,
-                    "flashcard_count": flashcard_count,
-                    "duration_seconds": duration_seconds,
-                })
-
-        return artifacts
+    def _parse_studio_artifacts(self, result: Any) -> list[dict]:
+        """Decode the gArtLc (poll studio) result into artifact dicts."""
+        return [artifact.to_dict() for artifact in decode_studio_artifacts(result)]
 
     def delete_studio_artifact(self, artifact_id: str, notebook_id: str | None = None) -> bool:
         """Delete a studio artifact (Audio, Video, or Mind Map).
@@ -2275,17 +2392,7 @@ class NotebookLMClient:
             self.RPC_LIST_MIND_MAPS, params, f"/notebook/{notebook_id}"
         )
 
-        timestamp = None
-        if list_result and isinstance(list_result, list) and len(list_result) > 0:
-            mm_list = list_result[0] if isinstance(list_result[0], list) else []
-            for mm_entry in mm_list:
-                if isinstance(mm_entry, list) and mm_entry[0] == mind_map_id:
-                    # Based on debug output: item[1][2][2] contains [seconds, micros]
-                    try:
-                        timestamp = mm_entry[1][2][2]
-                    except (IndexError, TypeError):
-                        pass
-                    break
+        timestamp = self._find_mind_map_timestamp(list_result, mind_map_id)
 
         # 2. Step 1: UUID-based deletion (AH0mwd)
         params_v2 = [notebook_id, None, [mind_map_id], [2]]
@@ -2299,6 +2406,22 @@ class NotebookLMClient:
 
         return True
 
+    @staticmethod
+    def _find_mind_map_timestamp(list_result: Any, mind_map_id: str) -> list | None:
+        """Find a mind map's [seconds, micros] timestamp in a cFji9 (list) result."""
+        timestamp = None
+        if list_result and isinstance(list_result, list) and len(list_result) > 0:
+            mm_list = list_result[0] if isinstance(list_result[0], list) else []
+            for mm_entry in mm_list:
+                if isinstance(mm_entry, list) and mm_entry[0] == mind_map_id:
+                    # Based on debug output: item[1][2][2] contains [seconds, micros]
+                    try:
+                        timestamp = mm_entry[1][2][2]
+                    except (IndexError, TypeError):
+                        pass
+                    break
+        return timestamp
+
     def create_infographic(
         self,
         notebook_id: str,
@@ -2310,8 +2433,29 @@ class NotebookLMClient:
     ) -> dict | None:
         """Create an Infographic from notebook sources.
     """
-        client = self._get_client()
+        params = self._infographic_params(
+            notebook_id, source_ids, orientation_code, detail_level_code, language, focus_prompt
+        )
+        result = self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "infographic",
+            orientation=constants.INFOGRAPHIC_ORIENTATIONS.get_name(orientation_code),
+            detail_level=constants.INFOGRAPHIC_DETAILS.get_name(detail_level_code),
+            language=language,
+        )
 
+    def _infographic_params(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        orientation_code: int,
+        detail_level_code: int,
+        language: str,
+        focus_prompt: str,
+    ) -> list:
+        """Build the R7cb6c params for an Infographic."""
         # Build source IDs in the nested format: [[[id1]], [[id2]], ...]
         sources_nested = [[[sid]] for sid in source_ids]
 
@@ -2327,38 +2471,12 @@ class NotebookLMClient:
             infographic_options  # position 14
         ]
 
-        params = [
+        return [
             [2],
             notebook_id,
             content
         ]
 
-        body = self._build_request_body(self.RPC_CREATE_STUDIO, params)
-        url = self._build_url(self.RPC_CREATE_STUDIO, f"/notebook/{notebook_id}")
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_CREATE_STUDIO)
-
-        if result and isinstance(result, list) and len(result) > 0:
-            artifact_data = result[0]
-            artifact_id = artifact_data[0] if isinstance(artifact_data, list) and len(artifact_data) > 0 else None
-            status_code = artifact_data[4] if isinstance(artifact_data, list) and len(artifact_data) > 4 else None
-
-            return {
-                "artifact_id": artifact_id,
-                "notebook_id": notebook_id,
-                "type": "infographic",
-                "status": "in_progress" if status_code == 1 else "completed" if status_code == 3 else "unknown",
-                "orientation": constants.INFOGRAPHIC_ORIENTATIONS.get_name(orientation_code),
-                "detail_level": constants.INFOGRAPHIC_DETAILS.get_name(detail_level_code),
-                "language": language,
-            }
-
-        return None
-
     def create_slide_deck(
         self,
         notebook_id: str,
@@ -2370,8 +2488,29 @@ class NotebookLMClient:
     ) -> dict | None:
         """Create a Slide Deck from notebook sources.
     """
-        client = self._get_client()
+        params = self._slide_deck_params(
+            notebook_id, source_ids, format_code, length_code, language, focus_prompt
+        )
+        result = self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "slide_deck",
+            format=constants.SLIDE_DECK_FORMATS.get_name(format_code),
+            length=constants.SLIDE_DECK_LENGTHS.get_name(length_code),
+            language=language,
+        )
 
+    def _slide_deck_params(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        format_code: int,
+        length_code: int,
+        language: str,
+        focus_prompt: str,
+    ) -> list:
+        """Build the R7cb6c params for a Slide Deck."""
         # Build source IDs in the nested format: [[[id1]], [[id2]], ...]
         sources_nested = [[[sid]] for sid in source_ids]
 
@@ -2386,38 +2525,12 @@ class NotebookLMClient:
             slide_deck_options  # position 16
         ]
 
-        params = [
+        return [
             [2],
             notebook_id,
             content
         ]
 
-        body = self._build_request_body(self.RPC_CREATE_STUDIO, params)
-        url = self._build_url(self.RPC_CREATE_STUDIO, f"/notebook/{notebook_id}")
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_CREATE_STUDIO)
-
-        if result and isinstance(result, list) and len(result) > 0:
-            artifact_data = result[0]
-            artifact_id = artifact_data[0] if isinstance(artifact_data, list) and len(artifact_data) > 0 else None
-            status_code = artifact_data[4] if isinstance(artifact_data, list) and len(artifact_data) > 4 else None
-
-            return {
-                "artifact_id": artifact_id,
-                "notebook_id": notebook_id,
-                "type": "slide_deck",
-                "status": "in_progress" if status_code == 1 else "completed" if status_code == 3 else "unknown",
-                "format": constants.SLIDE_DECK_FORMATS.get_name(format_code),
-                "length": constants.SLIDE_DECK_LENGTHS.get_name(length_code),
-                "language": language,
-            }
-
-        return None
-
     def create_report(
         self,
         notebook_id: str,
@@ -2428,8 +2541,25 @@ class NotebookLMClient:
     ) -> dict | None:
         """Create a Report from notebook sources.
     """
-        client = self._get_client()
+        params = self._report_params(notebook_id, source_ids, report_format, custom_prompt, language)
+        result = self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "report",
+            format=report_format,
+            language=language,
+        )
 
+    def _report_params(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        report_format: str,
+        custom_prompt: str,
+        language: str,
+    ) -> list:
+        """Build the R7cb6c params for a Report."""
         # Build source IDs in the nested format: [[[id1]], [[id2]], ...]
         sources_nested = [[[sid]] for sid in source_ids]
 
@@ -2504,37 +2634,12 @@ class NotebookLMClient:
             report_options
         ]
 
-        params = [
+        return [
             [2],
             notebook_id,
             content
         ]
 
-        body = self._build_request_body(self.RPC_CREATE_STUDIO, params)
-        url = self._build_url(self.RPC_CREATE_STUDIO, f"/notebook/{notebook_id}")
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_CREATE_STUDIO)
-
-        if result and isinstance(result, list) and len(result) > 0:
-            artifact_data = result[0]
-            artifact_id = artifact_data[0] if isinstance(artifact_data, list) and len(artifact_data) > 0 else None
-            status_code = artifact_data[4] if isinstance(artifact_data, list) and len(artifact_data) > 4 else None
-
-            return {
-                "artifact_id": artifact_id,
-                "notebook_id": notebook_id,
-                "type": "report",
-                "status": "in_progress" if status_code == 1 else "completed" if status_code == 3 else "unknown",
-                "format": report_format,
-                "language": language,
-            }
-
-        return None
-
     def create_flashcards(
         self,
         notebook_id: str,
@@ -2543,8 +2648,22 @@ class NotebookLMClient:
     ) -> dict | None:
         """Create Flashcards from notebook sources.
     """
-        client = self._get_client()
+        params = self._flashcards_params(notebook_id, source_ids, difficulty_code)
+        result = self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "flashcards",
+            difficulty=constants.FLASHCARD_DIFFICULTIES.get_name(difficulty_code),
+        )
 
+    def _flashcards_params(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        difficulty_code: int,
+    ) -> list:
+        """Build the R7cb6c params for Flashcards."""
         # Build source IDs in the nested format: [[[id1]], [[id2]], ...]
         sources_nested = [[[sid]] for sid in source_ids]
 
@@ -2569,36 +2688,12 @@ class NotebookLMClient:
             flashcard_options  # position 9
         ]
 
-        params = [
+        return [
             [2],
             notebook_id,
             content
         ]
 
-        body = self._build_request_body(self.RPC_CREATE_STUDIO, params)
-        url = self._build_url(self.RPC_CREATE_STUDIO, f"/notebook/{notebook_id}")
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_CREATE_STUDIO)
-
-        if result and isinstance(result, list) and len(result) > 0:
-            artifact_data = result[0]
-            artifact_id = artifact_data[0] if isinstance(artifact_data, list) and len(artifact_data) > 0 else None
-            status_code = artifact_data[4] if isinstance(artifact_data, list) and len(artifact_data) > 4 else None
-
-            return {
-                "artifact_id": artifact_id,
-                "notebook_id": notebook_id,
-                "type": "flashcards",
-                "status": "in_progress" if status_code == 1 else "completed" if status_code == 3 else "unknown",
-                "difficulty": constants.FLASHCARD_DIFFICULTIES.get_name(difficulty_code),
-            }
-
-        return None
-
     def create_quiz(
         self,
         notebook_id: str,
@@ -2614,7 +2709,24 @@ class NotebookLMClient:
             question_count: Number of questions (default: 2)
             difficulty: Difficulty level (default: 2)
         """
-        client = self._get_client()
+        params = self._quiz_params(notebook_id, source_ids, question_count, difficulty)
+        result = self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "quiz",
+            question_count=question_count,
+            difficulty=constants.FLASHCARD_DIFFICULTIES.get_name(difficulty),
+        )
+
+    def _quiz_params(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        question_count: int,
+        difficulty: int,
+    ) -> list:
+        """Build the R7cb6c params for a Quiz."""
         sources_nested = [[[sid]] for sid in source_ids]
 
         # Quiz options at position 9: [null, [2, null*6, [question_count, difficulty]]]
@@ -2635,32 +2747,7 @@ class NotebookLMClient:
             quiz_options  # position 9
         ]
 
-        params = [[2], notebook_id, content]
-
-        body = self._build_request_body(self.RPC_CREATE_STUDIO, params)
-        url = self._build_url(self.RPC_CREATE_STUDIO, f"/notebook/{notebook_id}")
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_CREATE_STUDIO)
-
-        if result and isinstance(result, list) and len(result) > 0:
-            artifact_data = result[0]
-            artifact_id = artifact_data[0] if isinstance(artifact_data, list) and len(artifact_data) > 0 else None
-            status_code = artifact_data[4] if isinstance(artifact_data, list) and len(artifact_data) > 4 else None
-
-            return {
-                "artifact_id": artifact_id,
-                "notebook_id": notebook_id,
-                "type": "quiz",
-                "status": "in_progress" if status_code == 1 else "completed" if status_code == 3 else "unknown",
-                "question_count": question_count,
-                "difficulty": constants.FLASHCARD_DIFFICULTIES.get_name(difficulty),
-            }
-
-        return None
+        return [[2], notebook_id, content]
 
     def create_data_table(
         self,
@@ -2677,7 +2764,23 @@ class NotebookLMClient:
             description: Description of the data table to create
             language: Language code (default: "en")
         """
-        client = self._get_client()
+        params = self._data_table_params(notebook_id, source_ids, description, language)
+        result = self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "data_table",
+            description=description,
+        )
+
+    def _data_table_params(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        description: str,
+        language: str,
+    ) -> list:
+        """Build the R7cb6c params for a Data Table."""
         sources_nested = [[[sid]] for sid in source_ids]
 
         # Data Table options at position 18: [null, [description, language]]
@@ -2691,31 +2794,7 @@ class NotebookLMClient:
             datatable_options  # position 18
         ]
 
-        params = [[2], notebook_id, content]
-
-        body = self._build_request_body(self.RPC_CREATE_STUDIO, params)
-        url = self._build_url(self.RPC_CREATE_STUDIO, f"/notebook/{notebook_id}")
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_CREATE_STUDIO)
-
-        if result and isinstance(result, list) and len(result) > 0:
-            artifact_data = result[0]
-            artifact_id = artifact_data[0] if isinstance(artifact_data, list) and len(artifact_data) > 0 else None
-            status_code = artifact_data[4] if isinstance(artifact_data, list) and len(artifact_data) > 4 else None
-
-            return {
-                "artifact_id": artifact_id,
-                "notebook_id": notebook_id,
-                "type": "data_table",
-                "status": "in_progress" if status_code == 1 else "completed" if status_code == 3 else "unknown",
-                "description": description,
-            }
-
-        return None
+        return [[2], notebook_id, content]
 
     def generate_mind_map(
         self,
@@ -2732,12 +2811,17 @@ class NotebookLMClient:
         Returns:
             Dict with mind_map_json and generation_id, or None on failure
         """
-        client = self._get_client()
+        params = self._generate_mind_map_params(source_ids)
+        result = self._call_rpc(self.RPC_GENERATE_MIND_MAP, params)
+        return self._parse_generated_mind_map(result, source_ids)
 
+    @staticmethod
+    def _generate_mind_map_params(source_ids: list[str]) -> list:
+        """Build the yyryJe (generate mind map) params."""
         # Build source IDs in the nested format: [[[id1]], [[id2]], ...]
         sources_nested = [[[sid]] for sid in source_ids]
 
-        params = [
+        return [
             sources_nested,
             None, None, None, None,
             ["interactive_mindmap", [["[CONTEXT]", ""]], ""],
@@ -2745,15 +2829,9 @@ class NotebookLMClient:
             [2, None, [1]]
         ]
 
-        body = self._build_request_body(self.RPC_GENERATE_MIND_MAP, params)
-        url = self._build_url(self.RPC_GENERATE_MIND_MAP)
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_GENERATE_MIND_MAP)
-
+    @staticmethod
+    def _parse_generated_mind_map(result: Any, source_ids: list[str]) -> dict | None:
+        """Decode the yyryJe (generate mind map) result."""
         if result and isinstance(result, list) and len(result) > 0:
             # Response is nested: [[json_string, null, [gen_ids]]]
             # So result[0] is [json_string, null, [gen_ids]]
@@ -2795,14 +2873,19 @@ class NotebookLMClient:
         Returns:
             Dict with mind_map_id and saved info, or None on failure
         """
-        client = self._get_client()
+        params = self._save_mind_map_params(notebook_id, mind_map_json, source_ids, title)
+        result = self._call_rpc(self.RPC_SAVE_MIND_MAP, params, f"/notebook/{notebook_id}")
+        return self._parse_saved_mind_map(result, notebook_id, title)
 
+    @staticmethod
+    def _save_mind_map_params(notebook_id: str, mind_map_json: str, source_ids: list[str], title: str) -> list:
+        """Build the CYK0Xb (save mind map) params."""
         # Build source IDs in the simpler format: [[id1], [id2], ...]
         sources_simple = [[sid] for sid in source_ids]
 
         metadata = [2, None, None, 5, sources_simple]
 
-        params = [
+        return [
             notebook_id,
             mind_map_json,
             metadata,
@@ -2810,15 +2893,9 @@ class NotebookLMClient:
             title
         ]
 
-        body = self._build_request_body(self.RPC_SAVE_MIND_MAP, params)
-        url = self._build_url(self.RPC_SAVE_MIND_MAP, f"/notebook/{notebook_id}")
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_SAVE_MIND_MAP)
-
+    @staticmethod
+    def _parse_saved_mind_map(result: Any, notebook_id: str, title: str) -> dict | None:
+        """Decode the CYK0Xb (save mind map) result."""
         if result and isinstance(result, list) and len(result) > 0:
             # Response is nested: [[mind_map_id, json, metadata, null, title]]
             inner = result[0] if isinstance(result[0], list) else result
@@ -2839,19 +2916,12 @@ class NotebookLMClient:
     def list_mind_maps(self, notebook_id: str) -> list[dict]:
         """List all Mind Maps in a notebook.
     """
-        client = self._get_client()
-
-        params = [notebook_id]
-
-        body = self._build_request_body(self.RPC_LIST_MIND_MAPS, params)
-        url = self._build_url(self.RPC_LIST_MIND_MAPS, f"/notebook/{notebook_id}")
-
-        response = client.post(url, content=body)
-        response.raise_for_status()
-
-        parsed = self._parse_response(response.text)
-        result = self._extract_rpc_result(parsed, self.RPC_LIST_MIND_MAPS)
+        result = self._call_rpc(self.RPC_LIST_MIND_MAPS, [notebook_id], f"/notebook/{notebook_id}")
+        return self._parse_mind_map_list(result)
 
+    @staticmethod
+    def _parse_mind_map_list(result: Any) -> list[dict]:
+        """Decode the cFji9 (list mind maps) result, skipping deleted entries."""
         mind_maps = []
         if result and isinstance(result, list) and len(result) > 0:
             mind_map_list = result[0] if isinstance(result[0], list) else []
@@ -2891,10 +2961,15 @@ class NotebookLMClient:
 
 
     def close(self) -> None:
-        """Close the HTTP client."""
+        """Close the HTTP clients, the fulltext cache and the conversation store."""
+        self._fulltext_cache.close()
+        self._conversations.close()
         if self._client:
             self._client.close()
             self._client = None
+        if self._long_running_client:
+            self._long_running_client.close()
+            self._long_running_client = None
 
 
 def extract_cookies_from_chrome_export(cookie_header: str) -> dict[str, str]:
@@ -0,0 +1,971 @@
+"""Asyncio NotebookLM client (notebooklm.google.com).
+
+Same method surface as NotebookLMClient, but every network call is a coroutine
+on a shared httpx.AsyncClient, so many in-flight RPCs can share one event loop
+instead of holding one worker thread each. Request building and response
+parsing are inherited from NotebookLMClient; only the I/O is redefined here.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+
+from . import constants
+from .answer_cache import AnswerCache, QueryIndex
+from .batching import RpcCoalescer
+from .circuit import BATCHEXECUTE, QUERY, CircuitBreaker
+from .conversations import ConversationBackend, HistoryPolicy
+from .deadline import clamp_timeout
+from .framing import FrameDecoder
+from .fulltext_cache import FulltextCache
+from .hedging import Hedger
+from .notebook_cache import CachedNotebook, NotebookCache, NotebookListCache, NotebookListSnapshot
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .singleflight import AsyncSingleFlight, rpc_key
+from .summary_cache import NOTEBOOK_SUMMARY, SOURCE_GUIDE, SummaryCache
+from .api_client import (
+    MAX_RPC_BATCH_SIZE,
+    SOURCE_ADD_TIMEOUT,
+    AuthenticationError,
+    Notebook,
+    NotebookLMClient,
+    QueryStreamState,
+    RPC_NAMES,
+    logger,
+)
+from .transport import TransportConfig
+
+
+class AsyncNotebookLMClient(NotebookLMClient):
+    """Asyncio client for NotebookLM MCP internal API."""
+
+    # Token extraction needs the event loop, so it runs on the first RPC instead
+    _REFRESH_AUTH_ON_INIT = False
+
+    def __init__(
+        self,
+        cookies: dict[str, str],
+        csrf_token: str = "",
+        session_id: str = "",
+        coalesce_rpcs: bool = False,
+        transport: TransportConfig | None = None,
+        long_running_transport: TransportConfig | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hedger: Hedger | None = None,
+        notebook_cache: NotebookCache | None = None,
+        fulltext_cache: FulltextCache | None = None,
+        summary_cache: SummaryCache | None = None,
+        notebook_list_cache: NotebookListCache | None = None,
+        answer_cache: AnswerCache | None = None,
+        query_index: QueryIndex | None = None,
+        conversation_store: ConversationBackend | None = None,
+        history_policy: HistoryPolicy | None = None,
+        restore_conversations: bool = False,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            cookies: Dict of Google auth cookies (SID, SSID, HSID, APISID, SAPISID, etc.)
+            csrf_token: CSRF token (optional - auto-extracted on the first RPC if not provided)
+            session_id: Session ID (optional - auto-extracted on the first RPC if not provided)
+            coalesce_rpcs: Merge concurrent RPCs on the same source path into one
+                batchexecute POST
+            transport: Connection pool / HTTP/2 settings for short RPCs
+                (default: TransportConfig.from_env())
+            long_running_transport: Settings for queries, source adds and imports
+                (default: TransportConfig.long_running_from_env())
+            rate_limiter: Per-account rate/concurrency limiter; pass the same one to
+                every client of an account (default: a new RateLimiter.from_env())
+            retry_policy: Backoff and retry budget for transient failures
+                (default: RetryPolicy.from_env())
+            circuit_breaker: Fails calls fast while their endpoint keeps failing
+                (default: a new CircuitBreaker.from_env())
+            hedger: Sends a duplicate of slow read RPCs, within a hedge budget;
+                share it across clients (default: Hedger.from_env(), off unless
+                NOTEBOOKLM_HEDGE=1)
+            notebook_cache: Short-lived cache of get_notebook results
+                (default: a new NotebookCache.from_env())
+            fulltext_cache: On-disk cache of source full text
+                (default: FulltextCache.from_env(), under ~/.notebooklm-mcp/)
+            summary_cache: Cache of source guides and notebook summaries; share it
+                across clients (default: a new SummaryCache.from_env())
+            notebook_list_cache: Stale-while-revalidate list_notebooks snapshot
+                (default: a new NotebookListCache.from_env())
+            answer_cache: First-turn answers reused by query(use_cache=True)
+                (default: a new AnswerCache.from_env())
+            query_index: Near-duplicate question index used by query(match_similar=True)
+                (default: a new QueryIndex.from_env())
+            conversation_store: Bounded store of conversation turns for follow-ups
+                (default: conversation_store_from_env(), SQLite shared by every process)
+            history_policy: Which earlier turns follow-ups send, unless a query passes
+                its own (default: HistoryPolicy.from_env(), all of them)
+            restore_conversations: Fetch the server's history (hPTbtc) for a follow-up
+                whose conversation the store does not hold (default: False; the
+                response layout is unverified)
+        """
+        super().__init__(
+            cookies,
+            csrf_token=csrf_token,
+            session_id=session_id,
+            transport=transport,
+            long_running_transport=long_running_transport,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            notebook_cache=notebook_cache,
+            fulltext_cache=fulltext_cache,
+            summary_cache=summary_cache,
+            notebook_list_cache=notebook_list_cache,
+            answer_cache=answer_cache,
+            query_index=query_index,
+            conversation_store=conversation_store,
+            history_policy=history_policy,
+            restore_conversations=restore_conversations,
+        )
+        self._client: httpx.AsyncClient | None = None
+        self._long_running_client: httpx.AsyncClient | None = None
+        self._hedger = hedger or Hedger.from_env(labels=RPC_NAMES)
+        self._single_flight = AsyncSingleFlight()
+        # Strong references to fire-and-forget tasks (notebook list refresh)
+        self._background_tasks: set[asyncio.Task] = set()
+        self._coalescer = (
+            RpcCoalescer(self._post_rpc_batch, MAX_RPC_BATCH_SIZE) if coalesce_rpcs else None
+        )
+
+    async def __aenter__(self) -> "AsyncNotebookLMClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    # =========================================================================
+    # Transport
+    # =========================================================================
+
+    async def _refresh_auth_tokens(self) -> None:
+        """
+        Refresh CSRF token and session ID by fetching the NotebookLM homepage.
+
+        Raises:
+            ValueError: If cookies are expired (redirected to login) or tokens not found
+        """
+        client = self._get_client()
+        response = await client.send(self._build_page_request(client), follow_redirects=True)
+        self._apply_page_tokens(response)
+
+    async def _ensure_auth_tokens(self) -> None:
+        """Fetch CSRF/session tokens if the client was created without them."""
+        if not self.csrf_token:
+            await self._refresh_auth_tokens()
+
+    def _get_client(self, long_running: bool = False) -> httpx.AsyncClient:
+        """Get or create the HTTP client for the short or long-running lane."""
+        if long_running:
+            if self._long_running_client is None:
+                self._long_running_client = httpx.AsyncClient(
+                    headers=self._rpc_headers(), **self._long_running_transport.client_kwargs()
+                )
+            return self._long_running_client
+        if self._client is None:
+            self._client = httpx.AsyncClient(headers=self._rpc_headers(), **self._transport.client_kwargs())
+        return self._client
+
+    async def _call_rpc(
+        self,
+        rpc_id: str,
+        params: Any,
+        path: str = "/",
+        timeout: float | None = None,
+    ) -> Any:
+        """Execute an RPC call and return the extracted result.
+
+        Uses the same three-layer auth recovery as NotebookLMClient._call_rpc.
+        Identical concurrent reads share one request. With coalesce_rpcs
+        enabled, short calls without a custom timeout that are issued
+        concurrently on the same source path share one POST.
+        """
+        if rpc_id in self.IDEMPOTENT_RPCS:
+            return await self._single_flight.do(
+                rpc_key(rpc_id, params, path, timeout),
+                lambda: self._send_rpc(rpc_id, params, path, timeout),
+            )
+        return await self._send_rpc(rpc_id, params, path, timeout)
+
+    async def _send_rpc(self, rpc_id: str, params: Any, path: str, timeout: float | None) -> Any:
+        if self._coalescer is not None and timeout is None and rpc_id not in self.LONG_RUNNING_RPCS:
+            return await self._coalescer.call(rpc_id, params, path)
+        return (await self._post_rpc_batch([(rpc_id, params)], path, timeout))[0]
+
+    async def _call_rpc_batch(
+        self,
+        calls: list[tuple[str, Any]],
+        path: str = "/",
+        timeout: float | None = None,
+    ) -> list[Any]:
+        """Execute several RPCs sharing a source path and return their results in order.
+
+        Batches larger than MAX_RPC_BATCH_SIZE are split into concurrent POSTs.
+        """
+        chunks = await asyncio.gather(*(
+            self._post_rpc_batch(calls[start:start + MAX_RPC_BATCH_SIZE], path, timeout)
+            for start in range(0, len(calls), MAX_RPC_BATCH_SIZE)
+        ))
+        return [result for chunk in chunks for result in chunk]
+
+    async def _post_rpc_batch(
+        self,
+        calls: list[tuple[str, Any]],
+        path: str = "/",
+        timeout: float | None = None,
+    ) -> list[Any]:
+        """Send one batchexecute POST, retrying transient failures per the retry policy."""
+        idempotent = self._is_idempotent(calls)
+        retry = self._retry_policy.start(idempotent)
+        while True:
+            try:
+                # An open circuit raises CircuitOpenError here, which is never retried
+                with self._circuit_breaker.guard([rpc_id for rpc_id, _ in calls], BATCHEXECUTE):
+                    if idempotent and self._hedger.enabled:
+                        return await self._send_hedged(calls, path, timeout)
+                    return await self._send_rpc_batch(calls, path, timeout)
+            except (httpx.HTTPError, AuthenticationError) as e:
+                delay = retry.next_delay(e)
+                if delay is None:
+                    raise
+                self._log_rpc_retry(calls, e, retry.attempts, delay)
+                await asyncio.sleep(delay)
+
+    async def _send_hedged(
+        self,
+        calls: list[tuple[str, Any]],
+        path: str = "/",
+        timeout: float | None = None,
+    ) -> list[Any]:
+        """Send a read batch, plus one duplicate if it outlasts the RPC's p95 latency.
+
+        The first successful response wins and the other request is cancelled.
+        """
+        rpc_ids = [rpc_id for rpc_id, _ in calls]
+        delay = self._hedger.delay(rpc_ids)
+        primary = asyncio.ensure_future(self._send_rpc_batch(calls, path, timeout))
+        started = {primary: time.monotonic()}
+        pending = {primary}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Still waiting after the hedge delay - duplicate once, budget permitting
+                    delay = None
+                    if self._hedger.try_spend(rpc_ids):
+                        hedge = asyncio.ensure_future(self._send_rpc_batch(calls, path, timeout))
+                        started[hedge] = time.monotonic()
+                        pending.add(hedge)
+                    continue
+                for task in done:
+                    if task.exception() is None:
+                        latency = time.monotonic() - started[task]
+                        self._hedger.record(rpc_ids, latency, hedge_won=task is not primary)
+                        return task.result()
+                    error = error or task.exception()
+                # A failed primary is not hedged; the retry loop decides
+                delay = None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def hedge_stats(self) -> dict[str, Any]:
+        """Hedge delays, hedges sent and hedges that won per read RPC."""
+        return self._hedger.stats()
+
+    async def _send_rpc_batch(
+        self,
+        calls: list[tuple[str, Any]],
+        path: str = "/",
+        timeout: float | None = None,
+        _retry: bool = False,
+        _deep_retry: bool = False,
+    ) -> list[Any]:
+        """Send one batchexecute POST (with auth recovery) and split its results."""
+        await self._ensure_auth_tokens()
+
+        long_running = self._is_long_running(calls)
+        client = self._get_client(long_running)
+        rpc_ids = self._batch_rpc_ids(calls)
+        body = self._build_batch_request_body(calls)
+        url = self._build_url(rpc_ids, path)
+        self._log_rpc_request(rpc_ids, url, body)
+
+        try:
+            async with self._rate_limiter.aslot([rpc_id for rpc_id, _ in calls], self._lane(long_running)):
+                timeout = self._request_timeout(timeout, long_running)
+                if timeout:
+                    response = await client.post(url, content=body, timeout=timeout)
+                else:
+                    response = await client.post(url, content=body)
+
+                self._log_rpc_response(response)
+                response.raise_for_status()
+
+            parsed = self._parse_response(response.content)
+            results = self._extract_batch_results(parsed, calls)
+            for result in results:
+                self._log_rpc_result(result)
+            return results
+
+        except (httpx.HTTPStatusError, AuthenticationError) as e:
+            if not self._is_auth_failure(e):
+                raise
+
+            # Layer 1: Refresh CSRF/session tokens (first retry only)
+            if not _retry:
+                try:
+                    await self._refresh_auth_tokens()
+                    self._refresh_client_headers()
+                    return await self._send_rpc_batch(calls, path, timeout, _retry=True)
+                except ValueError:
+                    # CSRF refresh failed (cookies expired) - continue to layer 2
+                    pass
+
+            # Layer 2 & 3: Reload from disk or run headless auth (deep retry)
+            if not _deep_retry:
+                if await self._try_reload_or_headless_auth():
+                    self._refresh_client_headers()
+                    return await self._send_rpc_batch(calls, path, timeout, _retry=True, _deep_retry=True)
+
+            raise AuthenticationError(
+                "Authentication expired. Run 'notebooklm-mcp-auth' in your terminal to re-authenticate."
+            )
+
+    async def _try_reload_or_headless_auth(self) -> bool:
+        """Reload tokens from disk or run headless auth, off the event loop.
+
+        Headless auth drives Chrome and can take many seconds, so it runs in a
+        worker thread. Returns True if new valid tokens were obtained.
+        """
+        return await asyncio.to_thread(super()._try_reload_or_headless_auth)
+
+    async def close(self) -> None:
+        """Close the HTTP clients, the fulltext cache and the conversation store."""
+        self._fulltext_cache.close()
+        self._conversations.close()
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+        if self._long_running_client:
+            await self._long_running_client.aclose()
+            self._long_running_client = None
+
+    # =========================================================================
+    # Notebook Operations
+    # =========================================================================
+
+    async def list_notebooks(self) -> list[Notebook]:
+        """List all notebooks (possibly a stale snapshot, see notebook_list_snapshot)."""
+        return (await self.notebook_list_snapshot()).notebooks
+
+    async def notebook_list_snapshot(self) -> NotebookListSnapshot:
+        """Notebook list, served stale-while-revalidate (see notebook_cache.py).
+
+        A stale snapshot is returned at once and refreshed in a background task.
+        """
+        snapshot = self._notebook_list_cache.get()
+        if snapshot is None:
+            return await self._fetch_notebook_list()
+        if not snapshot.fresh and self._notebook_list_cache.start_refresh():
+            task = asyncio.create_task(self._refresh_notebook_list())
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        return snapshot
+
+    async def _refresh_notebook_list(self) -> None:
+        try:
+            await self._fetch_notebook_list()
+        except Exception as e:
+            logger.info(f"Background notebook list refresh failed: {e}")
+        finally:
+            self._notebook_list_cache.end_refresh()
+
+    async def _fetch_notebook_list(self) -> NotebookListSnapshot:
+        """Fetch the notebook list and store it as the current snapshot."""
+        epoch = self._notebook_list_cache.epoch()
+        # [null, 1, null, [2]] - params for list notebooks
+        result = await self._call_rpc(self.RPC_LIST_NOTEBOOKS, [None, 1, None, [2]])
+        return self._notebook_list_cache.put(self._parse_notebook_list(result), epoch)
+
+    async def get_notebook(self, notebook_id: str) -> dict | None:
+        """Get notebook details (briefly cached, see notebook_cache.py)."""
+        return (await self._cached_notebook(notebook_id)).result
+
+    async def _cached_notebook(self, notebook_id: str) -> CachedNotebook:
+        """Notebook structure from the cache, fetching it on a miss."""
+        entry = self._notebook_cache.get(notebook_id)
+        if entry is None:
+            epoch = self._notebook_cache.epoch()
+            result = await self._call_rpc(
+                self.RPC_GET_NOTEBOOK,
+                [notebook_id, None, [2], None, 0],
+                f"/notebook/{notebook_id}",
+            )
+            entry = self._notebook_cache.put(notebook_id, result, epoch)
+        return entry
+
+    async def get_notebook_summary(self, notebook_id: str) -> dict[str, Any]:
+        """Get AI-generated summary and suggested topics (cached, see summary_cache.py)."""
+        fingerprint = (await self._cached_notebook(notebook_id)).fingerprint
+        cached = self._summary_cache.get(NOTEBOOK_SUMMARY, notebook_id, fingerprint)
+        if cached is not None:
+            return cached
+        result = await self._call_rpc(
+            self.RPC_GET_SUMMARY, [notebook_id, [2]], f"/notebook/{notebook_id}"
+        )
+        summary = self._parse_notebook_summary(result)
+        if fingerprint is not None:
+            self._summary_cache.put(NOTEBOOK_SUMMARY, notebook_id, fingerprint, summary)
+        return summary
+
+    async def get_source_guide(self, source_id: str) -> dict[str, Any]:
+        """Get AI-generated summary and keywords for a source (cached, see summary_cache.py)."""
+        version = self._notebook_cache.source_version(source_id)
+        cached = self._summary_cache.get(SOURCE_GUIDE, source_id, version)
+        if cached is not None:
+            return cached
+        result = await self._call_rpc(self.RPC_GET_SOURCE_GUIDE, [[[[source_id]]]], "/")
+        guide = self._parse_source_guide(result)
+        self._summary_cache.put(SOURCE_GUIDE, source_id, version, guide)
+        return guide
+
+    async def get_source_fulltext(self, source_id: str) -> dict[str, Any]:
+        """Get the full text content of a source (kept on disk, see fulltext_cache.py)."""
+        # SQLite and zlib work on megabytes of text; keep it off the event loop
+        version = await self._source_version(source_id)
+        cached = await asyncio.to_thread(self._fulltext_cache.get, source_id, version)
+        if cached is not None:
+            return cached
+        result = await self._call_rpc(self.RPC_GET_SOURCE, [[source_id], [2], [2]], "/")
+        content = self._parse_source_fulltext(result)
+        await asyncio.to_thread(self._fulltext_cache.put, source_id, content, version)
+        return content
+
+    async def _source_version(self, source_id: str) -> str | None:
+        """Fingerprint of a source's metadata, refetching the notebook that lists it if needed."""
+        version = self._notebook_cache.source_version(source_id)
+        notebook_id = self._notebook_cache.source_owner(source_id)
+        if version is None and notebook_id is not None:
+            try:
+                version = (await self._cached_notebook(notebook_id)).source_version(source_id)
+            except Exception as e:
+                logger.info(f"Could not revalidate source {source_id}: {e}")
+        return version
+
+    async def create_notebook(self, title: str = "") -> Notebook | None:
+        """Create a new notebook."""
+        params = [title, None, None, [2], [1, None, None, None, None, None, None, None, None, None, [1]]]
+        with self._invalidates():
+            result = await self._call_rpc(self.RPC_CREATE_NOTEBOOK, params)
+        return self._parse_created_notebook(result, title)
+
+    async def rename_notebook(self, notebook_id: str, new_title: str) -> bool:
+        """Rename a notebook."""
+        params = [notebook_id, [[None, None, None, [None, new_title]]]]
+        with self._invalidates(notebook_id):
+            result = await self._call_rpc(self.RPC_RENAME_NOTEBOOK, params, f"/notebook/{notebook_id}")
+        return result is not None
+
+    async def configure_chat(
+        self,
+        notebook_id: str,
+        goal: str = "default",
+        custom_prompt: str | None = None,
+        response_length: str = "default",
+    ) -> dict[str, Any]:
+        """Configure chat goal/style and response length for a notebook."""
+        params = self._chat_settings_params(notebook_id, goal, custom_prompt, response_length)
+        with self._invalidates(notebook_id):
+            result = await self._call_rpc(self.RPC_RENAME_NOTEBOOK, params, f"/notebook/{notebook_id}")
+        return self._parse_chat_settings(result, notebook_id, goal, custom_prompt, response_length)
+
+    async def delete_notebook(self, notebook_id: str) -> bool:
+        """Delete a notebook permanently. IRREVERSIBLE."""
+        with self._invalidates(notebook_id):
+            result = await self._call_rpc(self.RPC_DELETE_NOTEBOOK, [[notebook_id], [2]])
+        return result is not None
+
+    # =========================================================================
+    # Source Operations
+    # =========================================================================
+
+    async def check_source_freshness(self, source_id: str) -> bool | None:
+        """Check if a Drive source is fresh (up-to-date with Google Drive)."""
+        result = await self._call_rpc(self.RPC_CHECK_FRESHNESS, [None, [source_id], [2]])
+        return self._parse_freshness(result)
+
+    async def check_sources_freshness(self, source_ids: list[str]) -> dict[str, bool | None]:
+        """Check freshness of several Drive sources in one batchexecute round trip."""
+        if not source_ids:
+            return {}
+        calls = [(self.RPC_CHECK_FRESHNESS, [None, [source_id], [2]]) for source_id in source_ids]
+        results = await self._call_rpc_batch(calls)
+        return {source_id: self._parse_freshness(result) for source_id, result in zip(source_ids, results)}
+
+    async def sync_drive_source(self, source_id: str) -> dict | None:
+        """Sync a Drive source with the latest content from Google Drive."""
+        with self._invalidates(source_id=source_id):
+            result = await self._call_rpc(self.RPC_SYNC_DRIVE, [None, [source_id], [2]])
+        return self._parse_synced_source(result)
+
+    async def delete_source(self, source_id: str) -> bool:
+        """Delete a source from a notebook permanently. IRREVERSIBLE."""
+        with self._invalidates(source_id=source_id):
+            result = await self._call_rpc(self.RPC_DELETE_SOURCE, [[[source_id]], [2]])
+        # Response is typically [] on success
+        return result is not None
+
+    async def get_notebook_sources_with_types(self, notebook_id: str) -> list[dict]:
+        """Get all sources from a notebook with their type information."""
+        return [source.to_dict() for source in (await self._cached_notebook(notebook_id)).sources]
+
+    async def add_url_source(self, notebook_id: str, url: str) -> dict | None:
+        """Add a URL (website or YouTube) as a source to a notebook."""
+        return await self._add_source(notebook_id, self._url_source_data(url), "Untitled")
+
+    async def add_text_source(self, notebook_id: str, text: str, title: str = "Pasted Text") -> dict | None:
+        """Add pasted text as a source to a notebook."""
+        return await self._add_source(notebook_id, self._text_source_data(text, title), title)
+
+    async def add_drive_source(
+        self,
+        notebook_id: str,
+        document_id: str,
+        title: str,
+        mime_type: str = "application/vnd.google-apps.document"
+    ) -> dict | None:
+        """Add a Google Drive document as a source to a notebook."""
+        return await self._add_source(notebook_id, self._drive_source_data(document_id, title, mime_type), title)
+
+    async def _add_source(self, notebook_id: str, source_data: list, default_title: str) -> dict | None:
+        """Send an izAoDd (add source) RPC with the extended source timeout."""
+        params = self._add_source_params(notebook_id, source_data)
+        try:
+            with self._invalidates(notebook_id):
+                result = await self._call_rpc(
+                    self.RPC_ADD_SOURCE, params, f"/notebook/{notebook_id}", timeout=SOURCE_ADD_TIMEOUT
+                )
+        except httpx.TimeoutException:
+            # Large files/pages may take longer than the timeout but still succeed on backend
+            return self._source_add_timeout_result()
+        return self._parse_added_source(result, default_title)
+
+    # =========================================================================
+    # Query
+    # =========================================================================
+
+    async def query(
+        self,
+        notebook_id: str,
+        query_text: str,
+        source_ids: list[str] | None = None,
+        conversation_id: str | None = None,
+        timeout: float = 120.0,
+        use_cache: bool = False,
+        match_similar: bool = False,
+        history: HistoryPolicy | None = None,
+    ) -> dict | None:
+        """Query the notebook with a question. See NotebookLMClient.query."""
+        result = None
+        async for update in self.query_stream(
+            notebook_id, query_text, source_ids, conversation_id, timeout,
+            use_cache=use_cache, match_similar=match_similar, history=history,
+        ):
+            if update["type"] == "done":
+                result = update["result"]
+        return result
+
+    async def query_stream(
+        self,
+        notebook_id: str,
+        query_text: str,
+        source_ids: list[str] | None = None,
+        conversation_id: str | None = None,
+        timeout: float = 120.0,
+        use_cache: bool = False,
+        match_similar: bool = False,
+        history: HistoryPolicy | None = None,
+    ) -> AsyncIterator[dict]:
+        """Query the notebook and yield answer updates as the response streams in.
+
+        See NotebookLMClient.query_stream for the update format.
+        """
+        # If no source_ids provided, get them from the notebook
+        notebook = None
+        if source_ids is None:
+            notebook = await self._cached_notebook(notebook_id)
+            source_ids = notebook.source_ids
+
+        scope, version = None, None
+        if (use_cache or match_similar) and conversation_id is None:
+            # The notebook structure (60 s cache), not the stale-while-revalidate list
+            version = (notebook or await self._cached_notebook(notebook_id)).fingerprint
+            scope = self._answer_scope(notebook_id, source_ids, version)
+            # A hit seeds a conversation in the store, which may be SQLite: keep it off the event loop
+            cached = await asyncio.to_thread(
+                self._reused_answer, scope, query_text, version, use_cache, match_similar
+            )
+            if cached is not None:
+                yield {"type": "answer", "text": cached["answer"]}
+                yield {"type": "done", "result": cached}
+                return
+
+        await self._ensure_auth_tokens()
+        client = self._get_client(long_running=True)
+
+        # The conversation store does file I/O (SQLite by default), so it runs in a thread
+        if (
+            self._restore_conversations
+            and conversation_id is not None
+            and not await asyncio.to_thread(self._conversations.get, conversation_id)
+        ):
+            await self._restore_conversation(notebook_id, conversation_id)
+
+        conversation_id, is_new_conversation, body, history_turns = await asyncio.to_thread(
+            self._build_query_body, query_text, source_ids, conversation_id, history
+        )
+        url = self._build_query_url()
+        # The answer is cut off at the tool call's deadline, if that comes first
+        timeout = clamp_timeout(timeout)
+
+        state = QueryStreamState(request_bytes=len(body), history_turns=history_turns)
+        decoder = FrameDecoder()
+        deadline = state.started_at + timeout
+        partial = False
+        try:
+            with self._circuit_breaker.guard([self.QUERY_RATE_KEY], QUERY):
+                async with self._rate_limiter.aslot([self.QUERY_RATE_KEY], "long"), \
+                        client.stream("POST", url, content=body, timeout=timeout) as response:
+                    response.raise_for_status()
+                    async for data in response.aiter_bytes():
+                        for update in self._feed_query_bytes(state, decoder, data):
+                            yield update
+                        if time.monotonic() >= deadline:
+                            partial = True
+                            break
+                    else:
+                        for update in self._query_updates(state, decoder.finish()):
+                            yield update
+        except httpx.TimeoutException:
+            # Keep what already arrived; only fail if there is nothing to return
+            if not state.best_text:
+                raise
+            partial = True
+
+        result = await asyncio.to_thread(
+            self._finish_streamed_query, state, conversation_id, query_text, is_new_conversation, partial
+        )
+        if scope is not None and not partial:
+            self._remember_answer(scope, query_text, result["answer"], version, use_cache, match_similar)
+        yield {"type": "done", "result": result}
+
+    async def _restore_conversation(self, notebook_id: str, conversation_id: str) -> int:
+        """Fill the local store with an unknown conversation's turns from the server (hPTbtc).
+
+        See NotebookLMClient._restore_conversation.
+        """
+        try:
+            result = await self._call_rpc(self.RPC_GET_CONVERSATIONS, [notebook_id], f"/notebook/{notebook_id}")
+        except Exception as e:
+            logger.info(f"Could not fetch server history of conversation {conversation_id}: {e}")
+            return 0
+        return await asyncio.to_thread(self._store_restored_turns, result, conversation_id)
+
+    # =========================================================================
+    # Research
+    # =========================================================================
+
+    async def start_research(
+        self,
+        notebook_id: str,
+        query: str,
+        source: str = "web",
+        mode: str = "fast",
+    ) -> dict | None:
+        """Start a research session to discover sources."""
+        rpc_id, params, source_lower, mode_lower = self._research_start_request(notebook_id, query, source, mode)
+        result = await self._call_rpc(rpc_id, params, f"/notebook/{notebook_id}")
+        return self._parse_research_start(result, notebook_id, query, source_lower, mode_lower)
+
+    async def poll_research(self, notebook_id: str, target_task_id: str | None = None) -> dict | None:
+        """Poll for research results."""
+        result = await self._call_rpc(
+            self.RPC_POLL_RESEARCH, [None, None, notebook_id], f"/notebook/{notebook_id}"
+        )
+        return self._parse_research_poll(result, target_task_id)
+
+    async def import_research_sources(
+        self,
+        notebook_id: str,
+        task_id: str,
+        sources: list[dict],
+    ) -> list[dict]:
+        """Import research sources into the notebook."""
+        if not sources:
+            return []
+
+        params = self._import_research_params(notebook_id, task_id, sources)
+        # Import can take a long time when fetching multiple web sources
+        with self._invalidates(notebook_id):
+            result = await self._call_rpc(
+                self.RPC_IMPORT_RESEARCH, params, f"/notebook/{notebook_id}", timeout=120.0
+            )
+        return self._parse_imported_sources(result)
+
+    # =========================================================================
+    # Studio
+    # =========================================================================
+
+    async def _post_studio_create(self, notebook_id: str, params: list) -> Any:
+        """Send an R7cb6c (create studio artifact) RPC and return its result."""
+        return await self._call_rpc(self.RPC_CREATE_STUDIO, params, f"/notebook/{notebook_id}")
+
+    async def create_audio_overview(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        format_code: int = 1,  # AUDIO_FORMAT_DEEP_DIVE
+        length_code: int = 2,  # AUDIO_LENGTH_DEFAULT
+        language: str = "en",
+        focus_prompt: str = "",
+    ) -> dict | None:
+        """Create an Audio Overview (podcast) for a notebook."""
+        params = self._audio_overview_params(
+            notebook_id, source_ids, format_code, length_code, language, focus_prompt
+        )
+        result = await self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "audio",
+            format=constants.AUDIO_FORMATS.get_name(format_code),
+            length=constants.AUDIO_LENGTHS.get_name(length_code),
+            language=language,
+        )
+
+    async def create_video_overview(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        format_code: int = 1,  # VIDEO_FORMAT_EXPLAINER
+        visual_style_code: int = 1,  # VIDEO_STYLE_AUTO_SELECT
+        language: str = "en",
+        focus_prompt: str = "",
+    ) -> dict | None:
+        """Create a Video Overview for a notebook."""
+        params = self._video_overview_params(
+            notebook_id, source_ids, format_code, visual_style_code, language, focus_prompt
+        )
+        result = await self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "video",
+            format=constants.VIDEO_FORMATS.get_name(format_code),
+            visual_style=constants.VIDEO_STYLES.get_name(visual_style_code),
+            language=language,
+        )
+
+    async def poll_studio_status(self, notebook_id: str) -> list[dict]:
+        """Poll for studio content (audio/video overviews) status."""
+        result = await self._call_rpc(
+            self.RPC_POLL_STUDIO, self._poll_studio_params(notebook_id), f"/notebook/{notebook_id}"
+        )
+        return self._parse_studio_artifacts(result)
+
+    async def poll_studio_with_mind_maps(self, notebook_id: str) -> tuple[list[dict], list[dict]]:
+        """Poll studio artifacts and list mind maps in one batchexecute round trip."""
+        artifacts_result, mind_maps_result = await self._call_rpc_batch(
+            self._studio_overview_calls(notebook_id), f"/notebook/{notebook_id}"
+        )
+        return self._parse_studio_artifacts(artifacts_result), self._parse_mind_map_list(mind_maps_result)
+
+    async def delete_studio_artifact(self, artifact_id: str, notebook_id: str | None = None) -> bool:
+        """Delete a studio artifact (Audio, Video, or Mind Map). IRREVERSIBLE."""
+        # 1. Try standard deletion (Audio, Video, etc.)
+        try:
+            result = await self._call_rpc(self.RPC_DELETE_STUDIO, [[2], artifact_id])
+            if result is not None:
+                return True
+        except Exception:
+            # Continue to fallback if standard delete fails
+            pass
+
+        # 2. Fallback: Mind maps require a different RPC (AH0mwd)
+        if notebook_id:
+            return await self.delete_mind_map(notebook_id, artifact_id)
+
+        return False
+
+    async def delete_mind_map(self, notebook_id: str, mind_map_id: str) -> bool:
+        """Delete a Mind Map artifact using the observed two-step RPC sequence."""
+        source_path = f"/notebook/{notebook_id}"
+        list_result = await self._call_rpc(self.RPC_LIST_MIND_MAPS, [notebook_id], source_path)
+        timestamp = self._find_mind_map_timestamp(list_result, mind_map_id)
+
+        # Step 1: UUID-based deletion (AH0mwd)
+        await self._call_rpc(self.RPC_DELETE_MIND_MAP, [notebook_id, None, [mind_map_id], [2]], source_path)
+
+        # Step 2: Timestamp-based sync/deletion (cFji9) to avoid "ghosts"
+        if timestamp:
+            await self._call_rpc(self.RPC_LIST_MIND_MAPS, [notebook_id, None, timestamp, [2]], source_path)
+
+        return True
+
+    async def create_infographic(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        orientation_code: int = 1,  # INFOGRAPHIC_ORIENTATION_LANDSCAPE
+        detail_level_code: int = 2,  # INFOGRAPHIC_DETAIL_STANDARD
+        language: str = "en",
+        focus_prompt: str = "",
+    ) -> dict | None:
+        """Create an Infographic from notebook sources."""
+        params = self._infographic_params(
+            notebook_id, source_ids, orientation_code, detail_level_code, language, focus_prompt
+        )
+        result = await self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "infographic",
+            orientation=constants.INFOGRAPHIC_ORIENTATIONS.get_name(orientation_code),
+            detail_level=constants.INFOGRAPHIC_DETAILS.get_name(detail_level_code),
+            language=language,
+        )
+
+    async def create_slide_deck(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        format_code: int = 1,  # SLIDE_DECK_FORMAT_DETAILED
+        length_code: int = 3,  # SLIDE_DECK_LENGTH_DEFAULT
+        language: str = "en",
+        focus_prompt: str = "",
+    ) -> dict | None:
+        """Create a Slide Deck from notebook sources."""
+        params = self._slide_deck_params(
+            notebook_id, source_ids, format_code, length_code, language, focus_prompt
+        )
+        result = await self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "slide_deck",
+            format=constants.SLIDE_DECK_FORMATS.get_name(format_code),
+            length=constants.SLIDE_DECK_LENGTHS.get_name(length_code),
+            language=language,
+        )
+
+    async def create_report(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        report_format: str = "Briefing Doc",
+        custom_prompt: str = "",
+        language: str = "en",
+    ) -> dict | None:
+        """Create a Report from notebook sources."""
+        params = self._report_params(notebook_id, source_ids, report_format, custom_prompt, language)
+        result = await self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "report",
+            format=report_format,
+            language=language,
+        )
+
+    async def create_flashcards(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        difficulty_code: int = 2,  # FLASHCARD_DIFFICULTY_MEDIUM
+    ) -> dict | None:
+        """Create Flashcards from notebook sources."""
+        params = self._flashcards_params(notebook_id, source_ids, difficulty_code)
+        result = await self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "flashcards",
+            difficulty=constants.FLASHCARD_DIFFICULTIES.get_name(difficulty_code),
+        )
+
+    async def create_quiz(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        question_count: int = 2,
+        difficulty: int = 2,
+    ) -> dict | None:
+        """Create Quiz from notebook sources."""
+        params = self._quiz_params(notebook_id, source_ids, question_count, difficulty)
+        result = await self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "quiz",
+            question_count=question_count,
+            difficulty=constants.FLASHCARD_DIFFICULTIES.get_name(difficulty),
+        )
+
+    async def create_data_table(
+        self,
+        notebook_id: str,
+        source_ids: list[str],
+        description: str,
+        language: str = "en",
+    ) -> dict | None:
+        """Create Data Table from notebook sources."""
+        params = self._data_table_params(notebook_id, source_ids, description, language)
+        result = await self._post_studio_create(notebook_id, params)
+        return self._parse_created_artifact(
+            result,
+            notebook_id,
+            "data_table",
+            description=description,
+        )
+
+    # =========================================================================
+    # Mind Maps
+    # =========================================================================
+
+    async def generate_mind_map(self, source_ids: list[str]) -> dict | None:
+        """Generate a Mind Map JSON from sources (step 1 of 2)."""
+        result = await self._call_rpc(self.RPC_GENERATE_MIND_MAP, self._generate_mind_map_params(source_ids))
+        return self._parse_generated_mind_map(result, source_ids)
+
+    async def save_mind_map(
+        self,
+        notebook_id: str,
+        mind_map_json: str,
+        source_ids: list[str],
+        title: str = "Mind Map",
+    ) -> dict | None:
+        """Save a generated Mind Map to a notebook (step 2 of 2)."""
+        params = self._save_mind_map_params(notebook_id, mind_map_json, source_ids, title)
+        result = await self._call_rpc(self.RPC_SAVE_MIND_MAP, params, f"/notebook/{notebook_id}")
+        return self._parse_saved_mind_map(result, notebook_id, title)
+
+    async def list_mind_maps(self, notebook_id: str) -> list[dict]:
+        """List all Mind Maps in a notebook."""
+        result = await self._call_rpc(self.RPC_LIST_MIND_MAPS, [notebook_id], f"/notebook/{notebook_id}")
+        return self._parse_mind_map_list(result)
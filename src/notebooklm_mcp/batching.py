@@ -0,0 +1,107 @@
+"""Coalescing of concurrent RPCs into shared batchexecute POSTs.
+
+batchexecute accepts several calls in one f.req. RpcCoalescer collects the
+RPCs submitted during one event-loop iteration (per source path), sends them
+as one batch, and resolves each caller's future with its own result.
+
+Callers may run under different tool-call deadlines (deadline.py). The
+batch is sent under the shortest of them, so it never holds a caller past
+its deadline. If it fails once that deadline has passed, the callers that
+still have time are sent again without the expired ones. Each caller waits
+for its result only until its own deadline (call()).
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from .deadline import DeadlineExceeded, current_deadline, use_deadline
+
+# send(calls, path) -> results in the same order as calls
+BatchSender = Callable[[list[tuple[str, Any]], str], Awaitable[list[Any]]]
+
+
+class RpcCoalescer:
+    """Merge RPCs submitted in the same event-loop tick into one POST per source path."""
+
+    def __init__(self, send: BatchSender, max_batch_size: int = 20):
+        self._send = send
+        self._max_batch_size = max_batch_size
+        # path -> [(rpc_id, params, future, caller's deadline)]
+        self._pending: dict[str, list[tuple[str, Any, asyncio.Future, tuple[float, float] | None]]] = {}
+        # Strong references so in-flight dispatch tasks are not garbage collected
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, rpc_id: str, params: Any, path: str = "/") -> asyncio.Future:
+        """Queue an RPC for the next flush and return a future for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self._pending.setdefault(path, [])
+        if not batch:
+            # First call for this path in this tick - flush once the loop has
+            # run every callback that is already ready (i.e. other submitters)
+            loop.call_soon(self._flush, path)
+        batch.append((rpc_id, params, future, current_deadline()))
+
+        if len(batch) >= self._max_batch_size:
+            self._flush(path)
+        return future
+
+    async def call(self, rpc_id: str, params: Any, path: str = "/") -> Any:
+        """Submit an RPC and wait for its result until the caller's own deadline."""
+        deadline = current_deadline()
+        future = self.submit(rpc_id, params, path)
+        if deadline is None:
+            return await future
+        try:
+            await asyncio.wait({future}, timeout=max(0.0, deadline[0] - time.monotonic()))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        if not future.done():
+            # Dropped from the batch if it is still queued; a late result is ignored
+            future.cancel()
+            raise DeadlineExceeded(deadline[1])
+        return future.result()
+
+    def _flush(self, path: str) -> None:
+        batch = self._pending.pop(path, None)
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._dispatch(batch, path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: list, path: str) -> None:
+        # Callers that were cancelled while queued are dropped from the POST
+        live = [entry for entry in batch if not entry[2].done()]
+        if not live:
+            return
+
+        # The task runs in the first submitter's context: use the shortest
+        # deadline of all callers instead of whichever came first
+        deadline = min((entry[3] for entry in live if entry[3] is not None), default=None)
+        try:
+            with use_deadline(deadline):
+                results = await self._send([(rpc_id, params) for rpc_id, params, _, _ in live], path)
+        except asyncio.CancelledError:
+            for _, _, future, _ in live:
+                future.cancel()
+            raise
+        except Exception as e:
+            retry = []
+            if deadline is not None and time.monotonic() >= deadline[0]:
+                # Cut short by the tightest caller: the others still have time of their own
+                retry = [entry for entry in live if entry[3] is None or entry[3][0] > deadline[0]]
+            for _, _, future, _ in live:
+                if not future.done() and not any(future is entry[2] for entry in retry):
+                    future.set_exception(e)
+            if retry:
+                await self._dispatch(retry, path)
+            return
+
+        for (_, _, future, _), result in zip(live, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,261 @@
+"""Circuit breaker for NotebookLM endpoints.
+
+When NotebookLM degrades, calls that will fail anyway still hold a
+connection, a rate-limit slot and the caller for the full 30-120 s timeout.
+The breaker tracks recent outcomes per (rpc_id, endpoint) and, once the
+failure rate crosses a threshold, rejects calls to that key at once with
+CircuitOpenError:
+
+    closed     calls pass; outcomes are recorded
+    open       calls fail fast until the open period ends
+    half_open  one probe call passes; success closes, failure reopens
+
+Endpoints are "batchexecute" (keyed by rpc_id) and "query" (the streamed
+GenerateFreeFormStreamed call). Only server-side trouble counts as a
+failure: 5xx responses, timeouts and connection errors. 4xx, auth errors
+and cancellations leave the breaker alone.
+
+Environment overrides:
+    NOTEBOOKLM_CIRCUIT_FAILURE_RATE=<0-1>   Failure rate that opens a circuit (default 0.5, 0 = off)
+    NOTEBOOKLM_CIRCUIT_MIN_CALLS=<n>        Calls in the window before the rate applies (default 5)
+    NOTEBOOKLM_CIRCUIT_OPEN_SECONDS=<secs>  How long a circuit stays open (default 30)
+"""
+
+import contextlib
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+import httpx
+
+from .deadline import deadline_expired
+
+BATCHEXECUTE = "batchexecute"
+QUERY = "query"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a call whose circuit is open."""
+
+    def __init__(self, rpc: str, endpoint: str, retry_after: float, failure_rate: float):
+        self.rpc = rpc
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        self.failure_rate = failure_rate
+        super().__init__(
+            f"NotebookLM {endpoint} call '{rpc}' is failing "
+            f"({failure_rate:.0%} of recent calls); not retrying for {retry_after:.0f}s"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Tool error payload."""
+        return {
+            "status": "error",
+            "error": str(self),
+            "error_type": "circuit_open",
+            "rpc": self.rpc,
+            "endpoint": self.endpoint,
+            "retry_after_seconds": round(self.retry_after, 1),
+        }
+
+
+class Circuit:
+    """Outcome window and state of one (rpc_id, endpoint) key."""
+
+    __slots__ = ("outcomes", "state", "opened_at", "probing", "rejected")
+
+    def __init__(self) -> None:
+        self.outcomes: deque[tuple[float, bool]] = deque()  # (time, failed)
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+        self.rejected = 0
+
+    def failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(failed for _, failed in self.outcomes) / len(self.outcomes)
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker keyed by (rpc_id, endpoint)."""
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window: float = 60.0,
+        open_seconds: float = 30.0,
+        labels: Mapping[str, str] | None = None,
+    ):
+        """
+        Args:
+            failure_rate: Share of failed calls in the window that opens the circuit
+                (0 disables the breaker)
+            min_calls: Calls needed in the window before the rate is trusted
+            window: Seconds of outcomes considered
+            open_seconds: Time a circuit stays open before a probe is let through
+            labels: rpc_id -> readable name for errors and stats()
+        """
+        self._failure_rate = failure_rate
+        self._min_calls = max(1, min_calls)
+        self._window = window
+        self._open_seconds = open_seconds
+        self._labels = dict(labels or {})
+        self._lock = threading.Lock()
+        self._circuits: dict[tuple[str, str], Circuit] = {}
+
+    @classmethod
+    def from_env(cls, labels: Mapping[str, str] | None = None) -> "CircuitBreaker":
+        """Defaults, overridden by NOTEBOOKLM_CIRCUIT_* environment variables."""
+        def env(name: str, default: float) -> float:
+            try:
+                return float(os.environ[name])
+            except (KeyError, ValueError):
+                return default
+
+        return cls(
+            failure_rate=env("NOTEBOOKLM_CIRCUIT_FAILURE_RATE", 0.5),
+            min_calls=int(env("NOTEBOOKLM_CIRCUIT_MIN_CALLS", 5)),
+            open_seconds=env("NOTEBOOKLM_CIRCUIT_OPEN_SECONDS", 30.0),
+            labels=labels,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._failure_rate > 0
+
+    # =========================================================================
+    # Admission
+    # =========================================================================
+
+    def _circuit(self, key: tuple[str, str]) -> Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = Circuit()
+        return circuit
+
+    def before(self, rpc_ids: Iterable[str], endpoint: str = BATCHEXECUTE) -> list[tuple[str, str]]:
+        """Admit a call or raise CircuitOpenError.
+
+        Returns the keys this call probes (half-open circuits); pass them back
+        to after() so the probe slot is released.
+        """
+        probes = []
+        now = time.monotonic()
+        with self._lock:
+            keys = [(rpc_id, endpoint) for rpc_id in dict.fromkeys(rpc_ids)]
+            for key in keys:
+                circuit = self._circuits.get(key)
+                if circuit is None or circuit.state == CLOSED:
+                    continue
+                if circuit.state == OPEN and now - circuit.opened_at >= self._open_seconds:
+                    circuit.state = HALF_OPEN
+                if circuit.state == OPEN or circuit.probing:
+                    circuit.rejected += 1
+                    retry_after = max(0.0, circuit.opened_at + self._open_seconds - now)
+                    raise CircuitOpenError(
+                        self._labels.get(key[0], key[0]), endpoint, retry_after, circuit.failure_rate()
+                    )
+                probes.append(key)
+            # Claim probe slots only once every key has been admitted
+            for key in probes:
+                self._circuits[key].probing = True
+        return probes
+
+    def after(self, rpc_ids: Iterable[str], endpoint: str, probes: list[tuple[str, str]],
+              error: BaseException | None = None) -> None:
+        """Record the outcome of an admitted call."""
+        failed = error is not None and is_failure(error)
+        neutral = error is not None and not failed
+        now = time.monotonic()
+        with self._lock:
+            for key in probes:
+                self._circuits[key].probing = False
+            if neutral:
+                return
+            for rpc_id in dict.fromkeys(rpc_ids):
+                key = (rpc_id, endpoint)
+                circuit = self._circuit(key)
+                if circuit.state == HALF_OPEN and key in probes:
+                    if failed:
+                        self._open(circuit, now)
+                    else:
+                        self._close(circuit)
+                else:
+                    self._record(circuit, failed, now)
+
+    def _record(self, circuit: Circuit, failed: bool, now: float) -> None:
+        outcomes = circuit.outcomes
+        outcomes.append((now, failed))
+        while outcomes and now - outcomes[0][0] > self._window:
+            outcomes.popleft()
+        if (
+            circuit.state == CLOSED
+            and failed
+            and len(outcomes) >= self._min_calls
+            and circuit.failure_rate() >= self._failure_rate
+        ):
+            self._open(circuit, now)
+
+    @staticmethod
+    def _open(circuit: Circuit, now: float) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = now
+
+    @staticmethod
+    def _close(circuit: Circuit) -> None:
+        circuit.state = CLOSED
+        circuit.outcomes.clear()
+
+    @contextlib.contextmanager
+    def guard(self, rpc_ids: Iterable[str], endpoint: str = BATCHEXECUTE) -> Iterator[None]:
+        """Admit a call (or raise CircuitOpenError) and record how it ended.
+
+        Works around `await` too: admission never blocks.
+        """
+        if not self.enabled:
+            yield
+            return
+        rpc_ids = list(rpc_ids)
+        probes = self.before(rpc_ids, endpoint)
+        try:
+            yield
+        except BaseException as e:
+            self.after(rpc_ids, endpoint, probes, e)
+            raise
+        self.after(rpc_ids, endpoint, probes)
+
+    # =========================================================================
+    # Introspection
+    # =========================================================================
+
+    def stats(self) -> dict[str, Any]:
+        """State, recent failure rate and rejections per circuit that has seen traffic."""
+        with self._lock:
+            return {
+                f"{endpoint}:{self._labels.get(rpc_id, rpc_id)}": {
+                    "state": circuit.state,
+                    "calls": len(circuit.outcomes),
+                    "failure_rate": round(circuit.failure_rate(), 3),
+                    "rejected": circuit.rejected,
+                }
+                for (rpc_id, endpoint), circuit in self._circuits.items()
+            }
+
+
+def is_failure(error: BaseException) -> bool:
+    """Whether an exception means the endpoint is unhealthy."""
+    if isinstance(error, httpx.TimeoutException) and deadline_expired():
+        # Cut short by the caller's deadline, not by a slow server
+        return False
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
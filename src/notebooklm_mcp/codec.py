@@ -0,0 +1,107 @@
+"""JSON codec for RPC payloads.
+
+batchexecute payloads are JSON strings nested inside JSON, so every RPC
+encodes twice on the way out and decodes twice on the way back. This module
+picks the fastest available backend: orjson, then msgspec, then the stdlib.
+Set NOTEBOOKLM_JSON_BACKEND=json|orjson|msgspec to force one.
+
+All backends produce compact output (no spaces) like Chrome. orjson and
+msgspec write non-ASCII characters as UTF-8 rather than \\uXXXX escapes,
+which is also what the browser sends; both forms are valid JSON.
+
+Call through the module (codec.loads / codec.dumps) so set_backend() applies.
+"""
+
+import json
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on installed extras
+    msgspec = None
+
+
+def _json_dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _json_loads(data: bytes | bytearray | memoryview | str) -> Any:
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _orjson_dumps(obj: Any) -> str:
+    try:
+        return orjson.dumps(obj).decode("utf-8")
+    except TypeError:
+        # e.g. integers beyond 64 bits - the stdlib handles them
+        return _json_dumps(obj)
+
+
+def _orjson_loads(data: bytes | bytearray | memoryview | str) -> Any:
+    return orjson.loads(data)
+
+
+def _msgspec_dumps(obj: Any) -> str:
+    try:
+        return _MSGSPEC_ENCODER.encode(obj).decode("utf-8")
+    except (TypeError, OverflowError):
+        return _json_dumps(obj)
+
+
+def _msgspec_loads(data: bytes | bytearray | memoryview | str) -> Any:
+    return _MSGSPEC_DECODER.decode(data)
+
+
+_MSGSPEC_ENCODER = msgspec.json.Encoder() if msgspec is not None else None
+_MSGSPEC_DECODER = msgspec.json.Decoder() if msgspec is not None else None
+
+_BACKENDS = {"json": (_json_dumps, _json_loads, (ValueError,))}
+if orjson is not None:
+    _BACKENDS["orjson"] = (_orjson_dumps, _orjson_loads, (ValueError,))
+if msgspec is not None:
+    _BACKENDS["msgspec"] = (_msgspec_dumps, _msgspec_loads, (ValueError, msgspec.DecodeError))
+
+
+def available_backends() -> list[str]:
+    """Names of the codec backends importable in this environment."""
+    return list(_BACKENDS)
+
+
+def set_backend(name: str) -> None:
+    """Switch the active backend ("json", "orjson" or "msgspec").
+
+    Raises:
+        ValueError: If the backend is unknown or its package is not installed
+    """
+    global BACKEND, dumps, loads, DECODE_ERRORS
+    if name not in _BACKENDS:
+        raise ValueError(f"JSON backend '{name}' is not available (installed: {', '.join(_BACKENDS)})")
+    BACKEND = name
+    dumps, loads, DECODE_ERRORS = _BACKENDS[name]
+
+
+def _default_backend() -> str:
+    requested = os.environ.get("NOTEBOOKLM_JSON_BACKEND", "").lower()
+    if requested in _BACKENDS:
+        return requested
+    for name in ("orjson", "msgspec", "json"):
+        if name in _BACKENDS:
+            return name
+    return "json"
+
+
+# Active backend. dumps(obj) -> compact str, loads(bytes | str) -> object, and
+# DECODE_ERRORS is the exception tuple loads() raises on invalid input.
+BACKEND: str
+dumps = _json_dumps
+loads = _json_loads
+DECODE_ERRORS: tuple[type[Exception], ...] = (ValueError,)
+set_backend(_default_backend())
@@ -0,0 +1,500 @@
+"""Bounded store of conversation turns for follow-up queries.
+
+NotebookLM needs the earlier turns of a conversation in every follow-up
+request, so the client keeps each conversation's questions and answers.
+They used to live in a plain dict that never shrank. In a long-running
+HTTP server that dict held every question and answer ever handled.
+
+Both stores bound that memory:
+- idle conversations are dropped after the idle TTL,
+- the number of conversations is capped, least recently used dropped first,
+- the text held is counted against a byte budget; least recently used
+  conversations go once it is exceeded, never the one being written.
+
+A follow-up on a dropped conversation is sent without history, as for an
+unknown conversation_id.
+
+Every follow-up resends the earlier turns, so request size grows with the
+conversation. A HistoryPolicy windows what is sent: only the last N turns,
+answers of older turns cut to short stubs, and/or a byte budget that drops
+the oldest turns. Each stored turn records the size of the request that
+produced it and how long the answer took, so the effect of a policy on
+request size and latency can be measured (get_conversation_history).
+
+Backends implement ConversationBackend (get / append / delete / stats /
+close). The default, SqliteConversationStore, keeps turns in a WAL-mode
+database (~/.notebooklm-mcp/conversations.sqlite3) that every process on
+the host shares: with --stateless or several workers, a follow-up can land
+on any of them. ConversationStore keeps turns in process memory. A shared
+network store (Redis and the like) only needs the same five methods.
+
+Environment overrides:
+    NOTEBOOKLM_CONVERSATION_BACKEND=sqlite|memory  Where turns are kept (default sqlite)
+    NOTEBOOKLM_CONVERSATION_DB=<path>       SQLite database (default ~/.notebooklm-mcp/conversations.sqlite3)
+    NOTEBOOKLM_CONVERSATIONS_MAX=<n>        Conversations kept (default 1000)
+    NOTEBOOKLM_CONVERSATION_IDLE_TTL=<secs> Idle time before a conversation is dropped (default 21600)
+    NOTEBOOKLM_CONVERSATIONS_MB=<n>         Byte budget for stored text (default 64)
+    NOTEBOOKLM_HISTORY_TURNS=<n>            Turns sent with a follow-up (default all)
+    NOTEBOOKLM_HISTORY_BYTES=<n>            Byte budget for the history sent (default none)
+    NOTEBOOKLM_HISTORY_STUB_CHARS=<n>       Cut older answers to this many characters (default no stubs)
+"""
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+logger = logging.getLogger("notebooklm_mcp.api")
+
+
+class ConversationTurn:
+    """A single turn in a conversation (query + response).
+
+    Used to track conversation history for follow-up queries.
+    NotebookLM requires the full conversation history in follow-up requests.
+    """
+
+    __slots__ = ("query", "answer", "turn_number", "request_bytes", "elapsed")
+
+    def __init__(
+        self,
+        query: str,
+        answer: str,
+        turn_number: int,
+        request_bytes: int | None = None,
+        elapsed: float | None = None,
+    ):
+        self.query = query            # The user's question
+        self.answer = answer          # The AI's response
+        self.turn_number = turn_number  # 1-indexed turn number in the conversation
+        self.request_bytes = request_bytes  # Size of the query request body sent
+        self.elapsed = elapsed        # Seconds until the answer was complete
+
+    @property
+    def size(self) -> int:
+        """Bytes held by the turn's strings."""
+        return sys.getsizeof(self.query) + sys.getsizeof(self.answer)
+
+    def __repr__(self) -> str:
+        return f"ConversationTurn(turn_number={self.turn_number}, query={self.query[:40]!r})"
+
+
+@dataclass(frozen=True)
+class HistoryPolicy:
+    """Which earlier turns a follow-up query sends; the defaults send them all."""
+
+    max_turns: int | None = None  # Only the most recent turns (0 = none)
+    max_bytes: int | None = None  # Oldest turns dropped until the history fits (UTF-8 bytes)
+    stub_chars: int | None = None  # Answers of older turns cut to this many characters
+    full_turns: int = 1  # Most recent turns never cut to a stub
+
+    @classmethod
+    def from_env(cls) -> "HistoryPolicy":
+        """Defaults, overridden by NOTEBOOKLM_HISTORY_* environment variables."""
+        def env(name: str) -> int | None:
+            try:
+                return int(os.environ[name])
+            except (KeyError, ValueError):
+                return None
+
+        return cls(
+            max_turns=env("NOTEBOOKLM_HISTORY_TURNS"),
+            max_bytes=env("NOTEBOOKLM_HISTORY_BYTES"),
+            stub_chars=env("NOTEBOOKLM_HISTORY_STUB_CHARS"),
+        )
+
+    def apply(self, turns: list[ConversationTurn]) -> list[ConversationTurn]:
+        """The turns to send, oldest first; stubbed turns are copies."""
+        if self.max_turns is not None:
+            turns = turns[-self.max_turns:] if self.max_turns > 0 else []
+        if self.stub_chars is not None:
+            older = max(0, len(turns) - self.full_turns)
+            turns = [self._stub(turn) for turn in turns[:older]] + turns[older:]
+        if self.max_bytes is not None:
+            sizes = [len(t.query.encode("utf-8")) + len(t.answer.encode("utf-8")) for t in turns]
+            total = sum(sizes)
+            # The latest turn is always sent: without it the follow-up has no context at all
+            while len(turns) > 1 and total > self.max_bytes:
+                total -= sizes.pop(0)
+                turns = turns[1:]
+        return turns
+
+    def _stub(self, turn: ConversationTurn) -> ConversationTurn:
+        if len(turn.answer) <= self.stub_chars:
+            return turn
+        stub = turn.answer[:self.stub_chars].rstrip() + " …"
+        return ConversationTurn(turn.query, stub, turn.turn_number)
+
+
+class ConversationBackend(Protocol):
+    """Where a client keeps conversation turns; shared by every client of a server."""
+
+    def get(self, conversation_id: str) -> list[ConversationTurn]:
+        """Turns of a conversation, oldest first (empty if unknown or evicted)."""
+
+    def append(
+        self,
+        conversation_id: str,
+        query: str,
+        answer: str,
+        request_bytes: int | None = None,
+        elapsed: float | None = None,
+    ) -> ConversationTurn:
+        """Record a completed turn and its request size and latency; returns it with its turn number."""
+
+    def delete(self, conversation_id: str) -> bool:
+        """Forget a conversation; False if it was not stored."""
+
+    def stats(self) -> dict[str, Any]:
+        """Conversations, turns and bytes held, and evictions by reason."""
+
+    def close(self) -> None:
+        """Release connections; the store stays usable and reopens on demand."""
+
+
+def _limits_from_env() -> dict[str, Any]:
+    """Store limits from the NOTEBOOKLM_CONVERSATION* environment variables."""
+    def env(name: str, default: float) -> float:
+        try:
+            return float(os.environ[name])
+        except (KeyError, ValueError):
+            return default
+
+    return {
+        "max_conversations": int(env("NOTEBOOKLM_CONVERSATIONS_MAX", 1000)),
+        "idle_ttl": env("NOTEBOOKLM_CONVERSATION_IDLE_TTL", 6 * 3600.0),
+        "max_bytes": int(env("NOTEBOOKLM_CONVERSATIONS_MB", 64) * 1024 * 1024),
+    }
+
+
+def conversation_store_from_env() -> ConversationBackend:
+    """The backend named by NOTEBOOKLM_CONVERSATION_BACKEND (default sqlite)."""
+    if os.environ.get("NOTEBOOKLM_CONVERSATION_BACKEND", "sqlite").lower() == "memory":
+        return ConversationStore.from_env()
+    return SqliteConversationStore.from_env()
+
+
+class _Conversation:
+    __slots__ = ("turns", "size", "last_used")
+
+    def __init__(self) -> None:
+        self.turns: list[ConversationTurn] = []
+        self.size = 0
+        self.last_used = time.monotonic()
+
+
+class ConversationStore:
+    """In-memory conversation turns with LRU, idle-TTL and byte-budget eviction."""
+
+    def __init__(
+        self,
+        max_conversations: int = 1000,
+        idle_ttl: float = 6 * 3600.0,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        """
+        Args:
+            max_conversations: Conversations kept, least recently used dropped first
+            idle_ttl: Seconds without use after which a conversation is dropped
+            max_bytes: Budget for the query and answer strings held
+        """
+        self.max_conversations = max_conversations
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conversations: OrderedDict[str, _Conversation] = OrderedDict()
+        self._size = 0
+        self.evicted = {"lru": 0, "idle": 0, "bytes": 0}
+
+    @classmethod
+    def from_env(cls) -> "ConversationStore":
+        """Defaults, overridden by NOTEBOOKLM_CONVERSATION* environment variables."""
+        return cls(**_limits_from_env())
+
+    def get(self, conversation_id: str) -> list[ConversationTurn]:
+        """Turns of a conversation, oldest first (empty if unknown or evicted)."""
+        with self._lock:
+            self._expire(time.monotonic())
+            conversation = self._conversations.get(conversation_id)
+            if conversation is None:
+                return []
+            self._touch(conversation_id, conversation)
+            return list(conversation.turns)
+
+    def append(
+        self,
+        conversation_id: str,
+        query: str,
+        answer: str,
+        request_bytes: int | None = None,
+        elapsed: float | None = None,
+    ) -> ConversationTurn:
+        """Record a completed turn; returns it with its turn number."""
+        with self._lock:
+            self._expire(time.monotonic())
+            conversation = self._conversations.get(conversation_id)
+            if conversation is None:
+                conversation = self._conversations[conversation_id] = _Conversation()
+            turn = ConversationTurn(query, answer, len(conversation.turns) + 1, request_bytes, elapsed)
+            conversation.turns.append(turn)
+            conversation.size += turn.size
+            self._size += turn.size
+            self._touch(conversation_id, conversation)
+            self._enforce_limits()
+            return turn
+
+    def delete(self, conversation_id: str) -> bool:
+        """Forget a conversation; False if it was not stored."""
+        with self._lock:
+            conversation = self._conversations.pop(conversation_id, None)
+            if conversation is None:
+                return False
+            self._size -= conversation.size
+            return True
+
+    def _touch(self, conversation_id: str, conversation: _Conversation) -> None:
+        conversation.last_used = time.monotonic()
+        self._conversations.move_to_end(conversation_id)
+
+    def _expire(self, now: float) -> None:
+        """Drop idle conversations (the least recently used come first)."""
+        while self._conversations:
+            conversation_id, conversation = next(iter(self._conversations.items()))
+            if now - conversation.last_used < self.idle_ttl:
+                break
+            self._drop(conversation_id, "idle")
+
+    def _enforce_limits(self) -> None:
+        """Drop least recently used conversations, keeping the newest one."""
+        while len(self._conversations) > max(1, self.max_conversations):
+            self._drop(next(iter(self._conversations)), "lru")
+        while self._size > self.max_bytes and len(self._conversations) > 1:
+            self._drop(next(iter(self._conversations)), "bytes")
+
+    def _drop(self, conversation_id: str, reason: str) -> None:
+        conversation = self._conversations.pop(conversation_id)
+        self._size -= conversation.size
+        self.evicted[reason] += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Conversations, turns and bytes held, and evictions by reason."""
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                "backend": "memory",
+                "conversations": len(self._conversations),
+                "turns": sum(len(c.turns) for c in self._conversations.values()),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "evicted": dict(self.evicted),
+            }
+
+    def close(self) -> None:
+        pass
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    conversation_id TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS conversations_last_used ON conversations (last_used);
+CREATE TABLE IF NOT EXISTS turns (
+    conversation_id TEXT NOT NULL,
+    turn_number INTEGER NOT NULL,
+    query TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    request_bytes INTEGER,
+    elapsed REAL,
+    PRIMARY KEY (conversation_id, turn_number)
+);
+"""
+
+
+def default_conversation_path() -> Path:
+    """~/.notebooklm-mcp/conversations.sqlite3 (next to the auth cache)."""
+    return Path.home() / ".notebooklm-mcp" / "conversations.sqlite3"
+
+
+class SqliteConversationStore:
+    """Conversation turns in a SQLite database shared by every process on the host.
+
+    Same limits as ConversationStore, with the byte budget counted as the
+    UTF-8 length of the stored text and idle time measured in wall-clock
+    seconds (so that processes agree). Turn numbers are assigned inside the
+    INSERT, so two workers appending to one conversation cannot collide.
+    If the database cannot be opened, the store falls back to memory.
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        max_conversations: int = 1000,
+        idle_ttl: float = 6 * 3600.0,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        """
+        Args:
+            path: Database file (default: default_conversation_path()); opened on first use
+            max_conversations: Conversations kept, least recently used dropped first
+            idle_ttl: Seconds without use after which a conversation is dropped
+            max_bytes: Budget for the query and answer text stored
+        """
+        self.path = Path(path) if path is not None else default_conversation_path()
+        self.max_conversations = max_conversations
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._fallback: ConversationStore | None = None
+        self.evicted = {"lru": 0, "idle": 0, "bytes": 0}
+
+    @classmethod
+    def from_env(cls) -> "SqliteConversationStore":
+        """Defaults, overridden by NOTEBOOKLM_CONVERSATION* environment variables."""
+        return cls(os.environ.get("NOTEBOOKLM_CONVERSATION_DB") or None, **_limits_from_env())
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """Open the database on first use; on failure, keep turns in memory instead."""
+        if self._db is None and self._fallback is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.executescript(_SCHEMA)
+                self._db = db
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Conversations kept in memory, cannot open {self.path}: {e}")
+                self._fallback = ConversationStore(self.max_conversations, self.idle_ttl, self.max_bytes)
+        return self._db
+
+    def get(self, conversation_id: str) -> list[ConversationTurn]:
+        """Turns of a conversation, oldest first (empty if unknown or evicted)."""
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return self._fallback.get(conversation_id)
+            now = time.time()
+            with db:
+                touched = db.execute(
+                    "UPDATE conversations SET last_used = ? WHERE conversation_id = ? AND last_used > ?",
+                    (now, conversation_id, now - self.idle_ttl),
+                ).rowcount
+                if not touched:
+                    # Unknown, or idle: its rows go now so a later append starts afresh
+                    self._expire(db, now)
+                    return []
+                rows = db.execute(
+                    "SELECT query, answer, turn_number, request_bytes, elapsed FROM turns WHERE conversation_id = ? ORDER BY turn_number",
+                    (conversation_id,),
+                ).fetchall()
+        return [ConversationTurn(*row) for row in rows]
+
+    def append(
+        self,
+        conversation_id: str,
+        query: str,
+        answer: str,
+        request_bytes: int | None = None,
+        elapsed: float | None = None,
+    ) -> ConversationTurn:
+        """Record a completed turn; returns it with its turn number."""
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return self._fallback.append(conversation_id, query, answer, request_bytes, elapsed)
+            now = time.time()
+            size = len(query.encode("utf-8")) + len(answer.encode("utf-8"))
+            with db:
+                # Includes this conversation if it went idle: its old turns must not come back
+                self._expire(db, now)
+                db.execute(
+                    "INSERT INTO conversations VALUES (?, ?, ?) ON CONFLICT (conversation_id) "
+                    "DO UPDATE SET size = size + excluded.size, last_used = excluded.last_used",
+                    (conversation_id, size, now),
+                )
+                cursor = db.execute(
+                    "INSERT INTO turns SELECT ?, COALESCE(MAX(turn_number), 0) + 1, ?, ?, ?, ? "
+                    "FROM turns WHERE conversation_id = ?",
+                    (conversation_id, query, answer, request_bytes, elapsed, conversation_id),
+                )
+                turn_number = db.execute(
+                    "SELECT turn_number FROM turns WHERE rowid = ?", (cursor.lastrowid,)
+                ).fetchone()[0]
+                self._enforce_limits(db, conversation_id)
+        return ConversationTurn(query, answer, turn_number, request_bytes, elapsed)
+
+    def delete(self, conversation_id: str) -> bool:
+        """Forget a conversation; False if it was not stored."""
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return self._fallback.delete(conversation_id)
+            with db:
+                return self._remove(db, [conversation_id]) > 0
+
+    @staticmethod
+    def _remove(db: sqlite3.Connection, conversation_ids: list[str]) -> int:
+        db.executemany("DELETE FROM turns WHERE conversation_id = ?", [(cid,) for cid in conversation_ids])
+        return db.executemany(
+            "DELETE FROM conversations WHERE conversation_id = ?", [(cid,) for cid in conversation_ids]
+        ).rowcount
+
+    def _expire(self, db: sqlite3.Connection, now: float) -> None:
+        """Drop conversations idle for longer than the TTL."""
+        idle = [row[0] for row in db.execute(
+            "SELECT conversation_id FROM conversations WHERE last_used <= ?", (now - self.idle_ttl,)
+        )]
+        self.evicted["idle"] += self._remove(db, idle) if idle else 0
+
+    def _enforce_limits(self, db: sqlite3.Connection, keep: str) -> None:
+        """Drop least recently used conversations, never `keep`."""
+        count, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM conversations").fetchone()
+        excess = count - max(1, self.max_conversations)
+        if excess > 0:
+            oldest = [row[0] for row in db.execute(
+                "SELECT conversation_id FROM conversations WHERE conversation_id != ? "
+                "ORDER BY last_used LIMIT ?", (keep, excess),
+            )]
+            self.evicted["lru"] += self._remove(db, oldest)
+            size = db.execute("SELECT COALESCE(SUM(size), 0) FROM conversations").fetchone()[0]
+        while size > self.max_bytes:
+            oldest = db.execute(
+                "SELECT conversation_id, size FROM conversations WHERE conversation_id != ? "
+                "ORDER BY last_used LIMIT 1", (keep,),
+            ).fetchone()
+            if oldest is None:
+                break
+            self.evicted["bytes"] += self._remove(db, [oldest[0]])
+            size -= oldest[1]
+
+    def stats(self) -> dict[str, Any]:
+        """Conversations, turns and bytes held, and evictions by reason."""
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return {**self._fallback.stats(), "backend": "memory (sqlite unavailable)"}
+            conversations, turns, size = db.execute(
+                "SELECT COUNT(*), (SELECT COUNT(*) FROM turns), COALESCE(SUM(size), 0) FROM conversations"
+            ).fetchone()
+        return {
+            "backend": "sqlite",
+            "path": str(self.path),
+            "conversations": conversations,
+            "turns": turns,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "evicted": dict(self.evicted),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
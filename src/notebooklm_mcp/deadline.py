@@ -0,0 +1,102 @@
+"""Deadline propagation from an MCP tool call to the RPCs it makes.
+
+A tool that chains several RPCs (fetch sources, then create an artifact)
+used to give each one its full fixed timeout, so the tool could run for a
+multiple of what its caller was willing to wait. Each tool call now runs
+inside deadline_scope(), and the clients read the remaining budget:
+
+- every batchexecute request gets min(its usual timeout, time remaining),
+- query streams stop at the deadline (returning a partial answer if any),
+- retries are not attempted when the backoff would outlast the deadline,
+- a call made after the deadline raises DeadlineExceeded without sending.
+
+The deadline lives in a ContextVar, so it follows the tool call into the
+tasks it starts (asyncio copies the context) and never leaks into other
+tool calls. Outside a scope nothing changes.
+"""
+
+import contextlib
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+from typing import Any
+
+# (monotonic deadline, budget in seconds) of the current tool call
+_deadline: ContextVar[tuple[float, float] | None] = ContextVar("notebooklm_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised instead of starting a request once the call's budget is spent."""
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        super().__init__(f"Deadline of {budget:g}s for this call was exceeded")
+
+    def to_dict(self) -> dict[str, Any]:
+        """Tool error payload."""
+        return {
+            "status": "error",
+            "error": str(self),
+            "error_type": "deadline_exceeded",
+            "budget_seconds": self.budget,
+        }
+
+
+@contextlib.contextmanager
+def deadline_scope(seconds: float | None) -> Iterator[None]:
+    """Run the block with a deadline `seconds` from now (None or <= 0: no deadline).
+
+    A nested scope can only shorten the deadline it inherits.
+    """
+    if not seconds or seconds <= 0:
+        yield
+        return
+    deadline = (time.monotonic() + seconds, seconds)
+    current = _deadline.get()
+    if current is not None and current[0] <= deadline[0]:
+        deadline = current
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> tuple[float, float] | None:
+    """(monotonic deadline, budget) of the current call, to carry it across tasks."""
+    return _deadline.get()
+
+
+@contextlib.contextmanager
+def use_deadline(deadline: tuple[float, float] | None) -> Iterator[None]:
+    """Run the block under exactly `deadline` (from current_deadline()), replacing the inherited one."""
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> float | None:
+    """Seconds left before the current deadline (None without a deadline)."""
+    current = _deadline.get()
+    if current is None:
+        return None
+    return current[0] - time.monotonic()
+
+
+def deadline_expired() -> bool:
+    """Whether there is a deadline and it has passed."""
+    remaining = remaining_time()
+    return remaining is not None and remaining <= 0
+
+
+def clamp_timeout(timeout: float) -> float:
+    """`timeout` cut to the time remaining; raises DeadlineExceeded if none is left."""
+    current = _deadline.get()
+    if current is None:
+        return timeout
+    remaining = current[0] - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded(current[1])
+    return min(timeout, remaining)
@@ -0,0 +1,606 @@
+"""Typed decoders for positional RPC results.
+
+batchexecute results are nested arrays whose meaning depends on position.
+Each message type is described once, as field -> index path, and the paths
+are compiled into accessor functions up front. Decoding fills compact
+`__slots__` models; the client converts them to the dicts its public
+methods return with `to_dict()`.
+
+Layouts (observed, undocumented):
+
+    notebook:  [title, [sources], id, emoji, null, [metadata]]
+               metadata: [ownership, is_shared, ?, ?, ?, [modified], ?, ?, [created]]
+    source:    [[id], title, [metadata], [null, 2]]
+               metadata: [[drive_doc_id], ?, ?, ?, type, ?, ?, [url]]
+    fulltext:  [[[id], title, [metadata]], null, null, [[content blocks]]]
+    research:  [task_id, [?, [query, source_type], mode, [[sources], summary], status]]
+    artifact:  [id, title, type, ?, status, ?, [audio], [report], [video], [flashcards],
+                [created], ?, ?, ?, [infographic], [created], [slide deck], [created]]
+    conversations: [[conversation_id, ...], ...]  (hPTbtc; only the IDs are confirmed,
+               message lists are assumed to use the query history layout, see below)
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from . import constants
+
+# Default for fields whose absence must be told apart from an explicit null
+MISSING = object()
+
+Accessor = Callable[[Any], Any]
+
+
+def path(*indexes: int, kind: type | tuple[type, ...] | None = None, default: Any = None) -> Accessor:
+    """Compile an index path into an accessor.
+
+    The accessor walks nested lists by position and returns `default` when
+    any step is missing or not a list, or when the value at the end is not
+    an instance of `kind`. It never raises.
+    """
+    if len(indexes) == 1 and kind is None:
+        # Most fields are one level deep - skip the loop
+        (only,) = indexes
+
+        def access(data: Any) -> Any:
+            if type(data) is not list:
+                return default
+            try:
+                return data[only]
+            except IndexError:
+                return default
+
+        return access
+
+    def access(data: Any) -> Any:
+        for index in indexes:
+            if type(data) is not list:
+                return default
+            try:
+                data = data[index]
+            except IndexError:
+                return default
+        if kind is not None and not isinstance(data, kind):
+            return default
+        return data
+
+    return access
+
+
+class Model:
+    """Base for slotted models decoded from a positional array.
+
+    Subclasses declare `__slots__` and `FIELDS` ({name: accessor}); decode()
+    applies each accessor to the array. Slotted instances have no __dict__,
+    which matters for accounts with thousands of notebooks and sources.
+    """
+
+    __slots__ = ()
+    FIELDS: dict[str, Accessor] = {}
+    _accessors: tuple[tuple[str, Accessor], ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._accessors = tuple(cls.FIELDS.items())
+
+    @classmethod
+    def decode(cls, data: Any):
+        """Build an instance from the raw array."""
+        obj = cls.__new__(cls)
+        for name, access in cls._accessors:
+            setattr(obj, name, access(data))
+        return obj
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name, _ in self._accessors)
+        return f"{type(self).__name__}({values})"
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name, _ in self._accessors)
+
+
+def parse_timestamp(ts_array: list | None) -> str | None:
+    """Convert [seconds, nanoseconds] timestamp array to ISO format string.
+    """
+    if not ts_array or not isinstance(ts_array, list) or len(ts_array) < 1:
+        return None
+
+    try:
+        seconds = ts_array[0]
+        if not isinstance(seconds, (int, float)):
+            return None
+
+        # Convert to datetime
+        dt = datetime.fromtimestamp(seconds, tz=timezone.utc)
+        return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    except (ValueError, OSError, OverflowError):
+        return None
+
+
+def _collect_text(data: list) -> list[str]:
+    """Recursively extract all non-empty strings from nested arrays."""
+    texts = []
+    for item in data:
+        if isinstance(item, str) and item:
+            texts.append(item)
+        elif isinstance(item, list):
+            texts.extend(_collect_text(item))
+    return texts
+
+
+# =========================================================================
+# Notebooks and sources
+# =========================================================================
+
+_source_ids = path(0)
+
+
+def _source_id(src: Any) -> Any:
+    # Usually [[id], ...]; some responses carry the bare id string
+    ids = _source_ids(src)
+    if type(ids) is list:
+        return ids[0] if ids else None
+    return ids or None
+
+
+class Source(Model):
+    """A source entry of a notebook."""
+
+    __slots__ = ("id", "title", "source_type", "drive_doc_id", "url", "metadata")
+    FIELDS = {
+        "id": _source_id,
+        "title": path(1, default="Untitled"),
+        "source_type": path(2, 4),
+        "drive_doc_id": path(2, 0, 0),
+        "url": path(2, 7, 0),
+        # Raw metadata array; changes when the source is re-synced (cache fingerprints)
+        "metadata": path(2, kind=list),
+    }
+
+    @property
+    def source_type_name(self) -> str:
+        return constants.SOURCE_TYPES.get_name(self.source_type)
+
+    @property
+    def can_sync(self) -> bool:
+        """Google Docs (type 1) and Slides/Sheets (type 2) are stored in Drive and can be synced."""
+        return self.drive_doc_id is not None and self.source_type in (
+            constants.SOURCE_TYPE_GOOGLE_DOCS,
+            constants.SOURCE_TYPE_GOOGLE_OTHER,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "source_type": self.source_type,
+            "source_type_name": self.source_type_name,
+            "url": self.url,
+            "drive_doc_id": self.drive_doc_id,
+            "can_sync": self.can_sync,
+        }
+
+
+def decode_sources(sources_data: Any) -> list[Source]:
+    """Decode a notebook's source array, skipping malformed entries."""
+    if type(sources_data) is not list:
+        return []
+    return [Source.decode(src) for src in sources_data if type(src) is list and len(src) >= 2]
+
+
+@dataclass(slots=True)
+class Notebook:
+    """Represents a NotebookLM notebook."""
+
+    id: str
+    title: str
+    source_count: int
+    sources: list[dict]
+    is_owned: bool = True     # True if owned by user, False if shared with user
+    is_shared: bool = False   # True if shared with others (for owned notebooks)
+    created_at: str | None = None   # ISO format timestamp
+    modified_at: str | None = None  # ISO format timestamp
+
+    @property
+    def url(self) -> str:
+        return f"https://notebooklm.google.com/notebook/{self.id}"
+
+    @property
+    def ownership(self) -> str:
+        """Return human-readable ownership status."""
+        if self.is_owned:
+            return "owned"
+        return "shared_with_me"
+
+
+_notebook_title = path(0, kind=str, default="Untitled")
+_notebook_sources = path(1)
+_notebook_id = path(2)
+_notebook_ownership = path(5, 0, default=constants.OWNERSHIP_MINE)
+_notebook_shared = path(5, 1, default=False)
+_notebook_modified = path(5, 5)
+_notebook_created = path(5, 8)
+
+
+def decode_notebook(nb_data: Any) -> Notebook | None:
+    """Decode one row of the wXbhsf (list notebooks) result."""
+    if type(nb_data) is not list or len(nb_data) < 3:
+        return None
+    notebook_id = _notebook_id(nb_data)
+    if not notebook_id:
+        return None
+
+    sources = [{"id": src.id, "title": src.title} for src in decode_sources(_notebook_sources(nb_data))]
+    return Notebook(
+        id=notebook_id,
+        title=_notebook_title(nb_data),
+        source_count=len(sources),
+        sources=sources,
+        # metadata[0]: 1 = mine (owned), 2 = shared with me
+        is_owned=_notebook_ownership(nb_data) == constants.OWNERSHIP_MINE,
+        # metadata[1]: [1, true, ...] -> shared, [1, false, ...] -> private
+        is_shared=bool(_notebook_shared(nb_data)),
+        created_at=parse_timestamp(_notebook_created(nb_data)),
+        modified_at=parse_timestamp(_notebook_modified(nb_data)),
+    )
+
+
+def decode_notebook_list(result: Any) -> list[Notebook]:
+    """Decode the wXbhsf (list notebooks) result."""
+    if not result or type(result) is not list:
+        return []
+    rows = result[0] if type(result[0]) is list else result
+    notebooks = []
+    for nb_data in rows:
+        notebook = decode_notebook(nb_data)
+        if notebook is not None:
+            notebooks.append(notebook)
+    return notebooks
+
+
+def _unwrap_notebook(result: Any) -> Any:
+    """Notebook row of a rLM1Ne (get notebook) result, which wraps the notebook once."""
+    if not result or type(result) is not list:
+        return None
+    return result[0] if type(result[0]) is list else result
+
+
+def notebook_sources_data(result: Any) -> Any:
+    """Source array of a rLM1Ne (get notebook) result."""
+    notebook_data = _unwrap_notebook(result)
+    return None if notebook_data is None else _notebook_sources(notebook_data)
+
+
+def notebook_modified_data(result: Any) -> Any:
+    """Raw last-modified timestamp of a rLM1Ne (get notebook) result."""
+    notebook_data = _unwrap_notebook(result)
+    return None if notebook_data is None else _notebook_modified(notebook_data)
+
+
+# =========================================================================
+# Source content
+# =========================================================================
+
+class SourceContent(Model):
+    """Full text and metadata of a source (hizoJc)."""
+
+    __slots__ = ("title", "type_code", "url", "blocks")
+    FIELDS = {
+        "title": path(0, 1, kind=str, default=""),
+        "type_code": path(0, 2, 4, default=MISSING),
+        "url": path(0, 2, 7, 0, kind=str),
+        # Each content block: [start_pos, end_pos, content_data, ...]
+        "blocks": path(3, 0, kind=list, default=[]),
+    }
+
+    @property
+    def source_type(self) -> str:
+        if self.type_code is MISSING:
+            return ""
+        return constants.SOURCE_TYPES.get_name(self.type_code)
+
+    @property
+    def content(self) -> str:
+        parts = []
+        for block in self.blocks:
+            if type(block) is list:
+                parts.extend(_collect_text(block))
+        return "\n\n".join(parts)
+
+    def to_dict(self) -> dict[str, Any]:
+        content = self.content
+        return {
+            "content": content,
+            "title": self.title,
+            "source_type": self.source_type,
+            "url": self.url,
+            "char_count": len(content),
+        }
+
+
+# =========================================================================
+# Research
+# =========================================================================
+
+class ResearchSource(Model):
+    """A source found by a research task."""
+
+    __slots__ = ("index", "url", "title", "description", "result_type")
+    # Fast research: [url, title, desc, type, ...]
+    FIELDS = {
+        "url": path(0, kind=str, default=""),
+        "title": path(1, kind=str, default=""),
+        "description": path(2, kind=str, default=""),
+        "result_type": path(3, kind=int, default=1),
+    }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "url": self.url,
+            "title": self.title,
+            "description": self.description,
+            "result_type": self.result_type,
+            "result_type_name": constants.RESULT_TYPES.get_name(self.result_type),
+        }
+
+
+_deep_source_result_type = path(3, kind=int, default=5)
+_deep_source_report = path(6, kind=list)
+
+
+class ResearchTask(Model):
+    """A research task from the e3bVqc (poll research) result."""
+
+    __slots__ = ("task_id", "query", "source_type_code", "mode_code", "status_code",
+                 "summary", "sources_data", "sources", "report")
+    # Status lives at task_info[4], not task_data[2] (which is a timestamp)
+    FIELDS = {
+        "task_id": path(0),
+        "query": path(1, 1, 0, default=""),
+        "source_type_code": path(1, 1, 1, default=1),
+        "mode_code": path(1, 2),
+        "status_code": path(1, 4),
+        "summary": path(1, 3, 1, kind=str, default=""),
+        "sources_data": path(1, 3, 0, kind=list, default=[]),
+    }
+
+    @classmethod
+    def decode(cls, data: Any) -> "ResearchTask":
+        task = super().decode(data)
+        task.sources, task.report = _decode_research_sources(task.sources_data)
+        return task
+
+    @property
+    def status(self) -> str:
+        # 1 = in_progress, 2 = completed, 6 = imported (also completed)
+        return "completed" if self.status_code in (2, 6) else "in_progress"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "task_id": self.task_id,
+            "status": self.status,
+            "query": self.query,
+            "source_type": "web" if self.source_type_code == 1 else "drive",
+            "mode": "deep" if self.mode_code == 5 else "fast",
+            "sources": [src.to_dict() for src in self.sources],
+            "source_count": len(self.sources),
+            "summary": self.summary,
+            "report": self.report,  # Deep research report (markdown)
+        }
+
+
+def _decode_research_sources(sources_data: list) -> tuple[list[ResearchSource], str]:
+    """Decode research sources; returns (sources, deep research report)."""
+    sources = []
+    report = ""
+    for idx, src in enumerate(sources_data):
+        if type(src) is not list or len(src) < 2:
+            continue
+        if src[0] is None and isinstance(src[1], str):
+            # Deep research: [None, title, None, type, None, None, [report], ...]
+            source = ResearchSource.__new__(ResearchSource)
+            source.url = ""  # Deep research doesn't have URLs in source list
+            source.title = src[1]
+            source.description = ""
+            source.result_type = _deep_source_result_type(src)
+            report_data = _deep_source_report(src)
+            if report_data:
+                report = report_data[0] if isinstance(report_data[0], str) else ""
+        elif isinstance(src[0], str) or len(src) >= 3:
+            source = ResearchSource.decode(src)
+        else:
+            continue
+        source.index = idx
+        sources.append(source)
+    return sources, report
+
+
+def decode_research_tasks(result: Any) -> list[ResearchTask]:
+    """Decode the e3bVqc (poll research) result into its tasks, most recent first."""
+    if not result or type(result) is not list:
+        return []
+    # Unwrap the outer array to get [[task_id, task_info, status], [ts1], [ts2]]
+    if type(result[0]) is list and result[0] and type(result[0][0]) is list:
+        result = result[0]
+
+    tasks = []
+    for task_data in result:
+        if type(task_data) is not list or len(task_data) < 2:
+            continue
+        # Skip timestamp arrays (task_id should be a UUID string, not an int)
+        if not isinstance(task_data[0], str):
+            continue
+        if not task_data[1] or type(task_data[1]) is not list:
+            continue
+        tasks.append(ResearchTask.decode(task_data))
+    return tasks
+
+
+# =========================================================================
+# Studio artifacts
+# =========================================================================
+
+STUDIO_TYPE_NAMES = {
+    constants.STUDIO_TYPE_AUDIO: "audio",
+    constants.STUDIO_TYPE_REPORT: "report",
+    constants.STUDIO_TYPE_VIDEO: "video",
+    constants.STUDIO_TYPE_FLASHCARDS: "flashcards",  # Also includes Quiz (type 4)
+    constants.STUDIO_TYPE_INFOGRAPHIC: "infographic",
+    constants.STUDIO_TYPE_SLIDE_DECK: "slide_deck",
+    constants.STUDIO_TYPE_DATA_TABLE: "data_table",
+}
+
+# Type-specific fields, only read for artifacts of that type
+_audio_url = path(6, 3, kind=str)
+_audio_duration = path(6, 9, 0)
+_video_url = path(8, 3, kind=str)
+_report_content = path(7, 1, 0, kind=str)
+_flashcard_cards = path(9, 1, kind=list)
+_infographic_url = path(14, 2, 0, 1, 0, kind=str)
+_slide_deck_url = path(16, 0, kind=str)
+_slide_deck_url_nested = path(16, 3, kind=str)
+# created_at position varies by type
+_created_candidates = tuple(path(pos, kind=list) for pos in (10, 15, 17))
+
+
+def _http_url(value: str | None) -> str | None:
+    return value if value is not None and value.startswith("http") else None
+
+
+class StudioArtifact(Model):
+    """A studio artifact from the gArtLc (poll studio) result."""
+
+    __slots__ = ("artifact_id", "title", "type_code", "status_code", "created_at",
+                 "audio_url", "video_url", "infographic_url", "slide_deck_url",
+                 "report_content", "flashcard_count", "duration_seconds")
+    FIELDS = {
+        "artifact_id": path(0),
+        "title": path(1, default=""),
+        "type_code": path(2),
+        "status_code": path(4),
+    }
+
+    @classmethod
+    def decode(cls, data: Any) -> "StudioArtifact":
+        artifact = super().decode(data)
+        type_code = artifact.type_code
+        is_audio = type_code == constants.STUDIO_TYPE_AUDIO
+        artifact.audio_url = _audio_url(data) if is_audio else None
+        artifact.duration_seconds = _audio_duration(data) if is_audio else None
+        artifact.video_url = _video_url(data) if type_code == constants.STUDIO_TYPE_VIDEO else None
+        artifact.infographic_url = (
+            _http_url(_infographic_url(data)) if type_code == constants.STUDIO_TYPE_INFOGRAPHIC else None
+        )
+        artifact.slide_deck_url = None
+        if type_code == constants.STUDIO_TYPE_SLIDE_DECK:
+            artifact.slide_deck_url = _http_url(_slide_deck_url(data)) or _slide_deck_url_nested(data)
+        artifact.report_content = _report_content(data) if type_code == constants.STUDIO_TYPE_REPORT else None
+        cards = _flashcard_cards(data) if type_code == constants.STUDIO_TYPE_FLASHCARDS else None
+        artifact.flashcard_count = len(cards) if cards else None
+
+        artifact.created_at = None
+        for candidate in _created_candidates:
+            ts = candidate(data)
+            # Looks like a [seconds, nanos] timestamp
+            if ts and len(ts) >= 2 and isinstance(ts[0], (int, float)) and ts[0] > 1700000000:
+                artifact.created_at = parse_timestamp(ts)
+                break
+        return artifact
+
+    @property
+    def type(self) -> str:
+        return STUDIO_TYPE_NAMES.get(self.type_code, "unknown")
+
+    @property
+    def status(self) -> str:
+        if self.status_code == 1:
+            return "in_progress"
+        return "completed" if self.status_code == 3 else "unknown"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "artifact_id": self.artifact_id,
+            "title": self.title,
+            "type": self.type,
+            "status": self.status,
+            "created_at": self.created_at,
+            "audio_url": self.audio_url,
+            "video_url": self.video_url,
+            "infographic_url": self.infographic_url,
+            "slide_deck_url": self.slide_deck_url,
+            "report_content": self.report_content,
+            "flashcard_count": self.flashcard_count,
+            "duration_seconds": self.duration_seconds,
+        }
+
+
+def decode_studio_artifacts(result: Any) -> list[StudioArtifact]:
+    """Decode the gArtLc (poll studio) result, skipping malformed entries."""
+    if not result or type(result) is not list:
+        return []
+    # Response is an array of artifacts, possibly wrapped
+    rows = result[0] if type(result[0]) is list else result
+    return [StudioArtifact.decode(row) for row in rows if type(row) is list and len(row) >= 5]
+
+
+# =========================================================================
+# Conversations
+# =========================================================================
+
+def _is_message(item: Any) -> bool:
+    return (
+        type(item) is list and len(item) == 3 and isinstance(item[0], str)
+        and item[1] is None and item[2] in (1, 2)
+    )
+
+
+def _history_turns(row: list) -> list[tuple[str, str]]:
+    """(query, answer) pairs of a conversation row, or [] if it has no recognisable messages.
+
+    Only a row field that is a list made entirely of [text, null, role]
+    messages is read, and only when the messages form whole turns (one user
+    and one AI message each). Anything else restores nothing rather than
+    feed guessed text into a follow-up.
+    """
+    for field in row[1:]:
+        if type(field) is not list or not field or not all(_is_message(item) for item in field):
+            continue
+        if len(field) % 2:
+            return []
+        turns = []
+        for first, second in zip(field[::2], field[1::2]):
+            roles = {first[2]: first[0], second[2]: second[0]}
+            if len(roles) != 2:
+                return []
+            turns.append((roles[1], roles[2]))
+        return turns
+    return []
+
+
+_conversation_id = path(0, kind=str)
+
+
+def decode_conversations(result: Any) -> dict[str, list[tuple[str, str]]]:
+    """Decode the hPTbtc (notebook conversations) result into {id: [(query, answer), ...]}.
+
+    Unverified: the repo only documents hPTbtc as returning conversation IDs.
+    Message lists are assumed to use the query history layout
+    ([text, null, role], 1 = user, 2 = AI, a turn's two messages next to each
+    other, oldest turn first). Conversations listed without messages, or
+    with messages in any other shape, map to an empty list.
+    """
+    if not result or type(result) is not list:
+        return {}
+    # Usually wrapped once: [[[conversation_id, ...], ...]]
+    rows = result[0] if type(path(0, 0)(result)) is list else result
+    conversations = {}
+    for row in rows:
+        conversation_id = _conversation_id(row)
+        if conversation_id:
+            conversations[conversation_id] = _history_turns(row)
+    return conversations
@@ -0,0 +1,251 @@
+"""Incremental decoder for length-prefixed batchexecute responses.
+
+batchexecute (rt=c) and GenerateFreeFormStreamed bodies look like:
+
+    )]}'
+    <count>
+    <json payload>
+    <count>
+    <json payload>
+    ...
+
+FrameDecoder consumes the body as bytes - whole or fed chunk by chunk from a
+streaming response - and returns each JSON payload as soon as it is complete,
+without decoding the body to str or splitting it into lines. Payloads may
+contain raw newlines.
+
+Google counts payloads in characters (UTF-16 code units), which equals the
+byte length for ASCII. The fast path slices exactly <count> bytes; when that
+slice is not a complete JSON value (non-ASCII text) the count is converted to
+a byte length, and only if that fails too is the end of the JSON value found
+by decoding it.
+"""
+
+import json
+from typing import Any
+
+from . import codec
+
+XSSI_PREFIX = b")]}'"
+
+_WHITESPACE = b" \t\r\n"
+_DIGITS = b"0123456789"
+
+
+class FrameDecoder:
+    """Incremental decoder for `<count>\\n<json>` framed response bodies.
+
+    Usage:
+        decoder = FrameDecoder()
+        for chunk in response.iter_bytes():
+            for payload in decoder.feed(chunk):
+                ...
+        for payload in decoder.finish():
+            ...
+    """
+
+    __slots__ = ("_buffer", "_pos", "_started", "_wait_until", "_raw_decoder")
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._pos = 0  # Start of the unconsumed part of _buffer
+        self._started = False  # Anti-XSSI prefix handled
+        self._wait_until = 0  # Buffer length needed before the next frame can complete
+        self._raw_decoder = json.JSONDecoder()
+
+    def feed(self, data: bytes | bytearray | memoryview) -> list[Any]:
+        """Add response bytes and return the payloads completed by them."""
+        self._buffer += data
+        if len(self._buffer) < self._wait_until:
+            return []
+        return self._drain(final=False)
+
+    def finish(self) -> list[Any]:
+        """Return any payloads left once the response has ended."""
+        payloads = self._drain(final=True)
+        self._buffer.clear()
+        self._pos = 0
+        self._wait_until = 0
+        return payloads
+
+    def _drain(self, final: bool) -> list[Any]:
+        payloads = []
+        while True:
+            found, payload = self._next_frame(final)
+            if not found:
+                break
+            if payload is not None:
+                payloads.append(payload)
+
+        # Drop consumed bytes once they dominate the buffer (amortised O(n))
+        if self._pos and self._pos * 2 >= len(self._buffer):
+            del self._buffer[:self._pos]
+            self._wait_until = max(0, self._wait_until - self._pos)
+            self._pos = 0
+        return payloads
+
+    def _skip_whitespace(self) -> None:
+        buffer = self._buffer
+        end = len(buffer)
+        pos = self._pos
+        while pos < end and buffer[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+
+    def _wait(self, needed: int = 0) -> tuple[bool, Any]:
+        """Stop draining until the buffer holds at least `needed` bytes."""
+        self._wait_until = max(needed, len(self._buffer) + 1)
+        return False, None
+
+    def _next_frame(self, final: bool) -> tuple[bool, Any]:
+        """Consume one frame. Returns (consumed, payload); payload is None if unparseable."""
+        buffer = self._buffer
+        self._wait_until = 0
+
+        if not self._started:
+            self._skip_whitespace()
+            rest = bytes(buffer[self._pos:self._pos + len(XSSI_PREFIX)])
+            if len(rest) < len(XSSI_PREFIX) and XSSI_PREFIX.startswith(rest) and not final:
+                # Can't tell yet whether the body starts with the prefix
+                return self._wait()
+            if rest == XSSI_PREFIX:
+                self._pos += len(XSSI_PREFIX)
+            self._started = True
+
+        self._skip_whitespace()
+        start = self._pos
+        if start >= len(buffer):
+            return False, None
+
+        if buffer[start] not in _DIGITS:
+            # Unframed JSON (or junk): decode one line directly
+            return self._consume_unframed(start, final)
+
+        newline = buffer.find(b"\n", start)
+        if newline == -1:
+            if final:
+                # Trailing bare number with no payload
+                self._pos = len(buffer)
+                return True, None
+            return self._wait()
+
+        try:
+            count = int(buffer[start:newline])
+        except ValueError:
+            # Digits followed by something else - treat the line as unframed JSON
+            return self._consume_unframed(start, final)
+
+        payload_start = newline + 1
+        payload_end = payload_start + count
+        if payload_end > len(buffer) and not final:
+            # The payload is at least <count> bytes long
+            return self._wait(payload_end)
+
+        # The count may or may not include the newline that ends the count line
+        for begin in (payload_start, newline):
+            # Fast path: count == byte length (ASCII payloads)
+            payload = self._loads(begin, begin + count)
+            if payload is not _INCOMPLETE:
+                self._pos = begin + count
+                return True, payload
+
+        for begin in (payload_start, newline):
+            # Count in UTF-16 code units: convert it to a byte length
+            byte_length, missing = self._utf16_units_to_bytes(begin, count)
+            if byte_length is None:
+                if not final:
+                    # Every missing code unit is at least one more byte: wait for
+                    # them, so a long non-ASCII payload is rescanned O(log n) times
+                    # rather than once per chunk
+                    return self._wait(len(buffer) + missing)
+                continue
+            payload = self._loads(begin, begin + byte_length)
+            if payload is not _INCOMPLETE:
+                self._pos = begin + byte_length
+                return True, payload
+
+        # Last resort: the count is off (e.g. includes the separator) - find
+        # the end of the JSON value itself
+        return self._consume_json_value(payload_start, count, final)
+
+    def _loads(self, start: int, end: int) -> Any:
+        if end > len(self._buffer):
+            return _INCOMPLETE
+        # Decode straight from a view of the buffer - no slice copy for codecs
+        # that accept memoryviews. Views are released before returning so the
+        # bytearray can grow again.
+        with memoryview(self._buffer) as view, view[start:end] as data:
+            try:
+                return codec.loads(data)
+            except codec.DECODE_ERRORS:
+                return _INCOMPLETE
+
+    def _utf16_units_to_bytes(self, start: int, units: int) -> tuple[int | None, int]:
+        """UTF-8 byte length of the first `units` UTF-16 code units at start.
+
+        Returns (byte_length, 0), or (None, missing) with the number of code
+        units not received yet.
+        """
+        # A UTF-16 code unit takes at most 3 UTF-8 bytes
+        text = _decode_prefix(bytes(self._buffer[start:start + 3 * units + 3]))
+        encoded = text.encode("utf-16-le")
+        if len(encoded) < 2 * units:
+            return None, units - len(encoded) // 2
+        prefix = encoded[:2 * units].decode("utf-16-le", errors="ignore")
+        return len(prefix.encode("utf-8")), 0
+
+    def _consume_json_value(self, payload_start: int, count: int, final: bool) -> tuple[bool, Any]:
+        """Find the end of the JSON value starting at payload_start by decoding it."""
+        data = bytes(self._buffer[payload_start:])
+        text = data.decode("utf-8", errors="replace") if final else _decode_prefix(data)
+        offset = len(text) - len(text.lstrip())
+        try:
+            payload, end = self._raw_decoder.raw_decode(text, offset)
+        except json.JSONDecodeError:
+            if not final:
+                # Truncated and invalid input can't be told apart until the body ends
+                return self._wait()
+            # Invalid or truncated payload - skip <count> bytes and carry on
+            self._pos = min(payload_start + count, len(self._buffer))
+            return True, None
+
+        self._pos = payload_start + len(text[:end].encode("utf-8"))
+        return True, payload
+
+    def _consume_unframed(self, start: int, final: bool) -> tuple[bool, Any]:
+        """Consume a line that has no count prefix (legacy / unexpected format)."""
+        newline = self._buffer.find(b"\n", start)
+        if newline == -1:
+            if not final:
+                return self._wait()
+            newline = len(self._buffer)
+        try:
+            payload = codec.loads(bytes(self._buffer[start:newline]))
+        except codec.DECODE_ERRORS:
+            payload = None
+        self._pos = newline
+        return True, payload
+
+
+_INCOMPLETE = object()
+
+
+def _decode_prefix(data: bytes) -> str:
+    """Decode UTF-8, leaving out a trailing partial character."""
+    # At most 3 trailing bytes can belong to an incomplete character
+    for cut in range(4):
+        try:
+            return data[:len(data) - cut].decode("utf-8")
+        except UnicodeDecodeError:
+            continue
+    return data.decode("utf-8", errors="replace")
+
+
+def decode_frames(body: bytes | str) -> list[Any]:
+    """Decode a complete framed response body into its JSON payloads."""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    decoder = FrameDecoder()
+    payloads = decoder.feed(body)
+    payloads.extend(decoder.finish())
+    return payloads
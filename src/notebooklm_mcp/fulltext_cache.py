@@ -0,0 +1,216 @@
+"""Persistent cache of source full text.
+
+get_source_fulltext (hizoJc) downloads the whole indexed text of a source,
+which is megabytes for big PDFs, on every call. FulltextCache keeps the
+decoded result on disk in SQLite (~/.notebooklm-mcp/fulltext.sqlite3) so
+repeated reads and server restarts are served locally.
+
+Storage is content-addressed: text is zlib-compressed and stored once per
+SHA-256 of the text, and each source row points at its blob. Sources with
+identical text (the same PDF in two notebooks) share a blob.
+
+A cached entry is served when:
+- the source's current metadata fingerprint matches the one stored with
+  it. The fingerprint comes from a cached notebook that lists the source
+  (NotebookCache.source_version); past its TTL the client refetches the
+  get_notebook structure of the notebook last seen listing the source
+  (NotebookCache.source_owner), a small request next to the text. Or:
+- no fingerprint is known (the source has not been seen in any notebook
+  since the server started) and the entry is younger than the max age,
+  5 minutes by default.
+
+Re-syncing a Drive source changes its metadata, so the text is fetched
+again. sync_drive_source and delete_source through this client drop the
+entry at once. Least recently read sources are evicted when the stored
+blobs exceed the size limit.
+
+Environment overrides:
+    NOTEBOOKLM_FULLTEXT_CACHE=0|1          Enable the cache (default 1)
+    NOTEBOOKLM_FULLTEXT_CACHE_MB=<n>       Size limit of compressed text (default 256)
+    NOTEBOOKLM_FULLTEXT_MAX_AGE=<secs>     Max age without a fingerprint (default 300)
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any
+
+from . import codec
+
+logger = logging.getLogger("notebooklm_mcp.api")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    source_id TEXT PRIMARY KEY,
+    blob_hash TEXT NOT NULL,
+    meta TEXT NOT NULL,
+    version TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sources_accessed ON sources (accessed_at);
+"""
+
+
+def default_cache_path() -> Path:
+    """~/.notebooklm-mcp/fulltext.sqlite3 (next to the auth cache)."""
+    return Path.home() / ".notebooklm-mcp" / "fulltext.sqlite3"
+
+
+class FulltextCache:
+    """SQLite-backed, size-bounded LRU of get_source_fulltext results."""
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: float = 300.0,
+        enabled: bool = True,
+    ):
+        """
+        Args:
+            path: Database file (default: default_cache_path()); opened on first use
+            max_bytes: Limit on the compressed text kept
+            max_age: Seconds an entry is trusted when no fingerprint is known
+            enabled: False turns every call into a miss and stores nothing
+        """
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "FulltextCache":
+        """Defaults, overridden by NOTEBOOKLM_FULLTEXT_* environment variables."""
+        def env(name: str, default: float) -> float:
+            try:
+                return float(os.environ[name])
+            except (KeyError, ValueError):
+                return default
+
+        return cls(
+            max_bytes=int(env("NOTEBOOKLM_FULLTEXT_CACHE_MB", 256) * 1024 * 1024),
+            max_age=env("NOTEBOOKLM_FULLTEXT_MAX_AGE", 300.0),
+            enabled=os.environ.get("NOTEBOOKLM_FULLTEXT_CACHE", "1").lower() not in ("0", "false", "no"),
+        )
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """Open the database on first use; on failure, run without the cache."""
+        if self._db is None and self.enabled:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(self.path, check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.executescript(_SCHEMA)
+                self._db = db
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Fulltext cache disabled, cannot open {self.path}: {e}")
+                self.enabled = False
+        return self._db
+
+    def get(self, source_id: str, version: str | None = None) -> dict[str, Any] | None:
+        """Cached fulltext result for the source, or None if absent or stale."""
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT s.meta, s.version, s.fetched_at, b.data FROM sources s "
+                "JOIN blobs b ON b.hash = s.blob_hash WHERE s.source_id = ?",
+                (source_id,),
+            ).fetchone()
+            now = time.time()
+            if row is None or not self._is_fresh(row[1], row[2], version, now):
+                self.misses += 1
+                return None
+            with db:
+                db.execute("UPDATE sources SET accessed_at = ? WHERE source_id = ?", (now, source_id))
+            self.hits += 1
+            meta, data = row[0], row[3]
+        result = codec.loads(meta)
+        result["content"] = zlib.decompress(data).decode("utf-8")
+        return result
+
+    def _is_fresh(self, stored: str | None, fetched_at: float, version: str | None, now: float) -> bool:
+        if version is not None:
+            return stored == version
+        return now - fetched_at < self.max_age
+
+    def put(self, source_id: str, result: dict[str, Any], version: str | None = None) -> None:
+        """Store a fulltext result, then evict down to the size limit."""
+        content = result.get("content") or ""
+        if not content:
+            return
+        text = content.encode("utf-8")
+        blob_hash = hashlib.sha256(text).hexdigest()
+        meta = codec.dumps({key: value for key, value in result.items() if key != "content"})
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return
+            now = time.time()
+            with db:
+                exists = db.execute("SELECT 1 FROM blobs WHERE hash = ?", (blob_hash,)).fetchone()
+                if not exists:
+                    data = zlib.compress(text, 6)
+                    db.execute("INSERT INTO blobs VALUES (?, ?, ?)", (blob_hash, data, len(data)))
+                db.execute(
+                    "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?)",
+                    (source_id, blob_hash, meta, version, now, now),
+                )
+                self._evict(db)
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        """Drop least recently read sources until the blobs fit in max_bytes."""
+        self._drop_orphans(db)
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        while total > self.max_bytes:
+            oldest = db.execute("SELECT source_id FROM sources ORDER BY accessed_at LIMIT 1").fetchone()
+            if oldest is None:
+                break
+            db.execute("DELETE FROM sources WHERE source_id = ?", oldest)
+            self._drop_orphans(db)
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    @staticmethod
+    def _drop_orphans(db: sqlite3.Connection) -> None:
+        db.execute("DELETE FROM blobs WHERE hash NOT IN (SELECT blob_hash FROM sources)")
+
+    def invalidate(self, source_id: str) -> None:
+        """Forget a source (after the client synced or deleted it)."""
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return
+            with db:
+                db.execute("DELETE FROM sources WHERE source_id = ?", (source_id,))
+                self._drop_orphans(db)
+
+    def stats(self) -> dict[str, Any]:
+        """Entry count, stored bytes and hit/miss counters."""
+        with self._lock:
+            db = self._connect()
+            sources, size = (0, 0) if db is None else db.execute(
+                "SELECT (SELECT COUNT(*) FROM sources), (SELECT COALESCE(SUM(size), 0) FROM blobs)"
+            ).fetchone()
+        return {"enabled": self.enabled, "sources": sources, "bytes": size, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
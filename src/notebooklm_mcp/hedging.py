@@ -0,0 +1,147 @@
+"""Hedged requests for read-only RPCs (async client).
+
+Composite tools chain several reads, so one slow get_notebook or poll sets
+the latency of the whole tool. With hedging on, a read that has not
+answered after its RPC's observed p95 latency gets one duplicate request,
+and whichever response arrives first wins; the other is cancelled.
+
+Hedges are extra load on the account, so they are capped by a budget
+shared by all clients: each request earns `ratio` of a hedge (10% by
+default), up to a small reserve. No hedge is sent for an RPC until enough
+latency samples exist to know its p95.
+
+Environment overrides:
+    NOTEBOOKLM_HEDGE=0|1                Enable hedging (default 0)
+    NOTEBOOKLM_HEDGE_BUDGET=<ratio>     Hedges per request sent (default 0.1)
+    NOTEBOOKLM_HEDGE_MIN_DELAY=<secs>   Lower bound of the hedge delay (default 0.05)
+"""
+
+import os
+from collections import deque
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+
+class LatencyWindow:
+    """Most recent latencies of one RPC."""
+
+    __slots__ = ("samples", "hedged", "hedge_wins")
+
+    def __init__(self, size: int):
+        self.samples: deque[float] = deque(maxlen=size)
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Hedger:
+    """Per-RPC hedge delays plus a global hedge budget.
+
+    Not thread-safe: it is used from the event loop of the async client.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        ratio: float = 0.1,
+        reserve: float = 5.0,
+        min_delay: float = 0.05,
+        percentile: float = 0.95,
+        window: int = 100,
+        min_samples: int = 20,
+        labels: Mapping[str, str] | None = None,
+    ):
+        """
+        Args:
+            enabled: Send hedges at all (latency is only tracked when enabled)
+            ratio: Hedge budget earned per request
+            reserve: Max unspent hedges kept for bursts
+            min_delay: Lower bound of the hedge delay in seconds
+            percentile: Latency percentile that triggers the hedge
+            window: Latency samples kept per RPC
+            min_samples: Samples needed before an RPC is hedged
+            labels: rpc_id -> readable name for stats()
+        """
+        self.enabled = enabled
+        self._ratio = ratio
+        self._reserve = reserve
+        self._min_delay = min_delay
+        self._percentile = percentile
+        self._window = window
+        self._min_samples = max(1, min_samples)
+        self._labels = dict(labels or {})
+        self._tokens = reserve
+        self._latencies: dict[str, LatencyWindow] = {}
+
+    @classmethod
+    def from_env(cls, labels: Mapping[str, str] | None = None) -> "Hedger":
+        """Defaults, overridden by NOTEBOOKLM_HEDGE* environment variables."""
+        def env(name: str, default: float) -> float:
+            try:
+                return float(os.environ[name])
+            except (KeyError, ValueError):
+                return default
+
+        return cls(
+            enabled=os.environ.get("NOTEBOOKLM_HEDGE", "").lower() in ("1", "true", "yes"),
+            ratio=env("NOTEBOOKLM_HEDGE_BUDGET", 0.1),
+            min_delay=env("NOTEBOOKLM_HEDGE_MIN_DELAY", 0.05),
+            labels=labels,
+        )
+
+    def _window_for(self, rpc_id: str) -> LatencyWindow:
+        window = self._latencies.get(rpc_id)
+        if window is None:
+            window = self._latencies[rpc_id] = LatencyWindow(self._window)
+        return window
+
+    def _delay_for(self, window: LatencyWindow) -> float:
+        return max(self._min_delay, window.percentile(self._percentile))
+
+    def delay(self, rpc_ids: Iterable[str]) -> float | None:
+        """Seconds to wait before hedging a request, or None if it is not hedged.
+
+        Every request counts towards the budget, hedged or not.
+        """
+        self._tokens = min(self._reserve, self._tokens + self._ratio)
+        windows = [self._latencies.get(rpc_id) for rpc_id in rpc_ids]
+        if not windows or any(w is None or len(w.samples) < self._min_samples for w in windows):
+            return None
+        return max(self._delay_for(w) for w in windows)
+
+    def try_spend(self, rpc_ids: Iterable[str]) -> bool:
+        """Take one hedge from the budget."""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        for rpc_id in rpc_ids:
+            self._window_for(rpc_id).hedged += 1
+        return True
+
+    def record(self, rpc_ids: Iterable[str], latency: float, hedge_won: bool = False) -> None:
+        """Record a successful response's latency."""
+        for rpc_id in rpc_ids:
+            window = self._window_for(rpc_id)
+            window.samples.append(latency)
+            if hedge_won:
+                window.hedge_wins += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Hedge delay, hedges sent and hedges that won per RPC."""
+        return {
+            "enabled": self.enabled,
+            "budget": round(self._tokens, 2),
+            "rpcs": {
+                self._labels.get(rpc_id, rpc_id): {
+                    "rpc_id": rpc_id,
+                    "samples": len(window.samples),
+                    "hedge_delay": round(self._delay_for(window), 3) if window.samples else None,
+                    "hedged": window.hedged,
+                    "hedge_wins": window.hedge_wins,
+                }
+                for rpc_id, window in self._latencies.items()
+            },
+        }
@@ -0,0 +1,274 @@
+"""In-process caches of notebook structure and the notebook list.
+
+query() fetches the notebook on every question to learn its source IDs,
+and every studio tool lists the notebook's sources before doing real work.
+NotebookCache keeps the get_notebook result for a short TTL, along with
+its decoded sources and source IDs, so those calls skip a round trip.
+
+The client's own mutations invalidate what they touch: adding, deleting,
+syncing or importing sources, and renaming, configuring or deleting the
+notebook. Source-level calls only know the source ID, so those drop every
+cached notebook listing the source. Changes made elsewhere (the web UI, another
+process) show up once the TTL expires.
+
+A fetch that was already in flight when a mutation happened is not
+stored, so it cannot put pre-mutation data back into the cache.
+
+NotebookCache also remembers which notebook each source was last listed in
+(source_owner), beyond the TTL, so source-level calls that only know the
+source ID can refetch its notebook to check whether the source changed.
+
+NotebookListCache holds the last list_notebooks snapshot and serves it
+stale-while-revalidate: within the freshness window it is returned as is;
+after that it is still returned at once while one background refresh
+replaces it. Past the max staleness (or after any mutation made through
+the client) callers wait for a fresh listing.
+
+Environment overrides:
+    NOTEBOOKLM_NOTEBOOK_CACHE_TTL=<secs>         Entry lifetime (default 60, 0 = no caching)
+    NOTEBOOKLM_NOTEBOOK_LIST_FRESH=<secs>        Listing served without a refresh (default 30)
+    NOTEBOOKLM_NOTEBOOK_LIST_MAX_STALE=<secs>    Oldest listing served at all (default 3600, 0 = no caching)
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from . import codec
+from .decoders import Notebook, Source, decode_sources, notebook_modified_data, notebook_sources_data
+
+
+def fingerprint(data: Any) -> str:
+    """Short stable hash of JSON-like data."""
+    return hashlib.sha256(codec.dumps(data).encode()).hexdigest()[:16]
+
+
+class CachedNotebook:
+    """A get_notebook result and its lazily decoded sources."""
+
+    __slots__ = ("result", "expires_at", "_sources")
+
+    def __init__(self, result: Any, expires_at: float):
+        self.result = result
+        self.expires_at = expires_at
+        self._sources: list[Source] | None = None
+
+    @property
+    def sources(self) -> list[Source]:
+        if self._sources is None:
+            self._sources = decode_sources(notebook_sources_data(self.result))
+        return self._sources
+
+    @property
+    def source_ids(self) -> list[str]:
+        return [source.id for source in self.sources if isinstance(source.id, str)]
+
+    @property
+    def fingerprint(self) -> str | None:
+        """Hash of the source set, source metadata and modified time (None if not found)."""
+        if not self.result:
+            return None
+        sources = [[source.id, source.metadata] for source in self.sources]
+        return fingerprint([notebook_modified_data(self.result), sources])
+
+    def source_version(self, source_id: str) -> str | None:
+        """Fingerprint of a listed source's metadata (None if not listed)."""
+        for source in self.sources:
+            if source.id == source_id:
+                return fingerprint(source.metadata)
+        return None
+
+
+class NotebookCache:
+    """TTL cache of get_notebook results keyed by notebook ID."""
+
+    # Source -> notebook pairs remembered, least recently listed dropped first
+    MAX_OWNERS = 4096
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict[str, CachedNotebook] = {}
+        self._owners: OrderedDict[str, str] = OrderedDict()
+        # Bumped by every invalidation; fetches that straddle one are not stored
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "NotebookCache":
+        """Default TTL, overridden by NOTEBOOKLM_NOTEBOOK_CACHE_TTL."""
+        try:
+            ttl = float(os.environ["NOTEBOOKLM_NOTEBOOK_CACHE_TTL"])
+        except (KeyError, ValueError):
+            ttl = 60.0
+        return cls(ttl=ttl)
+
+    def get(self, notebook_id: str) -> CachedNotebook | None:
+        """Fresh entry for the notebook, or None."""
+        with self._lock:
+            entry = self._entries.get(notebook_id)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self.hits += 1
+                return entry
+            if entry is not None:
+                del self._entries[notebook_id]
+            self.misses += 1
+            return None
+
+    def epoch(self) -> int:
+        """Token to take before fetching; pass it to put()."""
+        return self._epoch
+
+    def put(self, notebook_id: str, result: Any, epoch: int) -> CachedNotebook:
+        """Store a fetched result unless a mutation happened since `epoch`."""
+        entry = CachedNotebook(result, time.monotonic() + self.ttl)
+        source_ids = entry.source_ids if result else []
+        with self._lock:
+            if result and self.ttl > 0 and epoch == self._epoch:
+                self._entries[notebook_id] = entry
+            for source_id in source_ids:
+                self._owners[source_id] = notebook_id
+                self._owners.move_to_end(source_id)
+            while len(self._owners) > self.MAX_OWNERS:
+                self._owners.popitem(last=False)
+        return entry
+
+    def invalidate(self, notebook_id: str) -> None:
+        """Drop a notebook."""
+        with self._lock:
+            self._epoch += 1
+            self._entries.pop(notebook_id, None)
+
+    def invalidate_source(self, source_id: str) -> None:
+        """Drop every cached notebook that contains the source."""
+        with self._lock:
+            self._epoch += 1
+            stale = [nb_id for nb_id, entry in self._entries.items() if source_id in entry.source_ids]
+            for notebook_id in stale:
+                del self._entries[notebook_id]
+
+    def source_version(self, source_id: str) -> str | None:
+        """Fingerprint of a source's metadata from any fresh cached notebook listing it.
+
+        None when no cached notebook lists the source. Used to revalidate
+        cached source content (fulltext_cache.py).
+        """
+        now = time.monotonic()
+        with self._lock:
+            entries = [entry for entry in self._entries.values() if entry.expires_at > now]
+        for entry in entries:
+            version = entry.source_version(source_id)
+            if version is not None:
+                return version
+        return None
+
+    def source_owner(self, source_id: str) -> str | None:
+        """Notebook that last listed the source in a fetched get_notebook result, if any."""
+        with self._lock:
+            return self._owners.get(source_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+
+class NotebookListSnapshot:
+    """A list_notebooks result and when it was fetched."""
+
+    __slots__ = ("notebooks", "fetched_at", "fresh_for")
+
+    def __init__(self, notebooks: list[Notebook], fetched_at: float, fresh_for: float):
+        self.notebooks = notebooks
+        self.fetched_at = fetched_at
+        self.fresh_for = fresh_for
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    @property
+    def fresh(self) -> bool:
+        return self.age < self.fresh_for
+
+
+class NotebookListCache:
+    """Stale-while-revalidate holder of the latest notebook list."""
+
+    def __init__(self, fresh_for: float = 30.0, max_stale: float = 3600.0):
+        """
+        Args:
+            fresh_for: Age below which the snapshot is served without a refresh
+            max_stale: Age above which it is not served at all (0 disables the cache)
+        """
+        self.fresh_for = fresh_for
+        self.max_stale = max_stale
+        self._lock = threading.Lock()
+        self._snapshot: NotebookListSnapshot | None = None
+        self._epoch = 0
+        self._refreshing = False
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "NotebookListCache":
+        """Defaults, overridden by NOTEBOOKLM_NOTEBOOK_LIST_* environment variables."""
+        def env(name: str, default: float) -> float:
+            try:
+                return float(os.environ[name])
+            except (KeyError, ValueError):
+                return default
+
+        return cls(
+            fresh_for=env("NOTEBOOKLM_NOTEBOOK_LIST_FRESH", 30.0),
+            max_stale=env("NOTEBOOKLM_NOTEBOOK_LIST_MAX_STALE", 3600.0),
+        )
+
+    def get(self) -> NotebookListSnapshot | None:
+        """Snapshot that may be served (fresh or stale), or None."""
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.age >= self.max_stale:
+                self._snapshot = None
+                self.misses += 1
+                return None
+            if snapshot.fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return snapshot
+
+    def epoch(self) -> int:
+        """Token to take before fetching; pass it to put()."""
+        return self._epoch
+
+    def put(self, notebooks: list[Notebook], epoch: int) -> NotebookListSnapshot:
+        """Store a fetched listing unless a mutation happened since `epoch`."""
+        snapshot = NotebookListSnapshot(notebooks, time.monotonic(), self.fresh_for)
+        with self._lock:
+            if self.max_stale > 0 and epoch == self._epoch:
+                self._snapshot = snapshot
+        return snapshot
+
+    def start_refresh(self) -> bool:
+        """Claim the single background refresh slot; False if one is running."""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+            return True
+
+    def end_refresh(self) -> None:
+        with self._lock:
+            self._refreshing = False
+
+    def invalidate(self) -> None:
+        """Drop the snapshot (after a mutation that changes the listing)."""
+        with self._lock:
+            self._epoch += 1
+            self._snapshot = None
@@ -0,0 +1,329 @@
+"""Client-side rate limiting for one Google account.
+
+Two controls apply to every request before it is sent:
+
+- Token buckets keyed by rpc_id cap the request rate per RPC, with bursts.
+- An AIMD concurrency limit per connection lane caps requests in flight.
+  Each success raises the limit by 1/limit (about +1 per window of calls),
+  and an HTTP 429/503 halves it (at most once per cooldown). Concurrency
+  then settles just under the account's real ceiling. Without it, a burst
+  of tool calls overloads the account and backs off to idle in turn.
+
+The same RateLimiter works for the sync and async clients. Its state sits
+behind a threading lock: sync callers block in slot(), async ones await aslot().
+
+Environment overrides:
+    NOTEBOOKLM_RPC_RATE=<per sec>       Token refill rate per rpc_id (default 10, 0 = unlimited)
+    NOTEBOOKLM_RPC_BURST=<n>            Bucket size per rpc_id (default 20)
+    NOTEBOOKLM_MAX_CONCURRENCY=<n>      Upper bound of the AIMD limit (default 32)
+"""
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from collections.abc import AsyncIterator, Iterable, Iterator, Mapping
+from typing import Any
+
+import httpx
+
+# Responses that mean "slow down" rather than "this call failed"
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+
+
+class TokenBucket:
+    """Refilling token bucket (rate tokens/second, up to capacity)."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def wait_time(self, count: int, now: float) -> float:
+        """Seconds until `count` tokens are available (0 if they are now)."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        # A batch larger than the bucket only waits for a full bucket
+        missing = min(count, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate)
+
+    def take(self, count: int) -> None:
+        self.tokens -= min(count, self.capacity)
+
+
+class AimdLimit:
+    """Additive-increase / multiplicative-decrease concurrency limit."""
+
+    __slots__ = ("limit", "minimum", "maximum", "backoff", "cooldown", "in_flight", "last_decrease")
+
+    def __init__(self, initial: float, minimum: float, maximum: float, backoff: float, cooldown: float):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.last_decrease = float("-inf")
+
+    @property
+    def has_room(self) -> bool:
+        return self.in_flight < max(1, int(self.limit))
+
+    def on_success(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def on_throttle(self, now: float) -> None:
+        # Responses to requests sent before the last cut carry no new information
+        if now - self.last_decrease >= self.cooldown:
+            self.limit = max(self.minimum, self.limit * self.backoff)
+            self.last_decrease = now
+
+
+class RpcStats:
+    """Per-rpc_id counters."""
+
+    __slots__ = ("admitted", "throttled", "waits", "waited_seconds")
+
+    def __init__(self) -> None:
+        self.admitted = 0
+        self.throttled = 0
+        self.waits = 0
+        self.waited_seconds = 0.0
+
+
+class RateLimiter:
+    """Token buckets per rpc_id plus an AIMD concurrency limit per lane."""
+
+    LANES = ("short", "long")
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: float = 20.0,
+        rates: Mapping[str, float] | None = None,
+        initial_concurrency: float = 8.0,
+        min_concurrency: float = 1.0,
+        max_concurrency: float = 32.0,
+        backoff: float = 0.5,
+        cooldown: float = 1.0,
+        labels: Mapping[str, str] | None = None,
+    ):
+        """
+        Args:
+            rate: Tokens per second per rpc_id (0 disables the buckets)
+            burst: Bucket capacity per rpc_id
+            rates: Per-rpc_id overrides of `rate`
+            initial_concurrency: Starting in-flight limit per lane
+            min_concurrency: Floor the limit backs off to
+            max_concurrency: Ceiling the limit grows to
+            backoff: Factor applied to the limit on 429/503
+            cooldown: Seconds between two decreases
+            labels: rpc_id -> readable name for stats()
+        """
+        self._rate = rate
+        self._burst = burst
+        self._rates = dict(rates or {})
+        self._labels = dict(labels or {})
+        self._cond = threading.Condition()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._stats: dict[str, RpcStats] = {}
+        self._lanes = {
+            lane: AimdLimit(initial_concurrency, min_concurrency, max_concurrency, backoff, cooldown)
+            for lane in self.LANES
+        }
+        # Async waiters blocked on a concurrency slot: (loop, future)
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @classmethod
+    def from_env(cls, labels: Mapping[str, str] | None = None) -> "RateLimiter":
+        """Defaults, overridden by NOTEBOOKLM_* environment variables."""
+        def env(name: str, default: float) -> float:
+            try:
+                return float(os.environ[name])
+            except (KeyError, ValueError):
+                return default
+
+        return cls(
+            rate=env("NOTEBOOKLM_RPC_RATE", 10.0),
+            burst=env("NOTEBOOKLM_RPC_BURST", 20.0),
+            max_concurrency=env("NOTEBOOKLM_MAX_CONCURRENCY", 32.0),
+            labels=labels,
+        )
+
+    # =========================================================================
+    # Admission
+    # =========================================================================
+
+    def _bucket(self, rpc_id: str, now: float) -> TokenBucket | None:
+        bucket = self._buckets.get(rpc_id)
+        if bucket is None:
+            rate = self._rates.get(rpc_id, self._rate)
+            if rate <= 0:
+                return None
+            bucket = self._buckets[rpc_id] = TokenBucket(rate, max(1.0, self._burst), now)
+        return bucket
+
+    def _try_admit(self, counts: dict[str, int], lane: str) -> float | None:
+        """Admit the request if possible (caller holds the lock).
+
+        Returns 0 when admitted, the seconds to wait for tokens, or None to
+        wait until a concurrency slot frees up.
+        """
+        limit = self._lanes[lane]
+        if not limit.has_room:
+            return None
+
+        now = time.monotonic()
+        buckets = [(self._bucket(rpc_id, now), count) for rpc_id, count in counts.items()]
+        wait = max((bucket.wait_time(count, now) for bucket, count in buckets if bucket), default=0.0)
+        if wait > 0:
+            return wait
+
+        for bucket, count in buckets:
+            if bucket:
+                bucket.take(count)
+        for rpc_id, count in counts.items():
+            self._rpc_stats(rpc_id).admitted += count
+        limit.in_flight += 1
+        return 0.0
+
+    def _rpc_stats(self, rpc_id: str) -> RpcStats:
+        stats = self._stats.get(rpc_id)
+        if stats is None:
+            stats = self._stats[rpc_id] = RpcStats()
+        return stats
+
+    def _record_wait(self, counts: dict[str, int], waited: float) -> None:
+        with self._cond:
+            for rpc_id in counts:
+                stats = self._rpc_stats(rpc_id)
+                stats.waits += 1
+                stats.waited_seconds += waited
+
+    def acquire(self, rpc_ids: Iterable[str], lane: str = "short") -> None:
+        """Block until the request may be sent."""
+        counts = _count(rpc_ids)
+        started = None
+        with self._cond:
+            while (wait := self._try_admit(counts, lane)) != 0:
+                started = started or time.monotonic()
+                self._cond.wait(wait)
+        if started is not None:
+            self._record_wait(counts, time.monotonic() - started)
+
+    async def acquire_async(self, rpc_ids: Iterable[str], lane: str = "short") -> None:
+        """Wait (without blocking the event loop) until the request may be sent."""
+        counts = _count(rpc_ids)
+        started = None
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                wait = self._try_admit(counts, lane)
+                if wait == 0:
+                    break
+                future = loop.create_future()
+                self._async_waiters.append((loop, future))
+            started = started or time.monotonic()
+            # Woken early by release(); otherwise recheck once tokens refill
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(future, wait)
+        if started is not None:
+            self._record_wait(counts, time.monotonic() - started)
+
+    def release(self, rpc_ids: Iterable[str], lane: str = "short", throttled: bool = False,
+                succeeded: bool = True) -> None:
+        """Return the concurrency slot and feed the outcome to the AIMD limit."""
+        with self._cond:
+            limit = self._lanes[lane]
+            limit.in_flight -= 1
+            if throttled:
+                limit.on_throttle(time.monotonic())
+                for rpc_id in set(rpc_ids):
+                    self._rpc_stats(rpc_id).throttled += 1
+            elif succeeded:
+                limit.on_success()
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+    @contextlib.contextmanager
+    def slot(self, rpc_ids: Iterable[str], lane: str = "short") -> Iterator[None]:
+        """Hold a slot around a request; a 429/503 HTTPStatusError counts as throttling."""
+        rpc_ids = list(rpc_ids)
+        self.acquire(rpc_ids, lane)
+        try:
+            yield
+        except BaseException as e:
+            self.release(rpc_ids, lane, throttled=is_throttle_error(e), succeeded=False)
+            raise
+        self.release(rpc_ids, lane)
+
+    @contextlib.asynccontextmanager
+    async def aslot(self, rpc_ids: Iterable[str], lane: str = "short") -> AsyncIterator[None]:
+        """Async version of slot()."""
+        rpc_ids = list(rpc_ids)
+        await self.acquire_async(rpc_ids, lane)
+        try:
+            yield
+        except BaseException as e:
+            self.release(rpc_ids, lane, throttled=is_throttle_error(e), succeeded=False)
+            raise
+        self.release(rpc_ids, lane)
+
+    # =========================================================================
+    # Introspection
+    # =========================================================================
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of concurrency limits, bucket levels and per-RPC counters."""
+        with self._cond:
+            now = time.monotonic()
+            rpcs = {}
+            for rpc_id, stats in self._stats.items():
+                bucket = self._buckets.get(rpc_id)
+                if bucket:
+                    bucket.wait_time(0, now)  # Refill to now
+                rpcs[self._labels.get(rpc_id, rpc_id)] = {
+                    "rpc_id": rpc_id,
+                    "admitted": stats.admitted,
+                    "throttled": stats.throttled,
+                    "waits": stats.waits,
+                    "waited_seconds": round(stats.waited_seconds, 3),
+                    "tokens": round(bucket.tokens, 2) if bucket else None,
+                    "rate_per_second": bucket.rate if bucket else None,
+                }
+            return {
+                "lanes": {
+                    lane: {
+                        "concurrency_limit": round(limit.limit, 2),
+                        "in_flight": limit.in_flight,
+                    }
+                    for lane, limit in self._lanes.items()
+                },
+                "rpcs": rpcs,
+            }
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """Whether an exception is an HTTP 429/503 response."""
+    return (
+        isinstance(error, httpx.HTTPStatusError)
+        and error.response.status_code in THROTTLE_STATUS_CODES
+    )
+
+
+def _count(rpc_ids: Iterable[str]) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for rpc_id in rpc_ids:
+        counts[rpc_id] = counts.get(rpc_id, 0) + 1
+    return counts
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,131 @@
+"""Retry policy for transient RPC failures.
+
+Every batchexecute POST goes through one retry loop in the client. What may
+be retried depends on the RPC's idempotency class:
+
+- Idempotent RPCs (reads and polls) are retried after any transient failure:
+  429, 5xx, connection errors, timeouts, dropped connections.
+- Everything else (source adds, studio creates, deletes, ...) is retried only
+  when the request cannot have been acted on: the connection was never made,
+  no pooled connection was free, or the server answered 429.
+
+Waits use exponential backoff with full jitter. A Retry-After header wins
+when it asks for longer. Each call has a budget of attempts and of total
+sleep time, and never sleeps past the tool call's deadline (deadline.py).
+
+Environment overrides:
+    NOTEBOOKLM_RETRY_ATTEMPTS=<n>       Max attempts per call, first one included (default 4)
+    NOTEBOOKLM_RETRY_BUDGET=<secs>      Max total backoff per call (default 20)
+"""
+
+import email.utils
+import os
+import random
+import time
+from dataclasses import dataclass
+
+import httpx
+
+from .deadline import remaining_time
+
+# Server answers worth another try (for idempotent RPCs)
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Failures where the request never reached the server
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Failures that may have happened after the server started work
+_TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Backoff settings and per-call retry budget."""
+
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    budget: float = 20.0  # Total seconds of backoff per call
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Defaults, overridden by NOTEBOOKLM_RETRY_* environment variables."""
+        defaults = cls()
+        try:
+            max_attempts = int(os.environ["NOTEBOOKLM_RETRY_ATTEMPTS"])
+        except (KeyError, ValueError):
+            max_attempts = defaults.max_attempts
+        try:
+            budget = float(os.environ["NOTEBOOKLM_RETRY_BUDGET"])
+        except (KeyError, ValueError):
+            budget = defaults.budget
+        return cls(max_attempts=max(1, max_attempts), budget=budget)
+
+    def start(self, idempotent: bool) -> "RetryState":
+        """Begin tracking one call."""
+        return RetryState(self, idempotent)
+
+
+class RetryState:
+    """Attempts and backoff spent by one call."""
+
+    __slots__ = ("policy", "idempotent", "attempts", "slept")
+
+    def __init__(self, policy: RetryPolicy, idempotent: bool):
+        self.policy = policy
+        self.idempotent = idempotent
+        self.attempts = 1
+        self.slept = 0.0
+
+    def next_delay(self, error: BaseException) -> float | None:
+        """Seconds to wait before retrying after `error`, or None to give up."""
+        if self.attempts >= self.policy.max_attempts or not is_retryable(error, self.idempotent):
+            return None
+
+        # Full jitter: uniform in [0, base * 2^n], capped
+        ceiling = min(self.policy.max_delay, self.policy.base_delay * 2 ** (self.attempts - 1))
+        delay = random.uniform(0, ceiling)
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        if self.slept + delay > self.policy.budget:
+            return None
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            # No time left for another attempt within the caller's deadline
+            return None
+        self.attempts += 1
+        self.slept += delay
+        return delay
+
+
+def is_retryable(error: BaseException, idempotent: bool) -> bool:
+    """Whether `error` is transient for an RPC of the given idempotency class."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        if status == 429:
+            # Rejected before any work was done
+            return True
+        return idempotent and status in RETRYABLE_STATUS_CODES
+    if isinstance(error, _UNSENT_ERRORS):
+        return True
+    return idempotent and isinstance(error, _TRANSIENT_ERRORS)
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+    """Delay requested by a Retry-After header (seconds or HTTP date), if any."""
+    if not isinstance(error, httpx.HTTPStatusError):
+        return None
+    value = error.response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
@@ -1,17 +1,29 @@
 """NotebookLM MCP Server."""
 
 import argparse
+import asyncio
+import contextlib
 import functools
 import json
 import logging
 import os
 from typing import Any
 
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
-from .api_client import NotebookLMClient, extract_cookies_from_chrome_export, parse_timestamp
+from .answer_cache import AnswerCache, QueryIndex
+from .api_client import RPC_NAMES, extract_cookies_from_chrome_export, parse_timestamp
+from .async_client import AsyncNotebookLMClient
+from .circuit import CircuitBreaker, CircuitOpenError
+from .conversations import ConversationBackend, HistoryPolicy, conversation_store_from_env
+from .deadline import DeadlineExceeded, deadline_scope, remaining_time
+from .fulltext_cache import FulltextCache
+from .hedging import Hedger
+from .notebook_cache import NotebookCache, NotebookListCache
+from .ratelimit import RateLimiter
+from .summary_cache import SummaryCache
 from . import constants
 from . import __version__
 
@@ -32,29 +44,51 @@ mcp = FastMCP(
 @mcp.custom_route("/health", methods=["GET"])
 async def health_check(request: Request) -> JSONResponse:
     """Health check endpoint for load balancers and monitoring."""
-    return JSONResponse({
+    health = {
         "status": "healthy",
         "service": "notebooklm-mcp",
         "version": __version__,
-    })
+    }
+    if _conversation_store is not None:
+        health["conversations"] = await asyncio.to_thread(_conversation_store.stats)
+    return JSONResponse(health)
 
 # Global state
-_client: NotebookLMClient | None = None
+_client: AsyncNotebookLMClient | None = None
+# One account per server process: the limiter, circuit breaker, hedger and
+# caches outlive client re-creation (refresh_auth) so what they learned is kept
+_rate_limiter: RateLimiter | None = None
+_circuit_breaker: CircuitBreaker | None = None
+_hedger: Hedger | None = None
+_notebook_cache: NotebookCache | None = None
+_notebook_list_cache: NotebookListCache | None = None
+_fulltext_cache: FulltextCache | None = None
+_summary_cache: SummaryCache | None = None
+_answer_cache: AnswerCache | None = None
+_query_index: QueryIndex | None = None
+_conversation_store: ConversationBackend | None = None
 _query_timeout: float = float(os.environ.get("NOTEBOOKLM_QUERY_TIMEOUT", "120.0"))
+# Budget for one tool call, shared by all the RPCs it makes (0 = none)
+_tool_timeout: float = float(os.environ.get("NOTEBOOKLM_TOOL_TIMEOUT", "300.0"))
 
 
 def logged_tool():
-    """Decorator that combines @mcp.tool() with MCP request/response logging."""
+    """Decorator that combines @mcp.tool() with MCP request/response logging.
+
+    The tool body runs inside a deadline scope of _tool_timeout seconds, so
+    its RPCs get the remaining budget rather than their own fixed timeouts.
+    """
     def decorator(func):
         @functools.wraps(func)
-        def wrapper(*args, **kwargs):
+        async def wrapper(*args, **kwargs):
             tool_name = func.__name__
             if mcp_logger.isEnabledFor(logging.DEBUG):
                 # Log request
-                params = {k: v for k, v in kwargs.items() if v is not None}
+                params = {k: v for k, v in kwargs.items() if v is not None and not isinstance(v, Context)}
                 mcp_logger.debug(f"MCP Request: {tool_name}({json.dumps(params, default=str)})")
             
-            result = func(*args, **kwargs)
+            with deadline_scope(_tool_timeout):
+                result = await func(*args, **kwargs)
             
             if mcp_logger.isEnabledFor(logging.DEBUG):
                 # Log response (truncate if too long)
@@ -69,12 +103,14 @@ def logged_tool():
     return decorator
 
 
-def get_client() -> NotebookLMClient:
+def get_client() -> AsyncNotebookLMClient:
     """Get or create the API client.
 
     Tries environment variables first, falls back to cached tokens from auth CLI.
     """
-    global _client
+    global _client, _rate_limiter, _circuit_breaker, _hedger
+    global _notebook_cache, _notebook_list_cache, _fulltext_cache, _summary_cache, _answer_cache, _query_index
+    global _conversation_store
     if _client is None:
         import os
 
@@ -101,16 +137,60 @@ def get_client() -> NotebookLMClient:
                     "2. NOTEBOOKLM_COOKIES 환경 변수를 수동으로 설정"
                 )
 
-        _client = NotebookLMClient(
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter.from_env(labels=RPC_NAMES)
+        if _circuit_breaker is None:
+            _circuit_breaker = CircuitBreaker.from_env(labels=RPC_NAMES)
+        if _hedger is None:
+            _hedger = Hedger.from_env(labels=RPC_NAMES)
+        if _notebook_cache is None:
+            _notebook_cache = NotebookCache.from_env()
+        if _notebook_list_cache is None:
+            _notebook_list_cache = NotebookListCache.from_env()
+        if _fulltext_cache is None:
+            _fulltext_cache = FulltextCache.from_env()
+        if _summary_cache is None:
+            _summary_cache = SummaryCache.from_env()
+        if _answer_cache is None:
+            _answer_cache = AnswerCache.from_env()
+        if _query_index is None:
+            _query_index = QueryIndex.from_env()
+        if _conversation_store is None:
+            _conversation_store = conversation_store_from_env()
+        _client = AsyncNotebookLMClient(
             cookies=cookies,
             csrf_token=csrf_token,
             session_id=session_id,
+            coalesce_rpcs=os.environ.get("NOTEBOOKLM_COALESCE_RPCS", "").lower() in ("1", "true", "yes"),
+            restore_conversations=os.environ.get("NOTEBOOKLM_RESTORE_CONVERSATIONS", "").lower()
+            in ("1", "true", "yes"),
+            rate_limiter=_rate_limiter,
+            circuit_breaker=_circuit_breaker,
+            hedger=_hedger,
+            notebook_cache=_notebook_cache,
+            fulltext_cache=_fulltext_cache,
+            summary_cache=_summary_cache,
+            notebook_list_cache=_notebook_list_cache,
+            answer_cache=_answer_cache,
+            query_index=_query_index,
+            conversation_store=_conversation_store,
         )
     return _client
 
 
+def _error_response(e: Exception) -> dict[str, Any]:
+    """Tool error payload for an exception.
+
+    An open circuit or a spent deadline gets a structured error (which call,
+    when to try again) so agents can back off instead of retrying straight away.
+    """
+    if isinstance(e, (CircuitOpenError, DeadlineExceeded)):
+        return e.to_dict()
+    return {"status": "error", "error": str(e)}
+
+
 @logged_tool()
-def refresh_auth() -> dict[str, Any]:
+async def refresh_auth() -> dict[str, Any]:
     """Reload auth tokens from disk or run headless re-authentication.
     
     Call this after running notebooklm-mcp-auth to pick up new tokens,
@@ -137,7 +217,8 @@ def refresh_auth() -> dict[str, Any]:
         # Try headless auth if Chrome profile exists
         try:
             from .auth_cli import run_headless_auth
-            tokens = run_headless_auth()
+            # Headless auth drives Chrome for several seconds - keep it off the event loop
+            tokens = await asyncio.to_thread(run_headless_auth)
             if tokens:
                 _client = None
                 get_client()
@@ -153,18 +234,22 @@ def refresh_auth() -> dict[str, Any]:
             "error": "No cached tokens found. Run 'notebooklm-mcp-auth' to authenticate.",
         }
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 @logged_tool()
-def notebook_list(max_results: int = 100) -> dict[str, Any]:
+async def notebook_list(max_results: int = 100) -> dict[str, Any]:
     """List all notebooks.
 
+    The list may come from a recent snapshot that is being refreshed in the
+    background; `fresh` and `age_seconds` say how current it is.
+
     Args:
         max_results: Maximum number of notebooks to return (default: 100)
     """
     try:
         client = get_client()
-        notebooks = client.list_notebooks()
+        snapshot = await client.notebook_list_snapshot()
+        notebooks = snapshot.notebooks
 
         # Count owned vs shared notebooks
         owned_count = sum(1 for nb in notebooks if nb.is_owned)
@@ -179,6 +264,8 @@ def notebook_list(max_results: int = 100) -> dict[str, Any]:
             "owned_count": owned_count,
             "shared_count": shared_count,
             "shared_by_me_count": shared_by_me_count,
+            "fresh": snapshot.fresh,
+            "age_seconds": round(snapshot.age, 1),
             "notebooks": [
                 {
                     "id": nb.id,
@@ -194,11 +281,11 @@ def notebook_list(max_results: int = 100) -> dict[str, Any]:
             ],
         }
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def notebook_create(title: str = "") -> dict[str, Any]:
+async def notebook_create(title: str = "") -> dict[str, Any]:
     """Create a new notebook.
 
     Args:
@@ -206,7 +293,7 @@ def notebook_create(title: str = "") -> dict[str, Any]:
     """
     try:
         client = get_client()
-        notebook = client.create_notebook(title=title)
+        notebook = await client.create_notebook(title=title)
 
         if notebook:
             return {
@@ -219,11 +306,11 @@ def notebook_create(title: str = "") -> dict[str, Any]:
             }
         return {"status": "error", "error": "Failed to create notebook"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def notebook_get(notebook_id: str) -> dict[str, Any]:
+async def notebook_get(notebook_id: str) -> dict[str, Any]:
     """Get notebook details with sources.
 
     Args:
@@ -231,7 +318,7 @@ def notebook_get(notebook_id: str) -> dict[str, Any]:
     """
     try:
         client = get_client()
-        result = client.get_notebook(notebook_id)
+        result = await client.get_notebook(notebook_id)
 
         # Extract timestamps from metadata if available
         # Result structure: [title, sources, id, emoji, null, metadata, ...]
@@ -253,11 +340,11 @@ def notebook_get(notebook_id: str) -> dict[str, Any]:
             "modified_at": modified_at,
         }
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def notebook_describe(notebook_id: str) -> dict[str, Any]:
+async def notebook_describe(notebook_id: str) -> dict[str, Any]:
     """Get AI-generated notebook summary with suggested topics.
 
     Args:
@@ -267,18 +354,18 @@ def notebook_describe(notebook_id: str) -> dict[str, Any]:
     """
     try:
         client = get_client()
-        result = client.get_notebook_summary(notebook_id)
+        result = await client.get_notebook_summary(notebook_id)
 
         return {
             "status": "success",
             **result,  # Includes summary and suggested_topics
         }
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def source_describe(source_id: str) -> dict[str, Any]:
+async def source_describe(source_id: str) -> dict[str, Any]:
     """Get AI-generated source summary with keyword chips.
 
     Args:
@@ -288,18 +375,18 @@ def source_describe(source_id: str) -> dict[str, Any]:
     """
     try:
         client = get_client()
-        result = client.get_source_guide(source_id)
+        result = await client.get_source_guide(source_id)
 
         return {
             "status": "success",
             **result,  # Includes summary and keywords
         }
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def source_get_content(source_id: str) -> dict[str, Any]:
+async def source_get_content(source_id: str) -> dict[str, Any]:
     """Get raw text content of a source (no AI processing).
 
     Returns the original indexed text from PDFs, web pages, pasted text,
@@ -312,18 +399,18 @@ def source_get_content(source_id: str) -> dict[str, Any]:
     """
     try:
         client = get_client()
-        result = client.get_source_fulltext(source_id)
+        result = await client.get_source_fulltext(source_id)
 
         return {
             "status": "success",
             **result,  # Includes content, title, source_type, url, char_count
         }
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def notebook_add_url(notebook_id: str, url: str) -> dict[str, Any]:
+async def notebook_add_url(notebook_id: str, url: str) -> dict[str, Any]:
     """Add URL (website or YouTube) as source.
 
     Args:
@@ -332,7 +419,7 @@ def notebook_add_url(notebook_id: str, url: str) -> dict[str, Any]:
     """
     try:
         client = get_client()
-        result = client.add_url_source(notebook_id, url=url)
+        result = await client.add_url_source(notebook_id, url=url)
 
         if result:
             return {
@@ -341,11 +428,11 @@ def notebook_add_url(notebook_id: str, url: str) -> dict[str, Any]:
             }
         return {"status": "error", "error": "Failed to add URL source"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def notebook_add_text(
+async def notebook_add_text(
     notebook_id: str,
     text: str,
     title: str = "Pasted Text",
@@ -359,7 +446,7 @@ def notebook_add_text(
     """
     try:
         client = get_client()
-        result = client.add_text_source(notebook_id, text=text, title=title)
+        result = await client.add_text_source(notebook_id, text=text, title=title)
 
         if result:
             return {
@@ -368,11 +455,11 @@ def notebook_add_text(
             }
         return {"status": "error", "error": "Failed to add text source"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def notebook_add_drive(
+async def notebook_add_drive(
     notebook_id: str,
     document_id: str,
     title: str,
@@ -403,7 +490,7 @@ def notebook_add_drive(
             }
 
         client = get_client()
-        result = client.add_drive_source(
+        result = await client.add_drive_source(
             notebook_id,
             document_id=document_id,
             title=title,
@@ -424,16 +511,22 @@ def notebook_add_drive(
             }
         return {"status": "error", "error": "Failed to add Drive source"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def notebook_query(
+async def notebook_query(
     notebook_id: str,
     query: str,
     source_ids: list[str] | str | None = None,
     conversation_id: str | None = None,
     timeout: float | None = None,
+    use_cache: bool = False,
+    match_similar: bool = False,
+    history_turns: int | None = None,
+    history_max_bytes: int | None = None,
+    history_stub_chars: int | None = None,
+    ctx: Context | None = None,
 ) -> dict[str, Any]:
     """Ask AI about EXISTING sources already in notebook. NOT for finding new sources.
 
@@ -445,6 +538,14 @@ def notebook_query(
         source_ids: Source IDs to query (default: all)
         conversation_id: For follow-up questions
         timeout: Request timeout in seconds (default: from env NOTEBOOKLM_QUERY_TIMEOUT or 120.0)
+        use_cache: Reuse the earlier answer to the same new-conversation question
+            while the notebook is unchanged (default: False)
+        match_similar: Also reuse the answer to a reworded earlier question; the
+            response names the matched question and its similarity (default: False)
+        history_turns: Follow-ups send only this many earlier turns (default: all)
+        history_max_bytes: Drop the oldest earlier turns until they fit in this many bytes
+        history_stub_chars: Cut answers of older turns to this many characters
+            (the latest turn is always sent in full)
     """
     try:
         # Handle AI clients that send source_ids as a JSON string instead of a list
@@ -459,28 +560,70 @@ def notebook_query(
         # Use provided timeout or fall back to global default
         effective_timeout = timeout if timeout is not None else _query_timeout
 
+        history = None
+        if (history_turns, history_max_bytes, history_stub_chars) != (None, None, None):
+            history = HistoryPolicy(
+                max_turns=history_turns, max_bytes=history_max_bytes, stub_chars=history_stub_chars
+            )
+
         client = get_client()
-        result = client.query(
+        result = None
+        # aclosing: if the MCP client cancels, the HTTP stream is released right away
+        async with contextlib.aclosing(client.query_stream(
             notebook_id,
             query_text=query,
             source_ids=source_ids,
             conversation_id=conversation_id,
             timeout=effective_timeout,
-        )
+            use_cache=use_cache,
+            match_similar=match_similar,
+            history=history,
+        )) as updates:
+            progress = 0
+            async for update in updates:
+                if update["type"] == "done":
+                    result = update["result"]
+                elif ctx is not None:
+                    progress += 1
+                    await _report_query_progress(ctx, progress, update)
 
         if result:
-            return {
+            response = {
                 "status": "success",
                 "answer": result.get("answer", ""),
                 "conversation_id": result.get("conversation_id"),
+                # True when the timeout hit mid-answer and this is what arrived so far
+                "partial": result.get("partial", False),
+                "cached": result.get("cached", False),
             }
+            if response["cached"]:
+                response["cache_age_seconds"] = result.get("cache_age_seconds")
+            if "matched_question" in result:
+                response["matched_question"] = result["matched_question"]
+                response["similarity"] = result["similarity"]
+            if "request_bytes" in result:
+                # Measure what the history window saves in request size and latency
+                response["request_bytes"] = result["request_bytes"]
+                response["history_turns"] = result["history_turns"]
+                response["elapsed_seconds"] = result["elapsed_seconds"]
+            return response
         return {"status": "error", "error": "Failed to query notebook"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
+
+
+async def _report_query_progress(ctx: Context, progress: int, update: dict) -> None:
+    """Send a streamed query update to the MCP client as a progress notification."""
+    prefix = "Thinking: " if update["type"] == "thinking" else ""
+    try:
+        await ctx.report_progress(progress, message=prefix + update["text"])
+    except Exception as e:
+        # Progress is best effort - never fail the query because a notification failed
+        mcp_logger.debug(f"Failed to send query progress: {e}")
 
 
 @logged_tool()
-def notebook_delete(
+async def notebook_delete(
     notebook_id: str,
     confirm: bool = False,
 ) -> dict[str, Any]:
@@ -501,7 +644,7 @@ def notebook_delete(
 
     try:
         client = get_client()
-        result = client.delete_notebook(notebook_id)
+        result = await client.delete_notebook(notebook_id)
 
         if result:
             return {
@@ -510,11 +653,11 @@ def notebook_delete(
             }
         return {"status": "error", "error": "Failed to delete notebook"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def notebook_rename(
+async def notebook_rename(
     notebook_id: str,
     new_title: str,
 ) -> dict[str, Any]:
@@ -526,7 +669,7 @@ def notebook_rename(
     """
     try:
         client = get_client()
-        result = client.rename_notebook(notebook_id, new_title)
+        result = await client.rename_notebook(notebook_id, new_title)
 
         if result:
             return {
@@ -538,11 +681,11 @@ def notebook_rename(
             }
         return {"status": "error", "error": "Failed to rename notebook"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def chat_configure(
+async def chat_configure(
     notebook_id: str,
     goal: str = "default",
     custom_prompt: str | None = None,
@@ -558,7 +701,7 @@ def chat_configure(
     """
     try:
         client = get_client()
-        result = client.configure_chat(
+        result = await client.configure_chat(
             notebook_id=notebook_id,
             goal=goal,
             custom_prompt=custom_prompt,
@@ -566,13 +709,13 @@ def chat_configure(
         )
         return result
     except ValueError as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def source_list_drive(notebook_id: str) -> dict[str, Any]:
+async def source_list_drive(notebook_id: str) -> dict[str, Any]:
     """List sources with types and Drive freshness status.
 
     Use before source_sync_drive to identify stale sources.
@@ -582,21 +725,18 @@ def source_list_drive(notebook_id: str) -> dict[str, Any]:
     """
     try:
         client = get_client()
-        sources = client.get_notebook_sources_with_types(notebook_id)
+        sources = await client.get_notebook_sources_with_types(notebook_id)
 
         # Separate sources by syncability
-        syncable_sources = []
-        other_sources = []
-
-        for src in sources:
-            if src.get("can_sync"):
-                # Check freshness for syncable sources (Drive docs and Gemini Notes)
-                is_fresh = client.check_source_freshness(src["id"])
-                src["is_fresh"] = is_fresh
-                src["needs_sync"] = is_fresh is False
-                syncable_sources.append(src)
-            else:
-                other_sources.append(src)
+        syncable_sources = [src for src in sources if src.get("can_sync")]
+        other_sources = [src for src in sources if not src.get("can_sync")]
+
+        # Check freshness for syncable sources (Drive docs and Gemini Notes) in one batch
+        freshness = await client.check_sources_freshness([src["id"] for src in syncable_sources])
+        for src in syncable_sources:
+            is_fresh = freshness.get(src["id"])
+            src["is_fresh"] = is_fresh
+            src["needs_sync"] = is_fresh is False
 
         # Count stale sources
         stale_count = sum(1 for s in syncable_sources if s.get("needs_sync"))
@@ -622,11 +762,11 @@ def source_list_drive(notebook_id: str) -> dict[str, Any]:
             ],
         }
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def source_sync_drive(
+async def source_sync_drive(
     source_ids: list[str],
     confirm: bool = False,
 ) -> dict[str, Any]:
@@ -661,7 +801,7 @@ def source_sync_drive(
 
         for source_id in source_ids:
             try:
-                result = client.sync_drive_source(source_id)
+                result = await client.sync_drive_source(source_id)
                 if result:
                     results.append({
                         "source_id": source_id,
@@ -694,11 +834,11 @@ def source_sync_drive(
             "results": results,
         }
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def source_delete(
+async def source_delete(
     source_id: str,
     confirm: bool = False,
 ) -> dict[str, Any]:
@@ -719,7 +859,7 @@ def source_delete(
 
     try:
         client = get_client()
-        result = client.delete_source(source_id)
+        result = await client.delete_source(source_id)
 
         if result:
             return {
@@ -728,11 +868,11 @@ def source_delete(
             }
         return {"status": "error", "error": "Failed to delete source"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def research_start(
+async def research_start(
     query: str,
     source: str = "web",
     mode: str = "fast",
@@ -764,7 +904,7 @@ def research_start(
         # Create notebook if needed
         if not notebook_id:
             notebook_title = title or f"Research: {query[:50]}"
-            notebook = client.create_notebook(title=notebook_title)
+            notebook = await client.create_notebook(title=notebook_title)
             if not notebook:
                 return {"status": "error", "error": "Failed to create notebook"}
             notebook_id = notebook.id
@@ -773,7 +913,7 @@ def research_start(
             created_notebook = False
 
         # Start research
-        result = client.start_research(
+        result = await client.start_research(
             notebook_id=notebook_id,
             query=query,
             source=source,
@@ -808,9 +948,9 @@ def research_start(
 
         return {"status": "error", "error": "Failed to start research"}
     except ValueError as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 def _compact_research_result(result: dict) -> dict:
@@ -839,7 +979,7 @@ def _compact_research_result(result: dict) -> dict:
 
 
 @logged_tool()
-def research_status(
+async def research_status(
     notebook_id: str,
     poll_interval: int = 30,
     max_wait: int = 300,
@@ -865,12 +1005,12 @@ def research_status(
 
         while True:
             polls += 1
-            result = client.poll_research(notebook_id, target_task_id=task_id)
+            result = await client.poll_research(notebook_id, target_task_id=task_id)
 
             if not result:
                 # If specific task requested but not found, keep waiting (it might appear)
                 if task_id:
-                     time.sleep(poll_interval)
+                     await asyncio.sleep(poll_interval)
                      continue
                 return {"status": "error", "error": "Failed to poll research status"}
 
@@ -888,9 +1028,10 @@ def research_status(
                     "research": result,
                 }
 
-            # Check if we should stop waiting
+            # Check if we should stop waiting (max_wait, or no time for another poll)
             elapsed = time.time() - start_time
-            if max_wait == 0 or elapsed >= max_wait:
+            remaining = remaining_time()
+            if max_wait == 0 or elapsed >= max_wait or (remaining is not None and remaining < poll_interval):
                 result["polls_made"] = polls
                 result["wait_time_seconds"] = round(elapsed, 1)
                 result["message"] = (
@@ -908,14 +1049,14 @@ def research_status(
                 }
 
             # Wait before next poll
-            time.sleep(poll_interval)
+            await asyncio.sleep(poll_interval)
 
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def research_import(
+async def research_import(
     notebook_id: str,
     task_id: str,
     source_indices: list[int] | None = None,
@@ -933,7 +1074,7 @@ def research_import(
         client = get_client()
 
         # First, get the current research results to get source details
-        poll_result = client.poll_research(notebook_id, target_task_id=task_id)
+        poll_result = await client.poll_research(notebook_id, target_task_id=task_id)
 
         if not poll_result or poll_result.get("status") == "no_research":
             return {
@@ -990,7 +1131,7 @@ def research_import(
 
         # Import web/drive sources (skip deep_report sources as they don't have URLs)
         web_sources_to_import = [s for s in sources_to_import if s.get("result_type") != 5]
-        imported = client.import_research_sources(
+        imported = await client.import_research_sources(
             notebook_id=notebook_id,
             task_id=task_id,
             sources=web_sources_to_import,
@@ -999,7 +1140,7 @@ def research_import(
         # If deep research with report, import the report as a text source
         if deep_report_source and report_content:
             try:
-                report_result = client.add_text_source(
+                report_result = await client.add_text_source(
                     notebook_id=notebook_id,
                     title=deep_report_source.get("title", "Deep Research Report"),
                     text=report_content,
@@ -1021,11 +1162,11 @@ def research_import(
             "notebook_url": f"https://notebooklm.google.com/notebook/{notebook_id}",
         }
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def audio_overview_create(
+async def audio_overview_create(
     notebook_id: str,
     source_ids: list[str] | None = None,
     format: str = "deep_dive",
@@ -1083,7 +1224,7 @@ def audio_overview_create(
 
         # Get source IDs if not provided
         if source_ids is None:
-            sources = client.get_notebook_sources_with_types(notebook_id)
+            sources = await client.get_notebook_sources_with_types(notebook_id)
             source_ids = [s["id"] for s in sources if s["id"]]
 
         if not source_ids:
@@ -1092,7 +1233,7 @@ def audio_overview_create(
                 "error": "No sources found in notebook. Add sources before creating audio overview.",
             }
 
-        result = client.create_audio_overview(
+        result = await client.create_audio_overview(
             notebook_id=notebook_id,
             source_ids=source_ids,
             format_code=format_code,
@@ -1115,11 +1256,11 @@ def audio_overview_create(
             }
         return {"status": "error", "error": "Failed to create audio overview"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def video_overview_create(
+async def video_overview_create(
     notebook_id: str,
     source_ids: list[str] | None = None,
     format: str = "explainer",
@@ -1177,7 +1318,7 @@ def video_overview_create(
 
         # Get source IDs if not provided
         if source_ids is None:
-            sources = client.get_notebook_sources_with_types(notebook_id)
+            sources = await client.get_notebook_sources_with_types(notebook_id)
             source_ids = [s["id"] for s in sources if s["id"]]
 
         if not source_ids:
@@ -1186,7 +1327,7 @@ def video_overview_create(
                 "error": "No sources found in notebook. Add sources before creating video overview.",
             }
 
-        result = client.create_video_overview(
+        result = await client.create_video_overview(
             notebook_id=notebook_id,
             source_ids=source_ids,
             format_code=format_code,
@@ -1209,11 +1350,11 @@ def video_overview_create(
             }
         return {"status": "error", "error": "Failed to create video overview"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def studio_status(notebook_id: str) -> dict[str, Any]:
+async def studio_status(notebook_id: str) -> dict[str, Any]:
     """Check studio content generation status and get URLs.
 
     Args:
@@ -1221,22 +1362,18 @@ def studio_status(notebook_id: str) -> dict[str, Any]:
     """
     try:
         client = get_client()
-        artifacts = client.poll_studio_status(notebook_id)
-
-        # Also fetch mind maps and add them as artifacts
-        try:
-            mind_maps = client.list_mind_maps(notebook_id)
-            for mm in mind_maps:
-                artifacts.append({
-                    "artifact_id": mm.get("mind_map_id"),
-                    "type": "mind_map",
-                    "title": mm.get("title", "Mind Map"),
-                    "status": "completed",
-                    "created_at": mm.get("created_at"),
-                })
-        except Exception:
-            # Don't fail studio_status if mind maps fail
-            pass
+        # Studio artifacts and mind maps are fetched in one batchexecute round trip
+        artifacts, mind_maps = await client.poll_studio_with_mind_maps(notebook_id)
+
+        # Add mind maps as artifacts
+        for mm in mind_maps:
+            artifacts.append({
+                "artifact_id": mm.get("mind_map_id"),
+                "type": "mind_map",
+                "title": mm.get("title", "Mind Map"),
+                "status": "completed",
+                "created_at": mm.get("created_at"),
+            })
 
         # Separate by status
         completed = [a for a in artifacts if a.get("status") == "completed"]
@@ -1254,11 +1391,11 @@ def studio_status(notebook_id: str) -> dict[str, Any]:
             "notebook_url": f"https://notebooklm.google.com/notebook/{notebook_id}",
         }
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def studio_delete(
+async def studio_delete(
     notebook_id: str,
     artifact_id: str,
     confirm: bool = False,
@@ -1281,7 +1418,7 @@ def studio_delete(
 
     try:
         client = get_client()
-        result = client.delete_studio_artifact(artifact_id, notebook_id)
+        result = await client.delete_studio_artifact(artifact_id, notebook_id)
 
         if result:
             return {
@@ -1291,11 +1428,11 @@ def studio_delete(
             }
         return {"status": "error", "error": "Failed to delete artifact"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def infographic_create(
+async def infographic_create(
     notebook_id: str,
     source_ids: list[str] | None = None,
     orientation: str = "landscape",
@@ -1353,7 +1490,7 @@ def infographic_create(
 
         # Get source IDs if not provided
         if source_ids is None:
-            sources = client.get_notebook_sources_with_types(notebook_id)
+            sources = await client.get_notebook_sources_with_types(notebook_id)
             source_ids = [s["id"] for s in sources if s["id"]]
 
         if not source_ids:
@@ -1362,7 +1499,7 @@ def infographic_create(
                 "error": "No sources found in notebook. Add sources before creating infographic.",
             }
 
-        result = client.create_infographic(
+        result = await client.create_infographic(
             notebook_id=notebook_id,
             source_ids=source_ids,
             orientation_code=orientation_code,
@@ -1385,11 +1522,11 @@ def infographic_create(
             }
         return {"status": "error", "error": "Failed to create infographic"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def slide_deck_create(
+async def slide_deck_create(
     notebook_id: str,
     source_ids: list[str] | None = None,
     format: str = "detailed_deck",
@@ -1447,7 +1584,7 @@ def slide_deck_create(
 
         # Get source IDs if not provided
         if source_ids is None:
-            sources = client.get_notebook_sources_with_types(notebook_id)
+            sources = await client.get_notebook_sources_with_types(notebook_id)
             source_ids = [s["id"] for s in sources if s["id"]]
 
         if not source_ids:
@@ -1456,7 +1593,7 @@ def slide_deck_create(
                 "error": "No sources found in notebook. Add sources before creating slide deck.",
             }
 
-        result = client.create_slide_deck(
+        result = await client.create_slide_deck(
             notebook_id=notebook_id,
             source_ids=source_ids,
             format_code=format_code,
@@ -1479,11 +1616,11 @@ def slide_deck_create(
             }
         return {"status": "error", "error": "Failed to create slide deck"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def report_create(
+async def report_create(
     notebook_id: str,
     source_ids: list[str] | None = None,
     report_format: str = "Briefing Doc",
@@ -1520,10 +1657,10 @@ def report_create(
 
         # Get source IDs if not provided
         if not source_ids:
-            sources = client.get_notebook_sources_with_types(notebook_id)
+            sources = await client.get_notebook_sources_with_types(notebook_id)
             source_ids = [s["id"] for s in sources if s.get("id")]
 
-        result = client.create_report(
+        result = await client.create_report(
             notebook_id=notebook_id,
             source_ids=source_ids,
             report_format=report_format,
@@ -1544,11 +1681,11 @@ def report_create(
             }
         return {"status": "error", "error": "Failed to create report"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def flashcards_create(
+async def flashcards_create(
     notebook_id: str,
     source_ids: list[str] | None = None,
     difficulty: str = "medium",
@@ -1588,10 +1725,10 @@ def flashcards_create(
 
         # Get source IDs if not provided
         if not source_ids:
-            sources = client.get_notebook_sources_with_types(notebook_id)
+            sources = await client.get_notebook_sources_with_types(notebook_id)
             source_ids = [s["id"] for s in sources if s.get("id")]
             
-        result = client.create_flashcards(
+        result = await client.create_flashcards(
             notebook_id=notebook_id,
             source_ids=source_ids,
             difficulty_code=difficulty_code,
@@ -1609,11 +1746,11 @@ def flashcards_create(
             }
         return {"status": "error", "error": "Failed to create flashcards"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def quiz_create(
+async def quiz_create(
     notebook_id: str,
     source_ids: list[str] | None = None,
     question_count: int = 2,
@@ -1655,10 +1792,10 @@ def quiz_create(
             }
 
         if not source_ids:
-            sources = client.get_notebook_sources_with_types(notebook_id)
+            sources = await client.get_notebook_sources_with_types(notebook_id)
             source_ids = [s["id"] for s in sources if s.get("id")]
 
-        result = client.create_quiz(
+        result = await client.create_quiz(
             notebook_id=notebook_id,
             source_ids=source_ids,
             question_count=question_count,
@@ -1678,11 +1815,11 @@ def quiz_create(
             }
         return {"status": "error", "error": "Failed to create quiz"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def data_table_create(
+async def data_table_create(
     notebook_id: str,
     description: str,
     source_ids: list[str] | None = None,
@@ -1715,10 +1852,10 @@ def data_table_create(
         client = get_client()
 
         if not source_ids:
-            sources = client.get_notebook_sources_with_types(notebook_id)
+            sources = await client.get_notebook_sources_with_types(notebook_id)
             source_ids = [s["id"] for s in sources if s.get("id")]
 
-        result = client.create_data_table(
+        result = await client.create_data_table(
             notebook_id=notebook_id,
             source_ids=source_ids,
             description=description,
@@ -1737,11 +1874,11 @@ def data_table_create(
             }
         return {"status": "error", "error": "Failed to create data table"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 @logged_tool()
-def mind_map_create(
+async def mind_map_create(
     notebook_id: str,
     source_ids: list[str] | None = None,
     title: str = "Mind Map",
@@ -1772,16 +1909,16 @@ def mind_map_create(
 
         # Get source IDs if not provided
         if not source_ids:
-            sources = client.get_notebook_sources_with_types(notebook_id)
+            sources = await client.get_notebook_sources_with_types(notebook_id)
             source_ids = [s["id"] for s in sources if s.get("id")]
 
         # Step 1: Generate the mind map
-        gen_result = client.generate_mind_map(source_ids=source_ids)
+        gen_result = await client.generate_mind_map(source_ids=source_ids)
         if not gen_result or not gen_result.get("mind_map_json"):
             return {"status": "error", "error": "Failed to generate mind map"}
 
         # Step 2: Save the mind map to the notebook
-        save_result = client.save_mind_map(
+        save_result = await client.save_mind_map(
             notebook_id=notebook_id,
             mind_map_json=gen_result["mind_map_json"],
             source_ids=source_ids,
@@ -1811,7 +1948,7 @@ def mind_map_create(
             }
         return {"status": "error", "error": "Failed to save mind map"}
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
 
 
 
@@ -1830,7 +1967,7 @@ ESSENTIAL_COOKIES = [
 
 
 @logged_tool()
-def save_auth_tokens(
+async def save_auth_tokens(
     cookies: str,
     csrf_token: str = "",
     session_id: str = "",
@@ -1924,7 +2061,13 @@ def save_auth_tokens(
             "extracted_session_id": bool(session_id),
         }
     except Exception as e:
-        return {"status": "error", "error": str(e)}
+        return _error_response(e)
+
+
+def _warn_if_conversations_local() -> None:
+    """Stateless workers only share follow-up history through the SQLite backend."""
+    if os.environ.get("NOTEBOOKLM_CONVERSATION_BACKEND", "sqlite").lower() == "memory":
+        print("Warning: NOTEBOOKLM_CONVERSATION_BACKEND=memory keeps follow-up history per worker")
 
 
 def main():
@@ -1949,6 +2092,9 @@ Environment Variables:
   NOTEBOOKLM_MCP_STATELESS     Enable stateless mode for scaling (true/false)
   NOTEBOOKLM_MCP_DEBUG         Enable debug logging for MCP + API traffic (true/false)
   NOTEBOOKLM_QUERY_TIMEOUT     Query timeout in seconds (default: 120.0)
+  NOTEBOOKLM_TOOL_TIMEOUT      Total budget per tool call in seconds (default: 300.0, 0 = none)
+  NOTEBOOKLM_CONVERSATION_BACKEND  Follow-up history store: sqlite (default, shared by workers) or memory
+  NOTEBOOKLM_RESTORE_CONVERSATIONS Fetch server history for unknown follow-ups (true/false, unverified layout)
 
 Examples:
   notebooklm-mcp                              # Default stdio transport
@@ -2001,11 +2147,18 @@ Examples:
         default=float(os.environ.get("NOTEBOOKLM_QUERY_TIMEOUT", "120.0")),
         help="Query timeout in seconds (default: 120.0)"
     )
+    parser.add_argument(
+        "--tool-timeout",
+        type=float,
+        default=float(os.environ.get("NOTEBOOKLM_TOOL_TIMEOUT", "300.0")),
+        help="Total time budget per tool call in seconds, 0 for none (default: 300.0)"
+    )
     args = parser.parse_args()
     
-    # Update global query timeout from CLI args
-    global _query_timeout
+    # Update global timeouts from CLI args
+    global _query_timeout, _tool_timeout
     _query_timeout = args.query_timeout
+    _tool_timeout = args.tool_timeout
     
     # Configure logging
     if args.debug:
@@ -2038,6 +2191,7 @@ Examples:
         print(f"Health check: http://{args.host}:{args.port}/health")
         if args.stateless:
             print("Stateless mode: ENABLED (suitable for horizontal scaling)")
+            _warn_if_conversations_local()
         mcp.run(
             transport="http",
             host=args.host,
@@ -2050,6 +2204,7 @@ Examples:
         print(f"Health check: http://{args.host}:{args.port}/health")
         if args.stateless:
             print("Stateless mode: ENABLED (suitable for horizontal scaling)")
+            _warn_if_conversations_local()
         mcp.run(
             transport="sse",
             host=args.host,
@@ -0,0 +1,152 @@
+"""Single-flight deduplication of identical in-flight reads.
+
+When parallel tool calls fan out over the same notebook, each of them asks
+for the same get_notebook / poll result at the same moment. While a read
+with a given key is in flight, later identical calls wait for it and get
+the same result (or exception) instead of sending their own request.
+
+Only reads go through here (IDEMPOTENT_RPCS), and only while in flight:
+nothing is cached once the request completes. The key is the rpc_id,
+source path and canonical JSON of the params (see rpc_key()).
+
+Callers sharing a request may run under different tool-call deadlines
+(deadline.py). The request runs under the first caller's; every caller
+waits only until its own and then raises DeadlineExceeded. If the request
+fails once the first caller's deadline has passed, callers with a later
+deadline send it again instead of inheriting that failure.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from . import codec
+from .deadline import DeadlineExceeded, current_deadline
+
+
+def _outlived(leader: tuple[float, float] | None, own: tuple[float, float] | None) -> bool:
+    """Whether a caller still has time after the deadline the shared call ran under."""
+    if leader is None or time.monotonic() < leader[0]:
+        return False
+    return own is None or own[0] > leader[0]
+
+
+def rpc_key(rpc_id: str, params: Any, path: str, timeout: float | None) -> Hashable:
+    """Key identifying an RPC call: same key, same request on the wire."""
+    return rpc_id, path, timeout, codec.dumps(params)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "deadline")
+
+    def __init__(self, deadline: tuple[float, float] | None) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.deadline = deadline
+
+
+class SingleFlight:
+    """Thread-based single flight for the sync client."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.sent = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn(), or wait for the identical call already running."""
+        deadline = current_deadline()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call(deadline)
+                self.sent += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            timeout = None if deadline is None else max(0.0, deadline[0] - time.monotonic())
+            if not call.done.wait(timeout):
+                raise DeadlineExceeded(deadline[1])
+            if call.error is not None:
+                if isinstance(call.error, Exception) and _outlived(call.deadline, deadline):
+                    return self.do(key, fn)
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class _InFlight:
+    __slots__ = ("task", "waiters", "deadline")
+
+    def __init__(self, task: asyncio.Future, deadline: tuple[float, float] | None):
+        self.task = task
+        self.waiters = 0
+        self.deadline = deadline
+
+
+class AsyncSingleFlight:
+    """Event-loop single flight for the async client.
+
+    The request runs in its own task, so one caller being cancelled does not
+    cancel it for the others; it is cancelled once every caller has gone.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _InFlight] = {}
+        self.sent = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn(), or the identical call already in flight."""
+        deadline = current_deadline()
+        call = self._calls.get(key)
+        if call is None:
+            task = asyncio.ensure_future(fn())
+            call = self._calls[key] = _InFlight(task, deadline)
+            task.add_done_callback(lambda _: self._forget(key, task))
+            self.sent += 1
+        else:
+            self.shared += 1
+        task = call.task
+
+        call.waiters += 1
+        try:
+            # asyncio.wait leaves the task running when this caller stops waiting
+            timeout = None if deadline is None else max(0.0, deadline[0] - time.monotonic())
+            await asyncio.wait({task}, timeout=timeout)
+            if not task.done():
+                raise DeadlineExceeded(deadline[1])
+        except (asyncio.CancelledError, DeadlineExceeded):
+            if not task.done() and call.waiters == 1:
+                # Last caller gave up - nobody needs the response
+                task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+        if not task.cancelled() and task.exception() is not None and _outlived(call.deadline, deadline):
+            return await self.do(key, fn)
+        return task.result()
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        call = self._calls.get(key)
+        if call is not None and call.task is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved: callers may all have been cancelled
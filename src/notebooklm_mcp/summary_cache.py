@@ -0,0 +1,105 @@
+"""Cache of AI-generated source guides and notebook summaries.
+
+get_source_guide (tr032e) and get_notebook_summary (VfAZjd) take seconds
+each, and their answer only changes when the underlying sources do.
+SummaryCache keeps them in memory, each stored with a fingerprint of what
+it was generated from:
+
+- notebook summary: the notebook's source set, each source's metadata and
+  the notebook's modified time (CachedNotebook.fingerprint),
+- source guide: the source's metadata (NotebookCache.source_version).
+
+A cached result is served while the current fingerprint matches. A source
+guide whose source is not listed by any cached notebook has no fingerprint
+to compare; it is served until the max age. The client's own mutations drop
+what they touch. One cache is shared by all clients of the server process.
+
+Environment overrides:
+    NOTEBOOKLM_SUMMARY_CACHE_SIZE=<n>     Entries kept (default 512, 0 = no caching)
+    NOTEBOOKLM_SUMMARY_MAX_AGE=<secs>     Max age without a fingerprint (default 3600)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+SOURCE_GUIDE = "source_guide"
+NOTEBOOK_SUMMARY = "notebook_summary"
+
+
+class SummaryCache:
+    """LRU of AI summary results keyed by (kind, id) and checked by fingerprint."""
+
+    def __init__(self, max_entries: int = 512, max_age: float = 3600.0):
+        """
+        Args:
+            max_entries: Results kept, least recently used dropped first
+            max_age: Seconds a result is trusted when no fingerprint is known
+        """
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        # (kind, id) -> (fingerprint, stored at, result)
+        self._entries: OrderedDict[tuple[str, str], tuple[str | None, float, dict[str, Any]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "SummaryCache":
+        """Defaults, overridden by NOTEBOOKLM_SUMMARY_* environment variables."""
+        def env(name: str, default: float) -> float:
+            try:
+                return float(os.environ[name])
+            except (KeyError, ValueError):
+                return default
+
+        return cls(
+            max_entries=int(env("NOTEBOOKLM_SUMMARY_CACHE_SIZE", 512)),
+            max_age=env("NOTEBOOKLM_SUMMARY_MAX_AGE", 3600.0),
+        )
+
+    def get(self, kind: str, item_id: str, fingerprint: str | None) -> dict[str, Any] | None:
+        """Cached result, or None if absent or generated from other content."""
+        key = (kind, item_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_fresh(entry, fingerprint):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry[2])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def _is_fresh(self, entry: tuple[str | None, float, dict[str, Any]], fingerprint: str | None) -> bool:
+        if fingerprint is not None:
+            return entry[0] == fingerprint
+        return time.monotonic() - entry[1] < self.max_age
+
+    def put(self, kind: str, item_id: str, fingerprint: str | None, result: dict[str, Any]) -> None:
+        """Store a result generated from content with the given fingerprint."""
+        if self.max_entries <= 0 or not result.get("summary"):
+            return
+        key = (kind, item_id)
+        with self._lock:
+            self._entries[key] = (fingerprint, time.monotonic(), dict(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, item_id: str) -> None:
+        """Drop every result stored for the id."""
+        with self._lock:
+            for key in [key for key in self._entries if key[1] == item_id]:
+                del self._entries[key]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
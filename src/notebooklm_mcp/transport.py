@@ -0,0 +1,109 @@
+"""HTTP transport settings shared by the sync and async clients.
+
+Traffic to notebooklm.google.com goes through two long-lived httpx clients
+(lanes) per NotebookLM client, so TLS sessions and keep-alive connections
+are reused:
+
+    short  metadata RPCs, polls and the homepage fetch for auth tokens
+    long   queries, source adds and research imports (up to 120 s each)
+
+Each lane has its own pool, so slow calls filling the long lane never make
+cheap polls wait for a connection. With HTTP/2 (needs the h2 package:
+`pip install notebooklm-mcp-server[http2]`), concurrent requests in a lane
+are multiplexed over a few connections.
+
+Environment overrides (short lane; prefix NOTEBOOKLM_LONG_ for the long lane):
+    NOTEBOOKLM_HTTP2=0|1                 Use HTTP/2 when h2 is installed (default 1)
+    NOTEBOOKLM_MAX_CONNECTIONS=<n>       Pool size (default 20, long lane 8)
+    NOTEBOOKLM_MAX_KEEPALIVE=<n>         Idle connections kept open (default 10, long lane 4)
+    NOTEBOOKLM_KEEPALIVE_EXPIRY=<secs>   Idle connection lifetime (default 120)
+    NOTEBOOKLM_POOL_TIMEOUT=<secs>       Max wait for a free connection (default 10, long lane 30)
+"""
+
+import importlib.util
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger("notebooklm_mcp.api")
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    """Connection pool and protocol settings for the httpx client."""
+
+    http2: bool = True
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 120.0  # Google keeps idle connections open for a few minutes
+    connect_timeout: float = 10.0
+    pool_timeout: float = 10.0  # Max wait for a free connection - bounds queueing under load
+    timeout: float = 30.0  # Read/write timeout unless a request overrides it
+
+    @classmethod
+    def from_env(cls, prefix: str = "NOTEBOOKLM_", defaults: "TransportConfig | None" = None) -> "TransportConfig":
+        """`defaults` (or the short-lane defaults), overridden by <prefix>* environment variables."""
+        defaults = defaults or cls()
+        http2 = os.environ.get(f"{prefix}HTTP2")
+        return cls(
+            http2=defaults.http2 if http2 is None else http2.lower() not in ("0", "false", "no"),
+            max_connections=_env_int(f"{prefix}MAX_CONNECTIONS", defaults.max_connections),
+            max_keepalive_connections=_env_int(f"{prefix}MAX_KEEPALIVE", defaults.max_keepalive_connections),
+            keepalive_expiry=_env_float(f"{prefix}KEEPALIVE_EXPIRY", defaults.keepalive_expiry),
+            connect_timeout=defaults.connect_timeout,
+            pool_timeout=_env_float(f"{prefix}POOL_TIMEOUT", defaults.pool_timeout),
+            timeout=defaults.timeout,
+        )
+
+    @classmethod
+    def long_running_from_env(cls) -> "TransportConfig":
+        """Long-lane settings: NOTEBOOKLM_LONG_* overrides on LONG_RUNNING_DEFAULTS."""
+        return cls.from_env("NOTEBOOKLM_LONG_", LONG_RUNNING_DEFAULTS)
+
+    @property
+    def use_http2(self) -> bool:
+        """Whether HTTP/2 is both requested and available."""
+        return self.http2 and HTTP2_AVAILABLE
+
+    def client_kwargs(self) -> dict[str, Any]:
+        """Keyword arguments for httpx.Client / httpx.AsyncClient."""
+        if self.http2 and not HTTP2_AVAILABLE:
+            logger.debug("HTTP/2 requested but h2 is not installed - using HTTP/1.1")
+        return {
+            "http2": self.use_http2,
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "timeout": httpx.Timeout(self.timeout, connect=self.connect_timeout, pool=self.pool_timeout),
+        }
+
+
+# Fewer connections, and callers may wait longer for one: these requests are
+# slow anyway, and a small pool keeps them from crowding out the short lane
+LONG_RUNNING_DEFAULTS = TransportConfig(
+    max_connections=8,
+    max_keepalive_connections=4,
+    pool_timeout=30.0,
+    timeout=120.0,
+)
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def conversation_db(tmp_path, monkeypatch):
+    """Keep the default SQLite conversation store out of the home directory."""
+    path = tmp_path / "conversations.sqlite3"
+    monkeypatch.setenv("NOTEBOOKLM_CONVERSATION_DB", str(path))
+    return path
@@ -0,0 +1,236 @@
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from notebooklm_mcp.answer_cache import AnswerCache, MinHasher, QueryIndex, normalize_query, similarity
+from notebooklm_mcp.async_client import AsyncNotebookLMClient
+from notebooklm_mcp.notebook_cache import NotebookCache, NotebookListCache
+
+
+def rpc_response(rpc_id, payload):
+    chunk = json.dumps([["wrb.fr", rpc_id, json.dumps(payload), None, None, None, "generic"]])
+    return f")]}}'\n{len(chunk)}\n{chunk}"
+
+
+def query_chunk(text, type_code):
+    inner = json.dumps([[text, None, [], None, [[], None, None, None, type_code]]])
+    chunk = json.dumps([["wrb.fr", None, inner]])
+    return f"{len(chunk)}\n{chunk}\n"
+
+
+def make_client(answer_cache=None, query_index=None):
+    calls = []
+    state = {"modified": 1700000000, "source_modified": 1}
+
+    def handler(request):
+        if request.url.path.endswith("GenerateFreeFormStreamed"):
+            calls.append("query")
+            answer = f"Answer number {calls.count('query')} from the notebook."
+            return httpx.Response(200, text=")]}'\n" + query_chunk(answer, 1))
+        rpc_id = request.url.params.get("rpcids")
+        calls.append(rpc_id)
+        payload = []
+        if rpc_id == "rLM1Ne":
+            source = [["a"], "Source", [None, 10, [state["source_modified"], 0]], [None, 2]]
+            payload = [["Notebook", [source], "nb", None, None, [1, False, None, None, None, [state["modified"], 0]]]]
+        return httpx.Response(200, text=rpc_response(rpc_id, payload))
+
+    client = AsyncNotebookLMClient(
+        cookies={"SID": "test_sid"},
+        csrf_token="token",
+        session_id="sid",
+        notebook_cache=NotebookCache(),
+        notebook_list_cache=NotebookListCache(),
+        answer_cache=answer_cache or AnswerCache(),
+        query_index=query_index or QueryIndex(),
+    )
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._long_running_client = client._client
+    return client, calls, state
+
+
+class TestAnswerCache:
+    """Test the opt-in first-turn answer cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_question_served_from_cache(self):
+        client, calls, _ = make_client()
+
+        first = await client.query("nb", "What is it?", source_ids=["b", "a"], use_cache=True)
+        second = await client.query("nb", "  what IS it ", source_ids=["a", "b"], use_cache=True)
+
+        assert calls == ["rLM1Ne", "query"]
+        assert second["answer"] == first["answer"]
+        assert second["cached"] is True and "cached" not in first
+        # A hit starts its own conversation, seeded with the cached turn
+        assert second["conversation_id"] != first["conversation_id"]
+        history = client.get_conversation_history(second["conversation_id"])
+        assert [turn["answer"] for turn in history] == [first["answer"]]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_opt_in_and_first_turn_only(self):
+        client, calls, _ = make_client()
+
+        first = await client.query("nb", "What is it?", source_ids=["a"])
+        await client.query("nb", "What is it?", source_ids=["a"])
+        await client.query("nb", "What is it?", source_ids=["a"], conversation_id=first["conversation_id"],
+                           use_cache=True)
+
+        assert calls == ["query", "query", "query"]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_modified_notebook_misses(self):
+        client, calls, state = make_client()
+
+        await client.query("nb", "What is it?", source_ids=["a"], use_cache=True)
+        state["modified"] += 60
+        client._notebook_cache.clear()
+        result = await client.query("nb", "What is it?", source_ids=["a"], use_cache=True)
+
+        assert calls == ["rLM1Ne", "query", "rLM1Ne", "query"]
+        assert result["answer"] == "Answer number 2 from the notebook."
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_source_edit_misses_despite_stale_notebook_list(self):
+        """The version comes from the notebook structure, not the stale-while-revalidate list."""
+        client, calls, state = make_client()
+        client._notebook_list_cache.put([], client._notebook_list_cache.epoch())
+
+        await client.query("nb", "What is it?", source_ids=["a"], use_cache=True)
+        # A source edited elsewhere: its metadata changes, the notebook set does not
+        state["source_modified"] += 1
+        client._notebook_cache.clear()
+        result = await client.query("nb", "What is it?", source_ids=["a"], use_cache=True)
+
+        assert "wXbhsf" not in calls
+        assert calls.count("query") == 2 and "cached" not in result
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_configure_chat_drops_answers(self):
+        cache = AnswerCache()
+        client, _, _ = make_client(cache)
+
+        await client.query("nb", "What is it?", source_ids=["a"], use_cache=True)
+        assert cache.stats()["entries"] == 1
+        await client.configure_chat("nb", goal="learning_guide")
+
+        assert cache.stats()["entries"] == 0
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_tool_reports_cache_hit(self):
+        from notebooklm_mcp import server
+
+        client, _, _ = make_client()
+        fn = getattr(server.notebook_query, "fn", server.notebook_query)
+        with patch.object(server, "get_client", return_value=client):
+            first = await fn(notebook_id="nb", query="Q?", source_ids=["a"], use_cache=True)
+            second = await fn(notebook_id="nb", query="Q?", source_ids=["a"], use_cache=True)
+
+        assert first["cached"] is False
+        assert second["cached"] is True and second["cache_age_seconds"] >= 0
+        assert second["answer"] == first["answer"]
+        await client.close()
+
+    def test_normalize_query(self):
+        assert normalize_query("  What is\tIT?? ") == "what is it"
+
+
+class TestQueryIndex:
+    """Test near-duplicate question matching."""
+
+    @pytest.mark.asyncio
+    async def test_reworded_question_reuses_answer(self):
+        client, calls, _ = make_client()
+
+        first = await client.query("nb", "How does the model handle errors?", source_ids=["a"], match_similar=True)
+        second = await client.query("nb", "how do the models handle errors", source_ids=["a"], match_similar=True)
+        other = await client.query("nb", "Who funded the project?", source_ids=["a"], match_similar=True)
+
+        assert calls == ["rLM1Ne", "query", "query"]
+        assert second["answer"] == first["answer"] and second["cached"] is True
+        assert second["matched_question"] == "How does the model handle errors?"
+        assert 0.7 <= second["similarity"] <= 1
+        assert "matched_question" not in other
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_scoped_to_sources_and_notebook_state(self):
+        client, calls, state = make_client()
+
+        await client.query("nb", "What are the key findings?", source_ids=["a"], match_similar=True)
+        await client.query("nb", "What are the key findings?", source_ids=["b"], match_similar=True)
+        state["modified"] += 60
+        client._notebook_cache.clear()
+        await client.query("nb", "What are the key findings?", source_ids=["a"], match_similar=True)
+
+        assert calls.count("query") == 3
+        await client.close()
+
+    def test_signatures(self):
+        hasher = MinHasher()
+        question = hasher.signature("What are the key findings?")
+
+        assert similarity(question, hasher.signature("what are the KEY findings")) == 1.0
+        assert similarity(question, hasher.signature("Who wrote the report?")) < 0.3
+        assert hasher.signature("What is it?") is None
+
+    def test_framing_words_do_not_count(self):
+        hasher = MinHasher()
+
+        question = hasher.signature("What are the key findings")
+
+        assert similarity(question, hasher.signature("Summarize the main findings")) >= QueryIndex().threshold
+
+    @pytest.mark.parametrize(
+        "first,second",
+        [
+            ("What does chapter 3 say", "What does chapter 4 say"),
+            ("What was the revenue in 2022?", "What was the revenue in 2023?"),
+            ("What does the EU regulation require?", "What does the US regulation require?"),
+        ],
+    )
+    def test_numbers_and_short_words_must_agree(self, first, second):
+        index = QueryIndex()
+        scope = ("nb", ("a",), "[]")
+        index.add(scope, first, "The first answer.", "t1")
+
+        assert index.match(scope, second, "t1") is None
+        assert index.match(scope, first, "t1") is not None
+
+    def test_least_recently_used_scopes_dropped(self):
+        index = QueryIndex(max_scopes=2)
+        for notebook_id in ["nb1", "nb2"]:
+            index.add((notebook_id, (), "[]"), "alpha findings", "answer", "t1")
+        assert index.match(("nb1", (), "[]"), "alpha findings", "t1") is not None
+
+        index.add(("nb3", (), "[]"), "alpha findings", "answer", "t1")
+
+        assert index.stats()["questions"] == 2
+        assert index.match(("nb2", (), "[]"), "alpha findings", "t1") is None
+        assert index.match(("nb1", (), "[]"), "alpha findings", "t1") is not None
+
+    def test_bounded_and_invalidated(self):
+        index = QueryIndex(per_scope=2)
+        scope = ("nb", ("a",), "[]")
+        for i, question in enumerate(["alpha findings", "beta results", "gamma methods"]):
+            index.add(scope, question, f"answer {i}", "t1")
+
+        assert index.match(scope, "alpha findings", "t1") is None
+        entry, score = index.match(scope, "gamma methods", "t1")
+        assert (entry.answer, score) == ("answer 2", 1.0)
+        index.invalidate("other")
+        assert index.stats()["questions"] == 2
+        # Entries from before the notebook changed are dropped
+        assert index.match(scope, "gamma methods", "t2") is None
+        assert index.stats()["questions"] == 0
+
+        index.add(scope, "delta", "answer", "t2")
+        index.invalidate("nb")
+        assert index.stats()["questions"] == 0
@@ -113,33 +113,37 @@ class TestNotebookLMClientAuth:
         # Restore the original method for this test
         original_method = NotebookLMClient._refresh_auth_tokens
         
-        with patch("httpx.Client") as MockClient:
-            # Mock the context manager behavior
-            client_instance = MockClient.return_value.__enter__.return_value
-            
-            req = httpx.Request("GET", "https://notebooklm.google.com/")
-            client_instance.get.return_value = httpx.Response(200, request=req, text=html)
-            
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, text=html)
+
+        # The page fetch goes through the shared RPC client
+        http_client = httpx.Client(transport=httpx.MockTransport(handler), headers=mock_client._rpc_headers())
+        with patch.object(mock_client, '_get_client', return_value=http_client):
             # Call the real method bound to the instance
             original_method(mock_client)
             
             assert mock_client.csrf_token == "new_csrf_token"
             assert mock_client._session_id == "123456789"
+            # RPC-only headers are not sent with the page GET
+            assert "X-Same-Domain" not in seen[0].headers
+            assert seen[0].headers["Cookie"] == "SID=test_sid"
 
     def test_refresh_auth_tokens_redirect_login(self, mock_client):
         """Test that redirect into login (expired cookies) raises ValueError."""
         
         original_method = NotebookLMClient._refresh_auth_tokens
         
-        with patch("httpx.Client") as MockClient:
-            client_instance = MockClient.return_value.__enter__.return_value
-            
-            # Mock redirect to accounts.google.com
-            # Note: httpx follows redirects so the final response URL is the login page
-            request = httpx.Request("GET", "https://accounts.google.com/ServiceLogin")
-            resp = httpx.Response(200, request=request, text="login page")
-            client_instance.get.return_value = resp
-            
+        def handler(request):
+            # httpx follows the redirect so the final response URL is the login page
+            if request.url.host == "accounts.google.com":
+                return httpx.Response(200, text="login page")
+            return httpx.Response(302, headers={"Location": "https://accounts.google.com/ServiceLogin"})
+
+        http_client = httpx.Client(transport=httpx.MockTransport(handler))
+        with patch.object(mock_client, '_get_client', return_value=http_client):
             with pytest.raises(ValueError, match="Authentication expired"):
                 original_method(mock_client)
 
@@ -182,7 +186,7 @@ class TestNotebookLMClientAuth:
             # ... other fields ignored
         ]]
         
-        with patch.object(mock_client, 'get_notebook', return_value=notebook_response):
+        with patch.object(mock_client, '_call_rpc', return_value=notebook_response):
             sources = mock_client.get_notebook_sources_with_types("nb_uuid")
             
             assert len(sources) == 1
@@ -230,3 +234,94 @@ class TestNotebookLMClientAuth:
             # Verify result contains friendly message
             assert result["status"] == "timeout"
             assert f"timed out after {SOURCE_ADD_TIMEOUT}s" in result["message"].lower()
+
+    def test_query_stream_yields_incremental_answers(self, mock_client):
+        """Test that query_stream yields answers as chunks arrive and query returns the last."""
+        def chunk(text, type_code):
+            inner = json.dumps([[text, None, [], None, [[], None, None, None, type_code]]])
+            payload = json.dumps([["wrb.fr", None, inner]])
+            return f"{len(payload)}\n{payload}\n".encode()
+
+        answers = ["The answer starts here", "The answer starts here and then finishes."]
+        stream = [b")]}'\n", chunk("Thinking about the sources first.", 2)] + [chunk(a, 1) for a in answers]
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=iter(stream)))
+
+        with patch.object(mock_client, '_get_client', return_value=httpx.Client(transport=transport)):
+            updates = list(mock_client.query_stream("nb_id", "Question?", source_ids=["s1"]))
+            result = mock_client.query("nb_id", "Question?", source_ids=["s1"])
+
+        assert [u["type"] for u in updates] == ["thinking", "answer", "answer", "done"]
+        assert [u["text"] for u in updates if u["type"] == "answer"] == answers
+        assert result["answer"] == answers[-1]
+        assert result["partial"] is False
+
+
+class TestNotebookLMClientBatching:
+    """Test batchexecute calls carrying several RPCs."""
+
+    def test_batch_request_uses_per_call_identifiers(self, mock_client):
+        """Test that batched calls are numbered and a single call stays "generic"."""
+        from urllib.parse import parse_qs
+
+        single = json.loads(parse_qs(mock_client._build_request_body("yR9Yof", []))["f.req"][0])
+        assert single[0][0][3] == "generic"
+
+        body = mock_client._build_batch_request_body([("yR9Yof", ["a"]), ("yR9Yof", ["b"])])
+        f_req = json.loads(parse_qs(body)["f.req"][0])
+        assert [call[3] for call in f_req[0]] == ["1", "2"]
+        assert [json.loads(call[1]) for call in f_req[0]] == [["a"], ["b"]]
+
+    def test_batch_results_split_by_identifier(self, mock_client):
+        """Test that repeated rpc_ids in one response go back to the right caller."""
+        # Responses may arrive out of order
+        items = [
+            ["wrb.fr", "yR9Yof", json.dumps([[None, False]]), None, None, None, "2"],
+            ["wrb.fr", "yR9Yof", json.dumps([[None, True]]), None, None, None, "1"],
+        ]
+        chunk = json.dumps(items)
+        response_text = f")]}}'\n{len(chunk)}\n{chunk}"
+
+        with patch.object(mock_client, '_get_client') as mock_get_client:
+            http_client = MagicMock(spec=httpx.Client)
+            mock_get_client.return_value = http_client
+            req = httpx.Request("POST", "https://notebooklm.google.com/batchexecute")
+            http_client.post.return_value = httpx.Response(200, request=req, text=response_text)
+
+            freshness = mock_client.check_sources_freshness(["src_a", "src_b"])
+
+        assert freshness == {"src_a": True, "src_b": False}
+        # One round trip for both sources
+        assert http_client.post.call_count == 1
+        url = http_client.post.call_args[0][0]
+        assert "rpcids=yR9Yof&" in url
+
+    def test_batch_auth_error_on_any_call_retries(self, mock_client):
+        """Test that RPC Error 16 on one batched call triggers auth recovery."""
+        error_items = [
+            ["wrb.fr", "gArtLc", json.dumps([]), None, None, None, "1"],
+            ["wrb.fr", "cFji9", None, None, None, [16], "2"],
+        ]
+        ok_items = [
+            ["wrb.fr", "gArtLc", json.dumps([]), None, None, None, "1"],
+            ["wrb.fr", "cFji9", json.dumps([]), None, None, None, "2"],
+        ]
+
+        def wrap(items):
+            chunk = json.dumps(items)
+            return f")]}}'\n{len(chunk)}\n{chunk}"
+
+        with patch.object(mock_client, '_get_client') as mock_get_client, \
+             patch.object(mock_client, '_refresh_auth_tokens') as mock_refresh:
+            http_client = MagicMock(spec=httpx.Client)
+            mock_get_client.return_value = http_client
+            req = httpx.Request("POST", "https://notebooklm.google.com/batchexecute")
+            http_client.post.side_effect = [
+                httpx.Response(200, request=req, text=wrap(error_items)),
+                httpx.Response(200, request=req, text=wrap(ok_items)),
+            ]
+
+            artifacts, mind_maps = mock_client.poll_studio_with_mind_maps("nb_id")
+
+        mock_refresh.assert_called_once()
+        assert artifacts == [] and mind_maps == []
+        assert http_client.post.call_count == 2
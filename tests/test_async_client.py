@@ -0,0 +1,385 @@
+import asyncio
+import inspect
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from notebooklm_mcp.async_client import AsyncNotebookLMClient
+from notebooklm_mcp.deadline import DeadlineExceeded, deadline_scope
+from notebooklm_mcp.retry import RetryPolicy
+
+
+def rpc_response(rpc_id, payload):
+    """Wrap a result the way batchexecute does."""
+    chunk = json.dumps([["wrb.fr", rpc_id, json.dumps(payload), None, None, None, "generic"]])
+    return f")]}}'\n{len(chunk)}\n{chunk}"
+
+
+def query_chunk(text, type_code):
+    inner = json.dumps([[text, None, [], None, [[], None, None, None, type_code]]])
+    chunk = json.dumps([["wrb.fr", None, inner]])
+    return f"{len(chunk)}\n{chunk}\n"
+
+
+@pytest.fixture
+def async_client():
+    return AsyncNotebookLMClient(cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid")
+
+
+def use_transport(client, handler):
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return patch.object(client, "_get_client", return_value=http_client)
+
+
+class TestAsyncNotebookLMClient:
+    """Test the asyncio client against a mock transport."""
+
+    def test_init_does_not_fetch_tokens(self):
+        """Constructing without a CSRF token must not do blocking I/O."""
+        with patch.object(AsyncNotebookLMClient, "_refresh_auth_tokens") as mock_refresh:
+            AsyncNotebookLMClient(cookies={"SID": "test_sid"})
+        mock_refresh.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_call_rpc_parses_result(self, async_client):
+        """Test that _call_rpc posts the request and extracts the RPC result."""
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, text=rpc_response("rLM1Ne", {"status": "ok"}))
+
+        with use_transport(async_client, handler):
+            result = await async_client._call_rpc("rLM1Ne", [], "/notebook/abc")
+
+        assert result == {"status": "ok"}
+        assert seen[0].url.params["rpcids"] == "rLM1Ne"
+        assert seen[0].url.params["source-path"] == "/notebook/abc"
+
+    @pytest.mark.asyncio
+    async def test_lazy_token_fetch_on_first_rpc(self):
+        """Test that missing tokens are fetched before the first RPC."""
+        client = AsyncNotebookLMClient(cookies={"SID": "test_sid"})
+
+        async def fake_refresh():
+            client.csrf_token = "fresh"
+
+        def handler(request):
+            return httpx.Response(200, text=rpc_response("rLM1Ne", []))
+
+        with patch.object(client, "_refresh_auth_tokens", side_effect=fake_refresh) as mock_refresh, \
+             use_transport(client, handler):
+            await client._call_rpc("rLM1Ne", [])
+            await client._call_rpc("rLM1Ne", [])
+
+        mock_refresh.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_auto_retry_on_401(self, async_client):
+        """Test that the client refreshes tokens and retries on HTTP 401."""
+        responses = [
+            httpx.Response(401),
+            httpx.Response(200, text=rpc_response("rLM1Ne", {"status": "ok"})),
+        ]
+
+        with use_transport(async_client, lambda request: responses.pop(0)), \
+             patch.object(async_client, "_refresh_auth_tokens", new_callable=AsyncMock) as mock_refresh:
+            result = await async_client._call_rpc("rLM1Ne", [])
+
+        mock_refresh.assert_awaited_once()
+        assert result == {"status": "ok"}
+        assert responses == []
+
+    @pytest.mark.asyncio
+    async def test_add_source_timeout(self, async_client):
+        """Test that a source add timeout is reported, not raised."""
+        def handler(request):
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        with use_transport(async_client, handler):
+            result = await async_client.add_url_source("nb", "https://example.com")
+
+        assert result["status"] == "timeout"
+
+    @pytest.mark.asyncio
+    async def test_query_caches_turn_for_follow_up(self, async_client):
+        """Test that query parses the streamed answer and records the turn."""
+        answer = "This is the final answer from the notebook."
+        bodies = []
+
+        def handler(request):
+            bodies.append(request.content.decode())
+            return httpx.Response(
+                200,
+                text=")]}'\n" + query_chunk("Thinking about the question first.", 2) + query_chunk(answer, 1),
+            )
+
+        with use_transport(async_client, handler):
+            first = await async_client.query("nb", "What is it?", source_ids=["s1"])
+            await async_client.query(
+                "nb", "Tell me more", source_ids=["s1"], conversation_id=first["conversation_id"]
+            )
+
+        assert first["answer"] == answer
+        assert first["turn_number"] == 1
+        assert len(async_client.get_conversation_history(first["conversation_id"])) == 2
+        # The follow-up carries the first turn as history
+        assert "What%20is%20it" in bodies[1]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_rpcs_share_loop(self, async_client):
+        """Test that concurrent RPCs overlap instead of running back to back."""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, text=rpc_response("rLM1Ne", {}))
+
+        with use_transport(async_client, handler):
+            # Distinct params: identical reads would share one request
+            await asyncio.gather(*(async_client._call_rpc("rLM1Ne", [i]) for i in range(5)))
+
+        assert peak == 5
+
+
+class TestAsyncServerTools:
+    """Test that MCP tools run on the event loop."""
+
+    def test_tools_are_coroutines(self):
+        from notebooklm_mcp import server
+
+        for name in ("notebook_list", "notebook_query", "research_status", "studio_status", "refresh_auth"):
+            tool = getattr(server, name)
+            fn = getattr(tool, "fn", tool)
+            assert inspect.iscoroutinefunction(fn), name
+
+    @pytest.mark.asyncio
+    async def test_notebook_query_reports_progress(self):
+        """Test that streamed answer text reaches the MCP client as progress."""
+        from fastmcp import Client
+
+        from notebooklm_mcp import server
+
+        class FakeClient:
+            async def query_stream(self, notebook_id, **kwargs):
+                yield {"type": "thinking", "text": "Looking at sources"}
+                yield {"type": "answer", "text": "Partial"}
+                yield {"type": "answer", "text": "Partial answer"}
+                yield {"type": "done", "result": {"answer": "Partial answer", "conversation_id": "c1"}}
+
+        progress = []
+
+        async def on_progress(value, total, message):
+            progress.append((value, message))
+
+        with patch.object(server, "get_client", return_value=FakeClient()):
+            async with Client(server.mcp) as mcp_client:
+                result = await mcp_client.call_tool(
+                    "notebook_query", {"notebook_id": "nb", "query": "Q?"}, progress_handler=on_progress
+                )
+
+        assert result.data["answer"] == "Partial answer"
+        assert progress == [
+            (1, "Thinking: Looking at sources"),
+            (2, "Partial"),
+            (3, "Partial answer"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_notebook_query_cancellation_closes_stream(self):
+        """Test that cancelling the tool mid-stream closes the query stream."""
+        from notebooklm_mcp import server
+
+        closed = asyncio.Event()
+        streaming = asyncio.Event()
+
+        class FakeClient:
+            async def query_stream(self, notebook_id, **kwargs):
+                try:
+                    yield {"type": "answer", "text": "First part"}
+                    streaming.set()
+                    await asyncio.sleep(10)
+                    yield {"type": "done", "result": {}}
+                finally:
+                    closed.set()
+
+        fn = getattr(server.notebook_query, "fn", server.notebook_query)
+        with patch.object(server, "get_client", return_value=FakeClient()):
+            task = asyncio.create_task(fn(notebook_id="nb", query="Q?"))
+            await streaming.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert closed.is_set()
+
+
+class TestRpcCoalescing:
+    """Test merging of concurrent RPCs into one batchexecute POST."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_rpcs_share_one_post(self):
+        client = AsyncNotebookLMClient(
+            cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid", coalesce_rpcs=True
+        )
+        posts = []
+
+        def handler(request):
+            from urllib.parse import parse_qs
+
+            f_req = json.loads(parse_qs(request.content.decode())["f.req"][0])
+            posts.append(f_req)
+            items = [
+                ["wrb.fr", call[0], json.dumps(json.loads(call[1])), None, None, None, call[3]]
+                for call in f_req[0]
+            ]
+            chunk = json.dumps(items)
+            return httpx.Response(200, text=f")]}}'\n{len(chunk)}\n{chunk}")
+
+        with use_transport(client, handler):
+            results = await asyncio.gather(*(client._call_rpc("rLM1Ne", [i]) for i in range(3)))
+
+        assert results == [[0], [1], [2]]
+        assert len(posts) == 1
+        assert [call[3] for call in posts[0][0]] == ["1", "2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_reaches_every_caller(self):
+        client = AsyncNotebookLMClient(
+            cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid", coalesce_rpcs=True,
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+
+        with use_transport(client, lambda request: httpx.Response(500)):
+            results = await asyncio.gather(
+                client._call_rpc("rLM1Ne", []), client._call_rpc("wXbhsf", []), return_exceptions=True
+            )
+
+        assert all(isinstance(r, httpx.HTTPStatusError) for r in results)
+
+    @staticmethod
+    def echo(f_req):
+        items = [
+            ["wrb.fr", call[0], json.dumps(json.loads(call[1])), None, None, None, call[3]]
+            for call in f_req[0]
+        ]
+        chunk = json.dumps(items)
+        return httpx.Response(200, text=f")]}}'\n{len(chunk)}\n{chunk}")
+
+    @pytest.mark.asyncio
+    async def test_each_caller_keeps_its_own_deadline(self):
+        client = AsyncNotebookLMClient(
+            cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid", coalesce_rpcs=True,
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+        read_timeouts = []
+
+        async def handler(request):
+            from urllib.parse import parse_qs
+
+            read_timeouts.append(request.extensions["timeout"]["read"])
+            await asyncio.sleep(0.2)
+            return self.echo(json.loads(parse_qs(request.content.decode())["f.req"][0]))
+
+        async def call(seconds, value):
+            with deadline_scope(seconds):
+                return await client._call_rpc("rLM1Ne", [value])
+
+        # The loose caller submits first, so the flush runs in its context
+        with use_transport(client, handler):
+            results = await asyncio.gather(call(30, 0), call(0.05, 1), return_exceptions=True)
+
+        assert results[0] == [0]
+        assert isinstance(results[1], DeadlineExceeded)
+        assert read_timeouts[0] <= 0.05
+
+    @pytest.mark.asyncio
+    async def test_batch_cut_short_is_resent_for_remaining_callers(self):
+        client = AsyncNotebookLMClient(
+            cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid", coalesce_rpcs=True,
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+        posts = []
+
+        async def handler(request):
+            from urllib.parse import parse_qs
+
+            f_req = json.loads(parse_qs(request.content.decode())["f.req"][0])
+            posts.append([json.loads(call[1]) for call in f_req[0]])
+            if request.extensions["timeout"]["read"] <= 0.05:
+                await asyncio.sleep(0.1)
+                raise httpx.ReadTimeout("timed out", request=request)
+            return self.echo(f_req)
+
+        async def call(seconds, value):
+            with deadline_scope(seconds):
+                return await client._call_rpc("rLM1Ne", [value])
+
+        with use_transport(client, handler):
+            results = await asyncio.gather(call(30, 0), call(0.05, 1), return_exceptions=True)
+
+        assert results[0] == [0]
+        assert isinstance(results[1], (DeadlineExceeded, httpx.ReadTimeout))
+        assert posts == [[[0], [1]], [[0]]]
+
+
+class TestQueryStream:
+    """Test incremental delivery of query answers."""
+
+    @pytest.mark.asyncio
+    async def test_yields_updates_as_chunks_arrive(self, async_client):
+        answer = "Partial answer that keeps growing"
+        chunks = [
+            ")]}'\n",
+            query_chunk("Reading the sources for the question.", 2),
+            query_chunk(answer, 1),
+            query_chunk(answer + " until it is complete.", 1),
+        ]
+
+        async def body():
+            for chunk in chunks:
+                await asyncio.sleep(0)
+                yield chunk.encode()
+
+        with use_transport(async_client, lambda request: httpx.Response(200, content=body())):
+            updates = [u async for u in async_client.query_stream("nb", "Question?", source_ids=["s1"])]
+
+        assert [u["type"] for u in updates] == ["thinking", "answer", "answer", "done"]
+        result = updates[-1]["result"]
+        assert result["answer"] == answer + " until it is complete."
+        assert result["partial"] is False
+        assert result["time_to_first_token_seconds"] is not None
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_best_partial_answer(self, async_client):
+        answer = "Only the first part of the answer arrived"
+
+        def handler(request):
+            async def body():
+                yield (")]}'\n" + query_chunk(answer, 1)).encode()
+                raise httpx.ReadTimeout("timed out", request=request)
+
+            return httpx.Response(200, content=body())
+
+        with use_transport(async_client, handler):
+            result = await async_client.query("nb", "Question?", source_ids=["s1"])
+
+        assert result["answer"] == answer
+        assert result["partial"] is True
+        # Partial answers are not recorded as conversation history
+        assert async_client.get_conversation_history(result["conversation_id"]) is None
+
+    @pytest.mark.asyncio
+    async def test_timeout_without_text_raises(self, async_client):
+        def handler(request):
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        with use_transport(async_client, handler), pytest.raises(httpx.ReadTimeout):
+            await async_client.query("nb", "Question?", source_ids=["s1"])
@@ -0,0 +1,142 @@
+import json
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from notebooklm_mcp.api_client import RPC_NAMES
+from notebooklm_mcp.async_client import AsyncNotebookLMClient
+from notebooklm_mcp.circuit import QUERY, CircuitBreaker, CircuitOpenError
+from notebooklm_mcp.retry import RetryPolicy
+
+
+def rpc_response(rpc_id, payload):
+    chunk = json.dumps([["wrb.fr", rpc_id, json.dumps(payload), None, None, None, "generic"]])
+    return f")]}}'\n{len(chunk)}\n{chunk}"
+
+
+def status_error(code):
+    request = httpx.Request("POST", "https://notebooklm.google.com/")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(code, request=request))
+
+
+def fail(breaker, rpc_id, error, endpoint="batchexecute"):
+    with pytest.raises(type(error)):
+        with breaker.guard([rpc_id], endpoint):
+            raise error
+
+
+class TestCircuitBreaker:
+    """Test opening, fast-fail and half-open probing."""
+
+    def test_opens_after_failure_rate(self):
+        breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, open_seconds=60.0, labels=RPC_NAMES)
+
+        with breaker.guard(["rLM1Ne"]):
+            pass
+        for _ in range(3):
+            fail(breaker, "rLM1Ne", status_error(503))
+
+        with pytest.raises(CircuitOpenError) as excinfo:
+            with breaker.guard(["rLM1Ne"]):
+                pytest.fail("call should not be sent")
+
+        error = excinfo.value.to_dict()
+        assert error["error_type"] == "circuit_open"
+        assert (error["rpc"], error["endpoint"]) == ("get_notebook", "batchexecute")
+        assert 0 < error["retry_after_seconds"] <= 60
+        assert breaker.stats()["batchexecute:get_notebook"]["rejected"] == 1
+
+    def test_keys_are_per_rpc_and_endpoint(self):
+        breaker = CircuitBreaker(min_calls=1, open_seconds=60.0)
+        fail(breaker, "query", httpx.ReadTimeout("slow"), QUERY)
+
+        with breaker.guard(["query"]):
+            pass
+        with breaker.guard(["wXbhsf"]):
+            pass
+        with pytest.raises(CircuitOpenError):
+            with breaker.guard(["query"], QUERY):
+                pass
+
+    def test_client_errors_do_not_count(self):
+        breaker = CircuitBreaker(min_calls=1)
+
+        fail(breaker, "rLM1Ne", status_error(400))
+        fail(breaker, "rLM1Ne", status_error(429))
+
+        with breaker.guard(["rLM1Ne"]):
+            pass
+        assert breaker.stats()["batchexecute:rLM1Ne"]["state"] == "closed"
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker(min_calls=1, open_seconds=0.01)
+        fail(breaker, "rLM1Ne", httpx.ConnectError("refused"))
+        time.sleep(0.02)
+
+        # One probe at a time; concurrent calls keep failing fast
+        probes = breaker.before(["rLM1Ne"])
+        with pytest.raises(CircuitOpenError):
+            with breaker.guard(["rLM1Ne"]):
+                pass
+
+        # A failed probe reopens the circuit
+        breaker.after(["rLM1Ne"], "batchexecute", probes, httpx.ConnectError("refused"))
+        assert breaker.stats()["batchexecute:rLM1Ne"]["state"] == "open"
+
+        time.sleep(0.02)
+        with breaker.guard(["rLM1Ne"]):
+            pass
+        assert breaker.stats()["batchexecute:rLM1Ne"]["state"] == "closed"
+
+    def test_disabled(self):
+        breaker = CircuitBreaker(failure_rate=0, min_calls=1)
+        for _ in range(3):
+            fail(breaker, "rLM1Ne", status_error(500))
+        assert breaker.stats() == {}
+
+
+class TestClientFastFail:
+    """Test that an open circuit stops requests before they are sent."""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_request_and_retries(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(502)
+
+        client = AsyncNotebookLMClient(
+            cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid",
+            retry_policy=RetryPolicy(max_attempts=4, base_delay=0.001),
+            circuit_breaker=CircuitBreaker(min_calls=2, open_seconds=60.0),
+        )
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        # Retries stop as soon as the circuit opens
+        with pytest.raises(CircuitOpenError):
+            await client.get_notebook("nb")
+        assert len(requests) == 2
+
+        with pytest.raises(CircuitOpenError):
+            await client.get_notebook("nb")
+        assert len(requests) == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_tool_reports_structured_error(self):
+        from notebooklm_mcp import server
+
+        class FakeClient:
+            async def get_notebook(self, notebook_id):
+                raise CircuitOpenError("get_notebook", "batchexecute", 12.0, 1.0)
+
+        with patch.object(server, "get_client", return_value=FakeClient()):
+            tool = server.notebook_get
+            result = await getattr(tool, "fn", tool)("nb")
+
+        assert result["status"] == "error"
+        assert result["error_type"] == "circuit_open"
+        assert result["retry_after_seconds"] == 12.0
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from notebooklm_mcp import codec
+from notebooklm_mcp.api_client import NotebookLMClient
+
+
+@pytest.fixture(params=codec.available_backends())
+def backend(request):
+    previous = codec.BACKEND
+    codec.set_backend(request.param)
+    yield request.param
+    codec.set_backend(previous)
+
+
+class TestCodec:
+    """Test that every installed backend is interchangeable."""
+
+    def test_dumps_is_compact(self, backend):
+        assert codec.dumps([None, 1, ["a", {"k": True}]]) == '[null,1,["a",{"k":true}]]'
+
+    def test_round_trip(self, backend):
+        value = [["wrb.fr", "rLM1Ne", "노트북 😀\nline", 1.5, -2, None, [[]]]]
+        assert codec.loads(codec.dumps(value)) == value
+        assert codec.loads(json.dumps(value).encode()) == value
+        assert codec.loads(memoryview(json.dumps(value).encode())) == value
+
+    def test_invalid_input_raises_decode_error(self, backend):
+        with pytest.raises(codec.DECODE_ERRORS):
+            codec.loads(b"[1,")
+
+    def test_request_body_decodes_identically(self, backend):
+        """Test that the double-encoded f.req means the same thing on every backend."""
+        from urllib.parse import parse_qs
+
+        client = NotebookLMClient.__new__(NotebookLMClient)
+        client.csrf_token = "token"
+        params = [["src-1"], "Qué es esto? 데이터", None, [2, None, [1]]]
+        body = client._build_request_body("rLM1Ne", params)
+        f_req = json.loads(parse_qs(body)["f.req"][0])
+        assert json.loads(f_req[0][0][1]) == params
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="not available"):
+            codec.set_backend("simdjson")
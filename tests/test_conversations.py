@@ -0,0 +1,421 @@
+import json
+import threading
+import time
+import urllib.parse
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from notebooklm_mcp.api_client import NotebookLMClient
+from notebooklm_mcp.async_client import AsyncNotebookLMClient
+from notebooklm_mcp.conversations import (
+    ConversationStore,
+    ConversationTurn,
+    HistoryPolicy,
+    SqliteConversationStore,
+    conversation_store_from_env,
+)
+
+
+def query_chunk(text, type_code):
+    inner = json.dumps([[text, None, [], None, [[], None, None, None, type_code]]])
+    chunk = json.dumps([["wrb.fr", None, inner]])
+    return f"{len(chunk)}\n{chunk}\n"
+
+
+def rpc_response(rpc_id, payload):
+    chunk = json.dumps([["wrb.fr", rpc_id, json.dumps(payload), None, None, None, "generic"]])
+    return f")]}}'\n{len(chunk)}\n{chunk}"
+
+
+def sent_history(body):
+    """The history array of a GenerateFreeFormStreamed request body."""
+    f_req = urllib.parse.parse_qs(body)["f.req"][0]
+    return json.loads(json.loads(f_req)[1])[2]
+
+
+class TestConversationStore:
+    """Test eviction and accounting of conversation turns."""
+
+    def test_turns_numbered_and_compact(self):
+        store = ConversationStore()
+
+        store.append("c1", "First?", "One")
+        turn = store.append("c1", "Second?", "Two")
+
+        assert turn.turn_number == 2
+        assert [t.answer for t in store.get("c1")] == ["One", "Two"]
+        assert not hasattr(turn, "__dict__")
+        assert store.get("unknown") == []
+
+    def test_least_recently_used_dropped(self):
+        store = ConversationStore(max_conversations=2)
+        store.append("a", "q", "a")
+        store.append("b", "q", "a")
+        store.get("a")
+        store.append("c", "q", "a")
+
+        assert store.get("b") == []
+        assert store.get("a") and store.get("c")
+        assert store.stats()["evicted"]["lru"] == 1
+
+    def test_idle_conversations_expire(self):
+        store = ConversationStore(idle_ttl=0.01)
+        store.append("a", "q", "a")
+        time.sleep(0.02)
+
+        assert store.get("a") == []
+        assert store.stats()["evicted"]["idle"] == 1
+
+    def test_byte_budget(self):
+        answer = "x" * 1000
+        store = ConversationStore(max_bytes=3 * ConversationTurn("q", answer, 1).size)
+        for conversation_id in ("a", "b", "c", "d"):
+            store.append(conversation_id, "q", answer)
+
+        stats = store.stats()
+        assert stats["conversations"] == 3
+        assert stats["bytes"] <= stats["max_bytes"]
+        assert stats["evicted"]["bytes"] == 1
+        assert store.get("a") == []
+
+        # The conversation being written is never dropped, even alone over budget
+        store.append("d", "q", answer * 10)
+        assert len(store.get("d")) == 2
+
+    def test_delete_releases_bytes(self):
+        store = ConversationStore()
+        store.append("a", "q", "answer")
+
+        assert store.delete("a") is True
+        assert store.delete("a") is False
+        assert store.stats()["bytes"] == 0
+
+    def test_client_uses_store(self):
+        store = ConversationStore()
+        client = NotebookLMClient(
+            cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid", conversation_store=store
+        )
+        client._cache_conversation_turn("c1", "What?", "That.", request_bytes=120, elapsed=1.5)
+
+        assert client._build_conversation_history("c1") == [["That.", None, 2], ["What?", None, 1]]
+        assert client.get_conversation_history("c1") == [
+            {"turn": 1, "query": "What?", "answer": "That.", "request_bytes": 120, "elapsed_seconds": 1.5}
+        ]
+        assert client.conversation_stats()["turns"] == 1
+        assert client.clear_conversation("c1") is True
+        assert client._build_conversation_history("c1") is None
+
+
+    @pytest.mark.asyncio
+    async def test_async_client_keeps_store_off_event_loop(self):
+        loop_thread = threading.current_thread()
+        threads = []
+
+        class RecordingStore(ConversationStore):
+            def get(self, conversation_id):
+                threads.append(threading.current_thread())
+                return super().get(conversation_id)
+
+            def append(self, *args, **kwargs):
+                threads.append(threading.current_thread())
+                return super().append(*args, **kwargs)
+
+        def handler(request):
+            if request.url.path.endswith("GenerateFreeFormStreamed"):
+                return httpx.Response(200, text=")]}'\n" + query_chunk("An answer from the notebook sources.", 1))
+            return httpx.Response(200, text=rpc_response("hPTbtc", [[["c1", [["Q", None, 1], ["A", None, 2]]]]]))
+
+        client = AsyncNotebookLMClient(
+            cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid", conversation_store=RecordingStore(),
+            restore_conversations=True,
+        )
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client._long_running_client = client._client
+
+        first = await client.query("nb", "One?", source_ids=["s"])
+        await client.query("nb", "Two?", source_ids=["s"], conversation_id=first["conversation_id"])
+        await client.query("nb", "Three?", source_ids=["s"], conversation_id="c1")
+
+        assert threads and loop_thread not in threads
+        await client.close()
+
+
+class TestSqliteConversationStore:
+    """Test the shared SQLite conversation backend."""
+
+    def test_shared_between_workers(self, tmp_path):
+        first = SqliteConversationStore(tmp_path / "c.sqlite3")
+        second = SqliteConversationStore(tmp_path / "c.sqlite3")
+
+        first.append("c1", "First?", "One")
+        turn = second.append("c1", "Second?", "Two", request_bytes=300, elapsed=2.0)
+
+        assert turn.turn_number == 2
+        assert (first.get("c1")[1].request_bytes, first.get("c1")[1].elapsed) == (300, 2.0)
+        assert [(t.turn_number, t.query) for t in first.get("c1")] == [(1, "First?"), (2, "Second?")]
+        assert second.delete("c1") is True
+        assert first.get("c1") == []
+        first.close()
+        second.close()
+
+    def test_limits(self, tmp_path):
+        store = SqliteConversationStore(tmp_path / "c.sqlite3", max_conversations=2)
+        for conversation_id in ("a", "b", "c"):
+            store.append(conversation_id, "q", "answer")
+        assert store.get("a") == []
+        assert store.stats()["evicted"]["lru"] == 1
+
+        store.max_bytes = 2 * len("qanswer")
+        store.append("c", "q", "answer")
+        stats = store.stats()
+        assert (stats["conversations"], stats["bytes"]) == (1, 14)
+        assert stats["evicted"]["bytes"] == 1
+
+        store.idle_ttl = 0
+        assert store.get("c") == []
+        store.append("d", "q", "a")
+        assert store.stats()["conversations"] == 1
+        store.close()
+
+    @pytest.mark.parametrize("make_store", [
+        lambda tmp_path: ConversationStore(idle_ttl=0.05),
+        lambda tmp_path: SqliteConversationStore(tmp_path / "c.sqlite3", idle_ttl=0.05),
+    ])
+    def test_idle_conversation_starts_afresh(self, tmp_path, make_store):
+        store = make_store(tmp_path)
+        store.append("c1", "q1", "a")
+        store.append("c1", "q2", "a")
+        time.sleep(0.1)
+
+        assert store.get("c1") == []
+        turn = store.append("c1", "q3", "a")
+
+        assert turn.turn_number == 1
+        assert [t.query for t in store.get("c1")] == ["q3"]
+        assert store.stats()["turns"] == 1
+        store.close()
+
+        # Appending straight after the idle period, without a read, also drops the old turns
+        store = make_store(tmp_path)
+        store.delete("c1")
+        store.append("c2", "q1", "a")
+        time.sleep(0.1)
+        assert store.append("c2", "q2", "a").turn_number == 1
+        store.close()
+
+    def test_unusable_path_falls_back_to_memory(self, tmp_path):
+        (tmp_path / "file").write_text("not a directory")
+        store = SqliteConversationStore(tmp_path / "file" / "c.sqlite3")
+
+        store.append("c1", "q", "a")
+
+        assert [t.answer for t in store.get("c1")] == ["a"]
+        assert store.stats()["backend"].startswith("memory")
+
+    def test_backend_from_env(self, monkeypatch, conversation_db):
+        store = conversation_store_from_env()
+        assert isinstance(store, SqliteConversationStore) and store.path == conversation_db
+
+        monkeypatch.setenv("NOTEBOOKLM_CONVERSATION_BACKEND", "memory")
+        assert isinstance(conversation_store_from_env(), ConversationStore)
+
+    def test_follow_up_on_another_client(self):
+        clients = [
+            NotebookLMClient(cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid")
+            for _ in range(2)
+        ]
+        clients[0]._cache_conversation_turn("c1", "What?", "That.")
+
+        assert clients[1]._build_conversation_history("c1") == [["That.", None, 2], ["What?", None, 1]]
+        for client in clients:
+            client.close()
+
+
+class TestHistoryPolicy:
+    """Test windowing of the history sent with follow-ups."""
+
+    turns = [ConversationTurn(f"Question {n}?", f"Answer {n} " + "x" * 50, n) for n in (1, 2, 3, 4)]
+
+    def test_default_sends_everything(self):
+        assert HistoryPolicy().apply(self.turns) == self.turns
+
+    def test_last_turns(self):
+        assert [t.turn_number for t in HistoryPolicy(max_turns=2).apply(self.turns)] == [3, 4]
+        assert HistoryPolicy(max_turns=0).apply(self.turns) == []
+
+    def test_stubs_keep_latest_answer(self):
+        window = HistoryPolicy(stub_chars=8, full_turns=1).apply(self.turns)
+
+        assert [t.answer for t in window[:3]] == ["Answer 1 …", "Answer 2 …", "Answer 3 …"]
+        assert window[3] is self.turns[3]
+        assert self.turns[0].answer.startswith("Answer 1 xxx")
+
+    def test_byte_budget_drops_oldest(self):
+        window = HistoryPolicy(max_bytes=150).apply(self.turns)
+        assert [t.turn_number for t in window] == [3, 4]
+        # The latest turn is sent even when it alone is over budget
+        assert [t.turn_number for t in HistoryPolicy(max_bytes=1).apply(self.turns)] == [4]
+
+        stubbed = HistoryPolicy(max_bytes=150, stub_chars=8).apply(self.turns)
+        assert [t.turn_number for t in stubbed] == [1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_query_window_and_metrics(self):
+        bodies = []
+
+        def handler(request):
+            bodies.append(request.content.decode())
+            return httpx.Response(200, text=")]}'\n" + query_chunk(f"Answer {len(bodies)} " + "y" * 200, 1))
+
+        client = AsyncNotebookLMClient(
+            cookies={"SID": "test_sid"},
+            csrf_token="token",
+            session_id="sid",
+            conversation_store=ConversationStore(),
+            history_policy=HistoryPolicy(max_turns=2),
+        )
+        client._long_running_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        first = await client.query("nb", "One?", source_ids=["s"])
+        cid = first["conversation_id"]
+        for question in ("Two?", "Three?"):
+            await client.query("nb", question, source_ids=["s"], conversation_id=cid)
+        stubbed = await client.query(
+            "nb", "Four?", source_ids=["s"], conversation_id=cid, history=HistoryPolicy(stub_chars=10)
+        )
+
+        assert [entry[0] for entry in sent_history(bodies[2])[1::2]] == ["One?", "Two?"]
+        assert [entry[0] for entry in sent_history(bodies[3])[1::2]] == ["One?", "Two?", "Three?"]
+        assert sent_history(bodies[3])[0][0] == "Answer 1 y …"
+        assert (first["history_turns"], stubbed["history_turns"]) == (0, 3)
+        assert stubbed["request_bytes"] == len(bodies[3].encode())
+        history = client.get_conversation_history(cid)
+        assert [turn["request_bytes"] for turn in history] == [len(body) for body in bodies]
+        assert all(turn["elapsed_seconds"] >= 0 for turn in history)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_tool_history_params(self):
+        from notebooklm_mcp import server
+
+        bodies = []
+
+        def handler(request):
+            bodies.append(request.content.decode())
+            return httpx.Response(200, text=")]}'\n" + query_chunk("An answer from the notebook sources.", 1))
+
+        client = AsyncNotebookLMClient(
+            cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid", conversation_store=ConversationStore()
+        )
+        client._long_running_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        fn = getattr(server.notebook_query, "fn", server.notebook_query)
+        with patch.object(server, "get_client", return_value=client):
+            first = await fn(notebook_id="nb", query="One?", source_ids=["s"])
+            await fn(notebook_id="nb", query="Two?", source_ids=["s"], conversation_id=first["conversation_id"])
+            third = await fn(
+                notebook_id="nb", query="Three?", source_ids=["s"], conversation_id=first["conversation_id"],
+                history_turns=1,
+            )
+
+        assert [entry[0] for entry in sent_history(bodies[2])[1::2]] == ["Two?"]
+        assert third["history_turns"] == 1
+        assert third["request_bytes"] == len(bodies[2]) and third["elapsed_seconds"] >= 0
+        await client.close()
+
+
+class TestServerHistory:
+    """Test restoring unknown conversations from the server (hPTbtc)."""
+
+    def make_client(self, conversations, restore=True):
+        calls, bodies = [], []
+
+        def handler(request):
+            if request.url.path.endswith("GenerateFreeFormStreamed"):
+                calls.append("query")
+                bodies.append(request.content.decode())
+                return httpx.Response(200, text=")]}'\n" + query_chunk("A fresh answer from the notebook.", 1))
+            rpc_id = request.url.params.get("rpcids")
+            calls.append(rpc_id)
+            return httpx.Response(200, text=rpc_response(rpc_id, conversations))
+
+        client = AsyncNotebookLMClient(
+            cookies={"SID": "test_sid"},
+            csrf_token="token",
+            session_id="sid",
+            conversation_store=ConversationStore(),
+            restore_conversations=restore,
+        )
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client._long_running_client = client._client
+        return client, calls, bodies
+
+    @pytest.mark.asyncio
+    async def test_unknown_conversation_restored(self):
+        client, calls, bodies = self.make_client(
+            [[["c1", [["Earlier answer.", None, 2], ["Earlier question?", None, 1]]], ["c2"]]]
+        )
+
+        result = await client.query("nb", "And then?", source_ids=["s"], conversation_id="c1")
+        await client.query("nb", "And after?", source_ids=["s"], conversation_id="c1")
+
+        assert calls == ["hPTbtc", "query", "query"]
+        assert sent_history(bodies[0]) == [["Earlier answer.", None, 2], ["Earlier question?", None, 1]]
+        assert result["turn_number"] == 2 and result["history_turns"] == 1
+        assert [turn["query"] for turn in client.get_conversation_history("c1")] == [
+            "Earlier question?", "And then?", "And after?"
+        ]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_conversation_unknown_to_server(self):
+        client, calls, bodies = self.make_client([[["c2"]]])
+
+        result = await client.query("nb", "Hello?", source_ids=["s"], conversation_id="c1")
+
+        assert calls == ["hPTbtc", "query"]
+        assert sent_history(bodies[0]) is None
+        assert result["turn_number"] == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_off_by_default(self):
+        client, calls, bodies = self.make_client([[["c1", [["Q", None, 1], ["A", None, 2]]]]], restore=False)
+
+        await client.query("nb", "Hello?", source_ids=["s"], conversation_id="c1")
+
+        assert calls == ["query"]
+        assert sent_history(bodies[0]) is None
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_unrecognised_shape_restores_nothing(self):
+        client, calls, bodies = self.make_client([[["c1", [[["Q", None, 1], ["A", None, 2]]], ["noise", None, 2]]]])
+
+        result = await client.query("nb", "Hello?", source_ids=["s"], conversation_id="c1")
+
+        assert calls == ["hPTbtc", "query"]
+        assert sent_history(bodies[0]) is None
+        assert [turn["query"] for turn in client.get_conversation_history("c1")] == ["Hello?"]
+        assert result["turn_number"] == 1
+        await client.close()
+
+    def test_sync_client_restores(self):
+        client = NotebookLMClient(
+            cookies={"SID": "test_sid"},
+            csrf_token="token",
+            session_id="sid",
+            conversation_store=ConversationStore(),
+            restore_conversations=True,
+        )
+        result = [[["c1", [["Q", None, 1], ["A", None, 2]]]]]
+        client._client = httpx.Client(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, text=rpc_response("hPTbtc", result)))
+        )
+
+        assert client._restore_conversation("nb", "c1") == 1
+        assert client._build_conversation_history("c1") == [["A", None, 2], ["Q", None, 1]]
+        # Already known: nothing is added twice
+        assert client._store_restored_turns(result, "c1") == 0
+        client.close()
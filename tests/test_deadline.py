@@ -0,0 +1,127 @@
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from notebooklm_mcp.async_client import AsyncNotebookLMClient
+from notebooklm_mcp.deadline import DeadlineExceeded, clamp_timeout, deadline_scope, remaining_time
+from notebooklm_mcp.retry import RetryPolicy
+
+
+def rpc_response(rpc_id, payload):
+    chunk = json.dumps([["wrb.fr", rpc_id, json.dumps(payload), None, None, None, "generic"]])
+    return f")]}}'\n{len(chunk)}\n{chunk}"
+
+
+class TestDeadlineScope:
+    """Test the deadline context."""
+
+    def test_no_deadline_outside_scope(self):
+        assert remaining_time() is None
+        assert clamp_timeout(30.0) == 30.0
+
+    def test_nested_scope_only_shortens(self):
+        with deadline_scope(10):
+            with deadline_scope(60):
+                assert remaining_time() <= 10
+            with deadline_scope(1):
+                assert clamp_timeout(30.0) <= 1
+            assert remaining_time() > 1
+        assert remaining_time() is None
+
+    def test_spent_deadline_raises(self):
+        with deadline_scope(0.01):
+            time.sleep(0.02)
+            with pytest.raises(DeadlineExceeded) as excinfo:
+                clamp_timeout(30.0)
+
+        assert excinfo.value.to_dict()["error_type"] == "deadline_exceeded"
+
+    @pytest.mark.asyncio
+    async def test_follows_into_tasks(self):
+        async def read():
+            return remaining_time()
+
+        with deadline_scope(5):
+            remaining = await asyncio.gather(read(), asyncio.create_task(read()))
+
+        assert all(0 < r <= 5 for r in remaining)
+
+
+class TestClientDeadlines:
+    """Test that RPCs get the remaining budget."""
+
+    def make_client(self, handler, **kwargs):
+        client = AsyncNotebookLMClient(cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid", **kwargs)
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client
+
+    @pytest.mark.asyncio
+    async def test_request_timeout_is_remaining_budget(self):
+        timeouts = []
+
+        def handler(request):
+            timeouts.append(request.extensions["timeout"])
+            return httpx.Response(200, text=rpc_response("rLM1Ne", []))
+
+        client = self.make_client(handler)
+        with deadline_scope(2):
+            await client.get_notebook("nb")
+
+        assert 0 < timeouts[0]["read"] <= 2
+        assert timeouts[0]["connect"] <= 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_spent_deadline_sends_nothing(self):
+        requests = []
+        client = self.make_client(lambda request: requests.append(request) or httpx.Response(200))
+
+        with deadline_scope(0.01):
+            await asyncio.sleep(0.02)
+            with pytest.raises(DeadlineExceeded):
+                await client.get_notebook("nb")
+
+        assert requests == []
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_no_retry_past_deadline(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(503, headers={"Retry-After": "5"})
+
+        client = self.make_client(handler, retry_policy=RetryPolicy(max_attempts=4))
+        with deadline_scope(1):
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get_notebook("nb")
+
+        assert len(requests) == 1
+        await client.close()
+
+
+class TestToolDeadline:
+    """Test that each tool call runs with its own deadline."""
+
+    @pytest.mark.asyncio
+    async def test_tool_reports_spent_budget(self):
+        from notebooklm_mcp import server
+
+        class FakeClient:
+            async def get_notebook(self, notebook_id):
+                await asyncio.sleep(0.05)
+                clamp_timeout(30.0)
+
+        tool = server.notebook_get
+        with patch.object(server, "get_client", return_value=FakeClient()), \
+                patch.object(server, "_tool_timeout", 0.01):
+            result = await getattr(tool, "fn", tool)("nb")
+
+        assert result["error_type"] == "deadline_exceeded"
+        assert result["budget_seconds"] == 0.01
+        assert remaining_time() is None
@@ -0,0 +1,149 @@
+import pytest
+
+from notebooklm_mcp.decoders import (
+    Source,
+    SourceContent,
+    StudioArtifact,
+    decode_conversations,
+    decode_notebook_list,
+    decode_research_tasks,
+    path,
+)
+
+MODIFIED = [1767225600, 0]  # 2026-01-01T00:00:00Z
+CREATED = [1735689600, 0]   # 2025-01-01T00:00:00Z
+
+
+def source_row(source_id, title, type_code=None, drive_doc_id=None, url=None):
+    metadata = [[drive_doc_id] if drive_doc_id else None, 331, [], [], type_code, None, 1, [url] if url else None]
+    return [[source_id], title, metadata, [None, 2]]
+
+
+class TestPathAccessor:
+    """Test compiled index-path accessors."""
+
+    @pytest.mark.parametrize("data", [None, "abc", {0: [1]}, [], [[]], [["x"]]])
+    def test_missing_or_wrong_shape_returns_default(self, data):
+        assert path(0, 1, default="d")(data) == "d"
+
+    def test_does_not_index_into_strings(self):
+        assert path(0, 0)(["source-id"]) is None
+
+    def test_kind_check(self):
+        assert path(1, kind=str, default="")([0, 5]) == ""
+        assert path(1, kind=str, default="")([0, "title"]) == "title"
+
+
+class TestDecoders:
+    """Test decoding of RPC results into slotted models."""
+
+    def test_notebook_list(self):
+        result = [[
+            ["Mine", [source_row("s1", "Doc")], "nb1", None, None, [1, True, None, None, None, MODIFIED, None, None, CREATED]],
+            [None, None, "nb2", None, None, [2, False]],
+            ["No id", [], None],
+            "junk",
+        ]]
+
+        notebooks = decode_notebook_list(result)
+
+        assert [nb.id for nb in notebooks] == ["nb1", "nb2"]
+        mine, shared = notebooks
+        assert mine.sources == [{"id": "s1", "title": "Doc"}]
+        assert (mine.is_owned, mine.is_shared) == (True, True)
+        assert mine.modified_at == "2026-01-01T00:00:00Z"
+        assert mine.created_at == "2025-01-01T00:00:00Z"
+        assert shared.title == "Untitled"
+        assert shared.ownership == "shared_with_me"
+        assert not hasattr(mine, "__dict__")
+
+    def test_source_sync_flags(self):
+        drive = Source.decode(source_row("s1", "Doc", type_code=1, drive_doc_id="doc"))
+        web = Source.decode(source_row("s2", "Site", type_code=5, url="https://example.com"))
+
+        assert drive.to_dict()["can_sync"] is True
+        assert web.to_dict() == {
+            "id": "s2",
+            "title": "Site",
+            "source_type": 5,
+            "source_type_name": "web_page",
+            "url": "https://example.com",
+            "drive_doc_id": None,
+            "can_sync": False,
+        }
+        assert not hasattr(web, "__dict__")
+
+    def test_source_content(self):
+        result = [
+            [["s1"], "Title", [None, None, None, None, 5, None, None, ["https://example.com"]]],
+            None,
+            None,
+            [[[0, 10, [["First block"]]], [10, 20, [[["Second"], ""]]]]],
+        ]
+
+        content = SourceContent.decode(result).to_dict()
+
+        assert content == {
+            "content": "First block\n\nSecond",
+            "title": "Title",
+            "source_type": "web_page",
+            "url": "https://example.com",
+            "char_count": len("First block\n\nSecond"),
+        }
+        assert SourceContent.decode(None).to_dict()["source_type"] == ""
+
+    def test_research_fast_and_deep(self):
+        fast = ["t1", [None, ["Query", 1], 1, [[["https://a.com", "A", "desc", 1]], "Summary"], 2]]
+        deep = ["t2", [None, ["Deep query", 2], 5, [[[None, "Report", None, 5, None, None, ["# Report"]]]], 1]]
+
+        tasks = [task.to_dict() for task in decode_research_tasks([[fast, deep], [1767225600]])]
+
+        assert tasks[0]["status"] == "completed"
+        assert tasks[0]["summary"] == "Summary"
+        assert tasks[0]["sources"][0]["url"] == "https://a.com"
+        assert tasks[1]["mode"] == "deep"
+        assert tasks[1]["source_type"] == "drive"
+        assert tasks[1]["report"] == "# Report"
+        assert tasks[1]["sources"][0]["title"] == "Report"
+
+    def test_studio_artifact_type_specific_fields(self):
+        audio = ["a1", "Overview", 1, None, 3, None, [None, None, None, "https://audio", None, None, None, None, None, [300]]]
+        slides = ["a2", "Deck", 8, None, 1] + [None] * 11 + [["not a url", None, None, "https://slides"]]
+        slides[10] = [1767225600, 0]
+
+        audio_dict = StudioArtifact.decode(audio).to_dict()
+        slides_dict = StudioArtifact.decode(slides).to_dict()
+
+        assert (audio_dict["type"], audio_dict["status"]) == ("audio", "completed")
+        assert audio_dict["audio_url"] == "https://audio"
+        assert audio_dict["duration_seconds"] == 300
+        assert slides_dict["slide_deck_url"] == "https://slides"
+        assert slides_dict["status"] == "in_progress"
+        assert slides_dict["created_at"] == "2026-01-01T00:00:00Z"
+        assert slides_dict["audio_url"] is None
+
+    @pytest.mark.parametrize("wrap", [lambda rows: [rows], lambda rows: rows])
+    def test_conversations(self, wrap):
+        result = wrap([
+            ["c1", [["A1", None, 2], ["Q1", None, 1], ["A2", None, 2], ["Q2", None, 1]]],
+            ["c2", None, [["Q", None, 1], ["A", None, 2]]],
+            ["c3"],
+            [None, [["orphan", None, 1]]],
+        ])
+
+        assert decode_conversations(result) == {
+            "c1": [("Q1", "A1"), ("Q2", "A2")],
+            "c2": [("Q", "A")],
+            "c3": [],
+        }
+
+    def test_conversations_unrecognised_shape(self):
+        result = [[
+            ["deep", [[["Q", None, 1], ["A", None, 2]]]],
+            ["mixed", [["Q", None, 1], ["A", None, 2], "extra"]],
+            ["unpaired", [["Q1", None, 1], ["Q2", None, 1]]],
+            ["odd", [["Q", None, 1], ["A", None, 2], ["Q2", None, 1]]],
+        ]]
+
+        assert decode_conversations(result) == {"deep": [], "mixed": [], "unpaired": [], "odd": []}
+        assert decode_conversations(None) == {} and decode_conversations([[]]) == {}
@@ -0,0 +1,94 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from notebooklm_mcp.framing import FrameDecoder, decode_frames
+
+FRAMES = [
+    [["wrb.fr", "rLM1Ne", "line one\nline two"]],
+    [["wrb.fr", "wXbhsf", "노트북 제목 😀"]],
+    [["di", 42], ["af.httprm", 41, "-123", 7]],
+]
+
+
+def utf16_len(text):
+    return len(text.encode("utf-16-le")) // 2
+
+
+def frame_body(counter, pretty=False):
+    parts = [")]}'\n"]
+    for frame in FRAMES:
+        # indent=1 puts raw newlines inside the payload itself
+        payload = json.dumps(frame, ensure_ascii=False, indent=1 if pretty else None)
+        parts.append(f"{counter(payload)}\n{payload}\n")
+    return "".join(parts).encode("utf-8")
+
+
+COUNTERS = {
+    "utf8_bytes": lambda p: len(p.encode("utf-8")),
+    "utf16_units": utf16_len,
+    "with_newline": lambda p: utf16_len(p) + 1,
+    "wrong": lambda p: 3,
+}
+
+
+class TestFrameDecoder:
+    """Test decoding of length-prefixed response bodies."""
+
+    @pytest.mark.parametrize("counter", COUNTERS.values(), ids=COUNTERS.keys())
+    @pytest.mark.parametrize("pretty", [False, True])
+    def test_whole_body(self, counter, pretty):
+        assert decode_frames(frame_body(counter, pretty)) == FRAMES
+
+    @pytest.mark.parametrize("counter", COUNTERS.values(), ids=COUNTERS.keys())
+    @pytest.mark.parametrize("step", [1, 3, 17, 4096])
+    def test_fed_in_pieces(self, counter, step):
+        """Test that splitting the body anywhere (even mid-character) gives the same frames."""
+        body = frame_body(counter, pretty=True)
+        decoder = FrameDecoder()
+        frames = []
+        for i in range(0, len(body), step):
+            frames.extend(decoder.feed(memoryview(body)[i:i + step]))
+        frames.extend(decoder.finish())
+        assert frames == FRAMES
+
+    def test_frames_returned_as_soon_as_complete(self):
+        payload = json.dumps(FRAMES[0])
+        decoder = FrameDecoder()
+
+        assert decoder.feed(f")]}}'\n{len(payload)}\n".encode()) == []
+        assert decoder.feed(payload[:10].encode()) == []
+        assert decoder.feed(payload[10:].encode()) == [FRAMES[0]]
+
+    def test_accepts_str_and_unframed_lines(self):
+        """Test the legacy format where JSON lines have no count prefix."""
+        body = ")]}'\n" + "\n".join(json.dumps(frame) for frame in FRAMES[:1]) + "\n"
+        assert decode_frames(body) == FRAMES[:1]
+
+    def test_skips_invalid_and_truncated_payloads(self):
+        good = json.dumps(FRAMES[0])
+        body = f")]}}'\n5\nnope!\n{len(good)}\n{good}\n99\n[[\"wrb.fr\"".encode()
+        assert decode_frames(body) == [FRAMES[0]]
+
+    def test_empty_body(self):
+        assert decode_frames(b"") == []
+        assert decode_frames(b")]}'") == []
+
+    @pytest.mark.parametrize("counter", [COUNTERS["utf16_units"], COUNTERS["with_newline"]])
+    def test_large_non_ascii_stream_not_rescanned_per_chunk(self, counter):
+        """A long non-ASCII payload fed in small chunks is converted a logarithmic number of times."""
+        frame = [["wrb.fr", None, "노트북 답변 😀 " * 40000]]
+        payload = json.dumps(frame, ensure_ascii=False)
+        body = f")]}}'\n{counter(payload)}\n{payload}\n".encode()
+        decoder = FrameDecoder()
+        frames = []
+        with patch.object(FrameDecoder, "_utf16_units_to_bytes", autospec=True,
+                          side_effect=FrameDecoder._utf16_units_to_bytes) as convert:
+            for i in range(0, len(body), 1024):
+                frames.extend(decoder.feed(body[i:i + 1024]))
+            frames.extend(decoder.finish())
+
+        assert frames == [frame]
+        assert len(body) // 1024 > 500
+        assert convert.call_count < 60
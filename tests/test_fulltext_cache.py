@@ -0,0 +1,166 @@
+import json
+import secrets
+
+import httpx
+import pytest
+
+from notebooklm_mcp.async_client import AsyncNotebookLMClient
+from notebooklm_mcp.fulltext_cache import FulltextCache
+from notebooklm_mcp.notebook_cache import NotebookCache
+
+
+def rpc_response(rpc_id, payload):
+    chunk = json.dumps([["wrb.fr", rpc_id, json.dumps(payload), None, None, None, "generic"]])
+    return f")]}}'\n{len(chunk)}\n{chunk}"
+
+
+def notebook(modified):
+    return [[
+        "Notebook",
+        [[["src-1"], "First", [None, 10, [None, modified], [], 5], [None, 2]]],
+        "nb",
+    ]]
+
+
+def source(text):
+    return [[["src-1"], "First", [None, None, None, None, 5]], None, None, [[[0, 10, [[text]]]]]]
+
+
+def make_client(cache):
+    requests = []
+    state = {"modified": 1, "text": "Full text"}
+
+    def handler(request):
+        rpc_id = request.url.params.get("rpcids")
+        requests.append(rpc_id)
+        payload = {
+            "rLM1Ne": notebook(state["modified"]),
+            "hizoJc": source(state["text"]),
+        }.get(rpc_id, [])
+        return httpx.Response(200, text=rpc_response(rpc_id, payload))
+
+    client = AsyncNotebookLMClient(
+        cookies={"SID": "test_sid"},
+        csrf_token="token",
+        session_id="sid",
+        notebook_cache=NotebookCache(),
+        fulltext_cache=cache,
+    )
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._long_running_client = client._client
+    return client, requests, state
+
+
+class TestFulltextCache:
+    """Test the on-disk source text cache."""
+
+    @pytest.mark.asyncio
+    async def test_served_from_disk_across_restarts(self, tmp_path):
+        client, requests, _ = make_client(FulltextCache(tmp_path / "ft.sqlite3"))
+
+        first = await client.get_source_fulltext("src-1")
+        second = await client.get_source_fulltext("src-1")
+        await client.close()
+
+        assert requests == ["hizoJc"]
+        assert second == first
+        assert first["content"] == "Full text"
+        assert first["source_type"] == "web_page"
+
+        restarted, requests, _ = make_client(FulltextCache(tmp_path / "ft.sqlite3"))
+        assert await restarted.get_source_fulltext("src-1") == first
+        assert requests == []
+        await restarted.close()
+
+    @pytest.mark.asyncio
+    async def test_refetched_when_source_metadata_changes(self, tmp_path):
+        client, requests, state = make_client(FulltextCache(tmp_path / "ft.sqlite3"))
+
+        await client.get_notebook("nb")
+        await client.get_source_fulltext("src-1")
+        await client.get_source_fulltext("src-1")
+        assert requests == ["rLM1Ne", "hizoJc"]
+
+        # Re-synced elsewhere: the notebook listing shows new metadata
+        state["modified"], state["text"] = 2, "Updated text"
+        client._notebook_cache.clear()
+        await client.get_notebook("nb")
+
+        assert (await client.get_source_fulltext("src-1"))["content"] == "Updated text"
+        assert requests == ["rLM1Ne", "hizoJc", "rLM1Ne", "hizoJc"]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_edited_source_not_served_stale_after_notebook_cache_expires(self, tmp_path):
+        client, requests, state = make_client(FulltextCache(tmp_path / "ft.sqlite3"))
+
+        await client.get_notebook("nb")
+        await client.get_source_fulltext("src-1")
+        client._notebook_cache.clear()  # TTL over: only the source's owner is remembered
+
+        # Unchanged: one notebook fetch revalidates the stored text
+        assert (await client.get_source_fulltext("src-1"))["content"] == "Full text"
+        assert requests == ["rLM1Ne", "hizoJc", "rLM1Ne"]
+
+        state["modified"], state["text"] = 2, "Edited text"
+        client._notebook_cache.clear()
+
+        assert (await client.get_source_fulltext("src-1"))["content"] == "Edited text"
+        assert requests == ["rLM1Ne", "hizoJc", "rLM1Ne", "rLM1Ne", "hizoJc"]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_max_age_applies_without_fingerprint(self, tmp_path):
+        client, requests, _ = make_client(FulltextCache(tmp_path / "ft.sqlite3", max_age=0))
+
+        await client.get_source_fulltext("src-1")
+        await client.get_source_fulltext("src-1")
+
+        assert requests == ["hizoJc", "hizoJc"]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_delete_source_drops_entry(self, tmp_path):
+        cache = FulltextCache(tmp_path / "ft.sqlite3")
+        client, _, _ = make_client(cache)
+
+        await client.get_source_fulltext("src-1")
+        await client.delete_source("src-1")
+
+        assert cache.stats()["sources"] == 0
+        await client.close()
+
+    def test_identical_text_stored_once(self, tmp_path):
+        cache = FulltextCache(tmp_path / "ft.sqlite3")
+        text = secrets.token_hex(2000)
+
+        cache.put("a", {"content": text, "title": "A"})
+        single = cache.stats()["bytes"]
+        cache.put("b", {"content": text, "title": "B"})
+
+        stats = cache.stats()
+        assert (stats["sources"], stats["bytes"]) == (2, single)
+        assert cache.get("b")["title"] == "B"
+
+    def test_evicts_least_recently_read(self, tmp_path):
+        cache = FulltextCache(tmp_path / "ft.sqlite3")
+        cache.put("a", {"content": secrets.token_hex(2000)})
+        blob = cache.stats()["bytes"]
+        cache.max_bytes = blob * 2.5
+
+        cache.put("b", {"content": secrets.token_hex(2000)})
+        assert cache.get("a") is not None  # "b" is now least recently read
+        cache.put("c", {"content": secrets.token_hex(2000)})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.stats()["sources"] == 2
+
+    def test_unusable_path_disables_cache(self, tmp_path):
+        (tmp_path / "file").write_text("")
+        cache = FulltextCache(tmp_path / "file" / "ft.sqlite3")
+
+        cache.put("a", {"content": "text"})
+
+        assert cache.get("a") is None
+        assert cache.stats()["enabled"] is False
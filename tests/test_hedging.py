@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from notebooklm_mcp.api_client import RPC_NAMES
+from notebooklm_mcp.async_client import AsyncNotebookLMClient
+from notebooklm_mcp.hedging import Hedger
+
+
+def rpc_response(rpc_id, payload):
+    chunk = json.dumps([["wrb.fr", rpc_id, json.dumps(payload), None, None, None, "generic"]])
+    return f")]}}'\n{len(chunk)}\n{chunk}"
+
+
+def warmed(hedger, rpc_id, latency, count=20):
+    for _ in range(count):
+        hedger.record([rpc_id], latency)
+    return hedger
+
+
+class TestHedger:
+    """Test hedge delays and the hedge budget."""
+
+    def test_no_delay_until_enough_samples(self):
+        hedger = Hedger(enabled=True, min_samples=20)
+        warmed(hedger, "rLM1Ne", 0.2, count=19)
+
+        assert hedger.delay(["rLM1Ne"]) is None
+        hedger.record(["rLM1Ne"], 0.2)
+        assert hedger.delay(["rLM1Ne"]) == 0.2
+
+    def test_delay_is_p95(self):
+        hedger = Hedger(enabled=True, min_samples=1, min_delay=0.0)
+        for i in range(100):
+            hedger.record(["gArtLc"], i / 100)
+
+        assert hedger.delay(["gArtLc"]) == 0.95
+
+    def test_budget_caps_hedges(self):
+        hedger = Hedger(enabled=True, ratio=0.25, reserve=2)
+
+        assert hedger.try_spend(["rLM1Ne"])
+        assert hedger.try_spend(["rLM1Ne"])
+        assert not hedger.try_spend(["rLM1Ne"])
+
+        # Four requests earn one hedge
+        for _ in range(4):
+            hedger.delay(["rLM1Ne"])
+        assert hedger.try_spend(["rLM1Ne"])
+        assert not hedger.try_spend(["rLM1Ne"])
+
+
+class TestHedgedRequests:
+    """Test duplicate requests for slow reads."""
+
+    def make_client(self, hedger, delays):
+        """Client whose n-th request answers after delays[n] seconds."""
+        requests = []
+
+        async def handler(request):
+            index = len(requests)
+            requests.append(request)
+            await asyncio.sleep(delays[index] if index < len(delays) else 0)
+            rpc_id = request.url.params.get("rpcids")
+            return httpx.Response(200, text=rpc_response(rpc_id, [f"response {index}"]))
+
+        client = AsyncNotebookLMClient(
+            cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid", hedger=hedger
+        )
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client, requests
+
+    @pytest.mark.asyncio
+    async def test_slow_read_is_hedged(self):
+        hedger = warmed(Hedger(enabled=True, labels=RPC_NAMES), "gArtLc", 0.02)
+        client, requests = self.make_client(hedger, [1.0, 0.0])
+
+        result = await client._call_rpc("gArtLc", [], "/notebook/nb")
+
+        assert result == ["response 1"]
+        assert len(requests) == 2
+        stats = client.hedge_stats()["rpcs"]["poll_studio"]
+        assert (stats["hedged"], stats["hedge_wins"]) == (1, 1)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_fast_read_is_not_hedged(self):
+        hedger = warmed(Hedger(enabled=True), "rLM1Ne", 0.5)
+        client, requests = self.make_client(hedger, [0.0])
+
+        assert await client._call_rpc("rLM1Ne", []) == ["response 0"]
+        assert len(requests) == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_writes_are_never_hedged(self):
+        hedger = warmed(Hedger(enabled=True), "CCqFvf", 0.01)
+        client, requests = self.make_client(hedger, [0.1])
+
+        await client._call_rpc("CCqFvf", [])
+
+        assert len(requests) == 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("NOTEBOOKLM_HEDGE", raising=False)
+        client, requests = self.make_client(None, [0.1])
+        warmed(client._hedger, "rLM1Ne", 0.01)
+
+        await client._call_rpc("rLM1Ne", [])
+
+        assert len(requests) == 1
+        await client.close()
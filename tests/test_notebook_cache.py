@@ -0,0 +1,218 @@
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from notebooklm_mcp.async_client import AsyncNotebookLMClient
+from notebooklm_mcp.notebook_cache import NotebookCache, NotebookListCache
+
+NOTEBOOK = [[
+    "Notebook",
+    [
+        [["src-1"], "First", [None, 10, [], [], 5, None, 1, ["https://example.com/1"]], [None, 2]],
+        [["src-2"], "Second", [None, 20, [], [], 4], [None, 2]],
+    ],
+    "nb",
+]]
+
+
+def rpc_response(rpc_id, payload):
+    chunk = json.dumps([["wrb.fr", rpc_id, json.dumps(payload), None, None, None, "generic"]])
+    return f")]}}'\n{len(chunk)}\n{chunk}"
+
+
+def make_client(ttl=60.0, delay=0.0):
+    requests = []
+
+    async def handler(request):
+        rpc_id = request.url.params.get("rpcids")
+        requests.append(rpc_id)
+        await asyncio.sleep(delay)
+        payload = NOTEBOOK if rpc_id == "rLM1Ne" else []
+        return httpx.Response(200, text=rpc_response(rpc_id, payload))
+
+    client = AsyncNotebookLMClient(
+        cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid", notebook_cache=NotebookCache(ttl=ttl)
+    )
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._long_running_client = client._client
+    return client, requests
+
+
+class TestNotebookCache:
+    """Test caching of notebook structure and its invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_structure_fetched_once(self):
+        client, requests = make_client()
+
+        await client.get_notebook("nb")
+        sources = await client.get_notebook_sources_with_types("nb")
+        entry = await client._cached_notebook("nb")
+
+        assert requests == ["rLM1Ne"]
+        assert [s["id"] for s in sources] == ["src-1", "src-2"]
+        assert entry.source_ids == ["src-1", "src-2"]
+        assert client._notebook_cache.hits == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_notebook_mutations_invalidate(self):
+        client, requests = make_client()
+
+        await client.get_notebook("nb")
+        await client.add_url_source("nb", "https://example.com/3")
+        await client.get_notebook("nb")
+        await client.rename_notebook("nb", "Renamed")
+        await client.get_notebook("nb")
+
+        assert requests.count("rLM1Ne") == 3
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_source_mutations_invalidate_owning_notebook(self):
+        client, requests = make_client()
+
+        await client.get_notebook("nb")
+        await client.delete_source("other-source")
+        await client.get_notebook("nb")
+        assert requests.count("rLM1Ne") == 1
+
+        await client.delete_source("src-2")
+        await client.get_notebook("nb")
+        assert requests.count("rLM1Ne") == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_mutation_still_invalidates(self):
+        client, requests = make_client()
+        await client.get_notebook("nb")
+
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(400)))
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.rename_notebook("nb", "Renamed")
+
+        assert client._notebook_cache.get("nb") is None
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_fetch_racing_a_mutation_is_not_stored(self):
+        client, requests = make_client(delay=0.05)
+
+        fetch = asyncio.ensure_future(client.get_notebook("nb"))
+        await asyncio.sleep(0.01)
+        client._notebook_cache.invalidate("nb")
+        await fetch
+
+        assert client._notebook_cache.get("nb") is None
+        await client.close()
+
+    def test_ttl(self):
+        cache = NotebookCache(ttl=0.01)
+        cache.put("nb", NOTEBOOK, cache.epoch())
+        assert cache.get("nb") is not None
+        time.sleep(0.02)
+        assert cache.get("nb") is None
+
+        disabled = NotebookCache(ttl=0)
+        disabled.put("nb", NOTEBOOK, disabled.epoch())
+        assert disabled.get("nb") is None
+
+    def test_source_owner_outlives_entry(self):
+        cache = NotebookCache(ttl=0.01)
+        cache.put("nb", NOTEBOOK, cache.epoch())
+        assert cache.source_version("src-2") is not None
+        time.sleep(0.02)
+
+        assert cache.source_version("src-2") is None
+        assert (cache.source_owner("src-2"), cache.source_owner("src-3")) == ("nb", None)
+
+
+def make_list_client(fresh_for=30.0, delay=0.0):
+    requests = []
+
+    async def handler(request):
+        rpc_id = request.url.params.get("rpcids")
+        requests.append(rpc_id)
+        await asyncio.sleep(delay)
+        listings = requests.count("wXbhsf")
+        payload = [[[f"Listing {listings}", [], "nb"]]] if rpc_id == "wXbhsf" else []
+        return httpx.Response(200, text=rpc_response(rpc_id, payload))
+
+    client = AsyncNotebookLMClient(
+        cookies={"SID": "test_sid"},
+        csrf_token="token",
+        session_id="sid",
+        notebook_list_cache=NotebookListCache(fresh_for=fresh_for),
+    )
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._long_running_client = client._client
+    return client, requests
+
+
+class TestNotebookListCache:
+    """Test the stale-while-revalidate notebook list."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_snapshot_served_without_request(self):
+        client, requests = make_list_client()
+
+        first = await client.list_notebooks()
+        second = await client.notebook_list_snapshot()
+
+        assert requests == ["wXbhsf"]
+        assert second.notebooks == first
+        assert second.fresh and second.age < 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_snapshot_served_then_refreshed_once(self):
+        client, requests = make_list_client(fresh_for=0, delay=0.02)
+        await client.list_notebooks()
+
+        stale = await asyncio.gather(*(client.notebook_list_snapshot() for _ in range(3)))
+        assert [s.notebooks[0].title for s in stale] == ["Listing 1"] * 3
+        assert not stale[0].fresh
+
+        await asyncio.gather(*client._background_tasks)
+        assert requests == ["wXbhsf", "wXbhsf"]
+        assert (await client.list_notebooks())[0].title == "Listing 2"
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_mutation_forces_fresh_listing(self):
+        client, requests = make_list_client()
+
+        await client.list_notebooks()
+        await client.create_notebook("New")
+        notebooks = await client.list_notebooks()
+
+        assert requests == ["wXbhsf", "CCqFvf", "wXbhsf"]
+        assert notebooks[0].title == "Listing 2"
+        await client.close()
+
+    def test_max_stale(self):
+        cache = NotebookListCache(fresh_for=0, max_stale=0.01)
+        cache.put([], cache.epoch())
+        assert cache.get() is not None
+        time.sleep(0.02)
+        assert cache.get() is None
+
+    @pytest.mark.asyncio
+    async def test_tool_reports_freshness(self):
+        from notebooklm_mcp import server
+
+        client, _ = make_list_client()
+        tool = server.notebook_list
+        with patch.object(server, "get_client", return_value=client):
+            await getattr(tool, "fn", tool)()
+            result = await getattr(tool, "fn", tool)()
+
+        assert result["status"] == "success"
+        assert result["fresh"] is True
+        assert 0 <= result["age_seconds"] < 1
+        assert result["notebooks"][0]["title"] == "Listing 1"
+        await client.close()
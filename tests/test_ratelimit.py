@@ -0,0 +1,113 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from notebooklm_mcp.api_client import RPC_NAMES
+from notebooklm_mcp.async_client import AsyncNotebookLMClient
+from notebooklm_mcp.ratelimit import RateLimiter
+from notebooklm_mcp.retry import RetryPolicy
+
+
+def status_error(code):
+    request = httpx.Request("POST", "https://notebooklm.google.com/")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(code, request=request))
+
+
+class TestRateLimiter:
+    """Test token buckets and the AIMD concurrency limit."""
+
+    def test_bucket_delays_burst_beyond_capacity(self):
+        limiter = RateLimiter(rate=20.0, burst=2)
+
+        started = time.monotonic()
+        for _ in range(3):
+            with limiter.slot(["wXbhsf"]):
+                pass
+        elapsed = time.monotonic() - started
+
+        assert elapsed >= 0.04
+        stats = limiter.stats()["rpcs"]["wXbhsf"]
+        assert (stats["admitted"], stats["waits"]) == (3, 1)
+
+    def test_buckets_are_per_rpc(self):
+        limiter = RateLimiter(rate=0.001, burst=1)
+
+        started = time.monotonic()
+        for rpc_id in ("wXbhsf", "rLM1Ne", "gArtLc"):
+            limiter.acquire([rpc_id])
+            limiter.release([rpc_id])
+
+        assert time.monotonic() - started < 0.5
+
+    def test_aimd_backs_off_and_recovers(self):
+        limiter = RateLimiter(rate=0, initial_concurrency=8, cooldown=60.0)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            with limiter.slot(["gArtLc"]):
+                raise status_error(429)
+        assert limiter.stats()["lanes"]["short"]["concurrency_limit"] == 4
+
+        # A second 429 within the cooldown does not cut again
+        with pytest.raises(httpx.HTTPStatusError):
+            with limiter.slot(["gArtLc"]):
+                raise status_error(503)
+        assert limiter.stats()["lanes"]["short"]["concurrency_limit"] == 4
+
+        for _ in range(8):
+            with limiter.slot(["gArtLc"]):
+                pass
+        assert limiter.stats()["lanes"]["short"]["concurrency_limit"] > 5
+        assert limiter.stats()["rpcs"]["gArtLc"]["throttled"] == 2
+
+    def test_other_errors_do_not_change_limit(self):
+        limiter = RateLimiter(rate=0, initial_concurrency=8)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            with limiter.slot(["gArtLc"]):
+                raise status_error(500)
+
+        lane = limiter.stats()["lanes"]["short"]
+        assert (lane["concurrency_limit"], lane["in_flight"]) == (8, 0)
+
+    @pytest.mark.asyncio
+    async def test_async_concurrency_capped(self):
+        limiter = RateLimiter(rate=0, initial_concurrency=2, max_concurrency=2)
+        in_flight = 0
+        peak = 0
+
+        async def call():
+            nonlocal in_flight, peak
+            async with limiter.aslot(["rLM1Ne"]):
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert peak == 2
+        assert limiter.stats()["lanes"]["short"]["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_client_reports_throttling_by_rpc_name(self):
+        limiter = RateLimiter(labels=RPC_NAMES)
+        client = AsyncNotebookLMClient(
+            cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid", rate_limiter=limiter,
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(429)))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_notebook("nb")
+
+        stats = client.rate_limit_stats()
+        assert stats["rpcs"]["get_notebook"]["throttled"] == 1
+        assert stats["lanes"]["short"]["concurrency_limit"] == 4
+        await client.close()
+
+
+def test_rpc_names_are_json_serializable_labels():
+    assert json.dumps(RateLimiter(labels=RPC_NAMES).stats())
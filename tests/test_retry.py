@@ -0,0 +1,133 @@
+import json
+
+import httpx
+import pytest
+
+from notebooklm_mcp.api_client import NotebookLMClient
+from notebooklm_mcp.async_client import AsyncNotebookLMClient
+from notebooklm_mcp.retry import RetryPolicy, is_retryable, retry_after_seconds
+
+
+def rpc_response(rpc_id, payload):
+    chunk = json.dumps([["wrb.fr", rpc_id, json.dumps(payload), None, None, None, "generic"]])
+    return f")]}}'\n{len(chunk)}\n{chunk}"
+
+
+def status_error(code, headers=None):
+    request = httpx.Request("POST", "https://notebooklm.google.com/")
+    response = httpx.Response(code, request=request, headers=headers)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def scripted(*statuses):
+    """Handler answering with the given statuses, then a successful RPC response."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if len(requests) <= len(statuses):
+            status = statuses[len(requests) - 1]
+            if isinstance(status, Exception):
+                raise status
+            return httpx.Response(status)
+        rpc_id = request.url.params.get("rpcids")
+        return httpx.Response(200, text=rpc_response(rpc_id, {"ok": True}))
+
+    return handler, requests
+
+
+FAST = RetryPolicy(max_attempts=4, base_delay=0.001, max_delay=0.01, budget=1.0)
+
+
+class TestRetryPolicy:
+    """Test which failures are retried and how long to wait."""
+
+    def test_idempotency_classes(self):
+        connect_error = httpx.ConnectError("refused")
+        read_timeout = httpx.ReadTimeout("slow")
+
+        assert is_retryable(status_error(503), idempotent=True)
+        assert not is_retryable(status_error(503), idempotent=False)
+        assert is_retryable(status_error(429), idempotent=False)
+        assert is_retryable(connect_error, idempotent=False)
+        assert is_retryable(read_timeout, idempotent=True)
+        assert not is_retryable(read_timeout, idempotent=False)
+        assert not is_retryable(status_error(400), idempotent=True)
+
+    def test_retry_after(self):
+        assert retry_after_seconds(status_error(429, {"Retry-After": "3"})) == 3.0
+        assert retry_after_seconds(status_error(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+        assert retry_after_seconds(status_error(429)) is None
+
+        retry = FAST.start(idempotent=True)
+        assert retry.next_delay(status_error(429, {"Retry-After": "0.5"})) == 0.5
+
+    def test_attempts_and_budget(self):
+        retry = RetryPolicy(max_attempts=2, base_delay=0.001).start(idempotent=True)
+        assert retry.next_delay(status_error(503)) is not None
+        assert retry.next_delay(status_error(503)) is None
+
+        # Retry-After beyond the budget gives up instead of sleeping
+        retry = RetryPolicy(budget=1.0).start(idempotent=False)
+        assert retry.next_delay(status_error(429, {"Retry-After": "30"})) is None
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("NOTEBOOKLM_RETRY_ATTEMPTS", "0")
+        monkeypatch.setenv("NOTEBOOKLM_RETRY_BUDGET", "5")
+
+        policy = RetryPolicy.from_env()
+
+        assert (policy.max_attempts, policy.budget) == (1, 5.0)
+
+
+class TestClientRetries:
+    """Test that RPCs go through the retry loop."""
+
+    def make_client(self, handler):
+        client = NotebookLMClient(
+            cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid", retry_policy=FAST
+        )
+        client._client = httpx.Client(transport=httpx.MockTransport(handler))
+        client._long_running_client = httpx.Client(transport=httpx.MockTransport(handler))
+        return client
+
+    def test_read_retried_after_server_error(self):
+        handler, requests = scripted(503, 502)
+        client = self.make_client(handler)
+
+        assert client._call_rpc(NotebookLMClient.RPC_GET_NOTEBOOK, []) == {"ok": True}
+        assert len(requests) == 3
+
+    def test_source_add_not_retried_after_server_error(self):
+        handler, requests = scripted(500)
+        client = self.make_client(handler)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            client.add_url_source("nb", "https://example.com")
+        assert len(requests) == 1
+
+    def test_source_add_retried_when_throttled(self):
+        handler, requests = scripted(429)
+        client = self.make_client(handler)
+
+        client.add_url_source("nb", "https://example.com")
+        assert len(requests) == 2
+
+    def test_direct_rpcs_use_retry_loop(self):
+        handler, requests = scripted(httpx.ConnectError("refused"))
+        client = self.make_client(handler)
+
+        client.poll_studio_status("nb")
+        assert len(requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_async_read_retried(self):
+        handler, requests = scripted(504)
+        client = AsyncNotebookLMClient(
+            cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid", retry_policy=FAST
+        )
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        assert await client.get_source_guide("src") is not None
+        assert len(requests) == 2
+        await client.close()
@@ -0,0 +1,217 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+from notebooklm_mcp.api_client import NotebookLMClient
+from notebooklm_mcp.async_client import AsyncNotebookLMClient
+from notebooklm_mcp.deadline import DeadlineExceeded, clamp_timeout, deadline_scope
+from notebooklm_mcp.singleflight import AsyncSingleFlight, SingleFlight, rpc_key
+
+
+def rpc_response(rpc_id, payload):
+    chunk = json.dumps([["wrb.fr", rpc_id, json.dumps(payload), None, None, None, "generic"]])
+    return f")]}}'\n{len(chunk)}\n{chunk}"
+
+
+def counting_handler(delay=0.05):
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(delay)
+        rpc_id = request.url.params.get("rpcids")
+        return httpx.Response(200, text=rpc_response(rpc_id, [len(requests)]))
+
+    return handler, requests
+
+
+def make_client(handler):
+    client = AsyncNotebookLMClient(cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestAsyncSingleFlight:
+    """Test sharing of identical in-flight reads."""
+
+    @pytest.mark.asyncio
+    async def test_identical_reads_share_one_request(self):
+        handler, requests = counting_handler()
+        client = make_client(handler)
+
+        results = await asyncio.gather(*(client.get_notebook("nb") for _ in range(5)))
+
+        assert len(requests) == 1
+        assert results == [[1]] * 5
+        assert (client._single_flight.sent, client._single_flight.shared) == (1, 4)
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_different_params_and_writes_are_not_shared(self):
+        handler, requests = counting_handler()
+        client = make_client(handler)
+
+        await asyncio.gather(client.get_notebook("a"), client.get_notebook("b"))
+        await asyncio.gather(*(client._call_rpc("CCqFvf", []) for _ in range(2)))
+
+        assert len(requests) == 4
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_nothing_is_cached_after_completion(self):
+        handler, requests = counting_handler(delay=0)
+        client = make_client(handler)
+
+        for _ in range(2):
+            await client._call_rpc(client.RPC_GET_SUMMARY, ["nb", [2]], "/notebook/nb")
+
+        assert len(requests) == 2
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight = AsyncSingleFlight()
+        started = asyncio.Event()
+
+        async def fetch():
+            started.set()
+            await asyncio.sleep(0.05)
+            return "result"
+
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        await started.wait()
+        second = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "result"
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        flight = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.sent == 1
+
+    @pytest.mark.asyncio
+    async def test_follower_with_more_time_runs_again(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            clamp_timeout(1.0)  # Raises once the deadline the call runs under is past
+            return "result"
+
+        async def caller(seconds):
+            with deadline_scope(seconds):
+                return await flight.do("key", fetch)
+
+        results = await asyncio.gather(caller(0.05), caller(30), return_exceptions=True)
+
+        assert isinstance(results[0], DeadlineExceeded)
+        assert results[1] == "result"
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_follower_with_less_time_stops_at_its_deadline(self):
+        flight = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.2)
+            return "result"
+
+        async def caller(seconds):
+            with deadline_scope(seconds):
+                started = time.monotonic()
+                try:
+                    return await flight.do("key", fetch)
+                finally:
+                    elapsed.append(time.monotonic() - started)
+
+        elapsed = []
+        results = await asyncio.gather(caller(30), caller(0.05), return_exceptions=True)
+
+        assert results[0] == "result"
+        assert isinstance(results[1], DeadlineExceeded)
+        assert min(elapsed) < 0.15
+        assert flight.sent == 1
+
+
+class TestSyncSingleFlight:
+    """Test the thread-based variant."""
+
+    def test_threads_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+        barrier = threading.Barrier(4)
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return "result"
+
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(flight.do("key", fetch))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["result"] * 4
+        assert len(calls) < 4
+
+    def test_waiters_keep_their_own_deadlines(self):
+        flight = SingleFlight()
+        calls = []
+        results = {}
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            clamp_timeout(1.0)
+            return "result"
+
+        def worker(name, seconds, delay):
+            time.sleep(delay)
+            with deadline_scope(seconds):
+                try:
+                    results[name] = flight.do("key", fetch)
+                except DeadlineExceeded as e:
+                    results[name] = e
+
+        threads = [
+            threading.Thread(target=worker, args=("leader", 0.1, 0)),
+            threading.Thread(target=worker, args=("short", 0.05, 0.02)),
+            threading.Thread(target=worker, args=("long", 30, 0.02)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert isinstance(results["leader"], DeadlineExceeded)
+        assert isinstance(results["short"], DeadlineExceeded)
+        assert results["long"] == "result"
+        assert len(calls) == 2
+
+    def test_key_is_canonical(self):
+        assert rpc_key("rLM1Ne", ["nb", None, [2]], "/", None) == rpc_key("rLM1Ne", ["nb", None, [2]], "/", None)
+        assert rpc_key("rLM1Ne", ["nb"], "/", None) != rpc_key("rLM1Ne", ["nb"], "/notebook/nb", None)
+        assert NotebookLMClient.RPC_GET_NOTEBOOK in NotebookLMClient.IDEMPOTENT_RPCS
@@ -0,0 +1,126 @@
+import json
+
+import httpx
+import pytest
+
+from notebooklm_mcp.async_client import AsyncNotebookLMClient
+from notebooklm_mcp.notebook_cache import NotebookCache
+from notebooklm_mcp.summary_cache import SOURCE_GUIDE, SummaryCache
+
+
+def rpc_response(rpc_id, payload):
+    chunk = json.dumps([["wrb.fr", rpc_id, json.dumps(payload), None, None, None, "generic"]])
+    return f")]}}'\n{len(chunk)}\n{chunk}"
+
+
+def make_client(summary_cache=None, notebook_cache=None):
+    requests = []
+    state = {"modified": 1, "summary": "About things"}
+
+    def handler(request):
+        rpc_id = request.url.params.get("rpcids")
+        requests.append(rpc_id)
+        payload = {
+            "rLM1Ne": [[
+                "Notebook",
+                [[["src-1"], "First", [None, 10, [None, state["modified"]], [], 5], [None, 2]]],
+                "nb",
+            ]],
+            "VfAZjd": [[state["summary"]], [[["Topic?", "Tell me"]]]],
+            "tr032e": [[[None, [state["summary"]], [["kw"]]]]],
+        }.get(rpc_id, [])
+        return httpx.Response(200, text=rpc_response(rpc_id, payload))
+
+    client = AsyncNotebookLMClient(
+        cookies={"SID": "test_sid"},
+        csrf_token="token",
+        session_id="sid",
+        notebook_cache=notebook_cache or NotebookCache(),
+        summary_cache=summary_cache or SummaryCache(),
+    )
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._long_running_client = client._client
+    return client, requests, state
+
+
+class TestSummaryCache:
+    """Test caching of source guides and notebook summaries."""
+
+    @pytest.mark.asyncio
+    async def test_notebook_summary_cached_until_sources_change(self):
+        client, requests, state = make_client()
+
+        first = await client.get_notebook_summary("nb")
+        assert await client.get_notebook_summary("nb") == first
+        assert first["summary"] == "About things"
+        assert requests == ["rLM1Ne", "VfAZjd"]
+
+        state["modified"], state["summary"] = 2, "About new things"
+        client._notebook_cache.clear()
+
+        assert (await client.get_notebook_summary("nb"))["summary"] == "About new things"
+        assert requests == ["rLM1Ne", "VfAZjd", "rLM1Ne", "VfAZjd"]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_shared_across_clients(self):
+        summaries, notebooks = SummaryCache(), NotebookCache()
+        first, _, _ = make_client(summaries, notebooks)
+        second, requests, _ = make_client(summaries, notebooks)
+
+        await first.get_notebook_summary("nb")
+        await first.get_notebook("nb")
+        await first.get_source_guide("src-1")
+        await second.get_notebook_summary("nb")
+        await second.get_source_guide("src-1")
+
+        assert requests == []
+        await first.close()
+        await second.close()
+
+    @pytest.mark.asyncio
+    async def test_source_guide_checked_against_source_metadata(self):
+        client, requests, state = make_client()
+
+        await client.get_notebook("nb")
+        guide = await client.get_source_guide("src-1")
+        assert guide == {"summary": "About things", "keywords": ["kw"]}
+        await client.get_source_guide("src-1")
+        assert requests == ["rLM1Ne", "tr032e"]
+
+        state["modified"] = 2
+        client._notebook_cache.clear()
+        await client.get_notebook("nb")
+        await client.get_source_guide("src-1")
+
+        assert requests == ["rLM1Ne", "tr032e", "rLM1Ne", "tr032e"]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_mutations_and_max_age_drop_entries(self):
+        client, requests, _ = make_client(SummaryCache(max_age=3600))
+
+        await client.get_source_guide("src-1")
+        await client.get_source_guide("src-1")
+        await client.delete_source("src-1")
+        await client.get_source_guide("src-1")
+
+        assert requests == ["tr032e", "tGMBJ", "tr032e"]
+
+        client._summary_cache.max_age = 0
+        await client.get_source_guide("src-1")
+        assert requests.count("tr032e") == 3
+        await client.close()
+
+    def test_empty_results_and_lru_bound(self):
+        cache = SummaryCache(max_entries=2)
+
+        cache.put(SOURCE_GUIDE, "empty", None, {"summary": "", "keywords": []})
+        for source_id in ("a", "b", "c"):
+            cache.put(SOURCE_GUIDE, source_id, "v", {"summary": source_id, "keywords": []})
+
+        assert cache.get(SOURCE_GUIDE, "empty", None) is None
+        assert cache.get(SOURCE_GUIDE, "a", "v") is None
+        assert cache.get(SOURCE_GUIDE, "c", "v")["summary"] == "c"
+        assert cache.get(SOURCE_GUIDE, "c", "other") is None
+        assert cache.stats()["entries"] == 1
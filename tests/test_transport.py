@@ -0,0 +1,101 @@
+import json
+
+import httpx
+import pytest
+
+from notebooklm_mcp import transport
+from notebooklm_mcp.async_client import AsyncNotebookLMClient
+from notebooklm_mcp.transport import TransportConfig
+
+
+def rpc_response(rpc_id, payload):
+    chunk = json.dumps([["wrb.fr", rpc_id, json.dumps(payload), None, None, None, "generic"]])
+    return f")]}}'\n{len(chunk)}\n{chunk}"
+
+
+class TestTransportConfig:
+    """Test connection pool settings."""
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("NOTEBOOKLM_HTTP2", "0")
+        monkeypatch.setenv("NOTEBOOKLM_MAX_CONNECTIONS", "4")
+        monkeypatch.setenv("NOTEBOOKLM_KEEPALIVE_EXPIRY", "not a number")
+
+        config = TransportConfig.from_env()
+
+        assert config.http2 is False
+        assert config.max_connections == 4
+        assert config.keepalive_expiry == TransportConfig().keepalive_expiry
+
+    def test_client_kwargs(self, monkeypatch):
+        monkeypatch.setattr(transport, "HTTP2_AVAILABLE", False)
+        kwargs = TransportConfig(max_connections=7, max_keepalive_connections=3).client_kwargs()
+
+        # Falls back to HTTP/1.1 without h2
+        assert kwargs["http2"] is False
+        assert kwargs["limits"] == httpx.Limits(max_connections=7, max_keepalive_connections=3, keepalive_expiry=120.0)
+        assert kwargs["timeout"].connect == 10.0
+
+
+class TestSharedClient:
+    """Test that auth recovery keeps the pooled client."""
+
+    @pytest.mark.asyncio
+    async def test_auth_retry_swaps_headers_on_same_client(self):
+        client = AsyncNotebookLMClient(cookies={"SID": "old"}, csrf_token="token", session_id="sid")
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers["Cookie"])
+            if len(seen) == 1:
+                return httpx.Response(401)
+            return httpx.Response(200, text=rpc_response("rLM1Ne", {"status": "ok"}))
+
+        async def fake_refresh():
+            client.cookies = {"SID": "new"}
+
+        client._client = http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), headers=client._rpc_headers()
+        )
+        client._refresh_auth_tokens = fake_refresh
+
+        assert await client._call_rpc("rLM1Ne", []) == {"status": "ok"}
+        assert client._client is http_client
+        assert seen == ["SID=old", "SID=new"]
+        await client.close()
+
+
+class TestConnectionLanes:
+    """Test that slow and fast RPCs use separate pools."""
+
+    @pytest.mark.asyncio
+    async def test_long_running_rpcs_use_their_own_client(self):
+        client = AsyncNotebookLMClient(
+            cookies={"SID": "test_sid"}, csrf_token="token", session_id="sid", coalesce_rpcs=True
+        )
+        lanes = []
+
+        def lane(name):
+            def handler(request):
+                rpc_id = request.url.params.get("rpcids")
+                lanes.append((name, rpc_id))
+                return httpx.Response(200, text=rpc_response(rpc_id, []))
+            return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        client._client = lane("short")
+        client._long_running_client = lane("long")
+
+        await client.add_url_source("nb", "https://example.com")
+        await client.get_notebook("nb")
+
+        assert lanes == [("long", "izAoDd"), ("short", "rLM1Ne")]
+        await client.close()
+        assert client._long_running_client is None
+
+    def test_lane_defaults(self):
+        short = TransportConfig.from_env()
+        long_running = TransportConfig.long_running_from_env()
+
+        assert long_running.max_connections < short.max_connections
+        assert long_running.timeout == 120.0
+        assert short.pool_timeout < long_running.pool_timeout